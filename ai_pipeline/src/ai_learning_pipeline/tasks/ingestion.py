@@ -14,13 +14,19 @@ This task uses the IntelligentIngestionPipeline which provides:
 2. LLM-Powered Analysis (knowledge type, entities, relationships, importance)
 3. Conflict Resolution (duplicate detection, supersession, merging)
 4. Human Review Integration (FLAG_REVIEW to Proposed Changes)
+
+Sources are ingested incrementally: an IngestionManifest kept in
+config_service records the content hash of every document already ingested,
+so reruns only send new or changed documents through the pipeline and
+documents that disappear from their source are tombstoned.
 """
 
+import hashlib
 import json
 import os
 import sys
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
 
 import httpx
 
@@ -40,6 +46,140 @@ def _log(event: str, **fields) -> None:
     print(json.dumps(payload, default=str))
 
 
+# Longest query sent to the RAG search endpoint for similarity checks; the
+# leading part of a chunk is enough to find its near-duplicates.
+MAX_SIMILARITY_QUERY_CHARS = 2000
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp from a source record into an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class IngestionManifest:
+    """
+    What has already been ingested from one source for a team.
+
+    Backed by config_service's /api/v1/internal/ingestion-manifest. Load it
+    before a run, skip documents whose content hash is unchanged, record the
+    ones that were ingested, and save once at the end together with the IDs
+    that have disappeared from the source (which config_service tombstones).
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        org_id: str,
+        team_node_id: str,
+        source: str,
+    ):
+        self._client = client
+        self.org_id = org_id
+        self.team_node_id = team_node_id
+        self.source = source
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._ingested: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    async def load(self) -> None:
+        """Fetch the manifest. On failure everything is treated as new."""
+        try:
+            response = await self._client.get(
+                "/api/v1/internal/ingestion-manifest",
+                params={
+                    "org_id": self.org_id,
+                    "team_node_id": self.team_node_id,
+                    "source": self.source,
+                },
+                headers={"X-Internal-Service": "ai_pipeline"},
+            )
+            response.raise_for_status()
+            self.entries = {
+                e["document_id"]: e for e in response.json().get("entries", [])
+            }
+        except Exception as e:
+            _log("ingestion_manifest_load_failed", source=self.source, error=str(e))
+            self.entries = {}
+
+    def is_unchanged(self, document_id: str, content: str) -> bool:
+        entry = self.entries.get(document_id)
+        return entry is not None and entry["content_hash"] == self.content_hash(content)
+
+    def record(
+        self,
+        document_id: str,
+        content: str,
+        last_modified: Optional[datetime] = None,
+    ) -> None:
+        """Mark a document as successfully ingested in this run."""
+        self._ingested[document_id] = {
+            "document_id": document_id,
+            "content_hash": self.content_hash(content),
+            "last_modified": last_modified.isoformat() if last_modified else None,
+        }
+
+    def missing(
+        self, seen_ids: Iterable[str], modified_since: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Manifest entries the source no longer returned.
+
+        With modified_since, only entries last modified at or after it count:
+        sources listed over a lookback window drop old documents without
+        deleting them, so those must not be tombstoned.
+        """
+        seen = set(seen_ids)
+        missing = []
+        for document_id, entry in self.entries.items():
+            if document_id in seen:
+                continue
+            if modified_since is not None:
+                last_modified = _parse_timestamp(entry.get("last_modified"))
+                if last_modified is None or last_modified < modified_since:
+                    continue
+            missing.append(document_id)
+        return sorted(missing)
+
+    async def save(self, deleted_document_ids: Iterable[str] = ()) -> None:
+        deleted = list(deleted_document_ids)
+        if not self._ingested and not deleted:
+            return
+        try:
+            response = await self._client.put(
+                "/api/v1/internal/ingestion-manifest",
+                json={
+                    "org_id": self.org_id,
+                    "team_node_id": self.team_node_id,
+                    "source": self.source,
+                    "entries": list(self._ingested.values()),
+                    "deleted_document_ids": deleted,
+                },
+                headers={"X-Internal-Service": "ai_pipeline"},
+            )
+            response.raise_for_status()
+            _log(
+                "ingestion_manifest_saved",
+                source=self.source,
+                ingested=len(self._ingested),
+                tombstoned=len(deleted),
+            )
+        except Exception as e:
+            # Next run re-ingests these documents; duplicates are caught by
+            # the pipeline's conflict resolution.
+            _log("ingestion_manifest_save_failed", source=self.source, error=str(e))
+
+
 class APIIntegratedStorageBackend:
     """
     Storage backend that combines in-memory storage with API integration.
@@ -47,6 +187,10 @@ class APIIntegratedStorageBackend:
     Content is stored in memory (for development/testing), but pending changes
     are submitted to the config_service internal API so they appear in the
     Proposed Changes UI at /team/pending-changes.
+
+    With a rag_client, similarity checks use the RAG service's vector search
+    over the existing knowledge base; only content stored during this run is
+    compared locally.
     """
 
     def __init__(
@@ -54,10 +198,14 @@ class APIIntegratedStorageBackend:
         org_id: str,
         team_node_id: str,
         config_service_url: str,
+        rag_client: Optional[httpx.AsyncClient] = None,
+        rag_tree: Optional[str] = None,
     ):
         self.org_id = org_id
         self.team_node_id = team_node_id
         self.config_service_url = config_service_url.rstrip("/")
+        self.rag_client = rag_client
+        self.rag_tree = rag_tree
 
         # In-memory storage for content
         self.nodes: Dict[str, Dict[str, Any]] = {}
@@ -105,6 +253,11 @@ class APIIntegratedStorageBackend:
                     "updated_at": datetime.utcnow().isoformat(),
                 }
             )
+        else:
+            # A knowledge-base node found through RAG search; keep the new
+            # version locally, noting which node it supersedes.
+            new_id = await self.store_content(content, source, analysis)
+            self.nodes[new_id]["supersedes"] = node_id
 
     async def find_similar(
         self,
@@ -112,7 +265,51 @@ class APIIntegratedStorageBackend:
         limit: int = 5,
         threshold: float = 0.75,
     ) -> List[Dict[str, Any]]:
-        """Find similar existing content using simple text overlap."""
+        """Find similar existing content.
+
+        Searches the knowledge base through the RAG service when configured,
+        plus whatever was stored in memory during this run.
+        """
+        results = self._find_similar_local(content, threshold)
+        if self.rag_client is not None:
+            results.extend(await self._find_similar_rag(content, limit, threshold))
+        results.sort(key=lambda x: x["similarity_score"], reverse=True)
+        return results[:limit]
+
+    async def _find_similar_rag(
+        self, content: str, limit: int, threshold: float
+    ) -> List[Dict[str, Any]]:
+        try:
+            response = await self.rag_client.post(
+                "/api/v1/search",
+                json={
+                    "query": content[:MAX_SIMILARITY_QUERY_CHARS],
+                    "tree": self.rag_tree,
+                    "top_k": limit,
+                },
+            )
+            response.raise_for_status()
+            hits = response.json().get("results", [])
+        except Exception as e:
+            _log("rag_similarity_search_failed", error=str(e))
+            return []
+
+        return [
+            {
+                "id": hit.get("node_id"),
+                "content": hit.get("text", ""),
+                "source": self.rag_tree or "knowledge_base",
+                "updated_at": "unknown",
+                "similarity_score": hit.get("score", 0.0),
+            }
+            for hit in hits
+            if hit.get("score", 0.0) >= threshold and not hit.get("is_summary")
+        ]
+
+    def _find_similar_local(
+        self, content: str, threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Jaccard word overlap against nodes stored in memory."""
         results = []
 
         content_words = set(content.lower().split())
@@ -140,8 +337,7 @@ class APIIntegratedStorageBackend:
                     }
                 )
 
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return results[:limit]
+        return results
 
     async def store_pending_change(self, change: Any) -> str:
         """Store a pending change by submitting to the config_service internal API."""
@@ -303,6 +499,8 @@ class KnowledgeIngestionTask:
                 org_id=self.org_id,
                 team_node_id=self.team_node_id,
                 config_service_url=config_service_url,
+                rag_client=self._raptor_client,
+                rag_tree=self.sources_config.get("rag_tree"),
             )
 
             self._pipeline = IntelligentIngestionPipeline(
@@ -417,15 +615,22 @@ class KnowledgeIngestionTask:
         return {"documents": 0, "chunks": 0, "status": "not_implemented"}
 
     async def _ingest_incidents(self) -> Dict[str, Any]:
-        """Ingest past incidents and postmortems using LLM-powered analysis."""
+        """Ingest new or changed incidents and postmortems using LLM-powered analysis."""
         lookback_days = self.sources_config.get("incidents_lookback_days", 90)
         _log("incidents_ingestion_started", lookback_days=lookback_days)
 
         documents = 0
         chunks = 0
         flagged = 0
+        unchanged = 0
+        tombstoned: List[str] = []
         errors = []
 
+        manifest = IngestionManifest(
+            self._config_client, self.org_id, self.team_node_id, source="incidents"
+        )
+        await manifest.load()
+
         try:
             # Fetch incidents from config service (where they're stored)
             response = await self._config_client.get(
@@ -435,16 +640,24 @@ class KnowledgeIngestionTask:
 
             if response.status_code == 200:
                 incidents = response.json().get("incidents", [])
+                seen_ids = []
 
                 for incident in incidents:
+                    incident_id = str(incident.get("id", "unknown"))
+                    seen_ids.append(incident_id)
                     try:
                         content = self._format_incident(incident)
+                        if manifest.is_unchanged(incident_id, content):
+                            unchanged += 1
+                            continue
+
+                        ingested = False
 
                         # Use intelligent pipeline if available
                         if self._pipeline:
                             result = await self._pipeline.ingest_content(
                                 content=content,
-                                source=f"incident:{incident.get('id', 'unknown')}",
+                                source=f"incident:{incident_id}",
                                 content_type="incident_report",
                                 extra_metadata={
                                     "incident_id": incident.get("id"),
@@ -462,6 +675,8 @@ class KnowledgeIngestionTask:
 
                             if result.errors:
                                 errors.extend(result.errors)
+                            else:
+                                ingested = True
 
                             _log(
                                 "incident_ingested",
@@ -491,6 +706,18 @@ class KnowledgeIngestionTask:
                                 chunks += result.get(
                                     "nodes_created", result.get("chunks_created", 0)
                                 )
+                                ingested = True
+
+                        # Failed incidents stay out of the manifest so the
+                        # next run retries them
+                        if ingested:
+                            manifest.record(
+                                incident_id,
+                                content,
+                                last_modified=_parse_timestamp(
+                                    incident.get("updated_at") or incident.get("date")
+                                ),
+                            )
 
                     except Exception as e:
                         _log(
@@ -500,14 +727,26 @@ class KnowledgeIngestionTask:
                         )
                         errors.append(f"Incident {incident.get('id')}: {e}")
 
+                # Incidents older than the lookback window are simply not
+                # listed any more; only ones inside it have been deleted.
+                tombstoned = manifest.missing(
+                    seen_ids,
+                    modified_since=datetime.now(timezone.utc)
+                    - timedelta(days=lookback_days),
+                )
+
         except httpx.HTTPStatusError as e:
             if e.response.status_code != 404:
                 raise
 
+        await manifest.save(deleted_document_ids=tombstoned)
+
         return {
             "documents": documents,
             "chunks": chunks,
             "flagged_for_review": flagged,
+            "unchanged": unchanged,
+            "tombstoned": len(tombstoned),
             "errors": errors,
             "status": "completed",
         }
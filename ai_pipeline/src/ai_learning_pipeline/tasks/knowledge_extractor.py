@@ -6,15 +6,25 @@ into classified, synthesized knowledge items for RAG ingestion.
 
 Uses gpt-4o-mini following the same pattern as
 github_scanner._generate_architecture_summary().
+
+Extraction is scheduled rather than one call per channel/document: content
+is packed into prompts up to a token budget, calls run with bounded
+concurrency and retry on rate limits, and results are cached by content
+hash so unchanged threads and documents are never re-sent to the LLM.
+Token usage, throughput and estimated cost are reported per run.
 """
 
 import asyncio
+import hashlib
 import json
 import os
-from collections import defaultdict
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .scanners import Document
 from .scanners.slack_scanner import CollectedMessage
@@ -31,6 +41,147 @@ def _log(event: str, **fields) -> None:
     print(json.dumps(payload, default=str))
 
 
+# Rough characters per token, for budgeting prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+# Tokens of channel messages / documents packed into a single prompt
+DEFAULT_PROMPT_TOKEN_BUDGET = 20_000
+DEFAULT_LLM_CONCURRENCY = 5
+# Keeps a packed document prompt's JSON answer within the completion limit
+MAX_DOCUMENTS_PER_PROMPT = 8
+MAX_LLM_RETRIES = 4
+MAX_RETRY_DELAY_SECONDS = 60.0
+
+# USD per 1M (input, output) tokens; unknown models are reported at 0
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-5.2": (1.75, 14.00),
+}
+
+# Parsed LLM results by prompt/document hash, and for each Slack unit
+# (thread or message) the prompt hash it was last extracted in plus the keys
+# of every unit in that prompt. Shared by every extractor in the process so
+# later scans reuse earlier results.
+_EXTRACTION_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_UNIT_PROMPTS: "OrderedDict[str, Tuple[str, Tuple[str, ...]]]" = OrderedDict()
+_EXTRACTION_CACHE_MAX_ENTRIES = 4096
+_cache_lock = threading.Lock()
+
+
+def _content_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cache_get(cache: "OrderedDict[str, Any]", key: str) -> Any:
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > _EXTRACTION_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def _pack(
+    units: List[Tuple[str, Any]],
+    budget_chars: int,
+    separator: str,
+    max_units: Optional[int] = None,
+) -> List[Tuple[List[str], List[Any]]]:
+    """Greedily pack (text, payload) units into batches of at most budget_chars.
+
+    Order is kept. A unit larger than the budget gets a batch of its own,
+    truncated.
+    """
+    batches: List[Tuple[List[str], List[Any]]] = []
+    texts: List[str] = []
+    payloads: List[Any] = []
+    size = 0
+    for text, payload in units:
+        if len(text) > budget_chars:
+            text = text[:budget_chars] + "\n\n[... truncated ...]"
+        added = len(text) + (len(separator) if texts else 0)
+        full = max_units is not None and len(texts) >= max_units
+        if texts and (size + added > budget_chars or full):
+            batches.append((texts, payloads))
+            texts, payloads, size = [], [], 0
+            added = len(text)
+        texts.append(text)
+        payloads.append(payload)
+        size += added
+    if texts:
+        batches.append((texts, payloads))
+    return batches
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a failed LLM call, or None to give up.
+
+    Rate limits (429), timeouts, conflicts and server errors are retried,
+    honouring Retry-After when the API sends one.
+    """
+    status = getattr(error, "status_code", None)
+    transient = type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+    if not transient and not (
+        isinstance(status, int) and (status in (408, 409, 429) or status >= 500)
+    ):
+        return None
+
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return min(float(headers["retry-after-ms"]) / 1000, MAX_RETRY_DELAY_SECONDS)
+        if headers.get("retry-after"):
+            return min(float(headers["retry-after"]), MAX_RETRY_DELAY_SECONDS)
+    except (TypeError, ValueError):
+        pass
+    return min(2**attempt + random.uniform(0, 1), MAX_RETRY_DELAY_SECONDS)
+
+
+@dataclass
+class ExtractionStats:
+    """LLM usage accumulated by one KnowledgeExtractor (one scan run)."""
+
+    llm_calls: int = 0
+    failed_calls: int = 0
+    retries: int = 0
+    cached_units: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    first_call_at: Optional[float] = None
+    last_call_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        tokens = self.prompt_tokens + self.completion_tokens
+        elapsed = (
+            self.last_call_at - self.first_call_at
+            if self.first_call_at is not None and self.last_call_at is not None
+            else 0.0
+        )
+        return {
+            "llm_calls": self.llm_calls,
+            "failed_calls": self.failed_calls,
+            "retries": self.retries,
+            "cached_units": self.cached_units,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "llm_seconds": round(elapsed, 3),
+            "tokens_per_second": round(tokens / elapsed, 1) if elapsed > 0 else 0.0,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
 @dataclass
 class ExtractedEntity:
     """An entity discovered during knowledge extraction."""
@@ -201,6 +352,67 @@ def _build_document_prompt(
     )
 
 
+def _build_document_batch_prompt(source_type: str, documents: List[str]) -> str:
+    """Build the knowledge extraction prompt for several small documents.
+
+    Each entry of documents is already formatted with its source, metadata
+    hints and content. Same instructions as _build_document_prompt, answered
+    per document.
+    """
+    blocks = "\n\n".join(
+        "### Document " + str(i) + "\n" + block for i, block in enumerate(documents, 1)
+    )
+    return (
+        "You are an expert SRE knowledge engineer. You are processing "
+        + str(len(documents))
+        + " documents from "
+        + source_type
+        + " that were discovered during an onboarding environment scan.\n\n"
+        "Your job is to transform each raw document into structured operational "
+        "knowledge that an AI SRE agent can use during incident investigation. "
+        "Treat every document independently.\n\n"
+        "## Documents\n\n" + blocks + "\n\n"
+        "## Instructions\n\n"
+        "For EACH document produce a structured knowledge extraction:\n\n"
+        '1. "index": The document number from its "### Document N" heading\n\n'
+        '2. "knowledge_type": Classify as one of: procedural, factual, relational, temporal, social, policy\n'
+        "   - Runbooks, how-tos, troubleshooting guides, deployment steps -> procedural\n"
+        "   - Service descriptions, API docs, architecture, configurations -> factual\n"
+        "   - Dependency maps, ownership info, integration points -> relational\n"
+        "   - Incident reports, postmortems, change logs, deployment history -> temporal\n"
+        "   - Team contacts, escalation paths, on-call info, expertise areas -> social\n"
+        "   - SLAs, compliance requirements, security policies -> policy\n\n"
+        '3. "title": A descriptive title for this knowledge item\n\n'
+        '4. "content": Rewrite the document as a concise, operational summary.\n'
+        "   - For PROCEDURAL: Extract clear numbered steps. Include prerequisites, "
+        "symptoms that trigger this procedure, and affected services.\n"
+        "   - For FACTUAL: Extract key facts: what the service does, tech stack, "
+        "critical endpoints, deployment method, key configuration.\n"
+        "   - For RELATIONAL: Map out dependencies, ownership, communication paths.\n"
+        "   - For TEMPORAL: Extract timeline, root cause, resolution, lessons learned.\n"
+        "   - Keep it under 500 words. Remove marketing language, redundant text, TODOs.\n\n"
+        '5. "entities": Extract all SRE-relevant entities mentioned.\n'
+        '   Array of {"name": "...", "type": "service|team|person|technology|metric|environment"}\n\n'
+        '6. "confidence": 0.0-1.0 how confident you are in the classification\n\n'
+        '7. "skip": true if this document has no operational value for an SRE agent '
+        "(e.g., a template with no content, a deprecated notice, marketing copy)\n\n"
+        "Respond in JSON with one entry per document:\n"
+        "{\n"
+        '  "documents": [\n'
+        "    {\n"
+        '      "index": 1,\n'
+        '      "skip": false,\n'
+        '      "title": "...",\n'
+        '      "knowledge_type": "factual",\n'
+        '      "content": "...",\n'
+        '      "entities": [{"name": "user-service", "type": "service"}],\n'
+        '      "confidence": 0.9\n'
+        "    }\n"
+        "  ]\n"
+        "}"
+    )
+
+
 class KnowledgeExtractor:
     """
     LLM-powered extraction that transforms raw scan data
@@ -208,11 +420,32 @@ class KnowledgeExtractor:
 
     Uses gpt-4o-mini following the same pattern as
     github_scanner._generate_architecture_summary().
+
+    One extractor is used per scan run; its stats accumulate LLM usage
+    across every extract_* call in that run.
     """
 
-    def __init__(self, model: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        prompt_token_budget: Optional[int] = None,
+    ):
         self.model = model or os.getenv("SCANNER_LLM_MODEL", "gpt-4o-mini")
-        self._semaphore = asyncio.Semaphore(5)
+        self.prompt_token_budget = prompt_token_budget or int(
+            os.getenv("SCANNER_LLM_PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET)
+        )
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency
+            or int(os.getenv("SCANNER_LLM_CONCURRENCY", DEFAULT_LLM_CONCURRENCY))
+        )
+        # Set on a rate limit so every concurrent call backs off together
+        self._paused_until = 0.0
+        self.stats = ExtractionStats()
+
+    def _content_budget(self, empty_prompt: str) -> int:
+        """Characters of content that fit the token budget next to a prompt template."""
+        return max(1000, self.prompt_token_budget * CHARS_PER_TOKEN - len(empty_prompt))
 
     async def extract_from_slack(
         self,
@@ -222,8 +455,9 @@ class KnowledgeExtractor:
         """Transform raw Slack messages into synthesized knowledge items.
 
         Groups messages by channel, then uses LLM to extract operational
-        knowledge from each channel's messages. Falls back to raw channel
-        documents when LLM is unavailable.
+        knowledge from each channel's messages, packed into as few prompts
+        as the token budget allows. Falls back to raw channel documents
+        when LLM is unavailable.
         """
         if not messages:
             return []
@@ -253,6 +487,7 @@ class KnowledgeExtractor:
             raw_messages=len(messages),
             items_extracted=len(items),
         )
+        _log("llm_extraction_stats", model=self.model, **self.stats.as_dict())
         return items
 
     @staticmethod
@@ -266,6 +501,12 @@ class KnowledgeExtractor:
         Thread parents and their replies are grouped in [THREAD]...[/THREAD]
         blocks. Non-threaded messages appear inline. All sorted chronologically.
         """
+        return "\n\n".join(block for block, _ in self._thread_units(messages))
+
+    def _thread_units(
+        self, messages: List[CollectedMessage]
+    ) -> List[Tuple[str, List[CollectedMessage]]]:
+        """Chronological (formatted block, messages) per thread or standalone message."""
         # Index thread parents by ts
         thread_parents: Dict[str, CollectedMessage] = {}
         thread_replies: Dict[str, List[CollectedMessage]] = defaultdict(list)
@@ -286,7 +527,7 @@ class KnowledgeExtractor:
 
         for msg in standalone:
             ts_str = self._format_ts(msg.ts)
-            events.append((msg.ts, "[%s] %s: %s" % (ts_str, msg.user, msg.text)))
+            events.append((msg.ts, "[%s] %s: %s" % (ts_str, msg.user, msg.text), [msg]))
 
         for parent_ts, parent_msg in thread_parents.items():
             replies = sorted(thread_replies.get(parent_ts, []), key=lambda m: m.ts)
@@ -301,10 +542,12 @@ class KnowledgeExtractor:
                 reply_ts = self._format_ts(reply.ts)
                 block_lines.append("  [%s] %s: %s" % (reply_ts, reply.user, reply.text))
             block_lines.append("[/THREAD]")
-            events.append((parent_msg.ts, "\n".join(block_lines)))
+            events.append(
+                (parent_msg.ts, "\n".join(block_lines), [parent_msg] + replies)
+            )
 
         events.sort(key=lambda e: e[0])
-        return "\n\n".join(e[1] for e in events)
+        return [(block, msgs) for _, block, msgs in events]
 
     async def _extract_from_channel(
         self,
@@ -312,55 +555,101 @@ class KnowledgeExtractor:
         messages: List[CollectedMessage],
         org_id: str,
     ) -> List[KnowledgeItem]:
-        """Extract knowledge items from a single channel's messages."""
+        """Extract knowledge items from a single channel's messages.
+
+        The channel is split into units (threads and standalone messages,
+        or single messages when there are no threads). A cached prompt
+        result is reused only when every unit of that prompt is present and
+        unchanged, since its items cannot be attributed to single units; the
+        remaining units are packed into prompts up to the token budget.
+        """
         # Format messages — use thread-grouped format when threads are present
         has_threads = any(m.is_thread_parent for m in messages)
 
         if has_threads:
-            formatted = self._format_messages_with_threads(messages)
+            units = self._thread_units(messages)
+            separator = "\n\n"
         else:
-            sorted_msgs = sorted(messages, key=lambda m: m.ts)
-            lines = []
-            for msg in sorted_msgs:
-                ts_str = msg.ts.split(".")[0] if "." in msg.ts else msg.ts
-                lines.append("[%s] %s: %s" % (ts_str, msg.user, msg.text))
-            formatted = "\n".join(lines)
-
-        # Truncate to ~80K chars (same limit as architecture map)
-        if len(formatted) > 80_000:
-            formatted = formatted[:80_000] + "\n\n[... truncated ...]"
-
-        prompt = _build_slack_prompt(channel_name, formatted)
+            units = [
+                ("[%s] %s: %s" % (self._format_ts(m.ts), m.user, m.text), [m])
+                for m in sorted(messages, key=lambda m: m.ts)
+            ]
+            separator = "\n"
+
+        keyed = [
+            (_content_hash(self.model, org_id, channel_name, text), text, msgs)
+            for text, msgs in units
+        ]
+        entries = {
+            unit_key: _cache_get(_UNIT_PROMPTS, unit_key) for unit_key, _, _ in keyed
+        }
+
+        results: Dict[str, Optional[dict]] = {}
+        fresh: List[Tuple[str, Tuple[str, List[CollectedMessage]]]] = []
+        for unit_key, text, unit_messages in keyed:
+            entry = entries[unit_key]
+            cached = None
+            if entry and all(entries.get(key) == entry for key in entry[1]):
+                cached = _cache_get(_EXTRACTION_CACHE, entry[0])
+            if cached is not None:
+                results[entry[0]] = cached
+            else:
+                fresh.append((text, (unit_key, unit_messages)))
+        self.stats.cached_units += len(units) - len(fresh)
 
-        async with self._semaphore:
-            result = await self._call_llm(prompt)
+        batches = _pack(
+            fresh,
+            self._content_budget(_build_slack_prompt(channel_name, "")),
+            separator,
+        )
 
-        if not result:
-            # LLM unavailable — fall back to raw channel document
-            return [self._fallback_channel_item(channel_name, messages, org_id)]
+        async def extract_batch(texts, payloads):
+            prompt = _build_slack_prompt(channel_name, separator.join(texts))
+            prompt_key = _content_hash(self.model, org_id, prompt)
+            result = await self._call_llm_cached(prompt_key, prompt)
+            if result is not None:
+                prompt_units = tuple(unit_key for unit_key, _ in payloads)
+                for unit_key in prompt_units:
+                    _cache_put(_UNIT_PROMPTS, unit_key, (prompt_key, prompt_units))
+            return prompt_key, result
+
+        extracted = await asyncio.gather(
+            *(extract_batch(texts, payloads) for texts, payloads in batches)
+        )
 
         items = []
-        for raw_item in result.get("items", []):
-            try:
-                item = self._parse_knowledge_item(
-                    raw_item,
-                    source_url="slack://#%s" % channel_name,
-                    extra_metadata={
-                        "channel": channel_name,
-                        "org_id": org_id,
-                        "source": "onboarding_scan",
-                        "raw_message_count": len(messages),
-                    },
+        for (texts, payloads), (prompt_key, result) in zip(batches, extracted):
+            if result is None:
+                # LLM unavailable — fall back to raw messages for this batch
+                batch_messages = [m for _, unit in payloads for m in unit]
+                items.append(
+                    self._fallback_channel_item(channel_name, batch_messages, org_id)
                 )
-                if item:
-                    items.append(item)
-            except Exception as e:
-                _log(
-                    "item_parse_failed",
-                    channel=channel_name,
-                    error=str(e),
-                )
-                continue
+            else:
+                results[prompt_key] = result
+
+        for result in results.values():
+            for raw_item in result.get("items", []):
+                try:
+                    item = self._parse_knowledge_item(
+                        raw_item,
+                        source_url="slack://#%s" % channel_name,
+                        extra_metadata={
+                            "channel": channel_name,
+                            "org_id": org_id,
+                            "source": "onboarding_scan",
+                            "raw_message_count": len(messages),
+                        },
+                    )
+                    if item:
+                        items.append(item)
+                except Exception as e:
+                    _log(
+                        "item_parse_failed",
+                        channel=channel_name,
+                        error=str(e),
+                    )
+                    continue
 
         # If LLM returned no items, fall back to raw
         if not items:
@@ -420,13 +709,16 @@ class KnowledgeExtractor:
         """Transform raw documents into classified knowledge items.
 
         Skips documents already tagged as architecture_map (already LLM-processed).
-        Processes up to 5 documents concurrently.
+        Documents extracted before with identical content reuse the cached
+        result; the rest are packed several to a prompt up to the token
+        budget.
         """
         if not documents:
             return []
 
-        tasks = []
         passthrough_items = []
+        cached: List[Tuple[Document, dict]] = []
+        fresh: List[Tuple[str, Tuple[Document, str]]] = []
 
         for doc in documents:
             # Architecture maps are already LLM-processed — pass through as-is
@@ -444,17 +736,49 @@ class KnowledgeExtractor:
                 )
                 continue
 
-            tasks.append(self._extract_from_document(doc, source_type))
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            metadata_hint = self._document_hint(doc)
+            doc_key = _content_hash(
+                self.model, source_type, doc.source_url, metadata_hint, doc.content
+            )
+            result = _cache_get(_EXTRACTION_CACHE, doc_key)
+            if result is not None:
+                cached.append((doc, result))
+                continue
+            block = (
+                "Source: "
+                + doc.source_url
+                + "\n"
+                + (metadata_hint + "\n" if metadata_hint else "")
+                + "\n"
+                + doc.content
+            )
+            fresh.append((block, (doc, doc_key)))
+        self.stats.cached_units += len(cached)
+
+        batches = _pack(
+            fresh,
+            self._content_budget(_build_document_batch_prompt(source_type, [])),
+            "\n\n",
+            max_units=MAX_DOCUMENTS_PER_PROMPT,
+        )
+        results = await asyncio.gather(
+            *(
+                self._extract_document_batch(texts, payloads, source_type)
+                for texts, payloads in batches
+            ),
+            return_exceptions=True,
+        )
 
         items = list(passthrough_items)
+        for doc, result in cached:
+            item = self._item_from_document_result(doc, result)
+            if item:
+                items.append(item)
         for result in results:
             if isinstance(result, Exception):
                 _log("document_extraction_failed", error=str(result))
                 continue
-            if result:
-                items.append(result)
+            items.extend(result)
 
         _log(
             "document_extraction_complete",
@@ -462,16 +786,64 @@ class KnowledgeExtractor:
             raw_documents=len(documents),
             items_extracted=len(items),
             passthrough=len(passthrough_items),
+            cached=len(cached),
+            prompts=len(batches),
         )
+        _log("llm_extraction_stats", model=self.model, **self.stats.as_dict())
         return items
 
-    async def _extract_from_document(
+    async def _extract_document_batch(
         self,
-        doc: Document,
+        texts: List[str],
+        payloads: List[Tuple[Document, str]],
         source_type: str,
-    ) -> Optional[KnowledgeItem]:
-        """Extract a knowledge item from a single document."""
-        # Build metadata hint for the LLM
+    ) -> List[KnowledgeItem]:
+        """Extract knowledge items from a packed batch of documents."""
+        if len(payloads) == 1:
+            doc, doc_key = payloads[0]
+            item = await self._extract_from_document(doc, source_type, doc_key)
+            return [item] if item else []
+
+        prompt = _build_document_batch_prompt(source_type, texts)
+        result = await self._call_llm_cached(
+            _content_hash(self.model, prompt),
+            prompt,
+            max_tokens=min(16_000, 1500 * len(payloads)),
+        )
+
+        answers: Dict[int, dict] = {}
+        if result is not None:
+            for entry in result.get("documents", []):
+                if isinstance(entry, dict) and isinstance(entry.get("index"), int):
+                    answers[entry["index"]] = entry
+
+        items: List[Optional[KnowledgeItem]] = []
+        missing = []
+        for i, (doc, doc_key) in enumerate(payloads, 1):
+            if result is None:
+                # LLM failed — fall back to raw ingestion
+                items.append(self._item_from_document_result(doc, None))
+            elif i in answers:
+                _cache_put(_EXTRACTION_CACHE, doc_key, answers[i])
+                items.append(self._item_from_document_result(doc, answers[i]))
+            else:
+                missing.append((doc, doc_key))
+
+        # Documents the batched answer left out get a prompt of their own
+        if missing:
+            items.extend(
+                await asyncio.gather(
+                    *(
+                        self._extract_from_document(doc, source_type, doc_key)
+                        for doc, doc_key in missing
+                    )
+                )
+            )
+        return [item for item in items if item]
+
+    @staticmethod
+    def _document_hint(doc: Document) -> str:
+        """Metadata hint lines for the LLM."""
         hints = []
         if doc.metadata.get("title"):
             hints.append("Title: %s" % doc.metadata["title"])
@@ -481,20 +853,33 @@ class KnowledgeExtractor:
             hints.append("Repository: %s" % doc.metadata["repo"])
         if doc.metadata.get("search_query"):
             hints.append("Found via search: %s" % doc.metadata["search_query"])
-        metadata_hint = "\n".join(hints) if hints else ""
+        return "\n".join(hints) if hints else ""
+
+    async def _extract_from_document(
+        self,
+        doc: Document,
+        source_type: str,
+        doc_key: str,
+    ) -> Optional[KnowledgeItem]:
+        """Extract a knowledge item from a single document."""
+        metadata_hint = self._document_hint(doc)
 
         # Truncate very large documents
         content = doc.content
-        if len(content) > 60_000:
-            content = content[:60_000] + "\n\n[... truncated ...]"
+        budget = self._content_budget(_build_document_prompt(source_type, "", "", ""))
+        if len(content) > budget:
+            content = content[:budget] + "\n\n[... truncated ...]"
 
         prompt = _build_document_prompt(
             source_type, doc.source_url, metadata_hint, content
         )
+        result = await self._call_llm_cached(doc_key, prompt)
+        return self._item_from_document_result(doc, result)
 
-        async with self._semaphore:
-            result = await self._call_llm(prompt)
-
+    def _item_from_document_result(
+        self, doc: Document, result: Optional[dict]
+    ) -> Optional[KnowledgeItem]:
+        """Turn the LLM's answer for one document into a KnowledgeItem."""
         if not result:
             # LLM failed — fall back to raw ingestion
             return KnowledgeItem(
@@ -567,6 +952,19 @@ class KnowledgeExtractor:
             metadata=extra_metadata or {},
         )
 
+    async def _call_llm_cached(
+        self, key: str, prompt: str, max_tokens: int = 3000
+    ) -> Optional[dict]:
+        """_call_llm under the concurrency limit, memoised by key on success."""
+        cached = _cache_get(_EXTRACTION_CACHE, key)
+        if cached is not None:
+            return cached
+        async with self._semaphore:
+            result = await self._call_llm(prompt, max_tokens=max_tokens)
+        if result is not None:
+            _cache_put(_EXTRACTION_CACHE, key, result)
+        return result
+
     async def _call_llm(
         self,
         prompt: str,
@@ -575,22 +973,72 @@ class KnowledgeExtractor:
         """Call gpt-4o-mini with JSON output.
 
         Same pattern as github_scanner._generate_architecture_summary().
+        Rate limits and transient errors are retried with backoff; a rate
+        limit pauses every call made through this extractor.
         """
         try:
             from openai import AsyncOpenAI
 
-            client = AsyncOpenAI()
-            response = await client.chat.completions.create(
-                model=self.model,
-                temperature=0.2,
-                max_tokens=max_tokens,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-            )
+            client = AsyncOpenAI(max_retries=0)
+            attempt = 0
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                started = time.monotonic()
+                try:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        temperature=0.2,
+                        max_tokens=max_tokens,
+                        messages=[{"role": "user", "content": prompt}],
+                        response_format={"type": "json_object"},
+                    )
+                    break
+                except Exception as e:
+                    delay = _retry_delay(e, attempt)
+                    if delay is None or attempt >= MAX_LLM_RETRIES:
+                        raise
+                    attempt += 1
+                    self.stats.retries += 1
+                    if getattr(e, "status_code", None) == 429:
+                        self._paused_until = max(
+                            self._paused_until, time.monotonic() + delay
+                        )
+                    _log(
+                        "llm_call_retry",
+                        model=self.model,
+                        attempt=attempt,
+                        delay_seconds=round(delay, 2),
+                        error=str(e),
+                    )
+                    await asyncio.sleep(delay)
 
+            self._record_usage(response, started)
             raw = response.choices[0].message.content
             return json.loads(raw)
 
         except Exception as e:
+            self.stats.failed_calls += 1
             _log("llm_call_failed", error=str(e), model=self.model)
             return None
+
+    def _record_usage(self, response: Any, started: float) -> None:
+        """Add a completion's token usage and estimated cost to stats."""
+        stats = self.stats
+        stats.llm_calls += 1
+        if stats.first_call_at is None:
+            stats.first_call_at = started
+        stats.last_call_at = time.monotonic()
+
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0)
+        completion_tokens = getattr(usage, "completion_tokens", 0)
+        if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+            return
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        input_price, output_price = MODEL_PRICES.get(self.model, (0.0, 0.0))
+        stats.cost_usd += (
+            prompt_tokens * input_price + completion_tokens * output_price
+        ) / 1_000_000
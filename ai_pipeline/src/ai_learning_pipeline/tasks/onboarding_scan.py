@@ -13,6 +13,7 @@ Triggered by:
 """
 
 import asyncio
+import copy
 import json
 import os
 import uuid
@@ -457,11 +458,27 @@ class OnboardingScanTask:
             "started_at": datetime.utcnow().isoformat(),
         }
 
-        # 1. Scan Slack (scoped to team's channels if specified)
+        # 1. Scan Slack (scoped to team's channels if specified), only past
+        #    each channel's high-water mark from the previous scan. Channel
+        #    batches are handed to the knowledge extractor as they finish.
+        slack_state = await self._get_scan_state("slack")
         scanner = SlackEnvironmentScanner(
-            bot_token=slack_bot_token, channel_ids=self.channel_ids
+            bot_token=slack_bot_token,
+            channel_ids=self.channel_ids,
+            high_water=slack_state.get("high_water"),
+            thread_marks=slack_state.get("thread_marks"),
         )
-        scan_result = await asyncio.to_thread(scanner.scan)
+        loop = asyncio.get_running_loop()
+        batches: asyncio.Queue = asyncio.Queue()
+        extraction = asyncio.create_task(self._extract_slack_batches(batches))
+        try:
+            scan_result = await asyncio.to_thread(
+                scanner.scan,
+                lambda batch: loop.call_soon_threadsafe(batches.put_nowait, batch),
+            )
+        finally:
+            # Scan finished: callbacks already queued run before this one
+            loop.call_soon_threadsafe(batches.put_nowait, None)
 
         result["channels_scanned"] = scan_result.channels_scanned
         result["messages_scanned"] = scan_result.messages_scanned
@@ -469,30 +486,32 @@ class OnboardingScanTask:
         result["scan_duration_ms"] = scan_result.scan_duration_ms
 
         if scan_result.error:
+            extraction.cancel()
             result["error"] = scan_result.error
             _log("initial_scan_error", error=scan_result.error)
             return result
 
-        if not scan_result.signals:
-            result["recommendations"] = []
-            _log("initial_scan_no_signals")
-            return result
-
-        # 2. Get existing integrations
-        existing = await self._get_existing_integrations()
+        recommendations: List[Recommendation] = []
+        if scan_result.signals:
+            # 2. Get existing integrations
+            existing = await self._get_existing_integrations()
 
-        # 3. Analyze signals
-        analysis = await self.analyzer.analyze(
-            signals=scan_result.signals,
-            existing_integrations=existing,
-        )
+            # 3. Analyze signals
+            analysis = await self.analyzer.analyze(
+                signals=scan_result.signals,
+                existing_integrations=existing,
+            )
+            recommendations = analysis.recommendations
+        else:
+            # Incremental rescans often find nothing new; still ingest below
+            _log("initial_scan_no_signals")
 
         # 4. Submit recommendations
-        if analysis.recommendations:
+        if recommendations:
             change_ids = await self.recommender.submit_recommendations(
                 org_id=self.org_id,
                 team_node_id=self.team_node_id,
-                recommendations=analysis.recommendations,
+                recommendations=recommendations,
             )
             result["recommendations_created"] = change_ids
             result["recommendations"] = [
@@ -501,24 +520,42 @@ class OnboardingScanTask:
                     "priority": r.priority,
                     "confidence": r.confidence,
                 }
-                for r in analysis.recommendations
+                for r in recommendations
             ]
         else:
             result["recommendations"] = []
 
         # 5. Ingest collected Slack knowledge into RAG
+        knowledge_items = await extraction
+        ingest_ok = True
         if scan_result.collected_messages:
             ingest_result = await self._ingest_slack_knowledge(
-                scan_result.collected_messages
+                scan_result.collected_messages, knowledge_items
             )
             result["rag_ingestion"] = ingest_result
+            ingest_ok = "error" not in ingest_result
 
+        # 6. Advance high-water and thread marks only once the messages are
+        #    ingested, so a failed ingest is retried by the next scan
+        if ingest_ok and (
+            scan_result.high_water != scanner.high_water
+            or scan_result.thread_marks != scanner.thread_marks
+        ):
+            await self._save_scan_state(
+                "slack",
+                {
+                    "high_water": scan_result.high_water,
+                    "thread_marks": scan_result.thread_marks,
+                },
+            )
+
+        result["llm_extraction"] = self.knowledge_extractor.stats.as_dict()
         result["completed_at"] = datetime.utcnow().isoformat()
 
         _log(
             "initial_scan_completed",
             signals=len(scan_result.signals),
-            recommendations=len(analysis.recommendations),
+            recommendations=len(recommendations),
             messages_ingested=len(scan_result.collected_messages),
         )
 
@@ -577,6 +614,7 @@ class OnboardingScanTask:
             current_integrations=existing,
         )
 
+        result["llm_extraction"] = self.knowledge_extractor.stats.as_dict()
         result["completed_at"] = datetime.utcnow().isoformat()
 
         _log(
@@ -634,23 +672,33 @@ class OnboardingScanTask:
         if not credentials:
             return {"status": "no_credentials"}
 
-        # Run the scanner — it calls external APIs directly
+        # Run the scanner — it calls external APIs directly. It may update
+        # scan_state in place (e.g. repo head SHAs to skip unchanged repos).
+        scan_state = await self._get_scan_state(integration_id)
+        previous_state = copy.deepcopy(scan_state)
         documents = await scanner_fn(
             credentials=credentials,
             config=config,
             org_id=self.org_id,
+            scan_state=scan_state,
         )
 
         if not documents:
+            if scan_state != previous_state:
+                await self._save_scan_state(integration_id, scan_state)
             return {"status": "no_docs_found"}
 
         # LLM extraction: transform raw docs into classified knowledge
         documents = await self._extract_knowledge_from_docs(documents, integration_id)
 
         # Ingest into RAG
-        return await self._ingest_documents(
+        result = await self._ingest_documents(
             documents, tree=f"{integration_id}_{self.org_id}_{self.team_node_id}"
         )
+        # Only remember what was scanned once it is ingested
+        if "error" not in result and scan_state != previous_state:
+            await self._save_scan_state(integration_id, scan_state)
+        return result
 
     async def _extract_knowledge_from_docs(
         self, documents: List[Document], source_type: str
@@ -861,23 +909,99 @@ class OnboardingScanTask:
             _log("get_integration_config_failed", error=str(e))
             return None
 
+    async def _extract_slack_batches(self, batches: asyncio.Queue) -> List[Any]:
+        """Run knowledge extraction on each scanned channel's messages as it
+        arrives on `batches`, until a None sentinel. Returns all items."""
+        tasks: List[asyncio.Task] = []
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                tasks.append(
+                    asyncio.create_task(
+                        self.knowledge_extractor.extract_from_slack(
+                            messages=batch, org_id=self.org_id
+                        )
+                    )
+                )
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        items: List[Any] = []
+        for batch_items in results:
+            if isinstance(batch_items, Exception):
+                _log("slack_batch_extraction_failed", error=str(batch_items))
+                continue
+            items.extend(batch_items)
+        return items
+
+    async def _get_scan_state(self, source: str) -> Dict[str, Any]:
+        """Scan state saved for `source` (e.g. "slack", "github") by the
+        previous scan, from the team's effective config."""
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(
+                    f"{self.config_service_url}/api/v2/orgs/{self.org_id}"
+                    f"/nodes/{self.team_node_id}/config/effective",
+                )
+                if response.status_code != 200:
+                    return {}
+                scan_state = response.json().get("onboarding_scan") or {}
+                return dict(scan_state.get(source) or {})
+        except Exception as e:
+            _log("scan_state_load_failed", source=source, error=str(e))
+            return {}
+
+    async def _save_scan_state(self, source: str, state: Dict[str, Any]) -> None:
+        """Persist scan state for `source` to the team's config."""
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.patch(
+                    f"{self.config_service_url}/api/v1/config/me",
+                    json={"config": {"onboarding_scan": {source: state}}},
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-Org-Id": self.org_id,
+                        "X-Team-Node-Id": self.team_node_id,
+                    },
+                )
+                if response.status_code == 200:
+                    _log("scan_state_saved", source=source)
+                else:
+                    _log(
+                        "scan_state_save_failed",
+                        source=source,
+                        status=response.status_code,
+                    )
+        except Exception as e:
+            _log("scan_state_save_failed", source=source, error=str(e))
+
     async def _ingest_slack_knowledge(
-        self, messages: List[CollectedMessage]
+        self,
+        messages: List[CollectedMessage],
+        knowledge_items: Optional[List[Any]] = None,
     ) -> Dict[str, Any]:
         """
         Ingest collected Slack messages into the RAG system.
 
         Uses LLM-powered KnowledgeExtractor to transform raw messages into
         classified operational knowledge items before ingesting into RAG.
+        Pass `knowledge_items` when extraction already ran (streamed from
+        the scan).
         """
         if not messages:
             return {"documents_sent": 0}
 
         # LLM extraction: transform raw messages into knowledge items
-        knowledge_items = await self.knowledge_extractor.extract_from_slack(
-            messages=messages,
-            org_id=self.org_id,
-        )
+        if knowledge_items is None:
+            knowledge_items = await self.knowledge_extractor.extract_from_slack(
+                messages=messages,
+                org_id=self.org_id,
+            )
 
         if not knowledge_items:
             _log(
@@ -8,6 +8,10 @@ To add a new integration scanner:
 1. Create a new module (e.g., notion_scanner.py)
 2. Implement a scan() function matching the IntegrationScanner protocol
 3. Register it in SCANNER_REGISTRY below
+
+scan_state is a JSON-serializable dict persisted per integration between
+scans; a scanner may read it and update it in place (e.g. to skip sources
+unchanged since the last scan). It is saved only after ingestion succeeds.
 """
 
 from dataclasses import dataclass, field
@@ -33,6 +37,7 @@ class IntegrationScanner(Protocol):
         credentials: Dict[str, Any],
         config: Dict[str, Any],
         org_id: str,
+        scan_state: Optional[Dict[str, Any]] = None,
     ) -> List[Document]: ...
 
 
@@ -111,6 +111,7 @@ async def scan(
     credentials: Dict[str, Any],
     config: Dict[str, Any],
     org_id: str,
+    scan_state: Optional[Dict[str, Any]] = None,
 ) -> List[Document]:
     """
     Scan Confluence for operational documents.
@@ -119,6 +120,7 @@ async def scan(
         credentials: Decrypted credentials (api_key/api_token, email/username)
         config: Integration config (base_url/url/domain)
         org_id: IncidentFox org ID
+        scan_state: Not used; Confluence is always scanned in full
     """
     api_token = credentials.get("api_key") or credentials.get("api_token", "")
     email = credentials.get("email") or credentials.get("username", "")
@@ -7,15 +7,27 @@ Scans a GitHub organization for:
 3. LLM-generated service map summarizing the codebase architecture
 
 Calls the GitHub API directly using credentials fetched from config_service.
+
+Each repo's default-branch tree is listed once (recursive trees API) and
+candidate paths are matched locally; matching blobs are then downloaded
+concurrently. Repos whose default-branch head hasn't moved since the last
+scan (scan_state["repo_shas"]) don't have their docs re-ingested. Repos
+whose tree can't be listed fall back to probing each path.
 """
 
+import asyncio
 import base64
 import json
 import os
+import threading
+import urllib.error
 import urllib.parse
 import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from . import Document, register_scanner
 
@@ -82,6 +94,8 @@ INFRA_SIGNAL_FILES = [
 MAX_REPOS = 20
 MAX_FILE_SIZE = 100_000  # 100KB
 MAX_SIGNAL_FILE_SIZE = 50_000  # 50KB — signal files should be small
+MAX_DIRECTORY_SAMPLE = 5  # Entries looked at per directory path
+DIRECTORY_SAMPLE_EXTENSIONS = {".yaml", ".yml", ".json", ".toml", ".md"}
 
 
 # --- LLM prompt for architecture summarization ---
@@ -136,12 +150,20 @@ Rules:
 # --- GitHub API helpers ---
 
 
+# Conditional-request cache: (token, url) -> (etag, decoded body). GitHub
+# answers a matching If-None-Match with 304, which doesn't count against
+# the rate limit, so rescans of unchanged trees and blobs are free.
+_ETAG_CACHE: "OrderedDict[Tuple[str, str], Tuple[str, Any]]" = OrderedDict()
+_ETAG_CACHE_MAX_ENTRIES = 512
+_etag_lock = threading.Lock()
+
+
 def _github_api(
     path: str,
     token: str,
     params: Optional[Dict[str, Any]] = None,
 ) -> Optional[Any]:
-    """Make a GitHub API request."""
+    """Make a GitHub API request (conditional, if the URL was seen before)."""
     url = f"https://api.github.com{path}"
     if params:
         url = f"{url}?{urllib.parse.urlencode(params)}"
@@ -151,10 +173,28 @@ def _github_api(
     req.add_header("Accept", "application/vnd.github.v3+json")
     req.add_header("User-Agent", "IncidentFox-Scanner")
 
+    cache_key = (token, url)
+    with _etag_lock:
+        cached = _ETAG_CACHE.get(cache_key)
+        if cached:
+            _ETAG_CACHE.move_to_end(cache_key)
+    if cached:
+        req.add_header("If-None-Match", cached[0])
+
     try:
         with urllib.request.urlopen(req, timeout=15) as response:
-            return json.loads(response.read().decode())
+            data = json.loads(response.read().decode())
+            etag = response.headers.get("ETag")
+            if etag:
+                with _etag_lock:
+                    _ETAG_CACHE[cache_key] = (etag, data)
+                    _ETAG_CACHE.move_to_end(cache_key)
+                    while len(_ETAG_CACHE) > _ETAG_CACHE_MAX_ENTRIES:
+                        _ETAG_CACHE.popitem(last=False)
+            return data
     except urllib.error.HTTPError as e:
+        if e.code == 304 and cached:
+            return cached[1]
         if e.code == 404:
             return None  # Expected for missing files
         _log("github_api_error", path=path, status=e.code)
@@ -164,6 +204,21 @@ def _github_api(
         return None
 
 
+def _fetch_concurrency() -> int:
+    return max(1, int(os.getenv("GITHUB_SCAN_CONCURRENCY", "8")))
+
+
+def _map_concurrent(fn: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+    """`map` over a bounded thread pool (GITHUB_SCAN_CONCURRENCY), in order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    workers = min(_fetch_concurrency(), len(items))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="github-scan"
+    ) as pool:
+        return list(pool.map(fn, items))
+
+
 def _list_repos(token: str, org: str) -> List[Dict[str, Any]]:
     """List repos for an org (or user if not an org)."""
     repos = _github_api(
@@ -212,14 +267,13 @@ def _get_directory_sample(
     max_size: int,
 ) -> Optional[str]:
     """For directory paths, fetch a sample of relevant files."""
-    relevant_extensions = {".yaml", ".yml", ".json", ".toml", ".md"}
     parts = []
 
-    for item in listing[:5]:  # Cap at 5 files per directory
+    for item in listing[:MAX_DIRECTORY_SAMPLE]:
         name = item.get("name", "")
         if item.get("type") != "file":
             continue
-        if not any(name.endswith(ext) for ext in relevant_extensions):
+        if not any(name.endswith(ext) for ext in DIRECTORY_SAMPLE_EXTENSIONS):
             continue
 
         content = _get_file_content(token, owner, repo, f"{dir_path}/{name}", max_size)
@@ -229,22 +283,203 @@ def _get_directory_sample(
     return "\n\n".join(parts) if parts else None
 
 
+# --- Tree-based fetching ---
+
+
+@dataclass
+class RepoTree:
+    """A repo's default-branch head and its file tree, listed once per scan."""
+
+    owner: str
+    name: str
+    full_name: str
+    head_sha: Optional[str] = None
+    # path -> tree entry ({"path", "type", "sha", "size"}); None means the
+    # tree couldn't be listed (or was truncated) and paths are probed instead
+    entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _repo_identity(repo_data: Dict[str, Any], github_org: str) -> Tuple[str, str, str]:
+    repo_name = repo_data.get("name", "")
+    full_name = repo_data.get("full_name", f"{github_org}/{repo_name}")
+    owner = full_name.split("/")[0] if "/" in full_name else github_org
+    return owner, repo_name, full_name
+
+
+def _get_repo_tree(token: str, repo_data: Dict[str, Any], github_org: str) -> RepoTree:
+    """Resolve the default-branch head and list its whole tree (2 requests)."""
+    owner, repo_name, full_name = _repo_identity(repo_data, github_org)
+    repo_tree = RepoTree(owner=owner, name=repo_name, full_name=full_name)
+
+    branch = repo_data.get("default_branch") or "main"
+    head = _github_api(
+        f"/repos/{owner}/{repo_name}/branches/{urllib.parse.quote(branch, safe='')}",
+        token,
+    )
+    repo_tree.head_sha = ((head or {}).get("commit") or {}).get("sha")
+    if not repo_tree.head_sha:
+        return repo_tree
+
+    tree = _github_api(
+        f"/repos/{owner}/{repo_name}/git/trees/{repo_tree.head_sha}",
+        token,
+        {"recursive": "1"},
+    )
+    if not tree:
+        return repo_tree
+    if tree.get("truncated"):
+        _log("github_tree_truncated", repo=full_name)
+        return repo_tree
+
+    repo_tree.entries = {e["path"]: e for e in tree.get("tree", []) if "path" in e}
+    return repo_tree
+
+
+def _get_repo_trees(
+    token: str, repos: List[Dict[str, Any]], github_org: str
+) -> Dict[str, RepoTree]:
+    """List every repo's tree concurrently. Returns {full_name: RepoTree}."""
+    trees = _map_concurrent(lambda r: _get_repo_tree(token, r, github_org), repos)
+    return {t.full_name: t for t in trees}
+
+
+def _match_tree_paths(
+    entries: Dict[str, Dict[str, Any]], candidates: List[str], max_size: int
+) -> Dict[str, List[Tuple[str, str]]]:
+    """Resolve candidate paths against a listed tree, without API calls.
+
+    Returns {candidate: [(file_path, blob_sha), ...]}: the file itself for a
+    file path, or a sample of files for a directory path (the first
+    MAX_DIRECTORY_SAMPLE entries, keeping YAML/JSON/TOML/Markdown files, as
+    _get_directory_sample does). Blobs larger than max_size are dropped.
+    """
+    matches: Dict[str, List[Tuple[str, str]]] = {}
+
+    for candidate in candidates:
+        path = candidate.rstrip("/")
+        entry = entries.get(path)
+        if not entry:
+            continue
+
+        if entry.get("type") == "blob":
+            if entry.get("size", 0) <= max_size:
+                matches[candidate] = [(path, entry["sha"])]
+            continue
+
+        if entry.get("type") != "tree":
+            continue
+        prefix = f"{path}/"
+        children = sorted(
+            (
+                e
+                for p, e in entries.items()
+                if p.startswith(prefix) and "/" not in p[len(prefix) :]
+            ),
+            key=lambda e: e["path"],
+        )
+        sample = [
+            (e["path"], e["sha"])
+            for e in children[:MAX_DIRECTORY_SAMPLE]
+            if e.get("type") == "blob"
+            and e.get("size", 0) <= max_size
+            and any(e["path"].endswith(ext) for ext in DIRECTORY_SAMPLE_EXTENSIONS)
+        ]
+        if sample:
+            matches[candidate] = sample
+
+    return matches
+
+
+def _get_blob_text(token: str, owner: str, repo: str, sha: str) -> Optional[str]:
+    data = _github_api(f"/repos/{owner}/{repo}/git/blobs/{sha}", token)
+    if not data or not data.get("content"):
+        return None
+    try:
+        return base64.b64decode(data["content"]).decode("utf-8")
+    except Exception:
+        return None
+
+
+def _fetch_repo_files(
+    token: str, repo_tree: RepoTree, candidates: List[str], max_size: int
+) -> Dict[str, str]:
+    """Fetch the candidate paths that exist in a repo. Returns {candidate: content}.
+
+    With a listed tree, only matching blobs are downloaded (concurrently);
+    otherwise each candidate is probed through the contents API.
+    """
+    owner, repo_name = repo_tree.owner, repo_tree.name
+
+    if repo_tree.entries is None:
+        files = {}
+        for candidate in candidates:
+            content = _get_file_content(token, owner, repo_name, candidate, max_size)
+            if content:
+                files[candidate] = content
+        return files
+
+    matches = _match_tree_paths(repo_tree.entries, candidates, max_size)
+    shas = sorted({sha for found in matches.values() for _, sha in found})
+    texts = dict(
+        zip(
+            shas,
+            _map_concurrent(
+                lambda sha: _get_blob_text(token, owner, repo_name, sha), shas
+            ),
+        )
+    )
+
+    files: Dict[str, str] = {}
+    for candidate, found in matches.items():
+        if len(found) == 1 and found[0][0] == candidate.rstrip("/"):
+            content = texts.get(found[0][1])
+        else:
+            parts = [
+                f"--- {path} ---\n{texts[sha]}" for path, sha in found if texts.get(sha)
+            ]
+            content = "\n\n".join(parts) if parts else None
+        if content:
+            files[candidate] = content
+    return files
+
+
+def _changed_repos(
+    repos: List[Dict[str, Any]],
+    trees: Dict[str, RepoTree],
+    github_org: str,
+    previous_shas: Dict[str, str],
+) -> List[Dict[str, Any]]:
+    """Repos whose default-branch head moved since the last scan (or is unknown)."""
+    changed = []
+    for repo_data in repos:
+        _, _, full_name = _repo_identity(repo_data, github_org)
+        head_sha = trees[full_name].head_sha
+        if not head_sha or previous_shas.get(full_name) != head_sha:
+            changed.append(repo_data)
+    return changed
+
+
 # --- Core scanning logic ---
 
 
 def _scan_ops_docs(
-    token: str, repos: List[Dict[str, Any]], github_org: str, org_id: str
+    token: str,
+    repos: List[Dict[str, Any]],
+    github_org: str,
+    org_id: str,
+    trees: Optional[Dict[str, RepoTree]] = None,
 ) -> List[Document]:
     """Scan repos for operational documents (README, runbooks, etc.)."""
     documents: List[Document] = []
+    if trees is None:
+        trees = _get_repo_trees(token, repos, github_org)
 
     for repo_data in repos:
-        repo_name = repo_data.get("name", "")
-        full_name = repo_data.get("full_name", f"{github_org}/{repo_name}")
-        owner = full_name.split("/")[0] if "/" in full_name else github_org
+        _, _, full_name = _repo_identity(repo_data, github_org)
+        files = _fetch_repo_files(token, trees[full_name], OPS_DOC_PATHS, MAX_FILE_SIZE)
 
         for doc_path in OPS_DOC_PATHS:
-            content = _get_file_content(token, owner, repo_name, doc_path)
+            content = files.get(doc_path)
             if content and len(content) >= 50:
                 documents.append(
                     Document(
@@ -264,24 +499,28 @@ def _scan_ops_docs(
 
 
 def _collect_infra_signals(
-    token: str, repos: List[Dict[str, Any]], github_org: str
+    token: str,
+    repos: List[Dict[str, Any]],
+    github_org: str,
+    trees: Optional[Dict[str, RepoTree]] = None,
 ) -> Dict[str, Dict[str, str]]:
     """Collect infrastructure signal files from repos.
 
     Returns: {repo_full_name: {file_path: file_content}}
     """
     repo_signals: Dict[str, Dict[str, str]] = {}
+    if trees is None:
+        trees = _get_repo_trees(token, repos, github_org)
 
     for repo_data in repos:
-        repo_name = repo_data.get("name", "")
-        full_name = repo_data.get("full_name", f"{github_org}/{repo_name}")
-        owner = full_name.split("/")[0] if "/" in full_name else github_org
+        _, _, full_name = _repo_identity(repo_data, github_org)
+        fetched = _fetch_repo_files(
+            token, trees[full_name], INFRA_SIGNAL_FILES, MAX_SIGNAL_FILE_SIZE
+        )
         files_found: Dict[str, str] = {}
 
         for signal_path in INFRA_SIGNAL_FILES:
-            content = _get_file_content(
-                token, owner, repo_name, signal_path, MAX_SIGNAL_FILE_SIZE
-            )
+            content = fetched.get(signal_path)
             if content and len(content) >= 10:
                 # Truncate large files to keep LLM context manageable
                 files_found[signal_path] = content[:10_000]
@@ -443,6 +682,7 @@ async def scan(
     credentials: Dict[str, Any],
     config: Dict[str, Any],
     org_id: str,
+    scan_state: Optional[Dict[str, Any]] = None,
 ) -> List[Document]:
     """
     Scan GitHub for operational documents and architecture context.
@@ -450,6 +690,11 @@ async def scan(
     Two passes:
     1. Fetch operational docs (README, runbooks) — ingested as-is
     2. Fetch infra signal files → LLM generates architecture map — ingested as summary
+
+    scan_state["repo_shas"] ({repo: default-branch head sha}) is read and
+    updated in place: repos whose head hasn't moved are skipped in pass 1,
+    and nothing is returned if no repo moved. Pass 2 still reads every repo
+    so the regenerated architecture map covers the whole org.
     """
     token = credentials.get("api_key") or credentials.get("token", "")
     if not token:
@@ -472,14 +717,30 @@ async def scan(
         _log("no_repos_found", org=github_org)
         return []
 
+    trees = await asyncio.to_thread(_get_repo_trees, token, repos, github_org)
+    previous_shas = (scan_state or {}).get("repo_shas") or {}
+    changed = _changed_repos(repos, trees, github_org, previous_shas)
+    if scan_state is not None:
+        scan_state["repo_shas"] = {
+            **previous_shas,
+            **{name: t.head_sha for name, t in trees.items() if t.head_sha},
+        }
+    if not changed:
+        _log("github_scan_unchanged", org=github_org, repos=len(repos))
+        return []
+
     documents: List[Document] = []
 
-    # Pass 1: Operational docs (direct ingestion)
-    ops_docs = _scan_ops_docs(token, repos, github_org, org_id)
+    # Pass 1: Operational docs (direct ingestion), changed repos only
+    ops_docs = await asyncio.to_thread(
+        _scan_ops_docs, token, changed, github_org, org_id, trees
+    )
     documents.extend(ops_docs)
 
     # Pass 2: Architecture map (LLM-generated summary)
-    repo_signals = _collect_infra_signals(token, repos, github_org)
+    repo_signals = await asyncio.to_thread(
+        _collect_infra_signals, token, repos, github_org, trees
+    )
     if repo_signals:
         arch_doc = await _generate_architecture_summary(
             repo_signals, github_org, org_id
@@ -490,6 +751,8 @@ async def scan(
     _log(
         "github_scan_completed",
         repos_scanned=len(repos),
+        repos_changed=len(changed),
+        repos_with_tree=sum(1 for t in trees.values() if t.entries is not None),
         ops_docs=len(ops_docs),
         repos_with_infra_signals=len(repo_signals),
         total_documents=len(documents),
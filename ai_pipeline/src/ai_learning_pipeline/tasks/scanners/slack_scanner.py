@@ -3,16 +3,23 @@ Slack Environment Scanner.
 
 Scans a Slack workspace to discover what tools and integrations
 the team uses, by analyzing channel names, message content, and shared URLs.
+
+Channels are scanned concurrently; Slack API calls share per-method token
+buckets sized to Slack's rate tiers. Per-channel high-water marks (newest
+message ts seen) let reruns fetch only messages newer than the last scan.
 """
 
 import json
 import re
+import threading
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 from urllib.parse import urlparse
 
 
@@ -113,6 +120,69 @@ class ScanResult:
     scan_duration_ms: float
     collected_messages: List[CollectedMessage] = field(default_factory=list)
     error: Optional[str] = None
+    # channel_id -> newest top-level message ts seen (input marks carried over)
+    high_water: Dict[str, str] = field(default_factory=dict)
+    # channel_id -> {thread parent ts -> newest reply ts seen}, for threads
+    # still inside the lookback window
+    thread_marks: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+
+# Sustained requests/minute per method, from Slack's rate tiers
+# (Tier 2: conversations.list, Tier 3: history and replies). Methods not
+# listed are not throttled client-side.
+SLACK_RATE_LIMITS: Dict[str, float] = {
+    "conversations.list": 20,
+    "conversations.history": 50,
+    "conversations.replies": 50,
+}
+
+# Retries for a request answered with HTTP 429
+MAX_RATE_LIMITED_RETRIES = 3
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers calling one method."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for `seconds` (Slack's Retry-After on a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def _ts_after(ts: str, mark: Optional[str]) -> bool:
+    """True if Slack ts `ts` is newer than high-water mark `mark`."""
+    if not mark:
+        return True
+    try:
+        return float(ts) > float(mark)
+    except ValueError:
+        return True
 
 
 # Tool detection patterns: integration_id -> (regex patterns, URL domains)
@@ -224,7 +294,9 @@ class SlackEnvironmentScanner:
     Strategy:
     1. List all public channels
     2. Identify relevant channels (incident/ops names + most active)
-    3. Read recent messages (configurable lookback)
+    3. Read recent messages (configurable lookback, or since the channel's
+       high-water mark), up to max_concurrent_channels channels at a time,
+       and re-read known threads for replies posted since the last scan
     4. Extract signals via pattern matching and URL classification
     """
 
@@ -237,6 +309,10 @@ class SlackEnvironmentScanner:
         channel_ids: Optional[List[str]] = None,
         max_threads_per_channel: int = 30,
         max_replies_per_thread: int = 50,
+        max_concurrent_channels: int = 4,
+        high_water: Optional[Dict[str, str]] = None,
+        thread_marks: Optional[Dict[str, Dict[str, str]]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
     ):
         self.bot_token = bot_token
         self.lookback_days = lookback_days
@@ -245,11 +321,32 @@ class SlackEnvironmentScanner:
         self.channel_ids = channel_ids  # Team-scoped filter (None = all)
         self.max_threads_per_channel = max_threads_per_channel
         self.max_replies_per_thread = max_replies_per_thread
-        self._last_replies_call = 0.0
-        self._replies_interval = 1.2  # seconds between replies calls (~50/min)
+        self.max_concurrent_channels = max(1, max_concurrent_channels)
+        self.high_water = dict(high_water or {})
+        self.thread_marks = {
+            channel_id: dict(threads)
+            for channel_id, threads in (thread_marks or {}).items()
+        }
+        limits = SLACK_RATE_LIMITS if rate_limits is None else rate_limits
+        # Slack tolerates short bursts above the sustained rate
+        self._buckets: Dict[str, TokenBucket] = {
+            method: TokenBucket(rpm, burst=max(1, int(rpm // 5)))
+            for method, rpm in limits.items()
+            if rpm > 0
+        }
+
+    def scan(
+        self,
+        on_batch: Optional[Callable[[List[CollectedMessage]], None]] = None,
+    ) -> ScanResult:
+        """Run the full Slack workspace scan.
 
-    def scan(self) -> ScanResult:
-        """Run the full Slack workspace scan."""
+        Args:
+            on_batch: Called with each channel's collected messages as soon as
+                that channel finishes (from a worker thread), so extraction
+                can start before the whole workspace is scanned. The same
+                messages are also returned in ScanResult.collected_messages.
+        """
         import time
 
         start = time.time()
@@ -257,6 +354,11 @@ class SlackEnvironmentScanner:
         collected_messages: List[CollectedMessage] = []
         channels_scanned = 0
         messages_scanned = 0
+        high_water = dict(self.high_water)
+        thread_marks = {
+            channel_id: dict(threads)
+            for channel_id, threads in self.thread_marks.items()
+        }
 
         try:
             # 1. Discover channels
@@ -268,6 +370,8 @@ class SlackEnvironmentScanner:
                     messages_scanned=0,
                     scan_duration_ms=(time.time() - start) * 1000,
                     error="Could not list channels",
+                    high_water=high_water,
+                    thread_marks=thread_marks,
                 )
 
             # Filter to team-scoped channels if specified
@@ -286,6 +390,8 @@ class SlackEnvironmentScanner:
                         messages_scanned=0,
                         scan_duration_ms=(time.time() - start) * 1000,
                         error="No team-scoped channels found",
+                        high_water=high_water,
+                        thread_marks=thread_marks,
                     )
 
             # 2. Extract signals from channel names
@@ -308,18 +414,41 @@ class SlackEnvironmentScanner:
                 if any(re.search(p, name) for p in RELEVANT_CHANNEL_PATTERNS):
                     relevant_names.add(name)
 
-            # 5. Scan messages in selected channels
+            # 5. Scan messages in selected channels, several at a time
             oldest = datetime.utcnow() - timedelta(days=self.lookback_days)
-            for ch in target_channels:
+
+            def scan_channel(ch: Dict[str, Any]):
                 ch_name = ch["name"]
-                collect_for_rag = ch_name.lower() in relevant_names
-                ch_signals, msg_count, ch_collected = self._scan_channel_messages(
-                    ch["id"], ch_name, oldest, collect_for_rag=collect_for_rag
+                scanned = self._scan_channel_messages(
+                    ch["id"],
+                    ch_name,
+                    oldest,
+                    collect_for_rag=ch_name.lower() in relevant_names,
                 )
-                signals.extend(ch_signals)
-                collected_messages.extend(ch_collected)
-                channels_scanned += 1
-                messages_scanned += msg_count
+                if on_batch and scanned[2]:
+                    on_batch(scanned[2])
+                return scanned
+
+            workers = min(self.max_concurrent_channels, len(target_channels)) or 1
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="slack-scan"
+            ) as pool:
+                futures = [pool.submit(scan_channel, ch) for ch in target_channels]
+                # Merge in channel order so results don't depend on timing
+                for ch, future in zip(target_channels, futures):
+                    ch_signals, msg_count, ch_collected, newest_ts, ch_threads = (
+                        future.result()
+                    )
+                    signals.extend(ch_signals)
+                    collected_messages.extend(ch_collected)
+                    channels_scanned += 1
+                    messages_scanned += msg_count
+                    if newest_ts:
+                        high_water[ch["id"]] = newest_ts
+                    if ch_threads:
+                        thread_marks[ch["id"]] = ch_threads
+                    elif ch_threads is not None:
+                        thread_marks.pop(ch["id"], None)
 
             # 6. Deduplicate and aggregate
             signals = self._deduplicate_signals(signals)
@@ -330,6 +459,9 @@ class SlackEnvironmentScanner:
                 messages_scanned=messages_scanned,
                 signals_found=len(signals),
                 messages_collected_for_rag=len(collected_messages),
+                incremental_channels=sum(
+                    1 for ch in target_channels if ch["id"] in self.high_water
+                ),
             )
 
             return ScanResult(
@@ -338,6 +470,8 @@ class SlackEnvironmentScanner:
                 messages_scanned=messages_scanned,
                 scan_duration_ms=(time.time() - start) * 1000,
                 collected_messages=collected_messages,
+                high_water=high_water,
+                thread_marks=thread_marks,
             )
 
         except Exception as e:
@@ -354,25 +488,45 @@ class SlackEnvironmentScanner:
     def _api_request(
         self, method: str, params: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
-        """Make a Slack API request."""
-        try:
-            url = f"https://slack.com/api/{method}"
-            if params:
-                url = f"{url}?{urllib.parse.urlencode(params)}"
-
-            req = urllib.request.Request(url)
-            req.add_header("Authorization", f"Bearer {self.bot_token}")
-            req.add_header("Content-Type", "application/json")
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode())
-                if not data.get("ok"):
-                    _log("slack_api_error", method=method, error=data.get("error"))
-                    return None
-                return data
-        except Exception as e:
-            _log("slack_api_request_failed", method=method, error=str(e))
-            return None
+        """Make a Slack API request, throttled by the method's token bucket.
+
+        A 429 pauses the bucket for Retry-After, so every worker calling the
+        method backs off, then the request is retried.
+        """
+        url = f"https://slack.com/api/{method}"
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        bucket = self._buckets.get(method)
+
+        for attempt in range(MAX_RATE_LIMITED_RETRIES + 1):
+            if bucket:
+                bucket.acquire()
+            try:
+                req = urllib.request.Request(url)
+                req.add_header("Authorization", f"Bearer {self.bot_token}")
+                req.add_header("Content-Type", "application/json")
+
+                with urllib.request.urlopen(req, timeout=30) as response:
+                    data = json.loads(response.read().decode())
+                    if not data.get("ok"):
+                        _log("slack_api_error", method=method, error=data.get("error"))
+                        return None
+                    return data
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and attempt < MAX_RATE_LIMITED_RETRIES:
+                    retry_after = float(e.headers.get("Retry-After") or 1)
+                    _log("slack_rate_limited", method=method, retry_after=retry_after)
+                    if bucket:
+                        bucket.pause(retry_after)
+                    else:
+                        time.sleep(retry_after)
+                    continue
+                _log("slack_api_request_failed", method=method, error=str(e))
+                return None
+            except Exception as e:
+                _log("slack_api_request_failed", method=method, error=str(e))
+                return None
+        return None
 
     def _list_channels(self) -> List[Dict[str, Any]]:
         """List all public channels in the workspace."""
@@ -445,33 +599,26 @@ class SlackEnvironmentScanner:
 
         return signals
 
-    def _rate_limit_replies(self) -> None:
-        """Simple rate limiter for conversations.replies (Tier 3: ~50 req/min)."""
-        if self._replies_interval <= 0:
-            return
-        elapsed = time.time() - self._last_replies_call
-        if elapsed < self._replies_interval:
-            time.sleep(self._replies_interval - elapsed)
-        self._last_replies_call = time.time()
-
     def _fetch_thread_replies(
         self,
         channel_id: str,
         channel_name: str,
         parent_ts: str,
+        since: Optional[str] = None,
     ) -> List[CollectedMessage]:
         """Fetch thread replies for a parent message via conversations.replies.
 
-        Returns reply messages (excluding the parent, which is already collected).
+        Returns reply messages (excluding the parent, which is already collected),
+        only those newer than `since` if given.
         """
-        result = self._api_request(
-            "conversations.replies",
-            {
-                "channel": channel_id,
-                "ts": parent_ts,
-                "limit": self.max_replies_per_thread,
-            },
-        )
+        params: Dict[str, Any] = {
+            "channel": channel_id,
+            "ts": parent_ts,
+            "limit": self.max_replies_per_thread,
+        }
+        if since:
+            params["oldest"] = since
+        result = self._api_request("conversations.replies", params)
 
         if not result:
             return []
@@ -479,7 +626,7 @@ class SlackEnvironmentScanner:
         replies = []
         for msg in result.get("messages", []):
             # Skip the parent message (included as first entry in replies response)
-            if msg.get("ts") == parent_ts:
+            if msg.get("ts") == parent_ts or not _ts_after(msg.get("ts", ""), since):
                 continue
 
             text = _get_message_text(msg)
@@ -505,9 +652,23 @@ class SlackEnvironmentScanner:
         channel_name: str,
         oldest: datetime,
         collect_for_rag: bool = False,
-    ) -> tuple[List[Signal], int, List[CollectedMessage]]:
+    ) -> tuple[
+        List[Signal],
+        int,
+        List[CollectedMessage],
+        Optional[str],
+        Optional[Dict[str, str]],
+    ]:
         """Scan messages in a channel for tool signals.
 
+        Only messages newer than the channel's high-water mark (if any) are
+        fetched; the newest ts seen is returned as the new mark (None if no
+        messages were fetched). Threads whose parent is older than the mark
+        still get replies, so for RAG-relevant channels the threads known
+        from earlier scans are re-read past their newest seen reply. The
+        channel's updated thread marks are returned last (None if the
+        channel's threads were not read).
+
         Args:
             collect_for_rag: If True, also collect raw messages for RAG ingestion
                 (only for incident/ops-relevant channels).
@@ -516,20 +677,34 @@ class SlackEnvironmentScanner:
         collected: List[CollectedMessage] = []
         messages_scanned = 0
 
+        mark = self.high_water.get(channel_id)
+        oldest_ts = str(oldest.timestamp())
+        if mark and _ts_after(mark, oldest_ts):
+            oldest_ts = mark  # `oldest` is exclusive, so the mark itself is skipped
+
         result = self._api_request(
             "conversations.history",
             {
                 "channel": channel_id,
-                "oldest": str(oldest.timestamp()),
+                "oldest": oldest_ts,
                 "limit": self.max_messages_per_channel,
             },
         )
 
         if not result:
-            return signals, 0, []
+            return signals, 0, [], None, None
 
-        messages = result.get("messages", [])
+        messages = [
+            msg
+            for msg in result.get("messages", [])
+            if _ts_after(msg.get("ts", ""), mark)
+        ]
         messages_scanned = len(messages)
+        newest_ts = max(
+            (msg["ts"] for msg in messages if msg.get("ts")),
+            key=float,
+            default=None,
+        )
 
         for msg in messages:
             text = _get_message_text(msg)
@@ -594,7 +769,14 @@ class SlackEnvironmentScanner:
                     )
 
         # Fetch thread replies for messages with threads (RAG-relevant channels only)
+        threads: Optional[Dict[str, str]] = None
         if collect_for_rag:
+            lookback_ts = str(oldest.timestamp())
+            threads = {
+                parent_ts: latest
+                for parent_ts, latest in self.thread_marks.get(channel_id, {}).items()
+                if _ts_after(parent_ts, lookback_ts)
+            }
             threaded = [msg for msg in messages if msg.get("reply_count", 0) > 0]
             threaded.sort(key=lambda m: m.get("reply_count", 0), reverse=True)
             threaded = threaded[: self.max_threads_per_channel]
@@ -612,12 +794,33 @@ class SlackEnvironmentScanner:
             # Fetch replies for each thread
             threads_fetched = 0
             for msg in threaded:
-                self._rate_limit_replies()
                 replies = self._fetch_thread_replies(
                     channel_id, channel_name, msg["ts"]
                 )
                 collected.extend(replies)
                 threads_fetched += 1
+                threads[msg["ts"]] = max(
+                    [msg.get("latest_reply") or msg["ts"]]
+                    + [r.ts for r in replies if r.ts],
+                    key=float,
+                )
+
+            # Known threads with parents past the mark: only new replies,
+            # most recently active first
+            known = sorted(
+                (ts for ts in threads if ts not in thread_parent_tss),
+                key=lambda ts: float(threads[ts]),
+                reverse=True,
+            )
+            for parent_ts in known[: self.max_threads_per_channel]:
+                replies = self._fetch_thread_replies(
+                    channel_id, channel_name, parent_ts, since=threads[parent_ts]
+                )
+                collected.extend(replies)
+                threads_fetched += 1
+                threads[parent_ts] = max(
+                    [threads[parent_ts]] + [r.ts for r in replies if r.ts], key=float
+                )
 
             if threads_fetched > 0:
                 reply_count = sum(
@@ -630,7 +833,7 @@ class SlackEnvironmentScanner:
                     replies_collected=reply_count,
                 )
 
-        return signals, messages_scanned, collected
+        return signals, messages_scanned, collected, newest_ts, threads
 
     def _extract_urls(self, text: str) -> List[str]:
         """Extract URLs from Slack message text."""
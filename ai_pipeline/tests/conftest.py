@@ -212,6 +212,15 @@ def github_file_contents() -> Dict[str, str]:
 # --- OpenAI mock ---
 
 
+@pytest.fixture(autouse=True)
+def _clear_extraction_cache():
+    """Extraction results are cached per process; keep tests independent."""
+    from ai_learning_pipeline.tasks import knowledge_extractor
+
+    knowledge_extractor._EXTRACTION_CACHE.clear()
+    knowledge_extractor._UNIT_PROMPTS.clear()
+
+
 @pytest.fixture
 def mock_openai_response():
     """Factory for mock OpenAI chat completion responses."""
@@ -0,0 +1,164 @@
+"""
+Tests for delta ingestion in KnowledgeIngestionTask.
+
+The config service (incidents + ingestion manifest) and the RAG service are
+served by an in-process httpx.MockTransport; the ingestion pipeline is mocked.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from ai_learning_pipeline.tasks.ingestion import (
+    APIIntegratedStorageBackend,
+    KnowledgeIngestionTask,
+)
+
+
+class FakeConfigService:
+    """Incidents listing plus the internal ingestion-manifest endpoints."""
+
+    def __init__(self, incidents):
+        self.incidents = incidents
+        self.manifest = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/incidents"):
+            return httpx.Response(200, json={"incidents": self.incidents})
+        if path == "/api/v1/internal/ingestion-manifest":
+            if request.method == "GET":
+                return httpx.Response(
+                    200, json={"entries": list(self.manifest.values())}
+                )
+            body = json.loads(request.content)
+            for entry in body["entries"]:
+                self.manifest[entry["document_id"]] = entry
+            for document_id in body["deleted_document_ids"]:
+                self.manifest.pop(document_id, None)
+            return httpx.Response(200, json={})
+        return httpx.Response(404)
+
+
+def _incident(incident_id, title, *, days_ago=1):
+    updated = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return {"id": incident_id, "title": title, "updated_at": updated.isoformat()}
+
+
+def _task(config_service):
+    task = KnowledgeIngestionTask(
+        org_id="org1",
+        team_node_id="teamA",
+        config_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(config_service.handler),
+            base_url="http://config",
+        ),
+        sources_config={"incidents_lookback_days": 30},
+    )
+    task._pipeline = AsyncMock()
+    task._pipeline.ingest_content.return_value = SimpleNamespace(
+        chunks_stored=1, chunks_flagged=0, errors=[]
+    )
+    return task
+
+
+class TestIncidentDeltaIngestion:
+    @pytest.mark.asyncio
+    async def test_only_new_or_changed_incidents_are_ingested(self):
+        service = FakeConfigService(
+            [_incident("i1", "DB down"), _incident("i2", "Disk full")]
+        )
+        task = _task(service)
+
+        first = await task._ingest_incidents()
+        assert (first["documents"], first["unchanged"]) == (2, 0)
+        assert set(service.manifest) == {"i1", "i2"}
+
+        service.incidents[1]["title"] = "Disk full on db-3"
+        service.incidents.append(_incident("i3", "Cert expired"))
+        task._pipeline.ingest_content.reset_mock()
+
+        second = await task._ingest_incidents()
+        assert (second["documents"], second["unchanged"]) == (2, 1)
+        sources = [
+            c.kwargs["source"] for c in task._pipeline.ingest_content.call_args_list
+        ]
+        assert sources == ["incident:i2", "incident:i3"]
+
+    @pytest.mark.asyncio
+    async def test_failed_incidents_are_retried(self):
+        service = FakeConfigService([_incident("i1", "DB down")])
+        task = _task(service)
+        task._pipeline.ingest_content.return_value = SimpleNamespace(
+            chunks_stored=0, chunks_flagged=0, errors=["llm timeout"]
+        )
+
+        await task._ingest_incidents()
+        assert service.manifest == {}
+
+    @pytest.mark.asyncio
+    async def test_deleted_incidents_are_tombstoned_but_aged_out_ones_kept(self):
+        service = FakeConfigService(
+            [
+                _incident("recent", "DB down"),
+                _incident("old", "Disk full", days_ago=45),
+                _incident("kept", "Cert expired"),
+            ]
+        )
+        task = _task(service)
+        await task._ingest_incidents()
+
+        # "recent" was deleted; "old" fell out of the 30-day window
+        service.incidents = [_incident("kept", "Cert expired")]
+        result = await task._ingest_incidents()
+
+        assert result["tombstoned"] == 1
+        assert set(service.manifest) == {"old", "kept"}
+
+
+class TestRagBackedSimilarity:
+    @pytest.mark.asyncio
+    async def test_find_similar_uses_rag_search(self):
+        requests = []
+
+        def rag(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(
+                200,
+                json={
+                    "results": [
+                        {"text": "Restart pgbouncer", "score": 0.91, "node_id": "7"},
+                        {"text": "Unrelated", "score": 0.4, "node_id": "8"},
+                        {
+                            "text": "Summary",
+                            "score": 0.95,
+                            "node_id": "9",
+                            "is_summary": True,
+                        },
+                    ]
+                },
+            )
+
+        storage = APIIntegratedStorageBackend(
+            org_id="org1",
+            team_node_id="teamA",
+            config_service_url="http://config",
+            rag_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(rag), base_url="http://rag"
+            ),
+            rag_tree="incidents",
+        )
+
+        similar = await storage.find_similar("x" * 5000, limit=3, threshold=0.75)
+
+        assert [s["id"] for s in similar] == ["7"]
+        assert requests[0]["tree"] == "incidents"
+        assert len(requests[0]["query"]) == 2000
+
+        # Updating a knowledge-base node keeps the new version locally
+        await storage.update_content("7", "Restart pgbouncer pool", "incident:1", None)
+        (node,) = storage.nodes.values()
+        assert node["supersedes"] == "7"
@@ -27,6 +27,7 @@ from ai_learning_pipeline.tasks.scanners.github_scanner import (
     _collect_infra_signals,
     _format_architecture_document,
     _format_repo_summaries,
+    _get_repo_trees,
     _scan_ops_docs,
 )
 
@@ -1186,3 +1187,152 @@ class TestRealisticOnboardingE2E:
 
         # Tree should be scoped to integration + org
         assert ingest_payload["tree"] == "github_org-incidentfox_default"
+
+
+# ===================================================================
+# 7. Tree-Based Fetching and Unchanged-Repo Skipping
+# ===================================================================
+
+
+def _make_tree_api_mock(
+    files: Dict[str, str],
+    head_sha: str = "head-1",
+    truncated: bool = False,
+):
+    """Create a _github_api mock serving branches, recursive trees and blobs.
+
+    Blob SHAs are "blob:<path>". Every requested path is recorded in
+    mock_api.calls.
+    """
+    dirs = {
+        "/".join(path.split("/")[:i])
+        for path in files
+        for i in range(1, path.count("/") + 1)
+    }
+    tree = [{"path": d, "type": "tree", "sha": f"tree:{d}"} for d in dirs] + [
+        {"path": p, "type": "blob", "sha": f"blob:{p}", "size": len(c)}
+        for p, c in files.items()
+    ]
+    prefix = f"/repos/{REPO_FULL_NAME}"
+
+    def mock_api(
+        path: str,
+        token: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        mock_api.calls.append(path)
+        if f"/orgs/{GITHUB_ORG}/repos" in path:
+            return MONOREPO_REPOS
+        if path == f"{prefix}/branches/main":
+            return {"name": "main", "commit": {"sha": head_sha}}
+        if path == f"{prefix}/git/trees/{head_sha}":
+            assert params == {"recursive": "1"}
+            return {"sha": "root", "tree": tree, "truncated": truncated}
+        if path.startswith(f"{prefix}/git/blobs/blob:"):
+            return _encode_file(files[path.split("/git/blobs/blob:", 1)[1]])
+        if "/contents/" in path:
+            return _make_github_api_mock(MONOREPO_REPOS, files)(path, token, params)
+        return None
+
+    mock_api.calls = []
+    return mock_api
+
+
+class TestTreeBasedFetching:
+    """Files are matched against one recursive tree listing per repo."""
+
+    def test_matches_tree_locally_and_fetches_only_blobs(self):
+        mock_api = _make_tree_api_mock(REAL_FILES)
+        with patch(
+            "ai_learning_pipeline.tasks.scanners.github_scanner._github_api",
+            side_effect=mock_api,
+        ):
+            signals = _collect_infra_signals(
+                token="ghp_test", repos=MONOREPO_REPOS, github_org=GITHUB_ORG
+            )
+
+        found = signals[REPO_FULL_NAME]
+        assert found["docker-compose.yml"] == REAL_FILES["docker-compose.yml"]
+        # Directory paths are sampled from the tree listing
+        assert "telemetry-agent.yml" in found[".github/workflows/"]
+        assert not any("/contents/" in c for c in mock_api.calls)
+        # branches + tree, then one request per matched blob
+        assert len(mock_api.calls) == 2 + 2
+
+    def test_same_results_as_per_path_probing(self):
+        tree_api = _make_tree_api_mock(REAL_FILES)
+        probe_api = _make_github_api_mock(MONOREPO_REPOS, REAL_FILES)
+        results = []
+        for api in (tree_api, probe_api):
+            with patch(
+                "ai_learning_pipeline.tasks.scanners.github_scanner._github_api",
+                side_effect=api,
+            ):
+                results.append(
+                    _scan_ops_docs(
+                        token="ghp_test",
+                        repos=MONOREPO_REPOS,
+                        github_org=GITHUB_ORG,
+                        org_id="org-123",
+                    )
+                )
+        via_tree, via_probe = results
+        assert [(d.source_url, d.content) for d in via_tree] == [
+            (d.source_url, d.content) for d in via_probe
+        ]
+
+    def test_truncated_tree_falls_back_to_probing(self):
+        mock_api = _make_tree_api_mock(REAL_FILES, truncated=True)
+        with patch(
+            "ai_learning_pipeline.tasks.scanners.github_scanner._github_api",
+            side_effect=mock_api,
+        ):
+            trees = _get_repo_trees("ghp_test", MONOREPO_REPOS, GITHUB_ORG)
+            signals = _collect_infra_signals(
+                token="ghp_test",
+                repos=MONOREPO_REPOS,
+                github_org=GITHUB_ORG,
+                trees=trees,
+            )
+
+        assert trees[REPO_FULL_NAME].entries is None
+        assert "docker-compose.yml" in signals[REPO_FULL_NAME]
+        assert any("/contents/" in c for c in mock_api.calls)
+
+    @pytest.mark.asyncio
+    async def test_scan_skips_repos_with_unchanged_head(self):
+        scanner_fn = get_scanner("github")
+        scan_state: Dict[str, Any] = {}
+
+        async def run(head_sha):
+            mock_api = _make_tree_api_mock(REAL_FILES, head_sha=head_sha)
+            with (
+                patch(
+                    "ai_learning_pipeline.tasks.scanners.github_scanner._github_api",
+                    side_effect=mock_api,
+                ),
+                patch(
+                    "ai_learning_pipeline.tasks.scanners.github_scanner"
+                    "._generate_architecture_summary",
+                    AsyncMock(return_value=None),
+                ),
+            ):
+                docs = await scanner_fn(
+                    credentials={"api_key": "ghp_test"},
+                    config={"account_login": GITHUB_ORG},
+                    org_id="org-123",
+                    scan_state=scan_state,
+                )
+            return docs, mock_api.calls
+
+        docs, _ = await run("head-1")
+        assert any("README.md" in d.source_url for d in docs)
+        assert scan_state == {"repo_shas": {REPO_FULL_NAME: "head-1"}}
+
+        docs, calls = await run("head-1")
+        assert docs == []
+        assert not any("/git/blobs/" in c for c in calls)
+
+        docs, _ = await run("head-2")
+        assert any("README.md" in d.source_url for d in docs)
+        assert scan_state["repo_shas"][REPO_FULL_NAME] == "head-2"
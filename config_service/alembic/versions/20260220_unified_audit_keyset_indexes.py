@@ -0,0 +1,45 @@
+"""Add (org_id, timestamp) indexes for the unified audit timeline.
+
+The unified audit query pages each source newest first within an org by
+keyset (timestamp, id); these indexes let every branch of its UNION ALL
+read only the rows of the requested page instead of sorting the org's
+whole history.
+
+Revision ID: 20260220_unified_audit_keyset_indexes
+Revises: 20260218_slack_session_cache
+Create Date: 2026-02-20
+"""
+
+from alembic import op
+
+revision = "20260220_unified_audit_keyset_indexes"
+down_revision = "20260218_slack_session_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_token_audit_org_event_at",
+        "token_audit",
+        ["org_id", "event_at"],
+    )
+    op.create_index(
+        "ix_config_change_history_org_changed_at",
+        "config_change_history",
+        ["org_id", "changed_at"],
+    )
+    op.create_index(
+        "ix_agent_runs_org_started_at",
+        "agent_runs",
+        ["org_id", "started_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_runs_org_started_at", table_name="agent_runs")
+    op.drop_index(
+        "ix_config_change_history_org_changed_at",
+        table_name="config_change_history",
+    )
+    op.drop_index("ix_token_audit_org_event_at", table_name="token_audit")
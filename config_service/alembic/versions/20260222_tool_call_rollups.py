@@ -0,0 +1,64 @@
+"""Add agent_tool_call_rollups and keyset indexes on agent_tool_calls.
+
+Tool calls are folded into hourly per org/team/tool rows at ingest (one
+row per duration histogram bucket), so analytics read the rollups
+instead of aggregating agent_tool_calls. The (started_at, id) and
+(tool_name, started_at) indexes back keyset pagination and per-tool
+time-range scans of the raw table.
+
+Existing tool calls are not backfilled here; call
+POST /api/v1/internal/tool-calls/rollups/rebuild for the range to keep.
+
+Revision ID: 20260222_tool_call_rollups
+Revises: 20260220_unified_audit_keyset_indexes
+Create Date: 2026-02-22
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260222_tool_call_rollups"
+down_revision = "20260220_unified_audit_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agent_tool_call_rollups",
+        sa.Column("org_id", sa.String(64), nullable=False),
+        sa.Column("team_node_id", sa.String(128), nullable=False),
+        sa.Column("tool_name", sa.String(128), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("duration_bucket", sa.Integer(), nullable=False),
+        sa.Column("call_count", sa.BigInteger(), nullable=False),
+        sa.Column("error_count", sa.BigInteger(), nullable=False),
+        sa.Column("duration_ms_sum", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "org_id", "team_node_id", "tool_name", "bucket_start", "duration_bucket"
+        ),
+    )
+    op.create_index(
+        "ix_agent_tool_call_rollups_org_bucket",
+        "agent_tool_call_rollups",
+        ["org_id", "bucket_start"],
+    )
+    op.create_index(
+        "ix_agent_tool_calls_started_at_id",
+        "agent_tool_calls",
+        ["started_at", "id"],
+    )
+    op.create_index(
+        "ix_agent_tool_calls_tool_started_at",
+        "agent_tool_calls",
+        ["tool_name", "started_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_tool_calls_tool_started_at", table_name="agent_tool_calls")
+    op.drop_index("ix_agent_tool_calls_started_at_id", table_name="agent_tool_calls")
+    op.drop_index(
+        "ix_agent_tool_call_rollups_org_bucket", table_name="agent_tool_call_rollups"
+    )
+    op.drop_table("agent_tool_call_rollups")
@@ -0,0 +1,31 @@
+"""Add a partial index on running agent runs for the stale-run sweeper.
+
+The sweeper and the stale-count endpoint only look at runs still in
+'running' status, a small and constantly changing slice of agent_runs;
+indexing that slice by started_at keeps both off the full table.
+
+Revision ID: 20260224_agent_runs_running_index
+Revises: 20260222_tool_call_rollups
+Create Date: 2026-02-24
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260224_agent_runs_running_index"
+down_revision = "20260222_tool_call_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_agent_runs_running_started_at",
+        "agent_runs",
+        ["started_at"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_runs_running_started_at", table_name="agent_runs")
@@ -0,0 +1,38 @@
+"""Add ingestion_manifest for AI pipeline delta ingestion.
+
+One row per (org, team, source, document) the knowledge ingestion task has
+ingested, with the content hash it saw. Reruns skip documents whose hash is
+unchanged; documents that vanish from their source get deleted_at set
+instead of being removed.
+
+Revision ID: 20260226_ingestion_manifest
+Revises: 20260224_agent_runs_running_index
+Create Date: 2026-02-26
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260226_ingestion_manifest"
+down_revision = "20260224_agent_runs_running_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_manifest",
+        sa.Column("org_id", sa.String(64), nullable=False),
+        sa.Column("team_node_id", sa.String(128), nullable=False),
+        sa.Column("source", sa.String(64), nullable=False),
+        sa.Column("document_id", sa.String(512), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("last_modified", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("ingested_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("org_id", "team_node_id", "source", "document_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingestion_manifest")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Load-test team-token authentication with and without the principal cache.
+
+Issues a throwaway team token, then hammers authenticate_bearer_token from
+N threads the way require_team_auth does (one session per request) for a
+fixed duration, once with PRINCIPAL_CACHE_TTL_SECONDS=0 and inline
+last_used_at writes (the old path) and once with the cache and batched
+last_used_at writes. Reports requests/sec and latency percentiles for each,
+then revokes the token.
+
+Runs against DATABASE_URL; point it at a staging database, not production.
+
+Usage:
+    python scripts/load_test_team_auth.py --org-id org1 --team-node-id teamA
+    python scripts/load_test_team_auth.py --org-id org1 --team-node-id teamA \\
+        --threads 32 --seconds 20
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure repo root is on sys.path so `import src.*` works when running as a script.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+import argparse
+import os
+import threading
+import time
+
+from src.core.dotenv import load_dotenv
+from src.core.principal_cache import get_last_used_recorder, reset_principal_cache
+from src.core.security import get_token_pepper
+from src.db.repository import (
+    authenticate_bearer_token,
+    issue_team_token,
+    revoke_team_token,
+)
+from src.db.session import db_session, get_db
+
+MODES = {
+    "uncached": {
+        "PRINCIPAL_CACHE_TTL_SECONDS": "0",
+        "PRINCIPAL_LAST_USED_FLUSH_SECONDS": "0",
+    },
+    "cached": {
+        "PRINCIPAL_CACHE_TTL_SECONDS": "30",
+        "PRINCIPAL_LAST_USED_FLUSH_SECONDS": "30",
+    },
+}
+
+
+def run_mode(mode: str, *, bearer: str, pepper: str, threads: int, seconds: float):
+    os.environ.update(MODES[mode])
+    reset_principal_cache()
+
+    latencies: list = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            db = next(get_db())
+            try:
+                authenticate_bearer_token(
+                    db, bearer=bearer, pepper=pepper, update_last_used=True
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                with lock:
+                    errors[0] += 1
+            finally:
+                db.close()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    recorder = get_last_used_recorder()
+    if recorder is not None:
+        recorder.stop()
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(
+        f"{mode:>9}: {len(latencies) / elapsed:10.0f} req/s  "
+        f"p50 {pct(0.50):7.2f} ms  p99 {pct(0.99):7.2f} ms  "
+        f"requests {len(latencies)}  errors {errors[0]}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--org-id", required=True)
+    parser.add_argument("--team-node-id", required=True)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument(
+        "--mode", choices=[*MODES, "both"], default="both", help="Which path to run"
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    pepper = get_token_pepper()
+
+    with db_session() as s:
+        bearer = issue_team_token(
+            s,
+            org_id=args.org_id,
+            team_node_id=args.team_node_id,
+            issued_by="load-test",
+            pepper=pepper,
+            label="load-test",
+        )
+    token_id = bearer.split(".", 1)[0]
+
+    print(f"threads: {args.threads}  seconds: {args.seconds}  token: {token_id}")
+    try:
+        for mode in MODES if args.mode == "both" else [args.mode]:
+            run_mode(
+                mode,
+                bearer=bearer,
+                pepper=pepper,
+                threads=args.threads,
+                seconds=args.seconds,
+            )
+    finally:
+        with db_session() as s:
+            revoke_team_token(s, token_id=token_id, revoked_by="load-test")
+
+
+if __name__ == "__main__":
+    main()
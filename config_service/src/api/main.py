@@ -28,12 +28,17 @@ from src.api.routes.tool_metadata import router as tool_metadata_router
 from src.api.routes.ui import router as ui_router
 from src.api.routes.visitor import router as visitor_router
 from src.core.audit_log import app_logger, configure_logging, new_request_id
-from src.core.metrics import HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS_TOTAL
+from src.core.metrics import (
+    DB_REQUEST_DURATION_SECONDS,
+    DB_REQUEST_STATEMENTS,
+    HTTP_REQUEST_DURATION_SECONDS,
+    HTTP_REQUESTS_TOTAL,
+)
 from src.core.yaml_config import YAMLConfigManager, is_local_mode
 from src.core.yaml_seeder import seed_from_yaml
 from src.core.yaml_validator import validate_yaml_config
 from src.core.yaml_watcher import start_yaml_watcher_background
-from src.db.session import get_session_maker
+from src.db.session import get_session_maker, start_db_timer
 
 
 def create_app() -> FastAPI:
@@ -128,6 +133,7 @@ def create_app() -> FastAPI:
             path=str(request.url.path),
         )
         start = __import__("time").time()
+        db_time = start_db_timer()
         try:
             response: Response = await call_next(request)
             duration_ms = int((__import__("time").time() - start) * 1000)
@@ -135,7 +141,15 @@ def create_app() -> FastAPI:
                 "http_request",
                 status_code=response.status_code,
                 duration_ms=duration_ms,
+                db_ms=int(db_time[0] * 1000),
+                db_statements=db_time[1],
             )
+            route = getattr(request.scope.get("route"), "path", None)
+            if route:
+                DB_REQUEST_DURATION_SECONDS.labels(request.method, route).observe(
+                    db_time[0]
+                )
+                DB_REQUEST_STATEMENTS.labels(request.method, route).observe(db_time[1])
             # metrics
             path = str(request.url.path)
             HTTP_REQUESTS_TOTAL.labels(
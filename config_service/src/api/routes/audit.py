@@ -7,9 +7,10 @@ from __future__ import annotations
 import csv
 import io
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -50,10 +51,11 @@ class AuditListResponse(BaseModel):
     """Paginated list of audit events."""
 
     events: List[AuditEventResponse]
-    total: int
+    total: Optional[int]  # only computed for the first page (no cursor)
     limit: int
     offset: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 class AgentRunCreateRequest(BaseModel):
@@ -118,6 +120,9 @@ def list_unified_audit(
     until: Optional[datetime] = Query(None),
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page (keyset pagination)"
+    ),
     session: Session = Depends(get_db),
     admin: AdminPrincipal = Depends(require_admin),
 ):
@@ -128,29 +133,37 @@ def list_unified_audit(
     - token: Token lifecycle events (issued, revoked, expired, permission_denied)
     - config: Configuration changes
     - agent: Agent run records
+
+    Page with `cursor` (preferred for deep pages) or `offset`; `total` is
+    only counted for the first page.
     """
     source_list = sources.split(",") if sources else None
     event_type_list = event_types.split(",") if event_types else None
 
-    events, total = repository.list_unified_audit(
-        session,
-        org_id=org_id,
-        sources=source_list,
-        team_node_id=team_node_id,
-        event_types=event_type_list,
-        actor=actor,
-        search=search,
-        since=since,
-        until=until,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        page = repository.list_unified_audit(
+            session,
+            org_id=org_id,
+            sources=source_list,
+            team_node_id=team_node_id,
+            event_types=event_type_list,
+            actor=actor,
+            search=search,
+            since=since,
+            until=until,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_total=cursor is None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Build team name lookup for better display
     nodes = {n.node_id: n for n in repository.list_org_nodes(session, org_id=org_id)}
 
     response_events = []
-    for e in events:
+    for e in page.events:
         team_name = None
         if e.team_node_id and e.team_node_id in nodes:
             team_name = nodes[e.team_node_id].name or e.team_node_id
@@ -172,13 +185,60 @@ def list_unified_audit(
 
     return AuditListResponse(
         events=response_events,
-        total=total,
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=offset + limit < total,
+        has_more=page.next_cursor is not None,
+        next_cursor=page.next_cursor,
     )
 
 
+_CSV_HEADER = [
+    "Timestamp",
+    "Source",
+    "Event Type",
+    "Actor",
+    "Team",
+    "Summary",
+    "Correlation ID",
+]
+
+
+def _audit_csv_chunks(filters: Dict[str, Any], rows_per_chunk: int) -> Iterator[str]:
+    """Render the filtered audit timeline as CSV text, a chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_CSV_HEADER)
+
+    # The response outlives the request's dependencies, so use a session
+    # owned by the stream.
+    with db_session() as session:
+        rows = 1
+        for e in repository.iter_unified_audit(
+            session, batch_size=rows_per_chunk, **filters
+        ):
+            writer.writerow(
+                [
+                    e.timestamp.isoformat(),
+                    e.source,
+                    e.event_type,
+                    e.actor or "",
+                    e.team_node_id or "",
+                    e.summary,
+                    e.correlation_id or "",
+                ]
+            )
+            rows += 1
+            if rows >= rows_per_chunk:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
 @router.get("/export")
 def export_audit_csv(
     org_id: str,
@@ -189,63 +249,31 @@ def export_audit_csv(
     search: Optional[str] = Query(None),
     since: Optional[datetime] = Query(None),
     until: Optional[datetime] = Query(None),
-    session: Session = Depends(get_db),
     admin: AdminPrincipal = Depends(require_admin),
 ):
-    """Export audit log as CSV for compliance reporting."""
-    source_list = sources.split(",") if sources else None
-    event_type_list = event_types.split(",") if event_types else None
+    """
+    Export audit log as CSV for compliance reporting.
 
-    events, _ = repository.list_unified_audit(
-        session,
+    Streams every matching event (no row cap), fetched and written in
+    chunks so memory stays flat for large orgs.
+    """
+    filters = dict(
         org_id=org_id,
-        sources=source_list,
+        sources=sources.split(",") if sources else None,
         team_node_id=team_node_id,
-        event_types=event_type_list,
+        event_types=event_types.split(",") if event_types else None,
         actor=actor,
         search=search,
         since=since,
         until=until,
-        limit=10000,  # Max export
-        offset=0,
-    )
-
-    # Build CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        [
-            "Timestamp",
-            "Source",
-            "Event Type",
-            "Actor",
-            "Team",
-            "Summary",
-            "Correlation ID",
-        ]
     )
 
-    for e in events:
-        writer.writerow(
-            [
-                e.timestamp.isoformat(),
-                e.source,
-                e.event_type,
-                e.actor or "",
-                e.team_node_id or "",
-                e.summary,
-                e.correlation_id or "",
-            ]
-        )
-
-    csv_content = output.getvalue()
-
     filename = (
         f"audit_export_{org_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
     )
 
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        _audit_csv_chunks(filters, rows_per_chunk=1000),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -316,8 +344,6 @@ def complete_agent_run(
     )
 
     if run is None:
-        from fastapi import HTTPException
-
         raise HTTPException(status_code=404, detail="Agent run not found")
 
     session.commit()
@@ -6,6 +6,7 @@ These endpoints are not exposed externally and use internal auth.
 import json
 import os
 import secrets
+import time
 import uuid as uuid_lib
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -13,8 +14,14 @@ from typing import Any, Dict, List, Optional
 import structlog
 from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
+from src.core.metrics import (
+    STALE_RUN_SWEEP_DURATION_SECONDS,
+    STALE_RUNS_MARKED_TOTAL,
+    STALE_RUNS_PENDING,
+)
 from src.db import repository
 from src.db.config_models import NodeConfiguration
 from src.db.config_repository import get_or_create_node_configuration
@@ -25,7 +32,7 @@ from src.db.models import (
     SlackApp,
     SlackInstallation,
 )
-from src.db.session import get_db
+from src.db.session import get_async_read_db, get_db
 
 logger = structlog.get_logger()
 
@@ -281,6 +288,8 @@ class StaleRunsCleanupRequest(BaseModel):
     """Request to mark stale runs as timeout."""
 
     max_age_seconds: int = 600  # Default: 10 minutes (2x typical 5min timeout)
+    batch_size: int = 500  # Runs marked per transaction
+    max_rows: int = 10000  # Cap per sweep; the next cronjob run picks up the rest
 
 
 class StaleRunsCleanupResponse(BaseModel):
@@ -289,6 +298,9 @@ class StaleRunsCleanupResponse(BaseModel):
     marked_count: int
     max_age_seconds: int
     message: str
+    batches: int = 0
+    capped: bool = False  # True if max_rows was hit and stale runs may remain
+    duration_ms: float = 0.0
 
 
 class StaleRunsCountResponse(BaseModel):
@@ -320,22 +332,40 @@ def cleanup_stale_agent_runs(
         service=service,
     )
 
-    marked_count = repository.mark_stale_runs_as_timeout(
+    if request.batch_size < 1 or request.max_rows < 1:
+        raise HTTPException(
+            status_code=400, detail="batch_size and max_rows must be positive"
+        )
+
+    started = time.perf_counter()
+    sweep = repository.mark_stale_runs_as_timeout(
         session,
         max_age_seconds=request.max_age_seconds,
+        batch_size=request.batch_size,
+        max_rows=request.max_rows,
     )
-    session.commit()
+    duration = time.perf_counter() - started
+    STALE_RUN_SWEEP_DURATION_SECONDS.observe(duration)
+    STALE_RUNS_MARKED_TOTAL.inc(sweep.marked)
+    if not sweep.capped:
+        STALE_RUNS_PENDING.set(0)
 
     logger.info(
         "cleanup_stale_runs_completed",
-        marked_count=marked_count,
+        marked_count=sweep.marked,
+        batches=sweep.batches,
+        capped=sweep.capped,
+        duration_ms=round(duration * 1000, 1),
         max_age_seconds=request.max_age_seconds,
     )
 
     return StaleRunsCleanupResponse(
-        marked_count=marked_count,
+        marked_count=sweep.marked,
         max_age_seconds=request.max_age_seconds,
-        message=f"Marked {marked_count} stale runs as timeout",
+        message=f"Marked {sweep.marked} stale runs as timeout",
+        batches=sweep.batches,
+        capped=sweep.capped,
+        duration_ms=round(duration * 1000, 1),
     )
 
 
@@ -355,6 +385,7 @@ def get_stale_runs_count(
         session,
         max_age_seconds=max_age_seconds,
     )
+    STALE_RUNS_PENDING.set(count)
 
     return StaleRunsCountResponse(
         stale_count=count,
@@ -410,6 +441,7 @@ class ToolCallsListResponse(BaseModel):
 
     tool_calls: List[ToolCallResponse]
     total: int
+    next_cursor: Optional[str] = None  # set by /tool-calls/query when more rows exist
 
 
 @router.post("/agent-runs/{run_id}/tool-calls", response_model=ToolCallsListResponse)
@@ -448,34 +480,17 @@ def record_tool_calls(
         for tc in request.tool_calls
     ]
 
+    rows = repository.normalize_tool_calls(run_id, tool_calls_data)
     count = repository.bulk_create_tool_calls(
         session,
         run_id=run_id,
-        tool_calls=tool_calls_data,
+        tool_calls=rows,
     )
     session.commit()
 
-    # Fetch the created records to return
-    tool_calls = repository.get_tool_calls_for_run(session, run_id=run_id)
-
+    # Echo the stored batch instead of re-reading the run's whole history
     return ToolCallsListResponse(
-        tool_calls=[
-            ToolCallResponse(
-                id=tc.id,
-                run_id=tc.run_id,
-                tool_name=tc.tool_name,
-                agent_name=tc.agent_name,
-                parent_agent=tc.parent_agent,
-                tool_input=tc.tool_input,
-                tool_output=tc.tool_output,
-                started_at=tc.started_at,
-                duration_ms=tc.duration_ms,
-                status=tc.status,
-                error_message=tc.error_message,
-                sequence_number=tc.sequence_number,
-            )
-            for tc in tool_calls
-        ],
+        tool_calls=[ToolCallResponse(**row) for row in rows],
         total=count,
     )
 
@@ -523,6 +538,7 @@ class ToolCallsQueryRequest(BaseModel):
     end_time: Optional[str] = None
     limit: int = 1000
     offset: int = 0
+    cursor: Optional[str] = None  # next_cursor from the previous page; replaces offset
 
 
 @router.post("/tool-calls/query", response_model=ToolCallsListResponse)
@@ -535,6 +551,7 @@ def query_tool_calls(
     Query tool calls across multiple runs.
 
     Used by the AI pipeline for aggregate analysis of tool usage patterns.
+    Results are newest first; page with next_cursor.
     """
     # Parse timestamps
     since = None
@@ -550,16 +567,26 @@ def query_tool_calls(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_time format")
 
-    tool_calls = repository.list_tool_calls(
-        session,
-        run_ids=request.run_ids,
-        tool_name=request.tool_name,
-        status=request.status,
-        since=since,
-        until=until,
-        limit=request.limit,
-        offset=request.offset,
-    )
+    limit = min(request.limit, 5000)
+    try:
+        tool_calls = repository.list_tool_calls(
+            session,
+            run_ids=request.run_ids,
+            tool_name=request.tool_name,
+            status=request.status,
+            since=since,
+            until=until,
+            limit=limit,
+            offset=request.offset,
+            cursor=request.cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    next_cursor = None
+    if tool_calls and len(tool_calls) == limit:
+        last = tool_calls[-1]
+        next_cursor = repository.encode_tool_call_cursor(last.started_at, last.id)
 
     return ToolCallsListResponse(
         tool_calls=[
@@ -578,7 +605,103 @@ def query_tool_calls(
             for tc in tool_calls
         ],
         total=len(tool_calls),
+        next_cursor=next_cursor,
+    )
+
+
+class ToolCallRollupItem(BaseModel):
+    """Tool call counts and latency for one team/tool (and hour)."""
+
+    team_node_id: Optional[str] = None
+    tool_name: str
+    bucket_start: Optional[datetime] = None  # None when group_by=tool
+    call_count: int
+    error_count: int
+    error_rate: float
+    avg_duration_ms: Optional[float] = None
+    p50_duration_ms: Optional[int] = None
+    p95_duration_ms: Optional[int] = None
+
+
+class ToolCallRollupsResponse(BaseModel):
+    rollups: List[ToolCallRollupItem]
+
+
+def _parse_iso(value: Optional[str], field: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field} format")
+
+
+@router.get("/tool-calls/rollups", response_model=ToolCallRollupsResponse)
+async def get_tool_call_rollups(
+    org_id: str,
+    team_node_id: Optional[str] = None,
+    tool_name: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    group_by: str = "hour",
+    db=Depends(get_async_read_db),
+    service: str = Depends(require_internal_service),
+):
+    """
+    Tool usage analytics from the hourly rollups.
+
+    group_by=hour returns one entry per team/tool/hour; group_by=tool
+    merges the range into one entry per team/tool. Percentiles are
+    histogram-bucket upper bounds. Served from the read replica when
+    DATABASE_READ_URL is set.
+    """
+    if group_by not in ("hour", "tool"):
+        raise HTTPException(status_code=400, detail="group_by must be hour or tool")
+
+    rollups = await db.run_sync(
+        repository.get_tool_call_rollups,
+        org_id=org_id,
+        team_node_id=team_node_id,
+        tool_name=tool_name,
+        since=_parse_iso(since, "since"),
+        until=_parse_iso(until, "until"),
+        by_hour=group_by == "hour",
     )
+    return ToolCallRollupsResponse(rollups=[ToolCallRollupItem(**r) for r in rollups])
+
+
+class ToolCallRollupsRebuildRequest(BaseModel):
+    since: str
+    until: str
+    org_id: Optional[str] = None
+
+
+@router.post("/tool-calls/rollups/rebuild")
+def rebuild_tool_call_rollups(
+    request: ToolCallRollupsRebuildRequest,
+    session: Session = Depends(get_db),
+    service: str = Depends(require_internal_service),
+):
+    """
+    Recompute rollups for a time range from the raw tool calls.
+
+    Backfills history recorded before rollups existed; safe to re-run.
+    """
+    folded = repository.rebuild_tool_call_rollups(
+        session,
+        since=_parse_iso(request.since, "since"),
+        until=_parse_iso(request.until, "until"),
+        org_id=request.org_id,
+    )
+    session.commit()
+    logger.info(
+        "tool_call_rollups_rebuilt",
+        org_id=request.org_id,
+        since=request.since,
+        until=request.until,
+        tool_calls=folded,
+    )
+    return {"tool_calls": folded}
 
 
 # ==================== Pending Changes (AI Pipeline Proposals) ====================
@@ -676,6 +799,87 @@ def create_pending_change_internal(
     )
 
 
+# ==================== Ingestion Manifest (AI Pipeline Delta Ingestion) ====================
+
+
+class IngestionManifestEntryModel(BaseModel):
+    document_id: str
+    content_hash: str
+    last_modified: Optional[datetime] = None
+
+
+class IngestionManifestUpdateRequest(BaseModel):
+    org_id: str
+    team_node_id: str
+    source: str
+    entries: List[IngestionManifestEntryModel] = []
+    deleted_document_ids: List[str] = []
+
+
+@router.get("/ingestion-manifest")
+def get_ingestion_manifest(
+    org_id: str,
+    team_node_id: str,
+    source: str,
+    session: Session = Depends(get_db),
+    service: str = Depends(require_internal_service),
+):
+    """
+    Documents the AI pipeline has already ingested for a team's source.
+
+    The pipeline hashes what it fetches against this list and only sends
+    new or changed documents through ingestion.
+    """
+    entries = repository.get_ingestion_manifest(
+        session, org_id=org_id, team_node_id=team_node_id, source=source
+    )
+    return {
+        "org_id": org_id,
+        "team_node_id": team_node_id,
+        "source": source,
+        "entries": [
+            {
+                "document_id": e.document_id,
+                "content_hash": e.content_hash,
+                "last_modified": (
+                    e.last_modified.isoformat() if e.last_modified else None
+                ),
+                "ingested_at": e.ingested_at.isoformat() if e.ingested_at else None,
+            }
+            for e in entries
+        ],
+    }
+
+
+@router.put("/ingestion-manifest")
+def update_ingestion_manifest(
+    request: IngestionManifestUpdateRequest,
+    session: Session = Depends(get_db),
+    service: str = Depends(require_internal_service),
+):
+    """Record newly ingested documents and tombstone ones gone from the source."""
+    key = dict(
+        org_id=request.org_id,
+        team_node_id=request.team_node_id,
+        source=request.source,
+    )
+    upserted = repository.upsert_ingestion_manifest(
+        session, entries=[e.model_dump() for e in request.entries], **key
+    )
+    tombstoned = repository.tombstone_ingestion_manifest(
+        session, document_ids=request.deleted_document_ids, **key
+    )
+    session.commit()
+
+    logger.info(
+        "ingestion_manifest_updated",
+        upserted=upserted,
+        tombstoned=tombstoned,
+        **key,
+    )
+    return {"upserted": upserted, "tombstoned": tombstoned}
+
+
 # ==================== Integration Credentials ====================
 
 
@@ -806,9 +1010,9 @@ def _check_routing_match(
 
 
 @router.post("/routing/lookup", response_model=RoutingLookupResponse)
-def lookup_routing(
+async def lookup_routing(
     request: RoutingLookupRequest,
-    session: Session = Depends(get_db),
+    db=Depends(get_async_read_db),
     service: str = Depends(require_internal_service),
 ):
     """
@@ -816,7 +1020,14 @@ def lookup_routing(
 
     Tries identifiers in priority order and returns the first match.
     Used by the agent service to route incoming webhooks to the correct team.
+    Served from the read replica when DATABASE_READ_URL is set.
     """
+    return await db.run_sync(_lookup_routing, request)
+
+
+def _lookup_routing(
+    session: Session, request: RoutingLookupRequest
+) -> RoutingLookupResponse:
     tried = []
 
     # Priority order for checking (maps request field name to internal field name)
@@ -834,31 +1045,32 @@ def lookup_routing(
         "service",
     ]
 
-    # Get all team nodes (teams have configs, we need to check routing in each)
-    # If org_id is specified, filter by org
-    if request.org_id:
-        team_nodes = (
-            session.query(OrgNode)
-            .filter(
-                OrgNode.org_id == request.org_id,
-                OrgNode.node_type == "team",
-            )
-            .all()
-        )
-    else:
-        team_nodes = (
-            session.query(OrgNode)
-            .filter(
-                OrgNode.node_type == "team",
-            )
-            .all()
+    # Load every team's routing config in one query (teams without a config
+    # can't match). If org_id is specified, filter by org
+    stmt = (
+        select(OrgNode.org_id, OrgNode.node_id, NodeConfiguration.config_json)
+        .join(
+            NodeConfiguration,
+            and_(
+                NodeConfiguration.org_id == OrgNode.org_id,
+                NodeConfiguration.node_id == OrgNode.node_id,
+            ),
         )
+        .where(OrgNode.node_type == "team")
+    )
+    if request.org_id:
+        stmt = stmt.where(OrgNode.org_id == request.org_id)
+    team_routes = [
+        (org_id, node_id, config_json.get("routing", {}))
+        for org_id, node_id, config_json in session.execute(stmt)
+        if config_json
+    ]
 
     logger.info(
         "routing_lookup_start",
         org_id=request.org_id,
         identifiers=list(request.identifiers.keys()),
-        team_count=len(team_nodes),
+        team_count=len(team_routes),
     )
 
     # Try each identifier type in priority order
@@ -870,27 +1082,12 @@ def lookup_routing(
         tried.append(identifier_type)
 
         # Search all team configs
-        for team_node in team_nodes:
-            # Get team's config
-            config_row = (
-                session.query(NodeConfiguration)
-                .filter(
-                    NodeConfiguration.org_id == team_node.org_id,
-                    NodeConfiguration.node_id == team_node.node_id,
-                )
-                .first()
-            )
-
-            if not config_row or not config_row.config_json:
-                continue
-
-            routing = config_row.config_json.get("routing", {})
-
+        for org_id, node_id, routing in team_routes:
             if _check_routing_match(routing, identifier_type, value):
                 logger.info(
                     "routing_lookup_match",
-                    org_id=team_node.org_id,
-                    team_node_id=team_node.node_id,
+                    org_id=org_id,
+                    team_node_id=node_id,
                     matched_by=identifier_type,
                     matched_value=value,
                 )
@@ -898,8 +1095,8 @@ def lookup_routing(
                 # For now we don't return actual token - caller should use org/team IDs
                 return RoutingLookupResponse(
                     found=True,
-                    org_id=team_node.org_id,
-                    team_node_id=team_node.node_id,
+                    org_id=org_id,
+                    team_node_id=node_id,
                     matched_by=identifier_type,
                     matched_value=value,
                     tried=tried,
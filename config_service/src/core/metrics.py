@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # Keep label cardinality low (only a few endpoints exist).
 HTTP_REQUESTS_TOTAL = Counter(
@@ -16,6 +16,21 @@ HTTP_REQUEST_DURATION_SECONDS = Histogram(
     buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
 )
 
+# Labeled by route template (e.g. /api/v1/internal/routing/lookup), not raw path
+DB_REQUEST_DURATION_SECONDS = Histogram(
+    "config_service_db_request_duration_seconds",
+    "Time spent executing SQL per HTTP request, in seconds",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+DB_REQUEST_STATEMENTS = Histogram(
+    "config_service_db_request_statements",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+
 AUTH_FAILURES_TOTAL = Counter(
     "config_service_auth_failures_total",
     "Total authentication failures",
@@ -48,3 +63,22 @@ FEEDBACK_TOTAL = Counter(
         "source",
     ],  # feedback_type: positive/negative, source: slack/github
 )
+
+STALE_RUN_SWEEP_DURATION_SECONDS = Histogram(
+    "config_service_stale_run_sweep_duration_seconds",
+    "Duration of stale agent run sweeps in seconds",
+    [],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+STALE_RUNS_MARKED_TOTAL = Counter(
+    "config_service_stale_runs_marked_total",
+    "Agent runs marked as timeout by the stale run sweeper",
+    [],
+)
+
+STALE_RUNS_PENDING = Gauge(
+    "config_service_stale_runs_pending",
+    "Agent runs past the stale threshold still in running status, as of the last check",
+    [],
+)
@@ -0,0 +1,340 @@
+"""Short-lived cache of authenticated team-token principals.
+
+Every orchestrator, slack-bot and credential-proxy call authenticates with
+a team token, which used to cost a team_tokens SELECT (and often an UPDATE
+of last_used_at) inside the request transaction. Now:
+
+- Successful authentications are cached in-process, bounded (LRU) and
+  short-lived. Entries are keyed by token_id + the peppered hash of the
+  presented secret, so only the exact token that authenticated can hit
+  and no secret is kept in memory.
+- Each entry records the org epoch from core/config_cache when it was
+  filled. Revocations bump the epoch on commit, so with a shared (redis)
+  config cache every replica drops the org's principals on its next
+  request; the revoking replica drops them right away. Without a config
+  cache, other replicas see a revocation within the TTL.
+- Tokens past expires_at are never served from the cache; they take the
+  database path, which records the "expired" audit event.
+- last_used_at is recorded in memory and written by a background thread
+  as one batched UPDATE per flush interval.
+
+Env:
+  - PRINCIPAL_CACHE_TTL_SECONDS: default 15, 0 disables the cache
+  - PRINCIPAL_CACHE_MAX_ITEMS: default 10000
+  - PRINCIPAL_LAST_USED_FLUSH_SECONDS: default 30, 0 writes last_used_at
+    inline (throttled) as before
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.core.audit_log import app_logger
+from src.core.config_cache import get_config_cache
+from src.core.metrics import CONFIG_CACHE_EVENTS_TOTAL
+
+logger = app_logger().bind(component="principal_cache")
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    org_id: str
+    team_node_id: str
+    token_id: str
+    permissions: List[str]
+    expires_at: Optional[datetime]
+    label: Optional[str]
+    epoch: Optional[int]  # org epoch when cached; None without a config cache
+    cached_at: float
+
+
+def _org_epoch(org_id: str) -> Optional[int]:
+    cache = get_config_cache()
+    return cache.get_org_epoch(org_id) if cache is not None else None
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of (token_id, token_hash) -> CachedPrincipal."""
+
+    def __init__(self, *, ttl_seconds: int, max_items: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, CachedPrincipal]" = OrderedDict()
+
+    @staticmethod
+    def _key(token_id: str, token_hash: str) -> str:
+        return f"{token_id}:{token_hash}"
+
+    def get(self, token_id: str, token_hash: str) -> Optional[CachedPrincipal]:
+        key = self._key(token_id, token_hash)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+        if entry is None:
+            CONFIG_CACHE_EVENTS_TOTAL.labels("principal", "miss").inc()
+            return None
+
+        fresh = time.monotonic() - entry.cached_at < self.ttl_seconds
+        if fresh and entry.expires_at is not None:
+            fresh = datetime.utcnow() < entry.expires_at.replace(tzinfo=None)
+        if fresh:
+            try:
+                fresh = _org_epoch(entry.org_id) == entry.epoch
+            except Exception as e:
+                # Can't confirm the token wasn't revoked: authenticate from the DB
+                logger.warning("principal_cache_epoch_failed", error=str(e))
+                fresh = False
+        if not fresh:
+            with self._lock:
+                if self._items.get(key) is entry:
+                    del self._items[key]
+            CONFIG_CACHE_EVENTS_TOTAL.labels("principal", "stale").inc()
+            return None
+
+        CONFIG_CACHE_EVENTS_TOTAL.labels("principal", "hit").inc()
+        return entry
+
+    def put(
+        self,
+        *,
+        token_hash: str,
+        org_id: str,
+        team_node_id: str,
+        token_id: str,
+        permissions: Optional[List[str]],
+        expires_at: Optional[datetime],
+        label: Optional[str],
+    ) -> None:
+        try:
+            epoch = _org_epoch(org_id)
+        except Exception:
+            return
+        entry = CachedPrincipal(
+            org_id=org_id,
+            team_node_id=team_node_id,
+            token_id=token_id,
+            permissions=list(permissions or []),
+            expires_at=expires_at,
+            label=label,
+            epoch=epoch,
+            cached_at=time.monotonic(),
+        )
+        key = self._key(token_id, token_hash)
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate_tokens(self, token_ids: Iterable[str]) -> None:
+        token_ids = set(token_ids)
+        with self._lock:
+            for key in [k for k, v in self._items.items() if v.token_id in token_ids]:
+                del self._items[key]
+
+    def invalidate_org(self, org_id: str) -> None:
+        with self._lock:
+            for key in [k for k, v in self._items.items() if v.org_id == org_id]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class LastUsedRecorder:
+    """Collects token last-used times and writes them in periodic batches."""
+
+    def __init__(
+        self,
+        *,
+        flush_interval_seconds: int,
+        session_factory: Optional[Callable] = None,
+    ):
+        self.flush_interval_seconds = flush_interval_seconds
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._pending: Dict[str, datetime] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def record(self, token_id: str, used_at: datetime) -> None:
+        with self._lock:
+            self._pending[token_id] = used_at
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="token-last-used-flusher", daemon=True
+                )
+                self._thread.start()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write pending last_used_at values in one executemany; returns rows sent."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        from sqlalchemy import bindparam, or_, update
+
+        from src.db.models import TeamToken
+
+        table = TeamToken.__table__
+        stmt = (
+            update(table)
+            .where(table.c.token_id == bindparam("b_token_id"))
+            # Never move last_used_at backwards (another replica may be ahead)
+            .where(
+                or_(
+                    table.c.last_used_at.is_(None),
+                    table.c.last_used_at < bindparam("b_used_at"),
+                )
+            )
+            .values(last_used_at=bindparam("b_used_at"))
+        )
+        params = [
+            {"b_token_id": token_id, "b_used_at": used_at}
+            for token_id, used_at in batch.items()
+        ]
+        try:
+            with self._new_session() as session:
+                session.execute(stmt, params)
+                session.commit()
+        except Exception as e:
+            logger.warning(
+                "token_last_used_flush_failed", error=str(e), rows=len(batch)
+            )
+            with self._lock:
+                for token_id, used_at in batch.items():
+                    newer = self._pending.get(token_id)
+                    if newer is None or newer < used_at:
+                        self._pending[token_id] = used_at
+            return 0
+        return len(params)
+
+    def _new_session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from src.db.session import db_session
+
+        return db_session()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.flush()
+
+
+_REVOKED_INFO_KEY = "principal_cache_revoked"
+
+
+def invalidate_principals_on_commit(
+    session, *, org_id: str, token_ids: Iterable[str]
+) -> None:
+    """Drop cached principals for revoked tokens once `session` commits.
+
+    Invalidating before the commit would let a concurrent request re-cache
+    the still-active row, so the local drop and the org epoch bump (which
+    reaches other replicas through a shared config cache) run after_commit.
+    """
+    from sqlalchemy import event
+
+    pending = session.info.setdefault(_REVOKED_INFO_KEY, {})
+    pending.setdefault(org_id, set()).update(token_ids)
+    if not event.contains(session, "after_commit", _apply_revocations):
+        event.listen(session, "after_commit", _apply_revocations)
+        event.listen(session, "after_rollback", _discard_revocations)
+
+
+def _apply_revocations(session) -> None:
+    pending = session.info.pop(_REVOKED_INFO_KEY, None)
+    if not pending:
+        return
+    cache = get_principal_cache()
+    config_cache = get_config_cache()
+    for org_id, token_ids in pending.items():
+        if cache is not None:
+            cache.invalidate_tokens(token_ids)
+        if config_cache is not None:
+            try:
+                config_cache.bump_org_epoch(org_id)
+            except Exception as e:
+                logger.warning(
+                    "principal_cache_epoch_bump_failed", org_id=org_id, error=str(e)
+                )
+
+
+def _discard_revocations(session) -> None:
+    session.info.pop(_REVOKED_INFO_KEY, None)
+
+
+_PRINCIPAL_CACHE_SINGLETON: Optional[PrincipalCache] = None
+_LAST_USED_RECORDER_SINGLETON: Optional[LastUsedRecorder] = None
+_singleton_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int((os.getenv(name) or str(default)).strip())
+
+
+def get_principal_cache() -> Optional[PrincipalCache]:
+    """Process-wide principal cache, or None if PRINCIPAL_CACHE_TTL_SECONDS=0."""
+    global _PRINCIPAL_CACHE_SINGLETON
+    if _PRINCIPAL_CACHE_SINGLETON is not None:
+        return _PRINCIPAL_CACHE_SINGLETON
+
+    ttl = max(0, min(_env_int("PRINCIPAL_CACHE_TTL_SECONDS", 15), 300))
+    if ttl == 0:
+        return None
+    with _singleton_lock:
+        if _PRINCIPAL_CACHE_SINGLETON is None:
+            _PRINCIPAL_CACHE_SINGLETON = PrincipalCache(
+                ttl_seconds=ttl,
+                max_items=max(1, _env_int("PRINCIPAL_CACHE_MAX_ITEMS", 10000)),
+            )
+    return _PRINCIPAL_CACHE_SINGLETON
+
+
+def get_last_used_recorder() -> Optional[LastUsedRecorder]:
+    """Process-wide batched last_used_at writer, or None for inline writes."""
+    global _LAST_USED_RECORDER_SINGLETON
+    if _LAST_USED_RECORDER_SINGLETON is not None:
+        return _LAST_USED_RECORDER_SINGLETON
+
+    interval = max(0, _env_int("PRINCIPAL_LAST_USED_FLUSH_SECONDS", 30))
+    if interval == 0:
+        return None
+    with _singleton_lock:
+        if _LAST_USED_RECORDER_SINGLETON is None:
+            recorder = LastUsedRecorder(flush_interval_seconds=interval)
+            # Don't drop the last batch on shutdown
+            atexit.register(recorder.stop)
+            _LAST_USED_RECORDER_SINGLETON = recorder
+    return _LAST_USED_RECORDER_SINGLETON
+
+
+def reset_principal_cache() -> None:
+    """Reset the process-wide cache and recorder (useful for tests)."""
+    global _PRINCIPAL_CACHE_SINGLETON, _LAST_USED_RECORDER_SINGLETON
+    _PRINCIPAL_CACHE_SINGLETON = None
+    if _LAST_USED_RECORDER_SINGLETON is not None:
+        _LAST_USED_RECORDER_SINGLETON._stop.set()
+    _LAST_USED_RECORDER_SINGLETON = None
@@ -192,6 +192,7 @@ class ConfigChangeHistory(Base):
     __table_args__ = (
         Index("ix_config_change_history_org_node", "org_id", "node_id"),
         Index("ix_config_change_history_changed_at", "changed_at"),
+        Index("ix_config_change_history_org_changed_at", "org_id", "changed_at"),
     )
 
 
@@ -317,6 +317,36 @@ class KnowledgeDocument(Base):
     )
 
 
+class IngestionManifestEntry(Base):
+    """
+    One source document the AI pipeline has ingested for a team.
+
+    The pipeline compares content_hash against what it fetches so reruns
+    only send new or changed documents through ingestion. Documents that
+    disappear from their source are tombstoned (deleted_at) rather than
+    removed; a tombstoned document that reappears is ingested again.
+    """
+
+    __tablename__ = "ingestion_manifest"
+
+    org_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    team_node_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    source: Mapped[str] = mapped_column(String(64), primary_key=True)
+    document_id: Mapped[str] = mapped_column(String(512), primary_key=True)
+
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # As reported by the source, if it has one
+    last_modified: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
 class PendingKnowledgeTeaching(Base):
     """
     Pending knowledge teachings from agents awaiting review.
@@ -496,6 +526,7 @@ class TokenAudit(Base):
         Index("ix_token_audit_org_team", "org_id", "team_node_id"),
         Index("ix_token_audit_token_id", "token_id"),
         Index("ix_token_audit_event_at", "event_at"),
+        Index("ix_token_audit_org_event_at", "org_id", "event_at"),
         Index("ix_token_audit_event_type", "event_type"),
     )
 
@@ -651,8 +682,16 @@ class AgentRun(Base):
         Index("ix_agent_runs_team_node_id", "org_id", "team_node_id"),
         Index("ix_agent_runs_correlation_id", "correlation_id"),
         Index("ix_agent_runs_started_at", "started_at"),
+        Index("ix_agent_runs_org_started_at", "org_id", "started_at"),
         Index("ix_agent_runs_status", "status"),
         Index("ix_agent_runs_trigger_source", "trigger_source"),
+        # Stale-run sweeps only ever look at running runs
+        Index(
+            "ix_agent_runs_running_started_at",
+            "started_at",
+            postgresql_where=sa.text("status = 'running'"),
+            sqlite_where=sa.text("status = 'running'"),
+        ),
     )
 
 
@@ -704,6 +743,61 @@ class AgentToolCall(Base):
         Index("ix_agent_tool_calls_run_id", "run_id"),
         Index("ix_agent_tool_calls_tool_name", "tool_name"),
         Index("ix_agent_tool_calls_started_at", "started_at"),
+        # Keyset pagination (newest first) and per-tool time-range scans
+        Index("ix_agent_tool_calls_started_at_id", "started_at", "id"),
+        Index("ix_agent_tool_calls_tool_started_at", "tool_name", "started_at"),
+    )
+
+
+# Upper bounds (ms) of the duration histogram buckets kept by tool call rollups.
+# Bucket i holds durations <= bound i; the last bucket holds everything above.
+TOOL_CALL_DURATION_BOUNDS_MS = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1_000,
+    2_000,
+    5_000,
+    10_000,
+    20_000,
+    50_000,
+    100_000,
+    200_000,
+    500_000,
+)
+
+
+class AgentToolCallRollup(Base):
+    """
+    Hourly tool call counts per org/team/tool, maintained at ingest.
+
+    Each row is one duration histogram bucket (duration_bucket indexes
+    TOOL_CALL_DURATION_BOUNDS_MS, -1 for calls without a duration), so
+    batches fold in with an additive upsert and p50/p95 can be estimated
+    for any time range without reading agent_tool_calls.
+    """
+
+    __tablename__ = "agent_tool_call_rollups"
+
+    org_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # "" for runs without a team
+    team_node_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    tool_name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    duration_bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    call_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    duration_ms_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_agent_tool_call_rollups_org_bucket", "org_id", "bucket_start"),
     )
 
 
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import base64
+import bisect
+import json
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import String, and_, cast, func, literal, or_, select, union_all
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
+from src.core.principal_cache import (
+    get_last_used_recorder,
+    get_principal_cache,
+    invalidate_principals_on_commit,
+)
 from src.core.security import generate_token, hash_token
 from src.db.models import (
     AgentRun,
     ConversationMapping,
     ImpersonationJTI,
+    IngestionManifestEntry,
     K8sCluster,
     K8sClusterStatus,
     OrgAdminToken,
@@ -139,6 +148,7 @@ def revoke_team_token(
         return
     row.revoked_at = datetime.utcnow()
     session.flush()
+    invalidate_principals_on_commit(session, org_id=row.org_id, token_ids=[token_id])
 
     # Audit log
     record_token_audit(
@@ -171,6 +181,7 @@ def revoke_team_token_scoped(
         return
     row.revoked_at = datetime.utcnow()
     session.flush()
+    invalidate_principals_on_commit(session, org_id=org_id, token_ids=[token_id])
 
     # Audit log
     record_token_audit(
@@ -273,6 +284,9 @@ def bulk_revoke_tokens(
         if token and token.revoked_at is None:
             token.revoked_at = datetime.utcnow()
             session.flush()
+            invalidate_principals_on_commit(
+                session, org_id=token.org_id, token_ids=[token_id]
+            )
 
             # Audit log
             record_token_audit(
@@ -670,9 +684,21 @@ def authenticate_bearer_token(
 ) -> Principal:
     """Authenticate an opaque bearer token against team_tokens.
 
+    Successful authentications are served from the principal cache until
+    its TTL runs out or the org's tokens are revoked.
+
     Raises ValueError if invalid or expired.
     """
     token_id, token_secret = _parse_bearer(bearer)
+    token_hash = hash_token(token_secret, pepper=pepper)
+    cache = get_principal_cache()
+    if cache is not None:
+        cached = cache.get(token_id, token_hash)
+        if cached is not None:
+            if update_last_used:
+                _note_token_used(session, token_id)
+            return Principal(org_id=cached.org_id, team_node_id=cached.team_node_id)
+
     row = session.execute(
         select(TeamToken).where(TeamToken.token_id == token_id)
     ).scalar_one_or_none()
@@ -680,7 +706,7 @@ def authenticate_bearer_token(
         raise ValueError("Invalid token")
     if row.revoked_at is not None:
         raise ValueError("Token revoked")
-    if row.token_hash != hash_token(token_secret, pepper=pepper):
+    if row.token_hash != token_hash:
         raise ValueError("Invalid token")
 
     # Check expiration
@@ -699,16 +725,10 @@ def authenticate_bearer_token(
         )
         raise ValueError("Token expired")
 
-    # Update last_used_at (throttled to reduce write contention - only update if older than 5 minutes)
     if update_last_used:
-        now = datetime.utcnow()
-        should_update = (
-            row.last_used_at is None
-            or (now - row.last_used_at.replace(tzinfo=None)).total_seconds() > 300
-        )
-        if should_update:
-            row.last_used_at = now
-            session.flush()
+        _note_token_used(session, token_id, row=row)
+    if cache is not None:
+        _cache_principal(cache, row, token_hash)
 
     return Principal(org_id=row.org_id, team_node_id=row.team_node_id)
 
@@ -725,6 +745,28 @@ def authenticate_bearer_token_extended(
     Raises ValueError if invalid, expired, or missing required permission.
     """
     token_id, token_secret = _parse_bearer(bearer)
+    token_hash = hash_token(token_secret, pepper=pepper)
+    cache = get_principal_cache()
+    cached = cache.get(token_id, token_hash) if cache is not None else None
+    if cached is not None:
+        _check_token_permission(
+            session,
+            org_id=cached.org_id,
+            team_node_id=cached.team_node_id,
+            token_id=token_id,
+            permissions=cached.permissions,
+            required_permission=required_permission,
+        )
+        _note_token_used(session, token_id)
+        return AuthenticatedToken(
+            org_id=cached.org_id,
+            team_node_id=cached.team_node_id,
+            token_id=token_id,
+            permissions=cached.permissions,
+            expires_at=cached.expires_at,
+            label=cached.label,
+        )
+
     row = session.execute(
         select(TeamToken).where(TeamToken.token_id == token_id)
     ).scalar_one_or_none()
@@ -732,7 +774,7 @@ def authenticate_bearer_token_extended(
         raise ValueError("Invalid token")
     if row.revoked_at is not None:
         raise ValueError("Token revoked")
-    if row.token_hash != hash_token(token_secret, pepper=pepper):
+    if row.token_hash != token_hash:
         raise ValueError("Invalid token")
 
     # Check expiration
@@ -750,13 +792,44 @@ def authenticate_bearer_token_extended(
         )
         raise ValueError("Token expired")
 
-    # Check permission
+    # Cache before the permission check: the token itself is valid
     permissions = row.permissions or []
+    if cache is not None:
+        _cache_principal(cache, row, token_hash)
+    _check_token_permission(
+        session,
+        org_id=row.org_id,
+        team_node_id=row.team_node_id,
+        token_id=token_id,
+        permissions=permissions,
+        required_permission=required_permission,
+    )
+    _note_token_used(session, token_id, row=row)
+
+    return AuthenticatedToken(
+        org_id=row.org_id,
+        team_node_id=row.team_node_id,
+        token_id=token_id,
+        permissions=permissions,
+        expires_at=row.expires_at,
+        label=row.label,
+    )
+
+
+def _check_token_permission(
+    session: Session,
+    *,
+    org_id: str,
+    team_node_id: str,
+    token_id: str,
+    permissions: List[str],
+    required_permission: Optional[str],
+) -> None:
     if required_permission and required_permission not in permissions:
         record_token_audit(
             session,
-            org_id=row.org_id,
-            team_node_id=row.team_node_id,
+            org_id=org_id,
+            team_node_id=team_node_id,
             token_id=token_id,
             event_type="permission_denied",
             actor="system",
@@ -764,20 +837,43 @@ def authenticate_bearer_token_extended(
         )
         raise ValueError(f"Permission denied: {required_permission}")
 
-    # Update last_used_at
-    row.last_used_at = datetime.utcnow()
-    session.flush()
 
-    return AuthenticatedToken(
+def _cache_principal(cache, row: TeamToken, token_hash: str) -> None:
+    cache.put(
+        token_hash=token_hash,
         org_id=row.org_id,
         team_node_id=row.team_node_id,
-        token_id=token_id,
-        permissions=permissions,
+        token_id=row.token_id,
+        permissions=row.permissions,
         expires_at=row.expires_at,
         label=row.label,
     )
 
 
+def _note_token_used(
+    session: Session, token_id: str, *, row: Optional[TeamToken] = None
+) -> None:
+    """Record a token use for last_used_at.
+
+    With the batched recorder this is an in-memory write. Otherwise the row
+    is updated inline, throttled to once per 5 minutes to reduce write
+    contention; cache hits have no row and are skipped in that mode.
+    """
+    now = datetime.utcnow()
+    recorder = get_last_used_recorder()
+    if recorder is not None:
+        recorder.record(token_id, now)
+        return
+    if row is None:
+        return
+    if (
+        row.last_used_at is None
+        or (now - row.last_used_at.replace(tzinfo=None)).total_seconds() > 300
+    ):
+        row.last_used_at = now
+        session.flush()
+
+
 def _parse_bearer(bearer: str) -> tuple[str, str]:
     if "." not in bearer:
         raise ValueError("Invalid token format")
@@ -1147,11 +1243,20 @@ def list_agent_runs(
     return list(session.execute(stmt).scalars().all())
 
 
+@dataclass(frozen=True)
+class StaleRunSweep:
+    marked: int
+    batches: int
+    capped: bool  # stopped at max_rows with stale runs possibly left
+
+
 def mark_stale_runs_as_timeout(
     session: Session,
     *,
     max_age_seconds: int = 600,  # 10 minutes default (2x typical 5min timeout)
-) -> int:
+    batch_size: int = 500,
+    max_rows: int = 10000,
+) -> StaleRunSweep:
     """
     Mark agent runs stuck in 'running' status as 'timeout'.
 
@@ -1160,45 +1265,69 @@ def mark_stale_runs_as_timeout(
     - Network partition during completion recording
     - Any other failure that prevented proper status recording
 
+    Runs are marked by set-based UPDATE ... RETURNING in batches of
+    batch_size (oldest first, skipping rows locked by a concurrent sweep
+    or completion), with duration_seconds computed in SQL. The session is
+    committed after each batch so a large backlog never holds one long
+    transaction; at most max_rows runs are marked per call.
+
     Args:
         session: Database session
         max_age_seconds: Mark runs as timeout if they've been running longer than this
+        batch_size: Runs updated per statement/transaction
+        max_rows: Cap on runs marked by this sweep
 
     Returns:
-        Number of runs marked as timeout
+        StaleRunSweep with the number of runs marked
     """
-    from datetime import timezone
-
-    cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
-
-    # Find stale running runs
-    stmt = (
-        select(AgentRun)
-        .where(AgentRun.status == "running")
-        .where(AgentRun.started_at < cutoff_time)
+    now = datetime.now(timezone.utc)
+    cutoff_time = now - timedelta(seconds=max_age_seconds)
+    error_message = (
+        f"Run exceeded {max_age_seconds}s without completion (marked by cleanup job)"
     )
 
-    stale_runs = list(session.execute(stmt).scalars().all())
+    marked = batches = 0
+    while marked < max_rows:
+        limit = min(batch_size, max_rows - marked)
+        stale_ids = (
+            select(AgentRun.id)
+            .where(AgentRun.status == "running")
+            .where(AgentRun.started_at < cutoff_time)
+            .order_by(AgentRun.started_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            AgentRun.__table__.update()
+            .where(AgentRun.id.in_(stale_ids))
+            .where(AgentRun.status == "running")
+            .values(
+                status="timeout",
+                completed_at=now,
+                error_message=error_message,
+                duration_seconds=_seconds_since(session, AgentRun.started_at, now),
+            )
+            .returning(AgentRun.id)
+        )
+        updated = len(session.execute(stmt).all())
+        session.commit()
+        batches += 1
+        marked += updated
+        if updated < limit:
+            return StaleRunSweep(marked=marked, batches=batches, capped=False)
 
-    if not stale_runs:
-        return 0
+    return StaleRunSweep(marked=marked, batches=batches, capped=True)
 
-    # Mark each as timeout
-    now = datetime.now(timezone.utc)
-    for run in stale_runs:
-        run.status = "timeout"
-        run.completed_at = now
-        run.error_message = f"Run exceeded {max_age_seconds}s without completion (marked by cleanup job)"
-
-        # Calculate duration
-        if run.started_at:
-            started = run.started_at
-            if started.tzinfo is None:
-                started = started.replace(tzinfo=timezone.utc)
-            run.duration_seconds = (now - started).total_seconds()
 
-    session.flush()
-    return len(stale_runs)
+def _seconds_since(session: Session, column, now: datetime):
+    """SQL expression for the seconds elapsed from `column` to `now`."""
+    if session.get_bind().dialect.name == "sqlite":
+        return (
+            func.julianday(now.strftime("%Y-%m-%d %H:%M:%S.%f"))
+            - func.julianday(column)
+        ) * 86400.0
+    return func.extract("epoch", literal(now) - column)
 
 
 def get_stale_runs_count(
@@ -1209,10 +1338,9 @@ def get_stale_runs_count(
     """
     Count agent runs stuck in 'running' status for longer than max_age_seconds.
 
-    Useful for monitoring/alerting without modifying data.
+    Useful for monitoring/alerting without modifying data. Served by the
+    partial index on running runs.
     """
-    from datetime import timezone
-
     cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
 
     stmt = (
@@ -1272,7 +1400,12 @@ def bulk_create_tool_calls(
     tool_calls: List[Dict[str, Any]],
 ) -> int:
     """
-    Bulk insert tool calls for a run.
+    Bulk insert tool calls for a run and fold them into the hourly rollups.
+
+    Rows go in as one executemany INSERT (batched into multi-row VALUES by
+    the driver) rather than per-row ORM objects. Ids that already exist are
+    skipped, so re-posting a batch is a no-op and is not counted twice in
+    the rollups.
 
     Args:
         run_id: The agent run ID
@@ -1295,30 +1428,300 @@ def bulk_create_tool_calls(
     if not tool_calls:
         return 0
 
-    records = []
+    rows = normalize_tool_calls(run_id, tool_calls)
+    table = AgentToolCall.__table__
+    stmt = (
+        _dialect_insert(session, table)
+        .on_conflict_do_nothing(index_elements=["id"])
+        .returning(table.c.id)
+    )
+    inserted = set(session.execute(stmt, rows).scalars())
+    if not inserted:
+        return 0
+
+    owner = session.execute(
+        select(AgentRun.org_id, AgentRun.team_node_id).where(AgentRun.id == run_id)
+    ).one_or_none()
+    if owner is not None:
+        rollups: Dict[tuple, List[int]] = {}
+        _fold_tool_calls(
+            rollups,
+            owner.org_id,
+            owner.team_node_id,
+            (r for r in rows if r["id"] in inserted),
+        )
+        _upsert_tool_call_rollups(session, rollups)
+    return len(inserted)
+
+
+def normalize_tool_calls(
+    run_id: str, tool_calls: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Column dicts for agent_tool_calls, with defaults and truncation applied."""
+    now = datetime.utcnow()
+    rows = []
     for i, tc in enumerate(tool_calls):
         output = tc.get("tool_output")
         error = tc.get("error_message")
-        records.append(
-            AgentToolCall(
-                id=tc.get("id", f"{run_id}_{i}"),
-                run_id=run_id,
-                agent_name=tc.get("agent_name"),
-                parent_agent=tc.get("parent_agent"),
-                tool_name=tc.get("tool_name", "unknown"),
-                tool_input=tc.get("tool_input"),
-                tool_output=output[:5000] if output else None,
-                started_at=tc.get("started_at", datetime.utcnow()),
-                duration_ms=tc.get("duration_ms"),
-                status=tc.get("status", "success"),
-                error_message=error[:1000] if error else None,
-                sequence_number=tc.get("sequence_number", i),
-            )
+        rows.append(
+            {
+                "id": tc.get("id", f"{run_id}_{i}"),
+                "run_id": run_id,
+                "agent_name": tc.get("agent_name"),
+                "parent_agent": tc.get("parent_agent"),
+                "tool_name": tc.get("tool_name", "unknown"),
+                "tool_input": tc.get("tool_input"),
+                "tool_output": output[:5000] if output else None,
+                "started_at": tc.get("started_at") or now,
+                "duration_ms": tc.get("duration_ms"),
+                "status": tc.get("status", "success"),
+                "error_message": error[:1000] if error else None,
+                "sequence_number": tc.get("sequence_number", i),
+            }
         )
+    return rows
 
-    session.add_all(records)
-    session.flush()
-    return len(records)
+
+def _dialect_insert(session: Session, table):
+    """INSERT supporting ON CONFLICT for the session's dialect (postgres, sqlite)."""
+    if session.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table)
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _rollup_hour(ts: datetime) -> datetime:
+    """Start of the UTC hour containing ts, as a naive datetime."""
+    return _naive_utc(ts).replace(minute=0, second=0, microsecond=0)
+
+
+def _duration_bucket(duration_ms: Optional[int]) -> int:
+    from .models import TOOL_CALL_DURATION_BOUNDS_MS
+
+    if duration_ms is None:
+        return -1
+    return bisect.bisect_left(TOOL_CALL_DURATION_BOUNDS_MS, duration_ms)
+
+
+def _fold_tool_calls(
+    rollups: Dict[tuple, List[int]],
+    org_id: str,
+    team_node_id: Optional[str],
+    rows: Iterable[Dict[str, Any]],
+) -> None:
+    """Accumulate [calls, errors, duration sum] per rollup key."""
+    for r in rows:
+        key = (
+            org_id,
+            team_node_id or "",
+            r["tool_name"],
+            _rollup_hour(r["started_at"]),
+            _duration_bucket(r["duration_ms"]),
+        )
+        acc = rollups.setdefault(key, [0, 0, 0])
+        acc[0] += 1
+        acc[1] += r["status"] != "success"
+        acc[2] += r["duration_ms"] or 0
+
+
+def _upsert_tool_call_rollups(
+    session: Session, rollups: Dict[tuple, List[int]]
+) -> None:
+    """Add folded counts to agent_tool_call_rollups with one executemany upsert."""
+    from .models import AgentToolCallRollup
+
+    if not rollups:
+        return
+    table = AgentToolCallRollup.__table__
+    stmt = _dialect_insert(session, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key.columns],
+        set_={
+            "call_count": table.c.call_count + stmt.excluded.call_count,
+            "error_count": table.c.error_count + stmt.excluded.error_count,
+            "duration_ms_sum": table.c.duration_ms_sum + stmt.excluded.duration_ms_sum,
+        },
+    )
+    # Sorted so concurrent ingests lock rollup rows in the same order
+    params = [
+        {
+            "org_id": org_id,
+            "team_node_id": team_node_id,
+            "tool_name": tool_name,
+            "bucket_start": bucket_start,
+            "duration_bucket": duration_bucket,
+            "call_count": calls,
+            "error_count": errors,
+            "duration_ms_sum": duration_sum,
+        }
+        for (
+            (org_id, team_node_id, tool_name, bucket_start, duration_bucket),
+            (calls, errors, duration_sum),
+        ) in sorted(rollups.items())
+    ]
+    session.execute(stmt, params)
+
+
+def rebuild_tool_call_rollups(
+    session: Session,
+    *,
+    since: datetime,
+    until: datetime,
+    org_id: Optional[str] = None,
+    batch_size: int = 5000,
+) -> int:
+    """
+    Recompute rollups for the hours overlapping [since, until) from agent_tool_calls.
+
+    Used to backfill calls recorded before rollups existed, or to repair a
+    range. Streams the raw rows; returns the number of tool calls folded.
+    """
+    from .models import AgentToolCall, AgentToolCallRollup
+
+    start = _rollup_hour(since)
+    end = _rollup_hour(until)
+    if end != _naive_utc(until):
+        end += timedelta(hours=1)
+
+    rollup = AgentToolCallRollup.__table__
+    delete_stmt = rollup.delete().where(
+        rollup.c.bucket_start >= start, rollup.c.bucket_start < end
+    )
+    if org_id:
+        delete_stmt = delete_stmt.where(rollup.c.org_id == org_id)
+    session.execute(delete_stmt)
+
+    stmt = (
+        select(
+            AgentRun.org_id,
+            AgentRun.team_node_id,
+            AgentToolCall.tool_name,
+            AgentToolCall.started_at,
+            AgentToolCall.duration_ms,
+            AgentToolCall.status,
+        )
+        .join(AgentRun, AgentRun.id == AgentToolCall.run_id)
+        .where(AgentToolCall.started_at >= start, AgentToolCall.started_at < end)
+        .execution_options(yield_per=batch_size)
+    )
+    if org_id:
+        stmt = stmt.where(AgentRun.org_id == org_id)
+
+    rollups: Dict[tuple, List[int]] = {}
+    folded = 0
+    for row in session.execute(stmt):
+        _fold_tool_calls(rollups, row.org_id, row.team_node_id, [row._mapping])
+        folded += 1
+    _upsert_tool_call_rollups(session, rollups)
+    return folded
+
+
+def get_tool_call_rollups(
+    session: Session,
+    *,
+    org_id: str,
+    team_node_id: Optional[str] = None,
+    tool_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    by_hour: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Tool call counts, error rate and duration percentiles from the rollups.
+
+    One entry per team/tool/hour, or per team/tool over the whole range
+    when by_hour is False. p50/p95 are the upper bound of the histogram
+    bucket the percentile falls in.
+    """
+    from .models import TOOL_CALL_DURATION_BOUNDS_MS, AgentToolCallRollup
+
+    r = AgentToolCallRollup
+    group_cols = [r.team_node_id, r.tool_name]
+    if by_hour:
+        group_cols.append(r.bucket_start)
+    stmt = select(
+        *group_cols,
+        r.duration_bucket,
+        func.sum(r.call_count).label("calls"),
+        func.sum(r.error_count).label("errors"),
+        func.sum(r.duration_ms_sum).label("duration_sum"),
+    ).where(r.org_id == org_id)
+    if team_node_id is not None:
+        stmt = stmt.where(r.team_node_id == team_node_id)
+    if tool_name:
+        stmt = stmt.where(r.tool_name == tool_name)
+    if since:
+        stmt = stmt.where(r.bucket_start >= _rollup_hour(since))
+    if until:
+        stmt = stmt.where(r.bucket_start <= _rollup_hour(until))
+    stmt = stmt.group_by(*group_cols, r.duration_bucket)
+
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for row in session.execute(stmt):
+        key = (row.team_node_id, row.tool_name, row.bucket_start if by_hour else None)
+        g = groups.setdefault(
+            key,
+            {"calls": 0, "errors": 0, "duration_sum": 0, "histogram": {}},
+        )
+        g["calls"] += int(row.calls)
+        g["errors"] += int(row.errors)
+        g["duration_sum"] += int(row.duration_sum)
+        if row.duration_bucket >= 0:
+            g["histogram"][row.duration_bucket] = int(row.calls)
+
+    def percentile(histogram: Dict[int, int], q: float) -> Optional[int]:
+        timed = sum(histogram.values())
+        if not timed:
+            return None
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= q * timed:
+                return TOOL_CALL_DURATION_BOUNDS_MS[
+                    min(bucket, len(TOOL_CALL_DURATION_BOUNDS_MS) - 1)
+                ]
+        return None
+
+    results = []
+    for (team, tool, bucket_start), g in sorted(
+        groups.items(), key=lambda kv: (kv[0][2] or datetime.min, kv[0][0], kv[0][1])
+    ):
+        timed = sum(g["histogram"].values())
+        results.append(
+            {
+                "team_node_id": team or None,
+                "tool_name": tool,
+                "bucket_start": bucket_start,
+                "call_count": g["calls"],
+                "error_count": g["errors"],
+                "error_rate": g["errors"] / g["calls"] if g["calls"] else 0.0,
+                "avg_duration_ms": g["duration_sum"] / timed if timed else None,
+                "p50_duration_ms": percentile(g["histogram"], 0.50),
+                "p95_duration_ms": percentile(g["histogram"], 0.95),
+            }
+        )
+    return results
+
+
+def encode_tool_call_cursor(started_at: datetime, tool_call_id: str) -> str:
+    """Opaque keyset cursor for list_tool_calls."""
+    return _encode_keyset_cursor([started_at.isoformat(), tool_call_id])
+
+
+def decode_tool_call_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of encode_tool_call_cursor; raises ValueError for malformed cursors."""
+    try:
+        started_at, tool_call_id = _decode_keyset_cursor(cursor)
+        return datetime.fromisoformat(started_at), str(tool_call_id)
+    except Exception as e:
+        raise ValueError(f"Invalid tool call cursor: {cursor!r}") from e
 
 
 def get_tool_calls_for_run(
@@ -1347,8 +1750,13 @@ def list_tool_calls(
     until: Optional[datetime] = None,
     limit: int = 1000,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> List["AgentToolCall"]:
-    """List tool calls with optional filtering."""
+    """List tool calls newest first with optional filtering.
+
+    Pass the cursor from encode_tool_call_cursor(last row) to fetch the next
+    page by keyset instead of offset.
+    """
     from .models import AgentToolCall
 
     stmt = select(AgentToolCall)
@@ -1363,9 +1771,22 @@ def list_tool_calls(
         stmt = stmt.where(AgentToolCall.started_at >= since)
     if until:
         stmt = stmt.where(AgentToolCall.started_at <= until)
+    if cursor:
+        cursor_ts, cursor_id = decode_tool_call_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                AgentToolCall.started_at < cursor_ts,
+                and_(
+                    AgentToolCall.started_at == cursor_ts,
+                    AgentToolCall.id < cursor_id,
+                ),
+            )
+        )
 
-    stmt = stmt.order_by(AgentToolCall.started_at.desc())
-    stmt = stmt.offset(offset).limit(min(limit, 5000))
+    stmt = stmt.order_by(AgentToolCall.started_at.desc(), AgentToolCall.id.desc())
+    if not cursor:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(min(limit, 5000))
 
     return list(session.execute(stmt).scalars().all())
 
@@ -1538,6 +1959,100 @@ def cleanup_expired_sessions(
     return len(expired)
 
 
+# =============================================================================
+# Ingestion Manifest
+# =============================================================================
+
+
+def get_ingestion_manifest(
+    session: Session,
+    *,
+    org_id: str,
+    team_node_id: str,
+    source: str,
+    include_deleted: bool = False,
+) -> List[IngestionManifestEntry]:
+    """Documents recorded for a team's source, live ones only by default."""
+    stmt = select(IngestionManifestEntry).where(
+        IngestionManifestEntry.org_id == org_id,
+        IngestionManifestEntry.team_node_id == team_node_id,
+        IngestionManifestEntry.source == source,
+    )
+    if not include_deleted:
+        stmt = stmt.where(IngestionManifestEntry.deleted_at.is_(None))
+    return list(
+        session.execute(stmt.order_by(IngestionManifestEntry.document_id)).scalars()
+    )
+
+
+def upsert_ingestion_manifest(
+    session: Session,
+    *,
+    org_id: str,
+    team_node_id: str,
+    source: str,
+    entries: List[Dict[str, Any]],
+) -> int:
+    """Record ingested documents (document_id, content_hash, last_modified).
+
+    One executemany upsert; re-recording a tombstoned document revives it.
+    """
+    if not entries:
+        return 0
+    now = datetime.utcnow()
+    table = IngestionManifestEntry.__table__
+    stmt = _dialect_insert(session, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key.columns],
+        set_={
+            "content_hash": stmt.excluded.content_hash,
+            "last_modified": stmt.excluded.last_modified,
+            "ingested_at": stmt.excluded.ingested_at,
+            "deleted_at": None,
+        },
+    )
+    params = [
+        {
+            "org_id": org_id,
+            "team_node_id": team_node_id,
+            "source": source,
+            "document_id": e["document_id"],
+            "content_hash": e["content_hash"],
+            "last_modified": e.get("last_modified"),
+            "ingested_at": now,
+            "deleted_at": None,
+        }
+        for e in sorted(entries, key=lambda e: e["document_id"])
+    ]
+    session.execute(stmt, params)
+    return len(params)
+
+
+def tombstone_ingestion_manifest(
+    session: Session,
+    *,
+    org_id: str,
+    team_node_id: str,
+    source: str,
+    document_ids: List[str],
+) -> int:
+    """Mark documents as deleted from their source. Returns rows tombstoned."""
+    if not document_ids:
+        return 0
+    result = session.execute(
+        IngestionManifestEntry.__table__.update()
+        .where(
+            IngestionManifestEntry.org_id == org_id,
+            IngestionManifestEntry.team_node_id == team_node_id,
+            IngestionManifestEntry.source == source,
+            IngestionManifestEntry.document_id.in_(document_ids),
+            IngestionManifestEntry.deleted_at.is_(None),
+        )
+        .values(deleted_at=datetime.utcnow())
+    )
+    return result.rowcount or 0
+
+
 # =============================================================================
 # Unified Audit Functions
 # =============================================================================
@@ -1558,39 +2073,76 @@ class UnifiedAuditEvent:
     correlation_id: Optional[str] = None
 
 
-def list_unified_audit(
-    session: Session,
+@dataclass
+class UnifiedAuditPage:
+    """One page of the unified audit timeline."""
+
+    events: List[UnifiedAuditEvent]
+    total: Optional[int]  # None unless count_total was requested
+    next_cursor: Optional[str]  # None on the last page
+
+
+_TOKEN_AUDIT_EVENT_TYPES = ("issued", "revoked", "expired", "permission_denied", "used")
+_AGENT_AUDIT_EVENT_TYPES = ("completed", "failed", "timeout", "running")
+
+
+def _encode_keyset_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_keyset_cursor(cursor: str) -> Any:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_audit_cursor(timestamp: datetime, source: str, row_id: str) -> str:
+    """Opaque keyset cursor for the unified audit timeline."""
+    return _encode_keyset_cursor([timestamp.isoformat(), source, row_id])
+
+
+def decode_audit_cursor(cursor: str) -> tuple[datetime, str, str]:
+    """Inverse of encode_audit_cursor; raises ValueError for malformed cursors."""
+    try:
+        timestamp, source, row_id = _decode_keyset_cursor(cursor)
+        return datetime.fromisoformat(timestamp), str(source), str(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid audit cursor: {cursor!r}") from e
+
+
+def _unified_audit_branches(
     *,
     org_id: str,
-    sources: Optional[List[str]] = None,  # token, config, agent
-    team_node_id: Optional[str] = None,
-    event_types: Optional[List[str]] = None,
-    actor: Optional[str] = None,
-    search: Optional[str] = None,
-    since: Optional[datetime] = None,
-    until: Optional[datetime] = None,
-    limit: int = 100,
-    offset: int = 0,
-) -> tuple[List[UnifiedAuditEvent], int]:
+    sources: List[str],
+    team_node_id: Optional[str],
+    event_types: Optional[List[str]],
+    actor: Optional[str],
+    search: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> List[tuple]:
     """
-    Aggregate audit events from all sources into a unified timeline.
+    One (source, timestamp column, row id expression, filtered select) per source.
 
-    Returns (events, total_count) for pagination.
+    The selects carry only the keyset columns (source, row_id, ts), so the
+    UNION ALL over them stays narrow; full rows are loaded for one page only.
     """
-    all_sources = sources or ["token", "config", "agent"]
-    events: List[UnifiedAuditEvent] = []
+    from .config_models import ConfigChangeHistory
+
+    pattern = f"%{search}%" if search else None
+    branches = []
 
-    # --- Token Audit ---
-    if "token" in all_sources:
-        stmt = select(TokenAudit).where(TokenAudit.org_id == org_id)
+    if "token" in sources:
+        row_id = cast(TokenAudit.id, String)
+        stmt = select(
+            literal("token", String).label("source"),
+            row_id.label("row_id"),
+            TokenAudit.event_at.label("ts"),
+        ).where(TokenAudit.org_id == org_id)
         if team_node_id:
             stmt = stmt.where(TokenAudit.team_node_id == team_node_id)
         if event_types:
-            token_types = [
-                et
-                for et in event_types
-                if et in ("issued", "revoked", "expired", "permission_denied", "used")
-            ]
+            token_types = [et for et in event_types if et in _TOKEN_AUDIT_EVENT_TYPES]
             if token_types:
                 stmt = stmt.where(TokenAudit.event_type.in_(token_types))
         if actor:
@@ -1599,38 +2151,22 @@ def list_unified_audit(
             stmt = stmt.where(TokenAudit.event_at >= since)
         if until:
             stmt = stmt.where(TokenAudit.event_at <= until)
-
-        token_rows = session.execute(stmt).scalars().all()
-        for row in token_rows:
-            summary = f"Token {row.event_type}"
-            if row.event_type == "issued":
-                label = (row.details or {}).get("label", "")
-                summary = f"Token issued{': ' + label if label else ''}"
-            elif row.event_type == "revoked":
-                summary = "Token revoked"
-            elif row.event_type == "expired":
-                summary = "Token expired"
-            elif row.event_type == "permission_denied":
-                summary = f"Permission denied: {(row.details or {}).get('required', 'unknown')}"
-
-            events.append(
-                UnifiedAuditEvent(
-                    id=f"token_{row.id}",
-                    source="token",
-                    event_type=row.event_type,
-                    timestamp=row.event_at,
-                    actor=row.actor,
-                    team_node_id=row.team_node_id,
-                    summary=summary,
-                    details={"token_id": row.token_id, **(row.details or {})},
+        if pattern:
+            stmt = stmt.where(
+                or_(
+                    TokenAudit.event_type.ilike(pattern),
+                    TokenAudit.token_id.ilike(pattern),
+                    cast(TokenAudit.details, String).ilike(pattern),
                 )
             )
-
-    # --- Config Audit ---
-    if "config" in all_sources:
-        from .config_models import ConfigChangeHistory
-
-        stmt = select(ConfigChangeHistory).where(ConfigChangeHistory.org_id == org_id)
+        branches.append(("token", TokenAudit.event_at, row_id, stmt))
+
+    if "config" in sources:
+        stmt = select(
+            literal("config", String).label("source"),
+            ConfigChangeHistory.id.label("row_id"),
+            ConfigChangeHistory.changed_at.label("ts"),
+        ).where(ConfigChangeHistory.org_id == org_id)
         if team_node_id:
             stmt = stmt.where(ConfigChangeHistory.node_id == team_node_id)
         if actor:
@@ -1639,46 +2175,27 @@ def list_unified_audit(
             stmt = stmt.where(ConfigChangeHistory.changed_at >= since)
         if until:
             stmt = stmt.where(ConfigChangeHistory.changed_at <= until)
-
-        config_rows = session.execute(stmt).scalars().all()
-        for row in config_rows:
-            changed_keys = list((row.change_diff or {}).get("changed", {}).keys())
-            summary = (
-                f"Config updated: {', '.join(changed_keys[:3])}"
-                if changed_keys
-                else "Config updated"
-            )
-            if len(changed_keys) > 3:
-                summary += f" (+{len(changed_keys) - 3} more)"
-
-            events.append(
-                UnifiedAuditEvent(
-                    id=f"config_{row.org_id}_{row.node_id}_{row.version}",
-                    source="config",
-                    event_type="config_updated",
-                    timestamp=row.changed_at,
-                    actor=row.changed_by,
-                    team_node_id=row.node_id,
-                    summary=summary,
-                    details={
-                        "node_id": row.node_id,
-                        "version": row.version,
-                        "diff": row.diff_json,
-                    },
+        if pattern:
+            stmt = stmt.where(
+                or_(
+                    ConfigChangeHistory.node_id.ilike(pattern),
+                    cast(ConfigChangeHistory.change_diff, String).ilike(pattern),
                 )
             )
+        branches.append(
+            ("config", ConfigChangeHistory.changed_at, ConfigChangeHistory.id, stmt)
+        )
 
-    # --- Agent Runs ---
-    if "agent" in all_sources:
-        stmt = select(AgentRun).where(AgentRun.org_id == org_id)
+    if "agent" in sources:
+        stmt = select(
+            literal("agent", String).label("source"),
+            AgentRun.id.label("row_id"),
+            AgentRun.started_at.label("ts"),
+        ).where(AgentRun.org_id == org_id)
         if team_node_id:
             stmt = stmt.where(AgentRun.team_node_id == team_node_id)
         if event_types:
-            agent_types = [
-                et
-                for et in event_types
-                if et in ("completed", "failed", "timeout", "running")
-            ]
+            agent_types = [et for et in event_types if et in _AGENT_AUDIT_EVENT_TYPES]
             if agent_types:
                 stmt = stmt.where(AgentRun.status.in_(agent_types))
         if actor:
@@ -1687,57 +2204,239 @@ def list_unified_audit(
             stmt = stmt.where(AgentRun.started_at >= since)
         if until:
             stmt = stmt.where(AgentRun.started_at <= until)
-
-        agent_rows = session.execute(stmt).scalars().all()
-        for row in agent_rows:
-            summary = f"Agent run {row.status}: {row.agent_name}"
-            if row.output_summary:
-                summary += f" - {row.output_summary[:100]}"
-            if row.confidence:
-                summary += f" ({row.confidence}% confidence)"
-
-            events.append(
-                UnifiedAuditEvent(
-                    id=f"agent_{row.id}",
-                    source="agent",
-                    event_type=f"agent_{row.status}",
-                    timestamp=row.started_at,
-                    actor=row.trigger_actor,
-                    team_node_id=row.team_node_id,
-                    summary=summary,
-                    details={
-                        "agent_name": row.agent_name,
-                        "trigger_source": row.trigger_source,
-                        "trigger_message": row.trigger_message,
-                        "status": row.status,
-                        "tool_calls": row.tool_calls_count,
-                        "duration_seconds": row.duration_seconds,
-                        "confidence": row.confidence,
-                        "error": row.error_message,
-                    },
-                    correlation_id=row.correlation_id,
+        if pattern:
+            stmt = stmt.where(
+                or_(
+                    AgentRun.status.ilike(pattern),
+                    AgentRun.agent_name.ilike(pattern),
+                    AgentRun.output_summary.ilike(pattern),
+                    AgentRun.trigger_source.ilike(pattern),
+                    AgentRun.trigger_message.ilike(pattern),
+                    AgentRun.error_message.ilike(pattern),
                 )
             )
+        branches.append(("agent", AgentRun.started_at, AgentRun.id, stmt))
+
+    return branches
+
+
+def _token_audit_event(row: TokenAudit) -> UnifiedAuditEvent:
+    summary = f"Token {row.event_type}"
+    if row.event_type == "issued":
+        label = (row.details or {}).get("label", "")
+        summary = f"Token issued{': ' + label if label else ''}"
+    elif row.event_type == "revoked":
+        summary = "Token revoked"
+    elif row.event_type == "expired":
+        summary = "Token expired"
+    elif row.event_type == "permission_denied":
+        summary = f"Permission denied: {(row.details or {}).get('required', 'unknown')}"
+
+    return UnifiedAuditEvent(
+        id=f"token_{row.id}",
+        source="token",
+        event_type=row.event_type,
+        timestamp=row.event_at,
+        actor=row.actor,
+        team_node_id=row.team_node_id,
+        summary=summary,
+        details={"token_id": row.token_id, **(row.details or {})},
+    )
 
-    # --- Search filter ---
-    if search:
-        search_lower = search.lower()
-        events = [
-            e
-            for e in events
-            if search_lower in e.summary.lower()
-            or search_lower in str(e.details).lower()
-        ]
 
-    # --- Sort by timestamp descending ---
-    events.sort(key=lambda e: e.timestamp, reverse=True)
+def _config_audit_event(row: "ConfigChangeHistory") -> UnifiedAuditEvent:
+    changed_keys = list((row.change_diff or {}).get("changed", {}).keys())
+    summary = (
+        f"Config updated: {', '.join(changed_keys[:3])}"
+        if changed_keys
+        else "Config updated"
+    )
+    if len(changed_keys) > 3:
+        summary += f" (+{len(changed_keys) - 3} more)"
+
+    return UnifiedAuditEvent(
+        id=f"config_{row.org_id}_{row.node_id}_{row.version}",
+        source="config",
+        event_type="config_updated",
+        timestamp=row.changed_at,
+        actor=row.changed_by,
+        team_node_id=row.node_id,
+        summary=summary,
+        details={
+            "node_id": row.node_id,
+            "version": row.version,
+            "diff": row.change_diff,
+        },
+    )
 
-    total = len(events)
 
-    # --- Paginate ---
-    events = events[offset : offset + limit]
+def _agent_run_audit_event(row: AgentRun) -> UnifiedAuditEvent:
+    summary = f"Agent run {row.status}: {row.agent_name}"
+    if row.output_summary:
+        summary += f" - {row.output_summary[:100]}"
+    if row.confidence:
+        summary += f" ({row.confidence}% confidence)"
 
-    return events, total
+    return UnifiedAuditEvent(
+        id=f"agent_{row.id}",
+        source="agent",
+        event_type=f"agent_{row.status}",
+        timestamp=row.started_at,
+        actor=row.trigger_actor,
+        team_node_id=row.team_node_id,
+        summary=summary,
+        details={
+            "agent_name": row.agent_name,
+            "trigger_source": row.trigger_source,
+            "trigger_message": row.trigger_message,
+            "status": row.status,
+            "tool_calls": row.tool_calls_count,
+            "duration_seconds": row.duration_seconds,
+            "confidence": row.confidence,
+            "error": row.error_message,
+        },
+        correlation_id=row.correlation_id,
+    )
+
+
+def list_unified_audit(
+    session: Session,
+    *,
+    org_id: str,
+    sources: Optional[List[str]] = None,  # token, config, agent
+    team_node_id: Optional[str] = None,
+    event_types: Optional[List[str]] = None,
+    actor: Optional[str] = None,
+    search: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    count_total: bool = True,
+) -> UnifiedAuditPage:
+    """
+    Aggregate audit events from all sources into a unified timeline.
+
+    Events are ordered newest first by (timestamp, source, row id). Merging,
+    filtering and pagination happen in SQL: each source contributes an
+    index-ordered, limited branch to a UNION ALL, and only the rows of the
+    returned page are loaded. Pass the previous page's `next_cursor` as
+    `cursor` to page by keyset (stable under concurrent inserts, no deep
+    OFFSET scans); `offset` is still honoured, relative to the cursor.
+
+    Raises ValueError for a malformed cursor.
+    """
+    from .config_models import ConfigChangeHistory
+
+    branches = _unified_audit_branches(
+        org_id=org_id,
+        sources=sources or ["token", "config", "agent"],
+        team_node_id=team_node_id,
+        event_types=event_types,
+        actor=actor,
+        search=search,
+        since=since,
+        until=until,
+    )
+    if not branches:
+        return UnifiedAuditPage(events=[], total=0, next_cursor=None)
+
+    total = None
+    if count_total:
+        total = sum(
+            session.execute(
+                select(func.count()).select_from(stmt.subquery())
+            ).scalar_one()
+            for _, _, _, stmt in branches
+        )
+
+    after = decode_audit_cursor(cursor) if cursor else None
+    window = offset + limit + 1
+    limited = []
+    for source, ts_col, row_id, stmt in branches:
+        if after is not None:
+            after_ts, after_source, after_id = after
+            # Keyset predicate (ts, source, row_id) < cursor; source is constant here
+            if source < after_source:
+                stmt = stmt.where(ts_col <= after_ts)
+            elif source == after_source:
+                stmt = stmt.where(
+                    or_(ts_col < after_ts, and_(ts_col == after_ts, row_id < after_id))
+                )
+            else:
+                stmt = stmt.where(ts_col < after_ts)
+        branch = stmt.order_by(ts_col.desc(), row_id.desc()).limit(window).subquery()
+        limited.append(select(branch.c.source, branch.c.row_id, branch.c.ts))
+
+    merged = union_all(*limited).subquery()
+    keys = session.execute(
+        select(merged.c.source, merged.c.row_id, merged.c.ts)
+        .order_by(merged.c.ts.desc(), merged.c.source.desc(), merged.c.row_id.desc())
+        .offset(offset)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(keys) > limit
+    keys = keys[:limit]
+
+    ids_by_source: Dict[str, List[str]] = {}
+    for source, row_id, _ in keys:
+        ids_by_source.setdefault(source, []).append(row_id)
+
+    loaded: Dict[tuple, UnifiedAuditEvent] = {}
+    if ids_by_source.get("token"):
+        token_ids = [int(i) for i in ids_by_source["token"]]
+        for row in session.execute(
+            select(TokenAudit).where(TokenAudit.id.in_(token_ids))
+        ).scalars():
+            loaded[("token", str(row.id))] = _token_audit_event(row)
+    if ids_by_source.get("config"):
+        for row in session.execute(
+            select(ConfigChangeHistory).where(
+                ConfigChangeHistory.id.in_(ids_by_source["config"])
+            )
+        ).scalars():
+            loaded[("config", row.id)] = _config_audit_event(row)
+    if ids_by_source.get("agent"):
+        for row in session.execute(
+            select(AgentRun).where(AgentRun.id.in_(ids_by_source["agent"]))
+        ).scalars():
+            loaded[("agent", row.id)] = _agent_run_audit_event(row)
+
+    events = [
+        loaded[(source, row_id)]
+        for source, row_id, _ in keys
+        if (source, row_id) in loaded
+    ]
+    next_cursor = None
+    if has_more and keys:
+        last_source, last_id, last_ts = keys[-1]
+        next_cursor = encode_audit_cursor(last_ts, last_source, last_id)
+
+    return UnifiedAuditPage(events=events, total=total, next_cursor=next_cursor)
+
+
+def iter_unified_audit(
+    session: Session,
+    *,
+    batch_size: int = 1000,
+    **filters: Any,
+) -> Iterator[UnifiedAuditEvent]:
+    """
+    Yield every matching unified audit event, newest first, with no cap.
+
+    Walks the timeline with keyset cursors, so memory stays bounded by
+    `batch_size` however many rows match. Accepts list_unified_audit's filters.
+    """
+    cursor = None
+    while True:
+        page = list_unified_audit(
+            session, limit=batch_size, cursor=cursor, count_total=False, **filters
+        )
+        yield from page.events
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
 
 
 # =============================================================================
@@ -1879,6 +2578,9 @@ def process_token_lifecycle(
         for token in inactive:
             # Revoke it
             token.revoked_at = datetime.utcnow()
+            invalidate_principals_on_commit(
+                session, org_id=org_id, token_ids=[token.token_id]
+            )
             record_token_audit(
                 session,
                 org_id=org_id,
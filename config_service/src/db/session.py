@@ -1,7 +1,9 @@
 import os
 import socket
+import time
 from contextlib import contextmanager
-from typing import Iterator, Optional
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
@@ -78,21 +80,48 @@ def _is_local_tunnel_up(url: str) -> bool:
         return False
 
 
-def make_engine():
-    return create_engine(
-        get_database_url(),
-        pool_pre_ping=True,
-        pool_size=20,
-        max_overflow=40,
-        pool_recycle=3600,
+def _env_int(name: str, default: int) -> int:
+    return int((os.getenv(name) or str(default)).strip())
+
+
+def _pool_settings() -> dict:
+    """Pool sizing shared by the sync and async engines.
+
+    Env:
+      - DB_POOL_SIZE: default 20
+      - DB_MAX_OVERFLOW: default 40
+      - DB_POOL_TIMEOUT: seconds to wait for a connection, default 30
+      - DB_POOL_RECYCLE: default 3600
+    """
+    return {
+        "pool_pre_ping": True,
+        "pool_size": _env_int("DB_POOL_SIZE", 20),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 40),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 3600),
+    }
+
+
+def make_engine(url: Optional[str] = None):
+    engine = create_engine(
+        url or get_database_url(),
+        **_pool_settings(),
         connect_args={
             "connect_timeout": 10,
             "options": "-c statement_timeout=30000",  # 30 second query timeout
         },
     )
+    instrument_engine(engine)
+    return engine
+
+
+def get_read_database_url() -> Optional[str]:
+    """Read-replica URL (DATABASE_READ_URL), or None to read from the primary."""
+    return os.getenv("DATABASE_READ_URL") or None
 
 
 _SessionLocal: Optional[sessionmaker] = None
+_ReadSessionLocal: Optional[sessionmaker] = None
 
 
 def get_session_maker() -> sessionmaker:
@@ -104,6 +133,19 @@ def get_session_maker() -> sessionmaker:
     return _SessionLocal
 
 
+def get_read_session_maker() -> sessionmaker:
+    """Sessions on the read replica if DATABASE_READ_URL is set, else the primary."""
+    global _ReadSessionLocal
+    if _ReadSessionLocal is None:
+        read_url = get_read_database_url()
+        if not read_url:
+            return get_session_maker()
+        _ReadSessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=make_engine(read_url)
+        )
+    return _ReadSessionLocal
+
+
 @contextmanager
 def db_session() -> Iterator[Session]:
     session = get_session_maker()()
@@ -128,3 +170,139 @@ def get_db() -> Iterator[Session]:
         raise
     finally:
         session.close()
+
+
+# =============================================================================
+# Async engine (optional, DB_ASYNC_ENABLED=1, requires asyncpg)
+# =============================================================================
+#
+# Routes that take get_async_read_db run their (sync) repository code with
+# `await db.run_sync(fn, ...)`. With the async engine that runs on an asyncpg
+# connection without tying up a threadpool worker for the whole query;
+# otherwise the same call runs on the threadpool against a sync session, so
+# routes don't need two code paths.
+
+
+def async_enabled() -> bool:
+    return os.getenv("DB_ASYNC_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+
+
+def to_async_url(url: str) -> Tuple[str, dict]:
+    """Rewrite a psycopg2 URL for asyncpg; returns (url, connect_args).
+
+    asyncpg doesn't understand libpq's sslmode, so it becomes the ssl
+    connect arg. DB_STATEMENT_CACHE_SIZE sets the prepared statement cache
+    per connection (default 100); set 0 behind PgBouncer in transaction
+    pooling mode.
+    """
+    from sqlalchemy.engine import make_url
+
+    u = make_url(url)
+    query = dict(u.query)
+    connect_args: dict = {
+        "timeout": 10,
+        "server_settings": {"statement_timeout": "30000"},
+    }
+    sslmode = query.pop("sslmode", None)
+    if sslmode and sslmode not in ("disable", "allow", "prefer"):
+        connect_args["ssl"] = "require" if sslmode == "require" else True
+    cache_size = _env_int("DB_STATEMENT_CACHE_SIZE", 100)
+    query["prepared_statement_cache_size"] = str(cache_size)
+    if cache_size == 0:
+        connect_args["statement_cache_size"] = 0
+    u = u.set(drivername="postgresql+asyncpg", query=query)
+    return u.render_as_string(hide_password=False), connect_args
+
+
+def make_async_engine(url: Optional[str] = None):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_url, connect_args = to_async_url(url or get_database_url())
+    engine = create_async_engine(
+        async_url, **_pool_settings(), connect_args=connect_args
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+_AsyncReadSessionLocal = None
+
+
+def get_async_read_session_maker():
+    global _AsyncReadSessionLocal
+    if _AsyncReadSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        engine = make_async_engine(get_read_database_url())
+        _AsyncReadSessionLocal = async_sessionmaker(
+            bind=engine, autoflush=False, expire_on_commit=False
+        )
+    return _AsyncReadSessionLocal
+
+
+class ThreadpoolSession:
+    """`run_sync` over a sync session on the threadpool (async engine disabled)."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any, **kwargs: Any):
+        from starlette.concurrency import run_in_threadpool
+
+        return await run_in_threadpool(fn, self._session, *args, **kwargs)
+
+
+async def get_async_read_db() -> AsyncIterator[Any]:
+    """FastAPI dependency for read-only endpoints that tolerate replica lag.
+
+    Yields an object with `await run_sync(fn, *args)`: an AsyncSession on
+    the async engine if enabled, else a ThreadpoolSession. Either way it
+    reads from DATABASE_READ_URL when set. Nothing is committed.
+    """
+    if async_enabled():
+        async with get_async_read_session_maker()() as session:
+            yield session
+        return
+
+    session = get_read_session_maker()()
+    try:
+        yield ThreadpoolSession(session)
+    finally:
+        session.rollback()
+        session.close()
+
+
+# =============================================================================
+# Per-request DB time
+# =============================================================================
+
+_request_db_time: ContextVar[Optional[List[float]]] = ContextVar(
+    "request_db_time", default=None
+)
+
+
+def start_db_timer() -> List[float]:
+    """Start accumulating [seconds, statements] for the current request.
+
+    The accumulator is a mutable list so statements executed on threadpool
+    workers (which run in a copy of the request context) still add to it.
+    """
+    acc = [0.0, 0]
+    _request_db_time.set(acc)
+    return acc
+
+
+def instrument_engine(engine) -> None:
+    """Add each statement's execution time to the current request's DB timer."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._db_timer_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        acc = _request_db_time.get()
+        if acc is not None:
+            acc[0] += time.perf_counter() - context._db_timer_start
+            acc[1] += 1
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.db import repository
+from src.db.base import Base
+
+KEY = {"org_id": "org1", "team_node_id": "teamA", "source": "incidents"}
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as s:
+        yield s
+
+
+def _manifest(session, **kwargs):
+    return {
+        e.document_id: e
+        for e in repository.get_ingestion_manifest(session, **KEY, **kwargs)
+    }
+
+
+def test_upsert_updates_hash_and_scopes_by_source(session):
+    repository.upsert_ingestion_manifest(
+        session,
+        **KEY,
+        entries=[
+            {"document_id": "inc-1", "content_hash": "a"},
+            {
+                "document_id": "inc-2",
+                "content_hash": "b",
+                "last_modified": datetime(2026, 2, 1),
+            },
+        ],
+    )
+    repository.upsert_ingestion_manifest(
+        session,
+        **{**KEY, "source": "confluence"},
+        entries=[{"document_id": "inc-1", "content_hash": "other"}],
+    )
+    repository.upsert_ingestion_manifest(
+        session, **KEY, entries=[{"document_id": "inc-1", "content_hash": "a2"}]
+    )
+    session.commit()
+
+    entries = _manifest(session)
+    assert {k: e.content_hash for k, e in entries.items()} == {
+        "inc-1": "a2",
+        "inc-2": "b",
+    }
+    assert entries["inc-2"].last_modified.replace(tzinfo=None) == datetime(2026, 2, 1)
+
+
+def test_tombstone_hides_entry_until_reingested(session):
+    repository.upsert_ingestion_manifest(
+        session,
+        **KEY,
+        entries=[
+            {"document_id": "inc-1", "content_hash": "a"},
+            {"document_id": "inc-2", "content_hash": "b"},
+        ],
+    )
+    assert (
+        repository.tombstone_ingestion_manifest(
+            session, **KEY, document_ids=["inc-2", "missing"]
+        )
+        == 1
+    )
+    # Already tombstoned
+    assert (
+        repository.tombstone_ingestion_manifest(session, **KEY, document_ids=["inc-2"])
+        == 0
+    )
+    session.commit()
+    assert set(_manifest(session)) == {"inc-1"}
+    assert _manifest(session, include_deleted=True)["inc-2"].deleted_at is not None
+
+    repository.upsert_ingestion_manifest(
+        session, **KEY, entries=[{"document_id": "inc-2", "content_hash": "b"}]
+    )
+    session.commit()
+    session.expire_all()
+    assert set(_manifest(session)) == {"inc-1", "inc-2"}
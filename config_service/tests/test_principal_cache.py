@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.core.config_cache import get_config_cache, reset_config_cache
+from src.core.principal_cache import (
+    LastUsedRecorder,
+    get_principal_cache,
+    reset_principal_cache,
+)
+from src.core.security import hash_token
+from src.db import repository
+from src.db.base import Base
+from src.db.models import NodeType, OrgNode, TeamToken
+
+PEPPER = "test-pepper"
+
+
+@pytest.fixture()
+def SessionLocal(monkeypatch):
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    monkeypatch.setenv("CONFIG_CACHE_BACKEND", "memory")
+    monkeypatch.setenv("PRINCIPAL_CACHE_TTL_SECONDS", "60")
+    monkeypatch.setenv("PRINCIPAL_LAST_USED_FLUSH_SECONDS", "0")
+    reset_config_cache()
+    reset_principal_cache()
+
+    with SessionLocal() as s:
+        s.add(
+            OrgNode(
+                org_id="org1",
+                node_id="teamA",
+                parent_id=None,
+                node_type=NodeType.team,
+                name="Team A",
+            )
+        )
+        for token_id in ("tokA", "tokB"):
+            s.add(
+                TeamToken(
+                    org_id="org1",
+                    team_node_id="teamA",
+                    token_id=token_id,
+                    token_hash=hash_token("secret", pepper=PEPPER),
+                    permissions=["config:read"],
+                )
+            )
+        s.commit()
+
+    yield SessionLocal
+    reset_config_cache()
+    reset_principal_cache()
+
+
+@pytest.fixture()
+def audit_events(monkeypatch):
+    # token_audit's BigInteger id doesn't autoincrement on sqlite
+    events = []
+    monkeypatch.setattr(
+        repository,
+        "record_token_audit",
+        lambda session, **kw: events.append(kw["event_type"]),
+    )
+    return events
+
+
+def _auth(SessionLocal, bearer="tokA.secret"):
+    with SessionLocal() as s:
+        principal = repository.authenticate_bearer_token(
+            s, bearer=bearer, pepper=PEPPER
+        )
+        s.commit()
+        return principal
+
+
+def test_cache_hit_skips_database(SessionLocal):
+    assert _auth(SessionLocal).team_node_id == "teamA"
+    assert len(get_principal_cache()) == 1
+
+    # A cache hit must not depend on the row anymore
+    with SessionLocal() as s:
+        row = s.get(TeamToken, ("org1", "teamA", "tokA"))
+        row.team_node_id = "changed-behind-cache"
+        s.commit()
+    assert _auth(SessionLocal).team_node_id == "teamA"
+
+
+def test_wrong_secret_never_hits(SessionLocal):
+    _auth(SessionLocal)
+    with pytest.raises(ValueError):
+        _auth(SessionLocal, bearer="tokA.wrong")
+
+
+def test_revocation_invalidates_after_commit(SessionLocal, audit_events):
+    _auth(SessionLocal)
+    _auth(SessionLocal, bearer="tokB.secret")
+    epoch = get_config_cache().get_org_epoch("org1")
+
+    with SessionLocal() as s:
+        repository.revoke_team_token(s, token_id="tokA", revoked_by="admin")
+        # Not committed yet: still cached
+        assert len(get_principal_cache()) == 2
+        s.commit()
+
+    assert get_config_cache().get_org_epoch("org1") == epoch + 1
+    with pytest.raises(ValueError, match="revoked"):
+        _auth(SessionLocal)
+    # The epoch bump drops the org's other principals too; they re-auth from the DB
+    assert _auth(SessionLocal, bearer="tokB.secret").org_id == "org1"
+
+
+def test_rolled_back_revocation_keeps_cache(SessionLocal, audit_events):
+    _auth(SessionLocal)
+    epoch = get_config_cache().get_org_epoch("org1")
+    with SessionLocal() as s:
+        repository.revoke_team_token(s, token_id="tokA")
+        s.rollback()
+    assert get_config_cache().get_org_epoch("org1") == epoch
+    assert _auth(SessionLocal).org_id == "org1"
+
+
+def test_expired_token_is_not_served_from_cache(SessionLocal, audit_events):
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    with SessionLocal() as s:
+        s.get(TeamToken, ("org1", "teamA", "tokA")).expires_at = expired
+        s.commit()
+    get_principal_cache().put(
+        token_hash=hash_token("secret", pepper=PEPPER),
+        org_id="org1",
+        team_node_id="teamA",
+        token_id="tokA",
+        permissions=[],
+        expires_at=expired,
+        label=None,
+    )
+
+    # Falls through to the DB path, which records the expiry
+    with pytest.raises(ValueError, match="expired"):
+        _auth(SessionLocal)
+    assert audit_events == ["expired"]
+
+
+def test_last_used_recorder_batches_updates(SessionLocal):
+    recorder = LastUsedRecorder(
+        flush_interval_seconds=3600, session_factory=SessionLocal
+    )
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    recorder.record("tokA", t0)
+    recorder.record("tokA", t0 + timedelta(seconds=5))
+    recorder.record("tokB", t0)
+    assert recorder.pending() == 2
+
+    assert recorder.flush() == 2
+    assert recorder.pending() == 0
+
+    # Never moves last_used_at backwards
+    recorder.record("tokA", t0)
+    recorder.flush()
+    recorder.stop()
+
+    with SessionLocal() as s:
+        used = {
+            r.token_id: r.last_used_at
+            for r in s.execute(select(TeamToken)).scalars().all()
+        }
+    assert used == {"tokA": t0 + timedelta(seconds=5), "tokB": t0}
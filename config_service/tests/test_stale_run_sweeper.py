@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from src.db import repository
+from src.db.base import Base
+from src.db.models import AgentRun
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as s:
+        yield s
+
+
+def _add_runs(session, n, *, age, status="running", prefix="run"):
+    started = datetime.utcnow() - age
+    for i in range(n):
+        session.add(
+            AgentRun(
+                id=f"{prefix}-{i}",
+                org_id="org1",
+                trigger_source="api",
+                agent_name="planner",
+                started_at=started - timedelta(seconds=i),
+                status=status,
+            )
+        )
+    session.commit()
+
+
+def test_sweep_marks_only_stale_running_runs(session):
+    _add_runs(session, 7, age=timedelta(hours=1), prefix="stale")
+    _add_runs(session, 3, age=timedelta(seconds=30), prefix="fresh")
+    _add_runs(session, 2, age=timedelta(hours=1), status="completed", prefix="done")
+
+    assert repository.get_stale_runs_count(session, max_age_seconds=600) == 7
+    sweep = repository.mark_stale_runs_as_timeout(
+        session, max_age_seconds=600, batch_size=3
+    )
+    assert (sweep.marked, sweep.batches, sweep.capped) == (7, 3, False)
+    assert repository.get_stale_runs_count(session, max_age_seconds=600) == 0
+
+    session.expire_all()
+    runs = {r.id: r for r in session.execute(select(AgentRun)).scalars()}
+    for i in range(7):
+        run = runs[f"stale-{i}"]
+        assert run.status == "timeout"
+        assert run.completed_at is not None
+        assert "600s" in run.error_message
+        # Computed in SQL from started_at
+        assert run.duration_seconds == pytest.approx(3600 + i, abs=5)
+    assert {runs[f"fresh-{i}"].status for i in range(3)} == {"running"}
+    assert {runs[f"done-{i}"].status for i in range(2)} == {"completed"}
+
+
+def test_sweep_stops_at_row_cap_oldest_first(session):
+    _add_runs(session, 10, age=timedelta(hours=1))
+
+    sweep = repository.mark_stale_runs_as_timeout(
+        session, max_age_seconds=600, batch_size=4, max_rows=6
+    )
+    assert (sweep.marked, sweep.batches, sweep.capped) == (6, 2, True)
+    session.expire_all()
+    timed_out = set(
+        session.execute(select(AgentRun.id).where(AgentRun.status == "timeout"))
+        .scalars()
+        .all()
+    )
+    # run-9 started earliest
+    assert timed_out == {f"run-{i}" for i in range(4, 10)}
+
+    sweep = repository.mark_stale_runs_as_timeout(session, max_age_seconds=600)
+    assert (sweep.marked, sweep.capped) == (4, False)
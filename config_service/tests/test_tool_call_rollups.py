@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from src.db import repository
+from src.db.base import Base
+from src.db.models import AgentRun, AgentToolCall, AgentToolCallRollup
+
+T0 = datetime(2026, 2, 1, 10, 0, 0)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as s:
+        for run_id, team in (("run1", "teamA"), ("run2", None)):
+            s.add(
+                AgentRun(
+                    id=run_id,
+                    org_id="org1",
+                    team_node_id=team,
+                    trigger_source="api",
+                    agent_name="planner",
+                    started_at=T0,
+                    status="completed",
+                )
+            )
+        s.commit()
+        yield s
+
+
+def _calls(prefix, n, *, start=T0, tool="grep_logs", error_every=0):
+    return [
+        {
+            "id": f"{prefix}-{i}",
+            "tool_name": tool,
+            "started_at": start + timedelta(minutes=i),
+            "duration_ms": 10 * (i + 1),
+            "status": "error" if error_every and i % error_every == 0 else "success",
+        }
+        for i in range(n)
+    ]
+
+
+def _rollup_rows(session):
+    return sorted(
+        (r.team_node_id, r.tool_name, r.bucket_start, r.duration_bucket, r.call_count)
+        for r in session.execute(select(AgentToolCallRollup)).scalars()
+    )
+
+
+def test_bulk_insert_is_idempotent_and_rolls_up(session):
+    calls = _calls("a", 90, error_every=10)
+    assert (
+        repository.bulk_create_tool_calls(session, run_id="run1", tool_calls=calls)
+        == 90
+    )
+    # Re-posting the same batch inserts and counts nothing
+    assert (
+        repository.bulk_create_tool_calls(session, run_id="run1", tool_calls=calls) == 0
+    )
+    session.commit()
+
+    assert session.query(AgentToolCall).count() == 90
+    hours = repository.get_tool_call_rollups(session, org_id="org1")
+    assert [h["bucket_start"] for h in hours] == [T0, T0 + timedelta(hours=1)]
+    assert [h["call_count"] for h in hours] == [60, 30]
+    assert [h["error_count"] for h in hours] == [6, 3]
+
+    (total,) = repository.get_tool_call_rollups(session, org_id="org1", by_hour=False)
+    assert total["call_count"] == 90
+    assert total["error_rate"] == pytest.approx(0.1)
+    assert total["avg_duration_ms"] == pytest.approx(455)
+    # Durations 10..900ms: median 450 falls in the (200, 500] bucket
+    assert total["p50_duration_ms"] == 500
+    assert total["p95_duration_ms"] == 1000
+
+
+def test_runs_without_team_roll_up_separately(session):
+    repository.bulk_create_tool_calls(session, run_id="run1", tool_calls=_calls("a", 3))
+    repository.bulk_create_tool_calls(session, run_id="run2", tool_calls=_calls("b", 2))
+    rows = repository.get_tool_call_rollups(session, org_id="org1", by_hour=False)
+    assert {(r["team_node_id"], r["call_count"]) for r in rows} == {
+        ("teamA", 3),
+        (None, 2),
+    }
+    teamless = repository.get_tool_call_rollups(
+        session, org_id="org1", team_node_id="", by_hour=False
+    )
+    assert [r["call_count"] for r in teamless] == [2]
+
+
+def test_rebuild_matches_ingest_rollups(session):
+    repository.bulk_create_tool_calls(
+        session, run_id="run1", tool_calls=_calls("a", 150, error_every=7)
+    )
+    repository.bulk_create_tool_calls(
+        session, run_id="run2", tool_calls=_calls("b", 40, tool="query_metrics")
+    )
+    ingested = _rollup_rows(session)
+
+    folded = repository.rebuild_tool_call_rollups(
+        session, since=T0 + timedelta(minutes=30), until=T0 + timedelta(hours=5)
+    )
+    assert folded == 190
+    assert _rollup_rows(session) == ingested
+
+
+def test_keyset_pages_match_offset_order(session):
+    # Same started_at for several calls so the id tie-breaker matters
+    calls = _calls("a", 25) + [
+        {"id": f"tie-{i}", "tool_name": "t", "started_at": T0} for i in range(5)
+    ]
+    repository.bulk_create_tool_calls(session, run_id="run1", tool_calls=calls)
+    expected = [tc.id for tc in repository.list_tool_calls(session, limit=100)]
+
+    seen, cursor = [], None
+    while True:
+        page = repository.list_tool_calls(session, limit=7, cursor=cursor)
+        seen += [tc.id for tc in page]
+        if len(page) < 7:
+            break
+        cursor = repository.encode_tool_call_cursor(page[-1].started_at, page[-1].id)
+    assert seen == expected
+    assert len(seen) == 30
+
+    with pytest.raises(ValueError):
+        repository.list_tool_calls(session, cursor="not-a-cursor")
@@ -0,0 +1,153 @@
+import csv
+import io
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.api.routes import audit
+from src.db import repository
+from src.db.base import Base
+from src.db.config_models import ConfigChangeHistory
+from src.db.models import AgentRun, TokenAudit
+
+T0 = datetime(2026, 2, 1, 10, 0, 0)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as s:
+        # Many events share a timestamp, within and across sources, so the
+        # (source, row id) tie-breakers decide page boundaries. Token ids run
+        # past 9 so string and integer id order differ.
+        for i in range(40):
+            ts = T0 + timedelta(minutes=i // 4)
+            s.add(
+                TokenAudit(
+                    id=i + 1,  # BigInteger keys don't autoincrement on SQLite
+                    org_id="org1",
+                    team_node_id="teamA",
+                    token_id=f"tok{i}",
+                    event_type="used" if i % 3 else "issued",
+                    event_at=ts,
+                    actor="alice",
+                )
+            )
+            s.add(
+                ConfigChangeHistory(
+                    id=f"cfg{i:02d}",
+                    org_id="org1",
+                    node_id="teamA",
+                    new_config={},
+                    change_diff={"changed": {f"key{i}": 1}},
+                    changed_by="bob",
+                    changed_at=ts,
+                    version=i,
+                )
+            )
+            s.add(
+                AgentRun(
+                    id=f"run{i:02d}",
+                    org_id="org1",
+                    team_node_id="teamA" if i % 2 else "teamB",
+                    trigger_source="slack",
+                    agent_name="planner",
+                    started_at=ts,
+                    status="completed" if i % 5 else "failed",
+                )
+            )
+        # Another org's events never show up
+        s.add(
+            AgentRun(
+                id="other",
+                org_id="org2",
+                trigger_source="api",
+                agent_name="planner",
+                started_at=T0,
+                status="completed",
+            )
+        )
+        s.commit()
+        yield s
+
+
+def _walk(session, batch, **filters):
+    ids, cursor = [], None
+    while True:
+        page = repository.list_unified_audit(
+            session, limit=batch, cursor=cursor, count_total=False, **filters
+        )
+        ids += [e.id for e in page.events]
+        if page.next_cursor is None:
+            return ids
+        assert page.next_cursor != cursor, "cursor did not advance"
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"sources": ["token", "agent"]},
+        {"team_node_id": "teamA", "event_types": ["completed", "used"]},
+        {"search": "key1", "since": T0 + timedelta(minutes=2)},
+    ],
+)
+def test_cursor_walk_matches_single_page(session, filters):
+    full = repository.list_unified_audit(session, org_id="org1", limit=1000, **filters)
+    expected = [e.id for e in full.events]
+    assert full.next_cursor is None
+    assert full.total == len(expected) > 0
+
+    timestamps = [e.timestamp for e in full.events]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+    for batch in (1, 7, 13):
+        walked = _walk(session, batch, org_id="org1", **filters)
+        # No gaps or duplicates at timestamp ties between pages
+        assert walked == expected
+
+    # offset paging agrees with the cursor walk
+    by_offset = []
+    for offset in range(0, len(expected), 11):
+        page = repository.list_unified_audit(
+            session, org_id="org1", limit=11, offset=offset, **filters
+        )
+        by_offset += [e.id for e in page.events]
+    assert by_offset == expected
+
+
+def test_malformed_cursor_rejected(session):
+    with pytest.raises(ValueError):
+        repository.list_unified_audit(session, org_id="org1", cursor="not-a-cursor")
+
+
+def test_streamed_csv_matches_paged_results(session, monkeypatch):
+    @contextmanager
+    def stream_session():
+        yield session
+
+    monkeypatch.setattr(audit, "db_session", stream_session)
+    filters = dict(org_id="org1", sources=None, team_node_id="teamA", search=None)
+
+    chunks = list(audit._audit_csv_chunks(filters, rows_per_chunk=9))
+    assert len(chunks) > 1
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+
+    events = repository.list_unified_audit(session, limit=1000, **filters).events
+    assert rows[0] == audit._CSV_HEADER
+    assert rows[1:] == [
+        [
+            e.timestamp.isoformat(),
+            e.source,
+            e.event_type,
+            e.actor or "",
+            e.team_node_id or "",
+            e.summary,
+            e.correlation_id or "",
+        ]
+        for e in events
+    ]
@@ -0,0 +1,349 @@
+"""Watch-based local object cache (informers) for the K8s executor.
+
+Each cached resource kind gets an informer thread that does a paginated
+LIST, then WATCHes from the returned resourceVersion and applies
+ADDED/MODIFIED/DELETED events to an in-memory store. When the server-side
+watch timeout elapses the watch is re-issued from the last resourceVersion
+seen; only an error or an expired resourceVersion (410 Gone) triggers a
+relist.
+
+The executor only serves reads from an informer that is synced and has
+heard from the API server recently (any event or bookmark); otherwise it
+falls back to a live API call. Logs are never cached.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+logger = structlog.get_logger(__name__)
+
+# Server-side watch timeout; the client re-issues the watch from the last
+# resourceVersion when it elapses.
+WATCH_TIMEOUT_SECONDS = 300
+
+# Client-side read timeout for LIST pages and watch connections (a watch
+# sees at least a bookmark well within this, so it only trips on a hung
+# connection).
+LIST_REQUEST_TIMEOUT_SECONDS = 60
+WATCH_REQUEST_TIMEOUT_SECONDS = WATCH_TIMEOUT_SECONDS + 30
+
+# Backoff between informer restarts after errors
+INFORMER_RETRY_DELAY_SECONDS = 5.0
+
+# How long a synced informer may go without hearing from the API server
+# before reads fall back to live calls. A quiet but healthy watch is only
+# heard from when it ends, every WATCH_TIMEOUT_SECONDS, so this allows a
+# full watch round plus reconnecting.
+DEFAULT_MAX_STALENESS_SECONDS = 2 * WATCH_TIMEOUT_SECONDS
+
+HTTP_GONE = 410
+
+ObjectKey = Tuple[str, str]  # (namespace, name); namespace is "" for nodes
+
+
+def _object_key(obj) -> ObjectKey:
+    return (obj.metadata.namespace or "", obj.metadata.name)
+
+
+class ResourceInformer:
+    """Keeps an in-memory copy of one resource kind in sync via LIST + WATCH."""
+
+    def __init__(
+        self,
+        kind: str,
+        list_func: Callable,
+        page_size: int = 500,
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+        list_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.kind = kind
+        self._list_func = list_func
+        self._list_kwargs = list_kwargs or {}
+        self._page_size = page_size
+        self._max_staleness = max_staleness_seconds
+
+        self._lock = threading.Lock()
+        self._objects: Dict[ObjectKey, Any] = {}
+        self._resource_version: Optional[str] = None
+        self._synced = False
+        self._last_contact = 0.0
+
+        self._stop = threading.Event()
+        self._watch: Optional[watch.Watch] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------
+
+    def start(self):
+        """Start the informer thread."""
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{self.kind}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the informer thread."""
+        self._stop.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def _run(self):
+        needs_list = True
+        while not self._stop.is_set():
+            try:
+                if needs_list:
+                    self._relist()
+                    needs_list = False
+                # Returns cleanly when the server-side timeout elapses; loop
+                # round and resume from the last resourceVersion.
+                self._watch_from(self._resource_version)
+                continue
+            except ApiException as e:
+                needs_list = True
+                if e.status == HTTP_GONE:
+                    logger.info("informer_resource_version_expired", kind=self.kind)
+                    continue
+                self._mark_unsynced("informer_api_error", e)
+            except Exception as e:
+                needs_list = True
+                self._mark_unsynced("informer_error", e)
+
+            self._stop.wait(INFORMER_RETRY_DELAY_SECONDS)
+
+    def _mark_unsynced(self, event: str, error: Exception):
+        with self._lock:
+            self._synced = False
+        logger.warning(event, kind=self.kind, error=str(error))
+
+    # -------------------------------------------------------------------
+    # LIST + WATCH
+    # -------------------------------------------------------------------
+
+    def _relist(self):
+        """Paginated LIST that replaces the store atomically."""
+        objects: Dict[ObjectKey, Any] = {}
+        continue_token = None
+        while True:
+            kwargs = dict(
+                self._list_kwargs,
+                limit=self._page_size,
+                _request_timeout=LIST_REQUEST_TIMEOUT_SECONDS,
+            )
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            response = self._list_func(**kwargs)
+            for obj in response.items:
+                objects[_object_key(obj)] = obj
+            continue_token = response.metadata._continue
+            if not continue_token:
+                break
+
+        with self._lock:
+            self._objects = objects
+            self._resource_version = response.metadata.resource_version
+            self._synced = True
+            self._last_contact = time.monotonic()
+
+        logger.info(
+            "informer_synced",
+            kind=self.kind,
+            objects=len(objects),
+            resource_version=self._resource_version,
+        )
+
+    def _watch_from(self, resource_version: Optional[str]):
+        """Apply watch events until stopped or the server-side timeout elapses.
+
+        Raises ApiException (410) when the resourceVersion has expired.
+        """
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            self._list_func,
+            resource_version=resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+            _request_timeout=WATCH_REQUEST_TIMEOUT_SECONDS,
+            **self._list_kwargs,
+        ):
+            self._apply_event(event["type"], event["object"])
+            if self._stop.is_set():
+                return
+
+        # A clean end of stream is a completed round trip to the API server
+        with self._lock:
+            self._last_contact = time.monotonic()
+
+    def _apply_event(self, event_type: str, obj):
+        with self._lock:
+            self._last_contact = time.monotonic()
+            metadata = getattr(obj, "metadata", None)
+            if metadata is None:
+                return
+            if metadata.resource_version:
+                self._resource_version = metadata.resource_version
+            if event_type in ("ADDED", "MODIFIED"):
+                self._objects[_object_key(obj)] = obj
+            elif event_type == "DELETED":
+                self._objects.pop(_object_key(obj), None)
+            # BOOKMARK only advances resourceVersion / last contact
+
+    # -------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------
+
+    def is_fresh(self) -> bool:
+        """True if synced and the API server was heard from recently."""
+        with self._lock:
+            if not self._synced:
+                return False
+            return time.monotonic() - self._last_contact <= self._max_staleness
+
+    def get(self, namespace: str, name: str):
+        with self._lock:
+            return self._objects.get((namespace, name))
+
+    def list(self, namespace: Optional[str] = None) -> List[Any]:
+        with self._lock:
+            if namespace is None:
+                return list(self._objects.values())
+            return [obj for (ns, _), obj in self._objects.items() if ns == namespace]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "synced": self._synced,
+                "objects": len(self._objects),
+                "resource_version": self._resource_version,
+                "seconds_since_contact": (
+                    round(time.monotonic() - self._last_contact, 1)
+                    if self._last_contact
+                    else None
+                ),
+            }
+
+
+class ObjectCache:
+    """Set of informers plus hit/miss accounting for executor commands."""
+
+    def __init__(self, informers: Dict[str, ResourceInformer]):
+        self._informers = informers
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def start(self):
+        for informer in self._informers.values():
+            informer.start()
+
+    def stop(self):
+        for informer in self._informers.values():
+            informer.stop()
+
+    def informer(self, kind: str) -> Optional[ResourceInformer]:
+        """Return the informer for kind if it can serve reads right now."""
+        informer = self._informers.get(kind)
+        if informer is not None and informer.is_fresh():
+            return informer
+        return None
+
+    def record(self, command: str, hit: bool):
+        with self._lock:
+            counter = self._hits if hit else self._misses
+            counter[command] = counter.get(command, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates per command and informer health, for heartbeats."""
+        with self._lock:
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+        total_hits = sum(hits.values())
+        total = total_hits + sum(misses.values())
+        return {
+            "hit_rate": round(total_hits / total, 4) if total else None,
+            "hits": hits,
+            "misses": misses,
+            "informers": {
+                kind: informer.stats() for kind, informer in self._informers.items()
+            },
+        }
+
+
+# ---------------------------------------------------------------------------
+# Label selectors
+# ---------------------------------------------------------------------------
+
+_SET_TERM = re.compile(r"^\s*([\w./-]+)\s+(in|notin)\s+\(([^)]*)\)\s*$")
+_EQ_TERM = re.compile(r"^\s*([\w./-]+)\s*(==|=|!=)\s*([\w.-]*)\s*$")
+_EXISTS_TERM = re.compile(r"^\s*(!?)\s*([\w./-]+)\s*$")
+
+
+def _split_selector(selector: str) -> List[str]:
+    """Split on commas that are not inside parentheses."""
+    terms, depth, current = [], 0, []
+    for ch in selector:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            terms.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    terms.append("".join(current))
+    return [t for t in terms if t.strip()]
+
+
+def compile_label_selector(
+    selector: Optional[str],
+) -> Optional[Callable[[Dict[str, str]], bool]]:
+    """Compile a label selector string into a predicate.
+
+    Supports equality (=, ==, !=), set (in, notin) and existence (key, !key)
+    terms. Returns None for syntax we don't understand, so callers can fall
+    back to a server-side selector.
+    """
+    if not selector:
+        return lambda labels: True
+
+    checks: List[Callable[[Dict[str, str]], bool]] = []
+    for term in _split_selector(selector):
+        match = _SET_TERM.match(term)
+        if match:
+            key, op, values = match.groups()
+            value_set = {v.strip() for v in values.split(",") if v.strip()}
+            if op == "in":
+                checks.append(lambda l, k=key, vs=value_set: l.get(k) in vs)
+            else:
+                checks.append(lambda l, k=key, vs=value_set: l.get(k) not in vs)
+            continue
+
+        match = _EQ_TERM.match(term)
+        if match:
+            key, op, value = match.groups()
+            if op == "!=":
+                checks.append(lambda l, k=key, v=value: l.get(k) != v)
+            else:
+                checks.append(lambda l, k=key, v=value: l.get(k) == v)
+            continue
+
+        match = _EXISTS_TERM.match(term)
+        if match:
+            negate, key = match.groups()
+            if negate:
+                checks.append(lambda l, k=key: k not in l)
+            else:
+                checks.append(lambda l, k=key: k in l)
+            continue
+
+        return None
+
+    return lambda labels: all(check(labels) for check in checks)
@@ -0,0 +1,53 @@
+"""Agent side of the multiplexed WebSocket channel to the gateway.
+
+Text frames are JSON control messages with a ``type`` field. Responses
+that are too large for one frame (typically pod logs) are gzip-compressed
+and sent as binary chunk frames: a JSON header, a newline, then a slice
+of the payload. The gateway reassembles them by request_id; see
+``k8s_gateway/channel.py``.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, Iterator, Union
+
+Frame = Union[str, bytes]
+
+
+def encode_message(message_type: str, payload: Dict[str, Any]) -> str:
+    """Encode a control message as a text frame."""
+    return json.dumps({"type": message_type, **payload}, separators=(",", ":"))
+
+
+def encode_response(
+    body: Dict[str, Any],
+    compress_threshold: int,
+    chunk_size: int,
+) -> Iterator[Frame]:
+    """
+    Yield the frames for one command response.
+
+    Small responses are a single text frame. Anything at or above
+    compress_threshold bytes is gzip-compressed and split into binary
+    chunks of at most chunk_size bytes.
+    """
+    data = encode_message("response", body)
+    if len(data) < compress_threshold and len(data) <= chunk_size:
+        yield data
+        return
+
+    payload = gzip.compress(data.encode(), compresslevel=1)
+    request_id = body["request_id"]
+    total = max(1, -(-len(payload) // chunk_size))
+    for seq in range(total):
+        header = json.dumps(
+            {
+                "type": "chunk",
+                "request_id": request_id,
+                "seq": seq,
+                "final": seq == total - 1,
+                "encoding": "gzip",
+            },
+            separators=(",", ":"),
+        ).encode()
+        yield header + b"\n" + payload[seq * chunk_size : (seq + 1) * chunk_size]
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     # Gateway connection (default is IncidentFox SaaS gateway)
     gateway_url: str = "https://ui.incidentfox.ai/gateway"
 
+    # "websocket" (multiplexed channel) or "sse" (SSE commands + HTTP POST
+    # responses). Falls back to sse if the gateway has no WebSocket endpoint.
+    transport: str = "websocket"
+
     # Reconnection settings
     initial_reconnect_delay: float = 1.0
     max_reconnect_delay: float = 60.0
@@ -23,6 +27,22 @@ class Settings(BaseSettings):
 
     # Command execution
     command_timeout: float = 30.0
+    max_concurrent_commands: int = 8
+
+    # WebSocket responses at/above this size are gzipped and sent in chunks
+    response_compress_threshold: int = 64 * 1024
+    response_chunk_size: int = 256 * 1024
+    list_page_size: int = 500  # limit/continue page size for live LIST calls
+
+    # Informer-backed object cache (watch + local store). Off by default:
+    # it holds a copy of every cached object, so size the memory limit
+    # to the cluster before enabling.
+    cache_enabled: bool = False
+    cache_resources: str = "pods,deployments,events,nodes"  # comma-separated
+    cache_page_size: int = 500
+    # Must exceed the informers' 300s watch timeout, or quiet resources
+    # are judged stale between watch restarts
+    cache_max_staleness_seconds: float = 600.0
 
     # Agent info
     agent_version: str = "0.1.0"
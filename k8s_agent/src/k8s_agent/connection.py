@@ -1,14 +1,18 @@
-"""SSE connection to IncidentFox Gateway."""
+"""Connection to IncidentFox Gateway (WebSocket, or SSE + HTTP POST)."""
 
 import asyncio
 import json
 from pathlib import Path
 from typing import Any, Dict, Optional
+from urllib.parse import urlencode
 
 import httpx
 import structlog
 from httpx_sse import aconnect_sse
+from websockets.asyncio.client import connect as ws_connect
+from websockets.exceptions import ConnectionClosed, InvalidStatus
 
+from .channel import encode_message, encode_response
 from .config import get_settings
 from .executor import K8sExecutor
 
@@ -18,8 +22,32 @@ logger = structlog.get_logger(__name__)
 HEALTH_FILE = Path("/tmp/healthy")
 
 
+# Handshake statuses from gateways that predate the WebSocket endpoint
+# (Starlette rejects an unrouted WebSocket with 403)
+WS_UNSUPPORTED_STATUSES = (403, 404)
+
+# Close code the gateway sends after accepting a socket with bad credentials
+WS_CLOSE_UNAUTHORIZED = 4401
+
+
+def _websocket_url(gateway_url: str) -> str:
+    """Map the gateway's http(s) base URL to ws(s)."""
+    if gateway_url.startswith("https://"):
+        return "wss://" + gateway_url[len("https://") :]
+    if gateway_url.startswith("http://"):
+        return "ws://" + gateway_url[len("http://") :]
+    return gateway_url
+
+
 class GatewayConnection:
-    """Manages SSE connection to IncidentFox K8s Gateway."""
+    """
+    Manages the connection to IncidentFox K8s Gateway.
+
+    With transport "websocket" (default) commands and responses share one
+    multiplexed socket. With "sse" commands arrive over SSE and each
+    response is POSTed back. Either way commands run concurrently, up to
+    max_concurrent_commands at a time.
+    """
 
     def __init__(self, executor: K8sExecutor):
         """
@@ -32,16 +60,33 @@ class GatewayConnection:
         self.settings = get_settings()
         self._reconnect_delay = self.settings.initial_reconnect_delay
         self._running = False
+        self._transport = self.settings.transport
+
+        # Active WebSocket (None when using SSE or disconnected)
+        self._ws = None
+        # Shared client for response/heartbeat POSTs on the SSE transport
+        self._http: Optional[httpx.AsyncClient] = None
+
+        self._command_slots = asyncio.Semaphore(self.settings.max_concurrent_commands)
+        self._command_tasks: set[asyncio.Task] = set()
 
     async def start(self):
         """Start the connection loop with automatic reconnection."""
         self._running = True
+        self._http = httpx.AsyncClient(timeout=10.0)
         logger.info(
             "starting_gateway_connection",
             gateway_url=self.settings.gateway_url,
             cluster_name=self.settings.cluster_name,
+            transport=self._transport,
         )
 
+        try:
+            await self._connection_loop()
+        finally:
+            await self._http.aclose()
+
+    async def _connection_loop(self):
         while self._running:
             try:
                 await self._connect()
@@ -83,7 +128,7 @@ class GatewayConnection:
             logger.warning("failed_to_remove_health_file", error=str(e))
 
     async def _connect(self):
-        """Establish SSE connection to gateway."""
+        """Establish a connection to the gateway."""
         # Get cluster info for registration
         cluster_info = self.executor.get_cluster_info()
 
@@ -97,15 +142,66 @@ class GatewayConnection:
         # Remove None values
         params = {k: str(v) for k, v in params.items() if v is not None}
 
-        # Build URL with query params
-        url = f"{self.settings.gateway_url}/agent/connect"
-
         headers = {
             "Authorization": f"Bearer {self.settings.api_key}",
             "User-Agent": f"incidentfox-k8s-agent/{self.settings.agent_version}",
         }
 
-        logger.info("connecting_to_gateway", url=url)
+        if self._transport == "websocket":
+            try:
+                await self._connect_websocket(params, headers)
+                return
+            except InvalidStatus as e:
+                if e.response.status_code not in WS_UNSUPPORTED_STATUSES:
+                    raise
+                logger.warning(
+                    "websocket_unsupported_falling_back_to_sse",
+                    status_code=e.response.status_code,
+                )
+                self._transport = "sse"
+
+        await self._connect_sse(params, headers)
+
+    async def _connect_websocket(self, params: Dict[str, str], headers: Dict[str, str]):
+        """Run the multiplexed WebSocket channel until it closes."""
+        url = f"{_websocket_url(self.settings.gateway_url)}/agent/ws"
+        logger.info("connecting_to_gateway", url=url, transport="websocket")
+
+        # Large payloads are gzipped per response (see channel.py), so
+        # per-message deflate would only cost CPU on small frames.
+        try:
+            async with ws_connect(
+                f"{url}?{urlencode(params)}",
+                additional_headers=headers,
+                compression=None,
+            ) as ws:
+                logger.info("connected_to_gateway", transport="websocket")
+                self._ws = ws
+                try:
+                    async for message in ws:
+                        if isinstance(message, bytes):
+                            logger.warning("unexpected_binary_frame", size=len(message))
+                            continue
+                        try:
+                            payload = json.loads(message)
+                        except json.JSONDecodeError:
+                            logger.warning("invalid_event_data", data=message[:200])
+                            continue
+                        await self._handle_message(payload.pop("type", None), payload)
+                finally:
+                    self._ws = None
+        except ConnectionClosed as e:
+            if e.rcvd is not None and e.rcvd.code == WS_CLOSE_UNAUTHORIZED:
+                raise RuntimeError(
+                    f"Gateway rejected agent credentials: {e.rcvd.reason}"
+                ) from e
+            raise
+
+    async def _connect_sse(self, params: Dict[str, str], headers: Dict[str, str]):
+        """Consume the SSE command stream until it closes."""
+        url = f"{self.settings.gateway_url}/agent/connect"
+
+        logger.info("connecting_to_gateway", url=url, transport="sse")
 
         async with httpx.AsyncClient(timeout=None) as client:
             async with aconnect_sse(
@@ -136,6 +232,10 @@ class GatewayConnection:
             logger.warning("invalid_event_data", event_type=event_type, data=data)
             return
 
+        await self._handle_message(event_type, payload)
+
+    async def _handle_message(self, event_type: Optional[str], payload: Dict[str, Any]):
+        """Dispatch a gateway message (same types on both transports)."""
         if event_type == "connected":
             logger.info(
                 "gateway_connected",
@@ -145,10 +245,17 @@ class GatewayConnection:
             self._create_health_file()
 
         elif event_type == "command":
-            await self._handle_command(payload)
+            # Run concurrently so a slow command (e.g. large logs) doesn't
+            # hold up the rest of the stream
+            task = asyncio.create_task(self._handle_command(payload))
+            self._command_tasks.add(task)
+            task.add_done_callback(self._command_tasks.discard)
 
         elif event_type == "heartbeat":
             logger.debug("heartbeat_received", timestamp=payload.get("timestamp"))
+            cache_stats = self.executor.cache_stats()
+            if cache_stats is not None:
+                await self._send_heartbeat(cache_stats)
 
         else:
             logger.warning("unknown_event_type", event_type=event_type)
@@ -172,7 +279,8 @@ class GatewayConnection:
 
         # Execute the command
         try:
-            result = await self.executor.execute(command, params)
+            async with self._command_slots:
+                result = await self.executor.execute(command, params)
             await self._send_response(
                 request_id=request_id,
                 ok=True,
@@ -196,6 +304,23 @@ class GatewayConnection:
                 error=str(e),
             )
 
+    async def _send_heartbeat(self, cache_stats: Dict[str, Any]):
+        """Report object-cache stats to the gateway."""
+        try:
+            if self._ws is not None:
+                await self._ws.send(
+                    encode_message("heartbeat", {"cache_stats": cache_stats})
+                )
+                return
+
+            url = f"{self.settings.gateway_url}/agent/heartbeat"
+            headers = {"Authorization": f"Bearer {self.settings.api_key}"}
+            await self._http.post(
+                url, headers=headers, json={"cache_stats": cache_stats}
+            )
+        except Exception as e:
+            logger.warning("heartbeat_send_error", error=str(e))
+
     async def _send_response(
         self,
         request_id: str,
@@ -204,7 +329,7 @@ class GatewayConnection:
         error: Optional[str] = None,
     ):
         """
-        Send command response to gateway.
+        Send command response to gateway (over the WebSocket if connected).
 
         Args:
             request_id: ID of the request being responded to
@@ -212,13 +337,6 @@ class GatewayConnection:
             result: Command result (if ok)
             error: Error message (if not ok)
         """
-        url = f"{self.settings.gateway_url}/agent/response/{request_id}"
-
-        headers = {
-            "Authorization": f"Bearer {self.settings.api_key}",
-            "Content-Type": "application/json",
-        }
-
         body = {
             "request_id": request_id,
             "ok": ok,
@@ -228,16 +346,41 @@ class GatewayConnection:
         else:
             body["error"] = error
 
+        ws = self._ws
+        if ws is not None:
+            try:
+                # Each chunk is its own frame, so other responses can
+                # interleave with a large one
+                for frame in encode_response(
+                    body,
+                    compress_threshold=self.settings.response_compress_threshold,
+                    chunk_size=self.settings.response_chunk_size,
+                ):
+                    await ws.send(frame)
+            except ConnectionClosed as e:
+                logger.error(
+                    "response_send_error",
+                    request_id=request_id,
+                    error=str(e),
+                )
+            return
+
+        url = f"{self.settings.gateway_url}/agent/response/{request_id}"
+
+        headers = {
+            "Authorization": f"Bearer {self.settings.api_key}",
+            "Content-Type": "application/json",
+        }
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(url, headers=headers, json=body)
-                if response.status_code != 200:
-                    logger.error(
-                        "response_send_failed",
-                        request_id=request_id,
-                        status_code=response.status_code,
-                        response=response.text[:200],
-                    )
+            response = await self._http.post(url, headers=headers, json=body)
+            if response.status_code != 200:
+                logger.error(
+                    "response_send_failed",
+                    request_id=request_id,
+                    status_code=response.status_code,
+                    response=response.text[:200],
+                )
         except Exception as e:
             logger.error(
                 "response_send_error",
@@ -7,6 +7,9 @@ import structlog
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
+from .cache import ObjectCache, ResourceInformer, compile_label_selector
+from .config import get_settings
+
 logger = structlog.get_logger(__name__)
 
 # Timeout for K8s API calls
@@ -33,6 +36,57 @@ class K8sExecutor:
         self.core_v1 = client.CoreV1Api()
         self.apps_v1 = client.AppsV1Api()
 
+        settings = get_settings()
+        self._list_page_size = settings.list_page_size
+        self.cache: Optional[ObjectCache] = None
+        if settings.cache_enabled:
+            self.cache = self._build_cache(settings)
+
+    def _build_cache(self, settings) -> ObjectCache:
+        """Create informers for the configured resource kinds."""
+        list_funcs = {
+            "pods": self.core_v1.list_pod_for_all_namespaces,
+            "deployments": self.apps_v1.list_deployment_for_all_namespaces,
+            "events": self.core_v1.list_event_for_all_namespaces,
+            "nodes": self.core_v1.list_node,
+        }
+        kinds = [k.strip() for k in settings.cache_resources.split(",") if k.strip()]
+        informers = {}
+        for kind in kinds:
+            if kind not in list_funcs:
+                logger.warning("unknown_cache_resource", kind=kind)
+                continue
+            informers[kind] = ResourceInformer(
+                kind=kind,
+                list_func=list_funcs[kind],
+                page_size=settings.cache_page_size,
+                max_staleness_seconds=settings.cache_max_staleness_seconds,
+            )
+        logger.info("object_cache_configured", kinds=list(informers))
+        return ObjectCache(informers)
+
+    def start_cache(self):
+        """Start informer threads (no-op when the cache is disabled)."""
+        if self.cache is not None:
+            self.cache.start()
+
+    def stop_cache(self):
+        """Stop informer threads."""
+        if self.cache is not None:
+            self.cache.stop()
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Cache hit rates and informer health (None when disabled)."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def _cached(self, kind: str, command: str):
+        """Return a fresh informer for kind and record the hit/miss."""
+        if self.cache is None:
+            return None
+        informer = self.cache.informer(kind)
+        self.cache.record(command, hit=informer is not None)
+        return informer
+
     async def execute(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a K8s command.
@@ -59,38 +113,58 @@ class K8sExecutor:
         self,
         namespace: str = "default",
         label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """List pods in a namespace."""
-        try:
-            pods = self.core_v1.list_namespaced_pod(
-                namespace=namespace,
-                label_selector=label_selector,
-                _request_timeout=K8S_API_TIMEOUT,
-            )
+        """List pods in a namespace.
 
-            return {
-                "namespace": namespace,
-                "pod_count": len(pods.items),
-                "pods": [
-                    {
-                        "name": pod.metadata.name,
-                        "namespace": pod.metadata.namespace,
-                        "status": pod.status.phase,
-                        "ready": self._get_pod_ready_status(pod),
-                        "restarts": self._get_pod_restart_count(pod),
-                        "node": pod.spec.node_name,
-                        "created_at": (
-                            pod.metadata.creation_timestamp.isoformat()
-                            if pod.metadata.creation_timestamp
-                            else None
-                        ),
-                    }
-                    for pod in pods.items
-                ],
-            }
-        except ApiException as e:
-            logger.error("list_pods_failed", namespace=namespace, error=str(e))
-            raise Exception(f"Failed to list pods: {e.reason}")
+        Served from the pod informer when possible; field selectors always go
+        to the API server, paginated with limit/continue.
+        """
+        matches = compile_label_selector(label_selector)
+        informer = (
+            self._cached("pods", "list_pods")
+            if matches is not None and not field_selector
+            else None
+        )
+        if informer is not None:
+            pods = [
+                pod
+                for pod in informer.list(namespace)
+                if matches(pod.metadata.labels or {})
+            ]
+            pods.sort(key=lambda pod: pod.metadata.name)
+        else:
+            try:
+                pods = self._list_all_pages(
+                    self.core_v1.list_namespaced_pod,
+                    namespace=namespace,
+                    label_selector=label_selector,
+                    field_selector=field_selector,
+                )
+            except ApiException as e:
+                logger.error("list_pods_failed", namespace=namespace, error=str(e))
+                raise Exception(f"Failed to list pods: {e.reason}")
+
+        return {
+            "namespace": namespace,
+            "pod_count": len(pods),
+            "pods": [
+                {
+                    "name": pod.metadata.name,
+                    "namespace": pod.metadata.namespace,
+                    "status": pod.status.phase,
+                    "ready": self._get_pod_ready_status(pod),
+                    "restarts": self._get_pod_restart_count(pod),
+                    "node": pod.spec.node_name,
+                    "created_at": (
+                        pod.metadata.creation_timestamp.isoformat()
+                        if pod.metadata.creation_timestamp
+                        else None
+                    ),
+                }
+                for pod in pods
+            ],
+        }
 
     def _cmd_get_pod_logs(
         self,
@@ -129,11 +203,17 @@ class K8sExecutor:
     ) -> Dict[str, Any]:
         """Get detailed information about a pod."""
         try:
-            pod = self.core_v1.read_namespaced_pod(
-                name=pod_name,
-                namespace=namespace,
-                _request_timeout=K8S_API_TIMEOUT,
-            )
+            pod = None
+            informer = self._cached("pods", "describe_pod")
+            if informer is not None:
+                pod = informer.get(namespace, pod_name)
+            if pod is None:
+                # Not cached (or created after the last event): read live
+                pod = self.core_v1.read_namespaced_pod(
+                    name=pod_name,
+                    namespace=namespace,
+                    _request_timeout=K8S_API_TIMEOUT,
+                )
 
             return {
                 "name": pod.metadata.name,
@@ -179,16 +259,24 @@ class K8sExecutor:
     ) -> Dict[str, Any]:
         """Get events related to a pod."""
         try:
-            events = self.core_v1.list_namespaced_event(
-                namespace=namespace,
-                field_selector=f"involvedObject.name={pod_name}",
-                _request_timeout=K8S_API_TIMEOUT,
-            )
+            informer = self._cached("events", "get_pod_events")
+            if informer is not None:
+                items = [
+                    event
+                    for event in informer.list(namespace)
+                    if event.involved_object and event.involved_object.name == pod_name
+                ]
+            else:
+                items = self._list_all_pages(
+                    self.core_v1.list_namespaced_event,
+                    namespace=namespace,
+                    field_selector=f"involvedObject.name={pod_name}",
+                )
 
             return {
                 "pod_name": pod_name,
                 "namespace": namespace,
-                "event_count": len(events.items),
+                "event_count": len(items),
                 "events": [
                     {
                         "type": event.type,
@@ -207,7 +295,7 @@ class K8sExecutor:
                         ),
                     }
                     for event in sorted(
-                        events.items,
+                        items,
                         key=lambda e: e.last_timestamp or e.first_timestamp or "",
                         reverse=True,
                     )
@@ -224,11 +312,16 @@ class K8sExecutor:
     ) -> Dict[str, Any]:
         """Get detailed information about a deployment."""
         try:
-            deployment = self.apps_v1.read_namespaced_deployment(
-                name=deployment_name,
-                namespace=namespace,
-                _request_timeout=K8S_API_TIMEOUT,
-            )
+            deployment = None
+            informer = self._cached("deployments", "describe_deployment")
+            if informer is not None:
+                deployment = informer.get(namespace, deployment_name)
+            if deployment is None:
+                deployment = self.apps_v1.read_namespaced_deployment(
+                    name=deployment_name,
+                    namespace=namespace,
+                    _request_timeout=K8S_API_TIMEOUT,
+                )
 
             return {
                 "name": deployment.metadata.name,
@@ -297,8 +390,12 @@ class K8sExecutor:
         """Get cluster information for registration."""
         try:
             # Get node count
-            nodes = self.core_v1.list_node(_request_timeout=K8S_API_TIMEOUT)
-            node_count = len(nodes.items)
+            informer = self.cache.informer("nodes") if self.cache else None
+            if informer is not None:
+                node_count = len(informer.list())
+            else:
+                nodes = self.core_v1.list_node(_request_timeout=K8S_API_TIMEOUT)
+                node_count = len(nodes.items)
 
             # Get namespace count
             namespaces = self.core_v1.list_namespace(_request_timeout=K8S_API_TIMEOUT)
@@ -319,6 +416,23 @@ class K8sExecutor:
             return {}
 
     # Helper methods
+    def _list_all_pages(self, list_func, **kwargs) -> list:
+        """Call a list API with server-side pagination and collect all items."""
+        items: list = []
+        continue_token = None
+        while True:
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            response = list_func(
+                limit=self._list_page_size,
+                _request_timeout=K8S_API_TIMEOUT,
+                **kwargs,
+            )
+            items.extend(response.items)
+            continue_token = response.metadata._continue
+            if not continue_token:
+                return items
+
     def _get_pod_ready_status(self, pod) -> str:
         """Get pod ready status as 'ready/total' string."""
         containers = pod.spec.containers or []
@@ -60,6 +60,9 @@ async def main():
         logger.error("failed_to_initialize_executor", error=str(e))
         sys.exit(1)
 
+    # Start informers (if the object cache is enabled)
+    executor.start_cache()
+
     # Create gateway connection
     connection = GatewayConnection(executor)
 
@@ -83,6 +86,7 @@ async def main():
     # Graceful shutdown
     logger.info("shutting_down")
     await connection.stop()
+    executor.stop_cache()
 
     # Cancel connection task
     connection_task.cancel()
@@ -0,0 +1,147 @@
+"""Tests for the informer LIST/WATCH loop."""
+
+from types import SimpleNamespace
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from k8s_agent import cache
+
+
+def _pod(name, resource_version, namespace="default"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            namespace=namespace, name=name, resource_version=resource_version
+        )
+    )
+
+
+class FakeApi:
+    """list_func stand-in: one page of pods, counts LIST calls."""
+
+    def __init__(self, pods, resource_version="10"):
+        self.pods = pods
+        self.resource_version = resource_version
+        self.list_calls = []
+
+    def __call__(self, **kwargs):
+        self.list_calls.append(kwargs)
+        return SimpleNamespace(
+            items=list(self.pods),
+            metadata=SimpleNamespace(
+                _continue=None, resource_version=self.resource_version
+            ),
+        )
+
+
+@pytest.fixture()
+def scripted_watch(monkeypatch):
+    """Replace watch.Watch with one that plays a script of watch rounds.
+
+    Each round is a list of events (the stream then ends, as on a server
+    timeout) or an exception to raise. When the script runs out the
+    informer is stopped.
+    """
+    monkeypatch.setattr(cache, "INFORMER_RETRY_DELAY_SECONDS", 0)
+    state = {"script": [], "calls": [], "informer": None}
+
+    class ScriptedWatch:
+        def stream(self, func, **kwargs):
+            state["calls"].append(kwargs)
+            if not state["script"]:
+                state["informer"]._stop.set()
+                return
+            step = state["script"].pop(0)
+            if isinstance(step, Exception):
+                raise step
+            yield from step
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(cache.watch, "Watch", ScriptedWatch)
+    return state
+
+
+def _informer(api, state):
+    informer = cache.ResourceInformer("pods", api)
+    state["informer"] = informer
+    return informer
+
+
+def test_watch_timeout_resumes_without_relist(scripted_watch):
+    api = FakeApi([_pod("a", "10")])
+    informer = _informer(api, scripted_watch)
+    scripted_watch["script"] = [
+        [{"type": "ADDED", "object": _pod("b", "11")}],
+        [],  # timeout with no events
+        [{"type": "DELETED", "object": _pod("a", "12")}],
+    ]
+
+    informer._run()
+
+    assert len(api.list_calls) == 1
+    assert api.list_calls[0]["_request_timeout"] == cache.LIST_REQUEST_TIMEOUT_SECONDS
+    # Each watch resumes from the last resourceVersion seen
+    assert [c["resource_version"] for c in scripted_watch["calls"]] == [
+        "10",
+        "11",
+        "11",
+        "12",
+    ]
+    assert [p.metadata.name for p in informer.list()] == ["b"]
+    assert informer.is_fresh()
+
+
+def test_gone_relists(scripted_watch):
+    api = FakeApi([_pod("a", "10")])
+    informer = _informer(api, scripted_watch)
+    scripted_watch["script"] = [
+        ApiException(status=cache.HTTP_GONE),
+        [{"type": "ADDED", "object": _pod("b", "21")}],
+    ]
+
+    informer._run()
+
+    assert len(api.list_calls) == 2
+    assert informer.stats()["synced"]
+    assert informer.get("default", "b") is not None
+
+
+def test_api_error_marks_unsynced(scripted_watch, monkeypatch):
+    api = FakeApi([_pod("a", "10")])
+    informer = _informer(api, scripted_watch)
+    scripted_watch["script"] = [ApiException(status=500)]
+    # Stop before the retry relists, so the unsynced state is observable
+    monkeypatch.setattr(informer._stop, "wait", lambda timeout: informer._stop.set())
+
+    informer._run()
+
+    assert len(api.list_calls) == 1
+    assert not informer.is_fresh()
+    assert informer.stats()["synced"] is False
+
+
+def test_quiet_informer_stays_fresh_across_watch_restarts(scripted_watch, monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(cache.time, "monotonic", lambda: clock["now"])
+    api = FakeApi([_pod("a", "10")])
+    informer = _informer(api, scripted_watch)
+    fresh_at_round_end = []
+
+    class QuietRound:
+        """A watch round with no events that ends on the server timeout."""
+
+        def __iter__(self):
+            # Reconnecting plus a full round without hearing from the server
+            clock["now"] += cache.INFORMER_RETRY_DELAY_SECONDS + 10
+            clock["now"] += cache.WATCH_TIMEOUT_SECONDS
+            fresh_at_round_end.append(informer.is_fresh())
+            return iter(())
+
+    scripted_watch["script"] = [QuietRound(), QuietRound(), QuietRound()]
+
+    informer._run()
+
+    assert fresh_at_round_end == [True, True, True]
+    assert len(api.list_calls) == 1
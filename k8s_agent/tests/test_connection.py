@@ -0,0 +1,27 @@
+"""Tests for the agent's WebSocket handshake handling."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from k8s_agent.connection import WS_CLOSE_UNAUTHORIZED, GatewayConnection
+from websockets.asyncio.server import serve
+
+
+async def test_rejected_credentials_keep_websocket_transport():
+    async def reject(ws):
+        await ws.close(code=WS_CLOSE_UNAUTHORIZED, reason="Invalid token")
+
+    executor = MagicMock()
+    executor.get_cluster_info.return_value = {}
+    conn = GatewayConnection(executor)
+
+    async with serve(reject, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        conn.settings = conn.settings.model_copy(
+            update={"gateway_url": f"http://127.0.0.1:{port}", "transport": "websocket"}
+        )
+        conn._transport = "websocket"
+        with pytest.raises(RuntimeError, match="rejected agent credentials"):
+            await conn._connect()
+
+    assert conn._transport == "websocket"
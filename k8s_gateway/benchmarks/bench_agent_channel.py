@@ -0,0 +1,176 @@
+"""Benchmark the gateway <-> agent command channel.
+
+Runs the gateway app under uvicorn and a real ``GatewayConnection`` from
+k8s_agent in the same process, with the K8s executor replaced by a fake
+that returns canned payloads. Commands are issued through
+``connection_manager.send_command`` (the path /internal/execute uses), and
+commands/sec plus latency percentiles are reported per transport.
+
+Usage:
+    pip install -e . -e ../k8s_agent
+    python benchmarks/bench_agent_channel.py --commands 2000 --concurrency 32
+    python benchmarks/bench_agent_channel.py --log-bytes 2000000 --commands 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+PORT = 18085
+
+os.environ.setdefault("INCIDENTFOX_API_KEY", "bench-token")
+os.environ.setdefault("INCIDENTFOX_CLUSTER_NAME", "bench-cluster")
+os.environ.setdefault("INCIDENTFOX_GATEWAY_URL", f"http://127.0.0.1:{PORT}")
+
+import structlog
+import uvicorn
+from k8s_agent.connection import GatewayConnection
+from k8s_gateway.auth import ClusterIdentity
+from k8s_gateway.connection_manager import connection_manager
+
+from k8s_agent import config as agent_config
+from k8s_gateway import main as gateway_main
+
+CLUSTER_ID = "bench-cluster-id"
+
+
+class FakeExecutor:
+    """Stands in for K8sExecutor: fixed payloads, optional latency."""
+
+    def __init__(self, log_bytes: int, latency: float):
+        line = "2026-01-01T00:00:00Z INFO request handled path=/api/v1/items\n"
+        self._logs = line * max(1, log_bytes // len(line))
+        self._pods = [
+            {"name": f"pod-{i}", "namespace": "default", "status": "Running"}
+            for i in range(20)
+        ]
+        self._latency = latency
+
+    def get_cluster_info(self):
+        return {"kubernetes_version": "v1.30.0", "node_count": 3}
+
+    def cache_stats(self):
+        return None
+
+    async def execute(self, command, params):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        if command == "get_pod_logs":
+            return {"pod_name": "pod-0", "logs": self._logs}
+        return {"namespace": "default", "pods": self._pods}
+
+
+async def _fake_auth(authorization: str) -> ClusterIdentity:
+    return ClusterIdentity(
+        cluster_id=CLUSTER_ID,
+        cluster_name="bench-cluster",
+        org_id="bench-org",
+        team_node_id="bench-team",
+        token_id="bench-token",
+    )
+
+
+async def _noop_status(*args, **kwargs):
+    return None
+
+
+async def _wait_for(predicate, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("agent did not (dis)connect in time")
+        await asyncio.sleep(0.01)
+
+
+async def run_transport(transport: str, args) -> dict:
+    os.environ["INCIDENTFOX_TRANSPORT"] = transport
+    agent_config.get_settings.cache_clear()
+
+    agent = GatewayConnection(FakeExecutor(args.log_bytes, args.latency))
+    agent_task = asyncio.create_task(agent.start())
+    await _wait_for(lambda: connection_manager.get_connection(CLUSTER_ID))
+
+    command = "get_pod_logs" if args.log_bytes else "list_pods"
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await connection_manager.send_command(CLUSTER_ID, command, {}, timeout=60)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.commands)))
+    elapsed = time.perf_counter() - start
+
+    await agent.stop()
+    agent_task.cancel()
+    try:
+        await agent_task
+    except asyncio.CancelledError:
+        pass
+    await _wait_for(lambda: connection_manager.get_connection(CLUSTER_ID) is None)
+
+    latencies.sort()
+    return {
+        "transport": transport,
+        "commands_per_sec": args.commands / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(args):
+    gateway_main.validate_k8s_agent_token = _fake_auth
+    gateway_main._update_cluster_status = _noop_status
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            gateway_main.app, host="127.0.0.1", port=PORT, log_level="warning"
+        )
+    )
+    server_task = asyncio.create_task(server.serve())
+    await _wait_for(lambda: server.started)
+
+    try:
+        for transport in args.transports:
+            result = await run_transport(transport, args)
+            print(
+                f"{result['transport']:>9}: "
+                f"{result['commands_per_sec']:8.0f} cmd/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  "
+                f"p99 {result['p99_ms']:7.2f} ms"
+            )
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--log-bytes",
+        type=int,
+        default=0,
+        help="Return get_pod_logs payloads of this size instead of list_pods",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Fake executor latency (s)"
+    )
+    parser.add_argument(
+        "--transports", nargs="+", default=["sse", "websocket"], metavar="T"
+    )
+    args = parser.parse_args()
+
+    # The gateway configures INFO logging on import; keep the output readable
+    logging.getLogger().setLevel(logging.WARNING)
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args))
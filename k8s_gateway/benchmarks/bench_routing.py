@@ -0,0 +1,140 @@
+"""Benchmark local vs. cross-replica command routing.
+
+Two ConnectionManagers ("replica-a" and "replica-b") share one cluster
+registry / command bus. Fake agents connect to replica-a: each is a task
+that drains its connection's command queue and answers with a canned
+payload. The load generator then runs the same command mix through
+replica-a (local delivery) and replica-b (forwarded over the bus) and
+reports commands/sec and latency percentiles.
+
+Usage:
+    python benchmarks/bench_routing.py --agents 10 --commands 5000
+    python benchmarks/bench_routing.py --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import structlog
+from k8s_gateway.auth import ClusterIdentity
+from k8s_gateway.command_bus import InMemoryCommandBus, InMemoryHub, RedisCommandBus
+from k8s_gateway.connection_manager import ConnectionManager
+from k8s_gateway.models import K8sCommandResponse
+
+PODS = [
+    {"name": f"pod-{i}", "namespace": "default", "status": "Running"} for i in range(20)
+]
+
+
+def _make_bus(replica_id: str, args, hub: InMemoryHub):
+    if args.redis_url:
+        return RedisCommandBus(replica_id, redis_url=args.redis_url)
+    return InMemoryCommandBus(replica_id, hub=hub)
+
+
+async def fake_agent(manager: ConnectionManager, cluster_id: str, latency: float):
+    """Answer every queued command for one cluster."""
+    conn = manager.get_connection(cluster_id)
+
+    async def answer(cmd):
+        if latency:
+            await asyncio.sleep(latency)
+        manager.handle_response(
+            cluster_id,
+            K8sCommandResponse(
+                request_id=cmd.request_id, ok=True, result={"pods": PODS}
+            ),
+        )
+
+    while True:
+        cmd = await conn.command_queue.get()
+        asyncio.create_task(answer(cmd))
+
+
+async def load(manager: ConnectionManager, cluster_ids, args) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await manager.execute(
+                cluster_ids[i % len(cluster_ids)], "list_pods", {}, timeout=30
+            )
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.commands)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "commands_per_sec": args.commands / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(args):
+    hub = InMemoryHub()
+    replica_a = ConnectionManager(_make_bus("replica-a", args, hub))
+    replica_b = ConnectionManager(_make_bus("replica-b", args, hub))
+    await replica_a.start()
+    await replica_b.start()
+
+    cluster_ids = [f"bench-cluster-{i}" for i in range(args.agents)]
+    agents = []
+    for cluster_id in cluster_ids:
+        await replica_a.register(
+            ClusterIdentity(
+                cluster_id=cluster_id,
+                cluster_name=cluster_id,
+                org_id="bench-org",
+                team_node_id="bench-team",
+                token_id="bench-token",
+            )
+        )
+        agents.append(
+            asyncio.create_task(fake_agent(replica_a, cluster_id, args.latency))
+        )
+
+    backend = "redis" if args.redis_url else "memory"
+    try:
+        for label, manager in (("local", replica_a), ("routed", replica_b)):
+            result = await load(manager, cluster_ids, args)
+            print(
+                f"{label:>6} ({backend}): "
+                f"{result['commands_per_sec']:8.0f} cmd/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  "
+                f"p99 {result['p99_ms']:7.2f} ms"
+            )
+    finally:
+        for task in agents:
+            task.cancel()
+        for cluster_id in cluster_ids:
+            await replica_a.unregister(cluster_id)
+        await replica_b.stop()
+        await replica_a.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--commands", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Fake agent latency (s)"
+    )
+    parser.add_argument(
+        "--redis-url", default="", help="Route over Redis instead of in-memory"
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(main(args))
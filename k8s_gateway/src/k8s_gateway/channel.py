@@ -0,0 +1,111 @@
+"""Framing for the multiplexed WebSocket channel between gateway and agent.
+
+One WebSocket per agent carries everything in both directions:
+
+- Text frames are JSON control messages with a ``type`` field:
+  ``connected``, ``command``, ``heartbeat`` (gateway -> agent) and
+  ``response``, ``heartbeat`` (agent -> gateway).
+- Binary frames carry large responses in chunks. Each frame is a JSON
+  header, a newline, then a slice of the (optionally gzip-compressed)
+  serialized response::
+
+      {"type": "chunk", "request_id": "...", "seq": 0, "final": false,
+       "encoding": "gzip"}\\n<bytes>
+
+Chunks from different requests may interleave, so one large log payload
+does not hold up other responses.
+
+The agent side of this protocol lives in ``k8s_agent/channel.py``.
+"""
+
+import gzip
+import json
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from pydantic import ValidationError
+
+from .models import K8sCommandResponse
+
+
+class ChannelError(Exception):
+    """Malformed or oversized channel message.
+
+    ``request_id`` is set when the frame could be attributed to a request,
+    so the caller can fail just that request and keep the channel open.
+    """
+
+    def __init__(self, message: str, request_id: Optional[str] = None):
+        super().__init__(message)
+        self.request_id = request_id
+
+
+@dataclass
+class _PartialResponse:
+    encoding: str
+    next_seq: int = 0
+    parts: list = field(default_factory=list)
+    size: int = 0
+
+
+class ChunkAssembler:
+    """Reassembles agent responses from text and binary frames."""
+
+    def __init__(self, max_response_bytes: int):
+        self._max_bytes = max_response_bytes
+        self._partial: Dict[str, _PartialResponse] = {}
+
+    def feed_binary(self, frame: bytes) -> Optional[K8sCommandResponse]:
+        """Add one chunk frame; returns the response once the final chunk arrives."""
+        header_end = frame.find(b"\n")
+        if header_end < 0:
+            raise ChannelError("Chunk frame missing header")
+        try:
+            header = json.loads(frame[:header_end])
+            request_id = header["request_id"]
+            seq = header["seq"]
+        except (ValueError, KeyError) as e:
+            raise ChannelError(f"Invalid chunk header: {e}")
+
+        partial = self._partial.get(request_id)
+        if partial is None:
+            partial = _PartialResponse(encoding=header.get("encoding", "identity"))
+            self._partial[request_id] = partial
+        if seq != partial.next_seq:
+            self._partial.pop(request_id, None)
+            raise ChannelError(f"Out-of-order chunk for {request_id}", request_id)
+
+        payload = frame[header_end + 1 :]
+        partial.parts.append(payload)
+        partial.size += len(payload)
+        partial.next_seq += 1
+        if partial.size > self._max_bytes:
+            self._partial.pop(request_id, None)
+            raise ChannelError(f"Response too large for {request_id}", request_id)
+
+        if not header.get("final"):
+            return None
+
+        del self._partial[request_id]
+        data = b"".join(partial.parts)
+        try:
+            if partial.encoding == "gzip":
+                data = gzip.decompress(data)
+            response = K8sCommandResponse.model_validate_json(data)
+        except (OSError, EOFError, zlib.error, ValidationError) as e:
+            raise ChannelError(
+                f"Undecodable response for {request_id}: {e}", request_id
+            )
+        if response.request_id != request_id:
+            raise ChannelError(f"Chunk body does not match {request_id}", request_id)
+        return response
+
+    def discard(self, request_id: str) -> None:
+        """Drop any partial chunks for a request."""
+        self._partial.pop(request_id, None)
+
+
+def encode_message(message_type: str, payload: dict) -> str:
+    """Encode a control message as a text frame."""
+    return json.dumps({"type": message_type, **payload}, separators=(",", ":"))
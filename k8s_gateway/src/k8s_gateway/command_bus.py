@@ -0,0 +1,315 @@
+"""Cluster registry and command bus shared by gateway replicas.
+
+An agent holds its SSE/WebSocket stream open to exactly one gateway replica.
+The replica that accepts the connection claims the cluster in the registry
+(a lease refreshed while the agent stays connected). When
+``/internal/execute`` lands on a different replica, it looks up the owner
+and forwards the command over the bus; the owner runs it against its local
+connection and publishes the result back.
+
+Backends (K8S_GATEWAY_REGISTRY_BACKEND):
+  - "memory" (default): single process. Replicas sharing an InMemoryHub can
+    route to each other, which is what tests and benchmarks use.
+  - "redis": cluster leases are Redis keys with a TTL; commands and replies
+    travel over per-replica pub/sub channels. Requires K8S_GATEWAY_REDIS_URL.
+"""
+
+import asyncio
+import json
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from .models import ClusterConnectionInfo
+
+logger = structlog.get_logger(__name__)
+
+# Executes a forwarded command on the local replica and returns a reply dict:
+# {"ok": bool, "result": dict | None, "error": str | None, "timed_out": bool}
+CommandHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# Extra time the forwarding replica waits beyond the command timeout, so the
+# owner's own timeout reply arrives before we give up on it
+FORWARD_GRACE_SECONDS = 5.0
+
+
+class CommandBus:
+    """Minimal registry + forwarding interface used by ConnectionManager."""
+
+    def __init__(self, replica_id: str):
+        self.replica_id = replica_id
+
+    async def start(self, handler: CommandHandler) -> None:
+        """Begin accepting commands forwarded to this replica."""
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    async def claim(self, info: ClusterConnectionInfo, ttl_seconds: int) -> None:
+        """Record (or refresh) this replica as the owner of a cluster."""
+        raise NotImplementedError
+
+    async def release(self, cluster_id: str) -> None:
+        """Drop the claim, unless another replica has taken the cluster over."""
+        raise NotImplementedError
+
+    async def lookup(self, cluster_id: str) -> Optional[ClusterConnectionInfo]:
+        raise NotImplementedError
+
+    async def list_clusters(self) -> List[ClusterConnectionInfo]:
+        raise NotImplementedError
+
+    async def forward(
+        self, replica_id: str, request: Dict[str, Any], timeout: float
+    ) -> Dict[str, Any]:
+        """Send a command to the owning replica and wait for its reply."""
+        raise NotImplementedError
+
+
+# =============================================================================
+# In-memory backend
+# =============================================================================
+
+
+class InMemoryHub:
+    """State shared by in-process replicas (stands in for Redis)."""
+
+    def __init__(self):
+        # cluster_id -> (lease expiry, info)
+        self.clusters: Dict[str, Tuple[float, ClusterConnectionInfo]] = {}
+        # replica_id -> handler for forwarded commands
+        self.handlers: Dict[str, CommandHandler] = {}
+
+
+class InMemoryCommandBus(CommandBus):
+    """Registry and bus for a single process."""
+
+    def __init__(self, replica_id: str, hub: Optional[InMemoryHub] = None):
+        super().__init__(replica_id)
+        self._hub = hub or InMemoryHub()
+
+    async def start(self, handler: CommandHandler) -> None:
+        self._hub.handlers[self.replica_id] = handler
+
+    async def stop(self) -> None:
+        self._hub.handlers.pop(self.replica_id, None)
+
+    async def claim(self, info: ClusterConnectionInfo, ttl_seconds: int) -> None:
+        self._hub.clusters[info.cluster_id] = (time.monotonic() + ttl_seconds, info)
+
+    async def release(self, cluster_id: str) -> None:
+        entry = self._hub.clusters.get(cluster_id)
+        if entry and entry[1].replica_id == self.replica_id:
+            del self._hub.clusters[cluster_id]
+
+    async def lookup(self, cluster_id: str) -> Optional[ClusterConnectionInfo]:
+        entry = self._hub.clusters.get(cluster_id)
+        if entry is None:
+            return None
+        expires_at, info = entry
+        if expires_at < time.monotonic():
+            self._hub.clusters.pop(cluster_id, None)
+            return None
+        return info
+
+    async def list_clusters(self) -> List[ClusterConnectionInfo]:
+        now = time.monotonic()
+        return [
+            info
+            for expires_at, info in self._hub.clusters.values()
+            if expires_at >= now
+        ]
+
+    async def forward(
+        self, replica_id: str, request: Dict[str, Any], timeout: float
+    ) -> Dict[str, Any]:
+        handler = self._hub.handlers.get(replica_id)
+        if handler is None:
+            return {"ok": False, "error": f"Gateway replica unavailable: {replica_id}"}
+        return await asyncio.wait_for(
+            handler(dict(request)), timeout=timeout + FORWARD_GRACE_SECONDS
+        )
+
+
+# =============================================================================
+# Redis backend
+# =============================================================================
+
+
+class RedisCommandBus(CommandBus):
+    """Registry in Redis keys with TTLs; commands over per-replica pub/sub."""
+
+    KEY_PREFIX = "k8s_gateway"
+
+    def __init__(self, replica_id: str, *, redis_url: str):
+        super().__init__(replica_id)
+        # Lazy import so runtime doesn't require redis unless enabled.
+        import redis.asyncio as redis  # type: ignore
+
+        self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._handler: Optional[CommandHandler] = None
+        # correlation_id -> future awaiting the owner's reply
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._serving: set[asyncio.Task] = set()
+
+    def _cluster_key(self, cluster_id: str) -> str:
+        return f"{self.KEY_PREFIX}:cluster:{cluster_id}"
+
+    def _channel(self, replica_id: str) -> str:
+        return f"{self.KEY_PREFIX}:replica:{replica_id}"
+
+    async def start(self, handler: CommandHandler) -> None:
+        self._handler = handler
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(self._channel(self.replica_id))
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe()
+            await self._pubsub.aclose()
+        await self._redis.aclose()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py resubscribes on the next read after a reconnect
+                logger.error("bus_listener_error", error=str(e))
+                await asyncio.sleep(1.0)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        if message.get("type") != "message":
+            return
+        try:
+            envelope = json.loads(message["data"])
+        except (TypeError, ValueError):
+            logger.warning("invalid_bus_message", replica_id=self.replica_id)
+            return
+
+        if envelope.get("kind") == "reply":
+            future = self._pending.get(envelope.get("correlation_id"))
+            if future is not None and not future.done():
+                future.set_result(envelope["response"])
+        elif envelope.get("kind") == "request":
+            task = asyncio.create_task(self._serve(envelope))
+            self._serving.add(task)
+            task.add_done_callback(self._serving.discard)
+
+    async def _serve(self, envelope: Dict[str, Any]) -> None:
+        try:
+            response = await self._handler(envelope["request"])
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        await self._redis.publish(
+            self._channel(envelope["reply_to"]),
+            json.dumps(
+                {
+                    "kind": "reply",
+                    "correlation_id": envelope["correlation_id"],
+                    "response": response,
+                }
+            ),
+        )
+
+    async def claim(self, info: ClusterConnectionInfo, ttl_seconds: int) -> None:
+        await self._redis.set(
+            self._cluster_key(info.cluster_id), info.model_dump_json(), ex=ttl_seconds
+        )
+
+    async def release(self, cluster_id: str) -> None:
+        import redis.exceptions  # type: ignore
+
+        key = self._cluster_key(cluster_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                raw = await pipe.get(key)
+                if raw is None or json.loads(raw).get("replica_id") != self.replica_id:
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+            except redis.exceptions.WatchError:
+                # Claimed by another replica while we were releasing
+                pass
+
+    async def lookup(self, cluster_id: str) -> Optional[ClusterConnectionInfo]:
+        raw = await self._redis.get(self._cluster_key(cluster_id))
+        if raw is None:
+            return None
+        return ClusterConnectionInfo.model_validate_json(raw)
+
+    async def list_clusters(self) -> List[ClusterConnectionInfo]:
+        keys = [
+            key async for key in self._redis.scan_iter(match=self._cluster_key("*"))
+        ]
+        if not keys:
+            return []
+        return [
+            ClusterConnectionInfo.model_validate_json(raw)
+            for raw in await self._redis.mget(keys)
+            if raw is not None
+        ]
+
+    async def forward(
+        self, replica_id: str, request: Dict[str, Any], timeout: float
+    ) -> Dict[str, Any]:
+        correlation_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[correlation_id] = future
+        try:
+            receivers = await self._redis.publish(
+                self._channel(replica_id),
+                json.dumps(
+                    {
+                        "kind": "request",
+                        "correlation_id": correlation_id,
+                        "reply_to": self.replica_id,
+                        "request": request,
+                    }
+                ),
+            )
+            if receivers == 0:
+                return {
+                    "ok": False,
+                    "error": f"Gateway replica unavailable: {replica_id}",
+                }
+            return await asyncio.wait_for(
+                future, timeout=timeout + FORWARD_GRACE_SECONDS
+            )
+        finally:
+            self._pending.pop(correlation_id, None)
+
+
+def default_replica_id() -> str:
+    """Hostname (the pod name in Kubernetes) plus a per-process suffix."""
+    return f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+
+
+def create_command_bus(settings) -> CommandBus:
+    """Build the bus selected by K8S_GATEWAY_REGISTRY_BACKEND."""
+    replica_id = settings.replica_id or default_replica_id()
+    backend = settings.registry_backend.lower()
+
+    if backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError(
+                "K8S_GATEWAY_REGISTRY_BACKEND=redis requires K8S_GATEWAY_REDIS_URL"
+            )
+        return RedisCommandBus(replica_id, redis_url=settings.redis_url)
+    if backend == "memory":
+        return InMemoryCommandBus(replica_id)
+    raise RuntimeError(f"Unknown K8S_GATEWAY_REGISTRY_BACKEND: {backend}")
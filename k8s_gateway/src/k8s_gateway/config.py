@@ -29,7 +29,17 @@ class Settings(BaseSettings):
 
     # Command execution
     command_timeout_seconds: float = 30.0
-    max_pending_commands: int = 100
+    max_pending_commands: int = 100  # In-flight commands per agent connection
+
+    # WebSocket channel: cap on a reassembled (chunked) agent response
+    max_response_bytes: int = 64 * 1024 * 1024
+
+    # Cluster registry / command bus shared by gateway replicas:
+    # "memory" (single replica) or "redis" (any replica can execute)
+    registry_backend: str = "memory"
+    redis_url: str = ""
+    replica_id: str = ""  # Defaults to hostname + random suffix
+    cluster_lease_seconds: int = 90  # Refreshed every heartbeat interval
 
     # Internal service auth
     internal_service_secret: str = ""
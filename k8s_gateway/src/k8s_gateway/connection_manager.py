@@ -9,7 +9,9 @@ from typing import Any, Dict, Optional
 import structlog
 
 from .auth import ClusterIdentity
-from .models import K8sCommand, K8sCommandResponse
+from .command_bus import CommandBus, InMemoryCommandBus, default_replica_id
+from .config import get_settings
+from .models import ClusterConnectionInfo, K8sCommand, K8sCommandResponse
 
 logger = structlog.get_logger(__name__)
 
@@ -31,6 +33,9 @@ class AgentConnection:
     node_count: Optional[int] = None
     namespace_count: Optional[int] = None
 
+    # Latest object-cache stats reported by the agent heartbeat
+    cache_stats: Optional[Dict[str, Any]] = None
+
     # Command queue for sending commands to agent
     command_queue: asyncio.Queue = field(default_factory=asyncio.Queue)
 
@@ -40,17 +45,18 @@ class AgentConnection:
 
 class ConnectionManager:
     """
-    Manages SSE connections from K8s agents.
+    Manages SSE and WebSocket connections from K8s agents.
 
     Handles:
     - Agent registration and disconnection
-    - Routing commands to agents
+    - Routing commands to agents, including agents connected to other
+      gateway replicas (via the command bus)
     - Tracking heartbeats
     - Multi-tenant isolation
     """
 
-    def __init__(self):
-        # cluster_id -> AgentConnection
+    def __init__(self, bus: Optional[CommandBus] = None):
+        # cluster_id -> AgentConnection (agents connected to this replica)
         self._connections: Dict[str, AgentConnection] = {}
 
         # team_node_id -> set of cluster_ids (for routing)
@@ -59,6 +65,77 @@ class ConnectionManager:
         # Lock for thread-safe operations
         self._lock = asyncio.Lock()
 
+        # Cluster registry + cross-replica forwarding; replaced by start()
+        self.bus: CommandBus = bus or InMemoryCommandBus(default_replica_id())
+        self._lease_task: Optional[asyncio.Task] = None
+
+    @property
+    def replica_id(self) -> str:
+        return self.bus.replica_id
+
+    async def start(self, bus: Optional[CommandBus] = None) -> None:
+        """Start serving forwarded commands and refreshing cluster leases."""
+        if bus is not None:
+            self.bus = bus
+        await self.bus.start(self._handle_forwarded)
+        self._lease_task = asyncio.create_task(self._refresh_leases())
+        logger.info(
+            "command_bus_started",
+            replica_id=self.replica_id,
+            backend=type(self.bus).__name__,
+        )
+
+    async def stop(self) -> None:
+        """Stop the lease refresher and detach from the bus."""
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            self._lease_task = None
+        for cluster_id in list(self._connections):
+            await self._release(cluster_id)
+        await self.bus.stop()
+
+    def connection_info(self, conn: AgentConnection) -> ClusterConnectionInfo:
+        """Registry record for a locally connected agent."""
+        return ClusterConnectionInfo(
+            cluster_id=conn.cluster_id,
+            cluster_name=conn.cluster_name,
+            org_id=conn.org_id,
+            team_node_id=conn.team_node_id,
+            connected_at=conn.connected_at,
+            last_heartbeat=conn.last_heartbeat,
+            agent_version=conn.agent_version,
+            kubernetes_version=conn.kubernetes_version,
+            node_count=conn.node_count,
+            cache_stats=conn.cache_stats,
+            replica_id=self.replica_id,
+        )
+
+    async def _claim(self, conn: AgentConnection) -> None:
+        try:
+            await self.bus.claim(
+                self.connection_info(conn), get_settings().cluster_lease_seconds
+            )
+        except Exception as e:
+            # The agent still works through this replica; only routing from
+            # other replicas is affected until the next lease refresh
+            logger.error(
+                "cluster_claim_failed", cluster_id=conn.cluster_id, error=str(e)
+            )
+
+    async def _release(self, cluster_id: str) -> None:
+        try:
+            await self.bus.release(cluster_id)
+        except Exception as e:
+            logger.error("cluster_release_failed", cluster_id=cluster_id, error=str(e))
+
+    async def _refresh_leases(self) -> None:
+        """Re-claim every local cluster each heartbeat interval."""
+        interval = get_settings().heartbeat_interval_seconds
+        while True:
+            await asyncio.sleep(interval)
+            for conn in list(self._connections.values()):
+                await self._claim(conn)
+
     async def register(
         self,
         identity: ClusterIdentity,
@@ -118,20 +195,30 @@ class ConnectionManager:
                 org_id=identity.org_id,
                 team_node_id=identity.team_node_id,
                 agent_version=agent_version,
+                replica_id=self.replica_id,
             )
 
-            return conn
+        await self._claim(conn)
+        return conn
 
-    async def unregister(self, cluster_id: str) -> None:
+    async def unregister(
+        self, cluster_id: str, conn: Optional[AgentConnection] = None
+    ) -> None:
         """
         Unregister an agent connection.
 
         Args:
             cluster_id: ID of the cluster to unregister
+            conn: If given, only unregister if it is still the active
+                connection (a reconnect may already have replaced it)
         """
         async with self._lock:
+            if conn is not None and self._connections.get(cluster_id) is not conn:
+                return
             await self._unregister_unsafe(cluster_id)
 
+        await self._release(cluster_id)
+
     async def _unregister_unsafe(self, cluster_id: str) -> None:
         """Unregister without lock (internal use)."""
         conn = self._connections.pop(cluster_id, None)
@@ -173,12 +260,31 @@ class ConnectionManager:
         """Get all active connections (for monitoring)."""
         return list(self._connections.values())
 
-    def update_heartbeat(self, cluster_id: str) -> bool:
+    async def get_cluster_info(
+        self, cluster_id: str
+    ) -> Optional[ClusterConnectionInfo]:
+        """Connection info for a cluster connected to any gateway replica."""
+        conn = self._connections.get(cluster_id)
+        if conn is not None:
+            return self.connection_info(conn)
+        return await self.bus.lookup(cluster_id)
+
+    async def list_cluster_info(self) -> list[ClusterConnectionInfo]:
+        """Connection info for clusters on all replicas (local entries win)."""
+        clusters = {info.cluster_id: info for info in await self.bus.list_clusters()}
+        for conn in self._connections.values():
+            clusters[conn.cluster_id] = self.connection_info(conn)
+        return list(clusters.values())
+
+    def update_heartbeat(
+        self, cluster_id: str, cache_stats: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         Update the heartbeat timestamp for a cluster.
 
         Args:
             cluster_id: ID of the cluster
+            cache_stats: Object-cache stats reported by the agent (optional)
 
         Returns:
             True if updated, False if cluster not found
@@ -186,6 +292,8 @@ class ConnectionManager:
         conn = self._connections.get(cluster_id)
         if conn:
             conn.last_heartbeat = datetime.utcnow()
+            if cache_stats is not None:
+                conn.cache_stats = cache_stats
             return True
         return False
 
@@ -211,12 +319,20 @@ class ConnectionManager:
         Raises:
             ValueError: If cluster not connected
             asyncio.TimeoutError: If command times out
+            RuntimeError: If the agent already has max_pending_commands in flight
             Exception: If command execution fails
         """
         conn = self._connections.get(cluster_id)
         if conn is None:
             raise ValueError(f"Cluster not connected: {cluster_id}")
 
+        max_pending = get_settings().max_pending_commands
+        if len(conn.pending_requests) >= max_pending:
+            raise RuntimeError(
+                f"Too many in-flight commands for cluster {cluster_id} "
+                f"(limit {max_pending})"
+            )
+
         # Generate request ID
         request_id = f"req_{uuid.uuid4().hex[:12]}"
 
@@ -262,6 +378,58 @@ class ConnectionManager:
             # Clean up pending request
             conn.pending_requests.pop(request_id, None)
 
+    async def execute(
+        self,
+        cluster_id: str,
+        command: str,
+        params: Dict[str, Any],
+        timeout: float = 30.0,
+    ) -> Dict[str, Any]:
+        """
+        Run a command on a cluster connected to any gateway replica.
+
+        Local agents are sent the command directly; otherwise the command is
+        forwarded to the owning replica over the bus. Raises the same
+        exceptions as send_command.
+        """
+        if cluster_id in self._connections:
+            return await self.send_command(cluster_id, command, params, timeout)
+
+        info = await self.bus.lookup(cluster_id)
+        if info is None or info.replica_id in (None, self.replica_id):
+            raise ValueError(f"Cluster not connected: {cluster_id}")
+
+        reply = await self.bus.forward(
+            info.replica_id,
+            {
+                "cluster_id": cluster_id,
+                "command": command,
+                "params": params,
+                "timeout": timeout,
+            },
+            timeout,
+        )
+        if reply.get("timed_out"):
+            raise asyncio.TimeoutError()
+        if not reply.get("ok"):
+            raise Exception(reply.get("error") or "Command failed")
+        return reply.get("result") or {}
+
+    async def _handle_forwarded(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command forwarded from another replica against a local agent."""
+        try:
+            result = await self.send_command(
+                request["cluster_id"],
+                request["command"],
+                request.get("params") or {},
+                request.get("timeout", 30.0),
+            )
+            return {"ok": True, "result": result}
+        except asyncio.TimeoutError:
+            return {"ok": False, "timed_out": True, "error": "Command timed out"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     def handle_response(self, cluster_id: str, response: K8sCommandResponse) -> bool:
         """
         Handle a command response from an agent.
@@ -324,12 +492,18 @@ class ConnectionManager:
         )
 
         return {
+            "replica_id": self.replica_id,
             "total_connections": total_connections,
             "teams_with_connections": teams_with_connections,
             "pending_commands": pending_commands,
             "connections_by_team": {
                 team: len(clusters) for team, clusters in self._by_team.items()
             },
+            "agent_cache_hit_rates": {
+                cluster_id: conn.cache_stats.get("hit_rate")
+                for cluster_id, conn in self._connections.items()
+                if conn.cache_stats
+            },
         }
 
 
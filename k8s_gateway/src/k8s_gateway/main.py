@@ -9,9 +9,17 @@ from typing import Optional
 
 import httpx
 import structlog
-from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.responses import JSONResponse
 from prometheus_client import Counter, Gauge, Histogram, generate_latest
+from pydantic import ValidationError
 from sse_starlette.sse import EventSourceResponse
 
 from .auth import (
@@ -19,9 +27,12 @@ from .auth import (
     validate_internal_service,
     validate_k8s_agent_token,
 )
+from .channel import ChannelError, ChunkAssembler, encode_message
+from .command_bus import create_command_bus
 from .config import get_settings
-from .connection_manager import connection_manager
+from .connection_manager import AgentConnection, connection_manager
 from .models import (
+    AgentHeartbeat,
     ClusterConnectionInfo,
     ExecuteCommandRequest,
     ExecuteCommandResponse,
@@ -49,6 +60,9 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# WebSocket close code for rejected agent credentials (4000-4999 are app-defined)
+WS_CLOSE_UNAUTHORIZED = 4401
+
 # Prometheus metrics
 AGENT_CONNECTIONS = Gauge(
     "k8s_gateway_agent_connections",
@@ -71,8 +85,10 @@ COMMAND_DURATION = Histogram(
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("k8s_gateway_starting")
+    await connection_manager.start(create_command_bus(get_settings()))
     yield
     logger.info("k8s_gateway_stopping")
+    await connection_manager.stop()
 
 
 settings = get_settings()
@@ -151,8 +167,6 @@ async def agent_connect(
     - command: K8s command to execute
     - heartbeat: Keep-alive message
     """
-    settings = get_settings()
-
     # Authenticate
     try:
         identity = await validate_k8s_agent_token(authorization)
@@ -160,81 +174,16 @@ async def agent_connect(
         logger.warning("agent_auth_failed", error=str(e))
         raise HTTPException(status_code=401, detail=str(e))
 
-    # Parse registration info from query params (optional)
-    agent_version = request.query_params.get("agent_version")
-    kubernetes_version = request.query_params.get("kubernetes_version")
-    node_count = request.query_params.get("node_count")
-    namespace_count = request.query_params.get("namespace_count")
-
-    # Register connection
-    conn = await connection_manager.register(
-        identity=identity,
-        agent_version=agent_version,
-        kubernetes_version=kubernetes_version,
-        node_count=int(node_count) if node_count else None,
-        namespace_count=int(namespace_count) if namespace_count else None,
-    )
-
-    # Update Prometheus metric
-    AGENT_CONNECTIONS.labels(team_node_id=identity.team_node_id).inc()
-
-    # Update cluster status in config_service
-    await _update_cluster_status(
-        identity.cluster_id,
-        status="connected",
-        agent_version=agent_version,
-        kubernetes_version=kubernetes_version,
-        node_count=int(node_count) if node_count else None,
-        namespace_count=int(namespace_count) if namespace_count else None,
-    )
+    conn = await _register_agent(identity, request.query_params)
 
     async def event_generator():
         """Generate SSE events for the agent."""
         try:
-            # Send connected event
-            yield {
-                "event": "connected",
-                "data": json.dumps(
-                    {
-                        "cluster_id": identity.cluster_id,
-                        "message": "Connected to K8s Gateway",
-                    }
-                ),
-            }
-
-            while True:
-                try:
-                    # Wait for command or heartbeat timeout
-                    cmd: K8sCommand = await asyncio.wait_for(
-                        conn.command_queue.get(),
-                        timeout=settings.heartbeat_interval_seconds,
-                    )
-
-                    # Send command event
-                    yield {
-                        "event": "command",
-                        "id": cmd.request_id,
-                        "data": json.dumps(
-                            {
-                                "request_id": cmd.request_id,
-                                "command": cmd.command,
-                                "params": cmd.params,
-                                "timeout": cmd.timeout,
-                            }
-                        ),
-                    }
-
-                except asyncio.TimeoutError:
-                    # Send heartbeat
-                    connection_manager.update_heartbeat(identity.cluster_id)
-                    yield {
-                        "event": "heartbeat",
-                        "data": json.dumps(
-                            {
-                                "timestamp": datetime.utcnow().isoformat(),
-                            }
-                        ),
-                    }
+            async for event_type, payload in _agent_events(conn, identity):
+                event = {"event": event_type, "data": json.dumps(payload)}
+                if event_type == "command":
+                    event["id"] = payload["request_id"]
+                yield event
 
         except asyncio.CancelledError:
             logger.info("agent_connection_cancelled", cluster_id=identity.cluster_id)
@@ -243,19 +192,70 @@ async def agent_connect(
                 "agent_connection_error", cluster_id=identity.cluster_id, error=str(e)
             )
         finally:
-            # Clean up on disconnect
-            await connection_manager.unregister(identity.cluster_id)
-            AGENT_CONNECTIONS.labels(team_node_id=identity.team_node_id).dec()
-
-            # Update cluster status
-            await _update_cluster_status(
-                identity.cluster_id,
-                status="disconnected",
-            )
+            await _unregister_agent(conn, identity)
 
     return EventSourceResponse(event_generator())
 
 
+@app.websocket("/agent/ws")
+@app.websocket("/gateway/agent/ws")
+async def agent_websocket(websocket: WebSocket):
+    """
+    WebSocket endpoint for K8s agents (multiplexed alternative to SSE).
+
+    A single connection carries commands to the agent and responses back,
+    so agents don't open a new HTTP request per response. Large responses
+    arrive as compressed binary chunks which may interleave across
+    requests (see channel.py for the framing).
+    """
+    try:
+        identity = await validate_k8s_agent_token(
+            websocket.headers.get("authorization", "")
+        )
+    except AuthError as e:
+        logger.warning("agent_auth_failed", error=str(e))
+        # Accept before closing: a close during the handshake is sent as
+        # HTTP 403, which agents read as "gateway has no WebSocket endpoint"
+        # and fall back to SSE for good.
+        await websocket.accept()
+        await websocket.close(code=WS_CLOSE_UNAUTHORIZED, reason=str(e))
+        return
+
+    await websocket.accept()
+    conn = await _register_agent(identity, websocket.query_params)
+
+    async def send_events():
+        async for event_type, payload in _agent_events(conn, identity):
+            await websocket.send_text(encode_message(event_type, payload))
+
+    sender = asyncio.create_task(send_events())
+    assembler = ChunkAssembler(get_settings().max_response_bytes)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            _handle_agent_message(identity, assembler, message)
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(
+            "agent_connection_error", cluster_id=identity.cluster_id, error=str(e)
+        )
+    finally:
+        sender.cancel()
+        try:
+            await sender
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(
+                "agent_sender_error", cluster_id=identity.cluster_id, error=str(e)
+            )
+        await _unregister_agent(conn, identity)
+
+
 @app.post("/agent/response/{request_id}")
 @app.post("/gateway/agent/response/{request_id}")
 async def agent_response(
@@ -292,12 +292,14 @@ async def agent_response(
 @app.post("/agent/heartbeat")
 @app.post("/gateway/agent/heartbeat")
 async def agent_heartbeat(
+    body: Optional[AgentHeartbeat] = None,
     authorization: str = Header(default=""),
 ):
     """
     Alternative heartbeat endpoint (in addition to SSE heartbeats).
 
     Agents can POST here if they want to send heartbeats outside the SSE stream.
+    The optional body carries agent-side object-cache stats.
     """
     # Authenticate
     try:
@@ -305,7 +307,9 @@ async def agent_heartbeat(
     except AuthError as e:
         raise HTTPException(status_code=401, detail=str(e))
 
-    updated = connection_manager.update_heartbeat(identity.cluster_id)
+    updated = connection_manager.update_heartbeat(
+        identity.cluster_id, cache_stats=body.cache_stats if body else None
+    )
 
     if not updated:
         raise HTTPException(status_code=404, detail="Agent not connected")
@@ -330,16 +334,17 @@ async def execute_command(
 
     Flow:
     1. AI agent calls this endpoint with cluster_id and command
-    2. Gateway finds the connected agent and sends command via SSE
-    3. Agent executes command and POSTs response
+    2. Gateway finds the replica holding the agent's connection (forwarding
+       over the command bus if it isn't this one) and sends the command
+    3. Agent executes command and sends the response back
     4. Gateway returns result to AI agent
     """
     # Validate internal service header
     if not validate_internal_service(x_internal_service):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    # Check if cluster is connected
-    conn = connection_manager.get_connection(body.cluster_id)
+    # Check if cluster is connected (to this or another gateway replica)
+    conn = await connection_manager.get_cluster_info(body.cluster_id)
     if conn is None:
         return ExecuteCommandResponse(
             ok=False,
@@ -363,7 +368,7 @@ async def execute_command(
     # Execute command with metrics
     start_time = datetime.utcnow()
     try:
-        result = await connection_manager.send_command(
+        result = await connection_manager.execute(
             cluster_id=body.cluster_id,
             command=body.command,
             params=body.params,
@@ -410,33 +415,18 @@ async def list_connected_clusters(
     if not validate_internal_service(x_internal_service):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    connections = connection_manager.get_all_connections()
+    clusters = await connection_manager.list_cluster_info()
 
     # Filter by org (preferred) or team
     if org_id:
-        connections = [c for c in connections if c.org_id == org_id]
+        clusters = [c for c in clusters if c.org_id == org_id]
     elif team_node_id:
-        connections = [c for c in connections if c.team_node_id == team_node_id]
-
-    clusters = [
-        ClusterConnectionInfo(
-            cluster_id=c.cluster_id,
-            cluster_name=c.cluster_name,
-            org_id=c.org_id,
-            team_node_id=c.team_node_id,
-            connected_at=c.connected_at,
-            last_heartbeat=c.last_heartbeat,
-            agent_version=c.agent_version,
-            kubernetes_version=c.kubernetes_version,
-            node_count=c.node_count,
-        )
-        for c in connections
-    ]
+        clusters = [c for c in clusters if c.team_node_id == team_node_id]
 
     return ListClustersResponse(clusters=clusters, total=len(clusters))
 
 
-@app.get("/internal/clusters/{cluster_id}")
+@app.get("/internal/clusters/{cluster_id}", response_model=ClusterConnectionInfo)
 async def get_cluster_connection(
     cluster_id: str,
     x_internal_service: Optional[str] = Header(default=None),
@@ -446,21 +436,11 @@ async def get_cluster_connection(
     if not validate_internal_service(x_internal_service):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    conn = connection_manager.get_connection(cluster_id)
-    if conn is None:
+    info = await connection_manager.get_cluster_info(cluster_id)
+    if info is None:
         raise HTTPException(status_code=404, detail="Cluster not connected")
 
-    return ClusterConnectionInfo(
-        cluster_id=conn.cluster_id,
-        cluster_name=conn.cluster_name,
-        org_id=conn.org_id,
-        team_node_id=conn.team_node_id,
-        connected_at=conn.connected_at,
-        last_heartbeat=conn.last_heartbeat,
-        agent_version=conn.agent_version,
-        kubernetes_version=conn.kubernetes_version,
-        node_count=conn.node_count,
-    )
+    return info
 
 
 # =============================================================================
@@ -468,6 +448,152 @@ async def get_cluster_connection(
 # =============================================================================
 
 
+async def _register_agent(identity, query_params) -> AgentConnection:
+    """Register an agent connection from its registration query params."""
+    agent_version = query_params.get("agent_version")
+    kubernetes_version = query_params.get("kubernetes_version")
+    node_count = query_params.get("node_count")
+    namespace_count = query_params.get("namespace_count")
+
+    conn = await connection_manager.register(
+        identity=identity,
+        agent_version=agent_version,
+        kubernetes_version=kubernetes_version,
+        node_count=int(node_count) if node_count else None,
+        namespace_count=int(namespace_count) if namespace_count else None,
+    )
+
+    # Update Prometheus metric
+    AGENT_CONNECTIONS.labels(team_node_id=identity.team_node_id).inc()
+
+    # Update cluster status in config_service
+    await _update_cluster_status(
+        identity.cluster_id,
+        status="connected",
+        agent_version=agent_version,
+        kubernetes_version=kubernetes_version,
+        node_count=int(node_count) if node_count else None,
+        namespace_count=int(namespace_count) if namespace_count else None,
+    )
+    return conn
+
+
+async def _unregister_agent(conn: AgentConnection, identity) -> None:
+    """Clean up after an agent disconnects."""
+    await connection_manager.unregister(identity.cluster_id, conn=conn)
+    AGENT_CONNECTIONS.labels(team_node_id=identity.team_node_id).dec()
+
+    # Update cluster status
+    await _update_cluster_status(
+        identity.cluster_id,
+        status="disconnected",
+    )
+
+
+async def _agent_events(conn: AgentConnection, identity):
+    """
+    Yield (event_type, payload) pairs to send to a connected agent.
+
+    Shared by the SSE and WebSocket transports: a connected event, then
+    commands as they are queued, with heartbeats when idle.
+    """
+    settings = get_settings()
+
+    yield "connected", {
+        "cluster_id": identity.cluster_id,
+        "message": "Connected to K8s Gateway",
+    }
+
+    while True:
+        try:
+            # Wait for command or heartbeat timeout
+            cmd: K8sCommand = await asyncio.wait_for(
+                conn.command_queue.get(),
+                timeout=settings.heartbeat_interval_seconds,
+            )
+        except asyncio.TimeoutError:
+            connection_manager.update_heartbeat(identity.cluster_id)
+            yield "heartbeat", {"timestamp": datetime.utcnow().isoformat()}
+            continue
+
+        yield "command", {
+            "request_id": cmd.request_id,
+            "command": cmd.command,
+            "params": cmd.params,
+            "timeout": cmd.timeout,
+        }
+
+
+def _handle_agent_message(identity, assembler: ChunkAssembler, message: dict) -> None:
+    """Apply one agent WebSocket frame.
+
+    A bad frame only fails the request it belongs to (or is dropped if it
+    can't be attributed); the channel and the agent's other in-flight
+    requests carry on.
+    """
+    cluster_id = identity.cluster_id
+
+    if message.get("bytes") is not None:
+        try:
+            response = assembler.feed_binary(message["bytes"])
+        except ChannelError as e:
+            logger.warning(
+                "invalid_agent_chunk",
+                cluster_id=cluster_id,
+                request_id=e.request_id,
+                error=str(e),
+            )
+            if e.request_id is not None:
+                _fail_request(cluster_id, e.request_id, str(e))
+            return
+        if response is not None:
+            connection_manager.handle_response(cluster_id, response)
+        return
+
+    try:
+        payload = json.loads(message.get("text") or "")
+    except json.JSONDecodeError as e:
+        logger.warning("invalid_agent_message", cluster_id=cluster_id, error=str(e))
+        return
+    if not isinstance(payload, dict):
+        logger.warning("invalid_agent_message", cluster_id=cluster_id)
+        return
+
+    message_type = payload.pop("type", None)
+    if message_type == "response":
+        try:
+            response = K8sCommandResponse(**payload)
+        except ValidationError as e:
+            request_id = payload.get("request_id")
+            logger.warning(
+                "invalid_agent_response",
+                cluster_id=cluster_id,
+                request_id=request_id,
+                error=str(e),
+            )
+            if isinstance(request_id, str):
+                _fail_request(cluster_id, request_id, "Invalid response from agent")
+            return
+        connection_manager.handle_response(cluster_id, response)
+    elif message_type == "heartbeat":
+        connection_manager.update_heartbeat(
+            cluster_id, cache_stats=payload.get("cache_stats")
+        )
+    else:
+        logger.warning(
+            "unknown_agent_message",
+            cluster_id=cluster_id,
+            message_type=message_type,
+        )
+
+
+def _fail_request(cluster_id: str, request_id: str, error: str) -> None:
+    """Complete a pending request with an error."""
+    connection_manager.handle_response(
+        cluster_id, K8sCommandResponse(request_id=request_id, ok=False, error=error)
+    )
+
+
 async def _update_cluster_status(
     cluster_id: str,
     status: str,
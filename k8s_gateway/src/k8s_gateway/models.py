@@ -25,6 +25,7 @@ class AgentHeartbeat(BaseModel):
     """Heartbeat message from agent."""
 
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    cache_stats: Optional[Dict[str, Any]] = None  # Agent object-cache hit rates
 
 
 # =============================================================================
@@ -86,6 +87,8 @@ class ClusterConnectionInfo(BaseModel):
     agent_version: Optional[str] = None
     kubernetes_version: Optional[str] = None
     node_count: Optional[int] = None
+    cache_stats: Optional[Dict[str, Any]] = None
+    replica_id: Optional[str] = None  # Gateway replica holding the agent stream
 
 
 class ListClustersResponse(BaseModel):
@@ -0,0 +1,140 @@
+"""Tests for the agent WebSocket endpoint and its per-message error handling."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+from k8s_gateway.auth import AuthError, ClusterIdentity
+from k8s_gateway.channel import ChunkAssembler
+from k8s_gateway.connection_manager import ConnectionManager
+from starlette.websockets import WebSocketDisconnect
+
+from k8s_gateway import main
+
+IDENTITY = ClusterIdentity(
+    cluster_id="c1",
+    cluster_name="prod",
+    org_id="org1",
+    team_node_id="team1",
+    token_id="tok1",
+)
+
+
+def _chunk(request_id: str, seq: int, body: bytes, final: bool = True) -> bytes:
+    header = {"type": "chunk", "request_id": request_id, "seq": seq, "final": final}
+    return json.dumps(header).encode() + b"\n" + body
+
+
+@pytest.fixture()
+def manager(monkeypatch):
+    manager = ConnectionManager()
+    monkeypatch.setattr(main, "connection_manager", manager)
+    monkeypatch.setattr(main, "_update_cluster_status", AsyncMock())
+    return manager
+
+
+@pytest.fixture()
+def agent_auth(monkeypatch):
+    monkeypatch.setattr(
+        main, "validate_k8s_agent_token", AsyncMock(return_value=IDENTITY)
+    )
+
+
+async def test_bad_frames_fail_only_their_request(manager):
+    conn = await manager.register(IDENTITY)
+    loop = asyncio.get_running_loop()
+    pending = {rid: loop.create_future() for rid in ("bad", "bad-json", "good")}
+    conn.pending_requests.update(pending)
+    assembler = ChunkAssembler(max_response_bytes=1024)
+
+    def feed(message):
+        main._handle_agent_message(IDENTITY, assembler, message)
+
+    # Out-of-order chunk, oversize chunk, invalid response: each fails its request
+    feed({"type": "websocket.receive", "bytes": _chunk("bad", 1, b"{}")})
+    feed({"type": "websocket.receive", "bytes": _chunk("bad-json", 0, b"{nope")})
+    # Unattributable frames are dropped
+    feed({"type": "websocket.receive", "bytes": b"no header"})
+    feed({"type": "websocket.receive", "text": "not json"})
+    feed({"type": "websocket.receive", "text": '{"type": "response", "ok": true}'})
+    # Later responses on the same channel still land
+    feed(
+        {
+            "type": "websocket.receive",
+            "text": json.dumps(
+                {"type": "response", "request_id": "good", "ok": True, "result": {}}
+            ),
+        }
+    )
+
+    assert "Out-of-order" in str(pending["bad"].exception())
+    assert "Undecodable" in str(pending["bad-json"].exception())
+    assert pending["good"].result() == {}
+    assert manager.get_connection("c1") is conn
+
+
+async def test_oversize_response_fails_request(manager):
+    conn = await manager.register(IDENTITY)
+    future = asyncio.get_running_loop().create_future()
+    conn.pending_requests["big"] = future
+    assembler = ChunkAssembler(max_response_bytes=10)
+
+    main._handle_agent_message(
+        IDENTITY,
+        assembler,
+        {"type": "websocket.receive", "bytes": _chunk("big", 0, b"x" * 11, False)},
+    )
+
+    assert "too large" in str(future.exception())
+
+
+def test_bad_frame_keeps_other_requests_running(manager, agent_auth):
+    with TestClient(main.app) as client:
+        with client.websocket_connect("/agent/ws") as ws:
+            assert json.loads(ws.receive_text())["type"] == "connected"
+            # Two commands in flight on the same channel
+            futures = [
+                client.portal.start_task_soon(
+                    manager.send_command, "c1", "list_pods", {}, 5.0
+                )
+                for _ in range(2)
+            ]
+            bad, good = (json.loads(ws.receive_text())["request_id"] for _ in futures)
+
+            ws.send_bytes(_chunk(bad, 1, b"{}"))  # out of order
+            ws.send_text("garbage")
+            ws.send_text(
+                json.dumps(
+                    {
+                        "type": "response",
+                        "request_id": good,
+                        "ok": True,
+                        "result": {"pods": []},
+                    }
+                )
+            )
+
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result(timeout=5))
+                except Exception as e:
+                    outcomes.append(str(e))
+            assert sorted(outcomes, key=str) == sorted(
+                [{"pods": []}, f"Out-of-order chunk for {bad}"], key=str
+            )
+            assert manager.get_connection("c1") is not None
+
+
+def test_auth_failure_closes_after_accept(manager, monkeypatch):
+    monkeypatch.setattr(
+        main, "validate_k8s_agent_token", AsyncMock(side_effect=AuthError("bad token"))
+    )
+    with TestClient(main.app) as client:
+        # The handshake succeeds (no HTTP 403), then the policy close arrives
+        with client.websocket_connect("/agent/ws") as ws:
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_text()
+    assert exc.value.code == main.WS_CLOSE_UNAUTHORIZED
@@ -0,0 +1,137 @@
+"""Tests for the in-memory cluster registry / command bus and cross-replica routing."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from k8s_gateway.auth import ClusterIdentity
+from k8s_gateway.command_bus import InMemoryCommandBus, InMemoryHub
+from k8s_gateway.connection_manager import ConnectionManager
+from k8s_gateway.models import ClusterConnectionInfo, K8sCommandResponse
+
+
+def _info(cluster_id: str, replica_id: str) -> ClusterConnectionInfo:
+    now = datetime.utcnow()
+    return ClusterConnectionInfo(
+        cluster_id=cluster_id,
+        cluster_name=cluster_id,
+        org_id="org1",
+        team_node_id="team1",
+        connected_at=now,
+        last_heartbeat=now,
+        replica_id=replica_id,
+    )
+
+
+def _identity(cluster_id: str) -> ClusterIdentity:
+    return ClusterIdentity(
+        cluster_id=cluster_id,
+        cluster_name=cluster_id,
+        org_id="org1",
+        team_node_id="team1",
+        token_id="tok1",
+    )
+
+
+async def test_claim_release_and_takeover():
+    hub = InMemoryHub()
+    a = InMemoryCommandBus("a", hub=hub)
+    b = InMemoryCommandBus("b", hub=hub)
+
+    await a.claim(_info("c1", "a"), ttl_seconds=60)
+    assert (await b.lookup("c1")).replica_id == "a"
+
+    # The agent reconnects to b; a's late release must not drop b's claim
+    await b.claim(_info("c1", "b"), ttl_seconds=60)
+    await a.release("c1")
+    assert (await a.lookup("c1")).replica_id == "b"
+    assert [info.cluster_id for info in await a.list_clusters()] == ["c1"]
+
+    await b.release("c1")
+    assert await a.lookup("c1") is None
+
+
+async def test_expired_lease_is_not_routable():
+    bus = InMemoryCommandBus("a")
+    await bus.claim(_info("c1", "a"), ttl_seconds=-1)
+    assert await bus.list_clusters() == []
+    assert await bus.lookup("c1") is None
+
+
+async def test_forward_delivers_to_owner_and_returns_reply():
+    hub = InMemoryHub()
+    owner = InMemoryCommandBus("owner", hub=hub)
+    sender = InMemoryCommandBus("sender", hub=hub)
+    received = []
+
+    async def handler(request):
+        received.append(request)
+        request["mutated"] = True
+        return {"ok": True, "result": {"echo": request["command"]}}
+
+    await owner.start(handler)
+    request = {"cluster_id": "c1", "command": "list_pods"}
+    reply = await sender.forward("owner", request, timeout=1)
+
+    assert reply == {"ok": True, "result": {"echo": "list_pods"}}
+    assert received[0]["command"] == "list_pods"
+    assert "mutated" not in request  # handler gets its own copy
+
+    # Once the owner stops, forwards fail fast instead of hanging
+    await owner.stop()
+    reply = await sender.forward("owner", request, timeout=1)
+    assert reply["ok"] is False
+    assert "unavailable" in reply["error"]
+
+
+@pytest.fixture()
+async def replicas():
+    hub = InMemoryHub()
+    a = ConnectionManager()
+    b = ConnectionManager()
+    await a.start(InMemoryCommandBus("replica-a", hub=hub))
+    await b.start(InMemoryCommandBus("replica-b", hub=hub))
+    yield a, b
+    await a.stop()
+    await b.stop()
+
+
+async def _answer_next(manager: ConnectionManager, cluster_id: str, **response):
+    cmd = await manager.get_connection(cluster_id).command_queue.get()
+    manager.handle_response(
+        cluster_id, K8sCommandResponse(request_id=cmd.request_id, **response)
+    )
+    return cmd
+
+
+async def test_execute_routes_to_owning_replica(replicas):
+    a, b = replicas
+    await a.register(_identity("c1"))
+
+    agent = asyncio.create_task(_answer_next(a, "c1", ok=True, result={"pods": []}))
+    assert await b.execute("c1", "list_pods", {"namespace": "x"}, timeout=2) == {
+        "pods": []
+    }
+    cmd = await agent
+    assert (cmd.command, cmd.params) == ("list_pods", {"namespace": "x"})
+
+    agent = asyncio.create_task(_answer_next(a, "c1", ok=False, error="forbidden"))
+    with pytest.raises(Exception, match="forbidden"):
+        await b.execute("c1", "list_pods", {}, timeout=2)
+    await agent
+
+    # The agent never answers: the owner's timeout comes back as TimeoutError
+    with pytest.raises(asyncio.TimeoutError):
+        await b.execute("c1", "list_pods", {}, timeout=0.05)
+
+
+async def test_unknown_or_released_cluster_raises(replicas):
+    a, b = replicas
+    with pytest.raises(ValueError):
+        await b.execute("missing", "list_pods", {})
+
+    conn = await a.register(_identity("c1"))
+    assert (await b.get_cluster_info("c1")).replica_id == "replica-a"
+    await a.unregister("c1", conn=conn)
+    with pytest.raises(ValueError):
+        await b.execute("c1", "list_pods", {})
@@ -0,0 +1,146 @@
+"""Benchmark the anomaly engine on long synthetic metric series.
+
+Builds a noisy series with daily seasonality, a few injected spikes and two
+level shifts, then times each engine function against the pure-Python
+approach the anomaly tools used before (global mean/stdev z-scores, a
+sliding-window change-point scan, a single-lag Pearson loop). Reports how
+many injected spikes each detector finds and how many other points it
+flags, and where the change points land.
+
+The legacy sliding-window scan is quadratic in practice for large windows,
+so it is only timed on the first --legacy-points points.
+
+Usage:
+    python benchmarks/bench_anomaly.py
+    python benchmarks/bench_anomaly.py --points 1000000 --window 60
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from incidentfox_mcp.utils import anomaly_engine  # noqa: E402
+
+PERIOD = 1440  # one day at 1m resolution
+
+
+def synthetic_series(points: int, seed: int = 0):
+    """Seasonal noise with spikes and two level shifts; returns (x, spikes, shifts)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(points)
+    x = 100 + 20 * np.sin(2 * np.pi * t / PERIOD) + rng.normal(0, 2, points)
+    shifts = [points // 3, 2 * points // 3]
+    x[shifts[0] :] += 15
+    x[shifts[1] :] -= 25
+    spikes = rng.choice(np.arange(PERIOD, points), size=20, replace=False)
+    x[spikes] += rng.choice([-1, 1], size=len(spikes)) * 40
+    return x, set(int(i) for i in spikes), shifts
+
+
+def legacy_zscores(data: list) -> list:
+    mean = statistics.mean(data)
+    std = statistics.stdev(data)
+    return [(v - mean) / std for v in data]
+
+
+def legacy_change_points(data: list, window: int) -> list:
+    points = []
+    for i in range(window, len(data) - window + 1):
+        before = data[i - window : i]
+        mean_before = statistics.mean(before)
+        std_before = statistics.stdev(before)
+        change = statistics.mean(data[i : i + window]) - mean_before
+        if std_before > 0 and abs(change / std_before) > 2:
+            points.append(i)
+    return points
+
+
+def legacy_correlation(a: list, b: list) -> float:
+    n = len(a)
+    mean_a = statistics.mean(a)
+    mean_b = statistics.mean(b)
+    covariance = sum((a[i] - mean_a) * (b[i] - mean_b) for i in range(n)) / n
+    return covariance / (statistics.stdev(a) * statistics.stdev(b))
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def report_detection(label, z, spikes, threshold, ms):
+    flagged = set(np.flatnonzero(np.abs(np.nan_to_num(z)) > threshold).tolist())
+    found = len(flagged & spikes)
+    print(
+        f"{label:>22}: {ms:9.1f} ms  spikes found {found:2d}/{len(spikes)}  "
+        f"other points flagged {len(flagged - spikes):6d}"
+    )
+
+
+def main(args):
+    x, spikes, shifts = synthetic_series(args.points)
+    data = x.tolist()
+    print(f"points: {args.points}  spikes: {len(spikes)}  level shifts at {shifts}")
+    print(f"threshold: {args.threshold}  window: {args.window}\n")
+
+    z, ms = timed(legacy_zscores, data)
+    report_detection("legacy global (py)", np.array(z), spikes, args.threshold, ms)
+    for label, method, kwargs in (
+        ("global", "global", {}),
+        ("robust", "robust", {}),
+        ("rolling", "rolling", {"window": args.window}),
+        ("ewma", "ewma", {"alpha": 0.1}),
+        ("seasonal", "seasonal", {"period": PERIOD}),
+    ):
+        (z, _, _), ms = timed(anomaly_engine.score, x, method, **kwargs)
+        report_detection(label, z, spikes, args.threshold, ms)
+
+    print()
+    legacy_n = min(args.legacy_points, args.points)
+    found, ms = timed(legacy_change_points, data[:legacy_n], 5)
+    print(
+        f"{'legacy windows (py)':>22}: {ms:9.1f} ms  on first {legacy_n} points, "
+        f"{len(found)} change points flagged"
+    )
+    # Change points are searched after removing the daily profile
+    phase = np.arange(args.points) % PERIOD
+    profile = np.array([np.median(x[phase == p]) for p in range(PERIOD)])
+    points, ms = timed(anomaly_engine.change_points, x - profile[phase], 30)
+    print(
+        f"{'cusum segmentation':>22}: {ms:9.1f} ms  change points at "
+        f"{[p['index'] for p in points]}"
+    )
+
+    print()
+    rng = np.random.default_rng(1)
+    follower = np.roll(x, 15) + rng.normal(0, 2, args.points)
+    corr, ms = timed(legacy_correlation, data, follower.tolist())
+    print(f"{'legacy pearson (py)':>22}: {ms:9.1f} ms  lag 0 only, r={corr:.3f}")
+    (lags, corrs), ms = timed(anomaly_engine.lagged_correlation, x, follower, 120)
+    best = int(np.nanargmax(corrs))
+    print(
+        f"{'lagged (fft)':>22}: {ms:9.1f} ms  {len(lags)} lags, "
+        f"best lag {lags[best]} r={corrs[best]:.3f}"
+    )
+
+    print()
+    _, ms = timed(statistics.quantiles, data, n=100)
+    print(f"{'legacy percentiles':>22}: {ms:9.1f} ms")
+    _, ms = timed(anomaly_engine.percentiles, x)
+    print(f"{'partition percentiles':>22}: {ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--threshold", type=float, default=4.0)
+    parser.add_argument("--legacy-points", type=int, default=20_000)
+    main(parser.parse_args())
@@ -1,21 +1,34 @@
 """Anomaly detection and metrics analysis tools.
 
 Provides statistical analysis tools:
-- detect_anomalies: Z-score based anomaly detection
-- correlate_metrics: Find metric correlations
-- find_change_point: Detect when behavior changed
+- detect_anomalies: Rolling/robust, EWMA or seasonal z-score anomaly detection
+- correlate_metrics: Find metric correlations, including lagged ones
+- find_change_point: Detect when behavior changed (CUSUM binary segmentation)
 - forecast_metric: Linear regression forecasting
 - analyze_metric_distribution: Distribution analysis with percentiles/SLO insights
 - prophet_detect_anomalies: Prophet-based seasonal anomaly detection
 - prophet_forecast: Prophet forecasting with uncertainty
 - prophet_decompose: Trend/seasonality decomposition
+
+The statistics run on NumPy arrays (utils/anomaly_engine.py). Besides JSON
+arrays, the series inputs accept "prometheus:<PromQL>" or "datadog:<query>"
+to fetch full series in-process instead of passing them through the agent.
 """
 
 import json
 import statistics
+from datetime import datetime, timezone
 
+import numpy as np
 from mcp.server.fastmcp import FastMCP
 
+from ..utils import anomaly_engine
+from .datadog import query_metric_series
+from .prometheus import query_range_series
+
+# Anomalies listed per response; the strongest are kept beyond this
+MAX_REPORTED_ANOMALIES = 100
+
 
 def _is_prophet_available() -> bool:
     """Check if Prophet is installed."""
@@ -27,11 +40,68 @@ def _is_prophet_available() -> bool:
         return False
 
 
-def _z_score(value: float, mean: float, std: float) -> float:
-    """Calculate Z-score for a value."""
-    if std == 0:
-        return 0.0
-    return (value - mean) / std
+def _load_series(
+    values: str, labels: str | None, hours_ago: int, step: str
+) -> tuple[np.ndarray, list | np.ndarray | None]:
+    """Parse a series argument: a JSON array, or a metrics query to fetch.
+
+    "prometheus:<PromQL>" and "datadog:<query>" are fetched in full and must
+    return exactly one series; missing samples are dropped.
+
+    Returns:
+        (values, labels) where labels is the parsed JSON labels, an array of
+        epoch seconds for fetched series, or None
+    """
+    source, _, query = values.partition(":")
+    if source in ("prometheus", "datadog") and query.strip():
+        if source == "prometheus":
+            series = query_range_series(query.strip(), hours_ago, step)
+        else:
+            series = query_metric_series(query.strip(), hours_ago)
+        if len(series) != 1:
+            raise ValueError(
+                f"{source} query returned {len(series)} series; aggregate it "
+                f"to exactly one (e.g. with sum() or avg())"
+            )
+        data = anomaly_engine.as_series(series[0]["values"])
+        timestamps = anomaly_engine.as_series(series[0]["timestamps"])
+        keep = np.isfinite(data)
+        return data[keep], timestamps[keep]
+
+    return anomaly_engine.as_series(json.loads(values)), (
+        json.loads(labels) if labels else None
+    )
+
+
+def _label(labels: list | np.ndarray | None, index: int):
+    """Label for a point: given label, ISO timestamp, or the index itself."""
+    index = int(index)
+    if labels is None:
+        return index
+    if isinstance(labels, np.ndarray):
+        return datetime.fromtimestamp(labels[index], tz=timezone.utc).isoformat()
+    return labels[index] if index < len(labels) else index
+
+
+def _round(value, digits: int = 4) -> float | None:
+    """Round a NumPy scalar for JSON; NaN becomes None."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def _interpret_correlation(correlation: float) -> str:
+    abs_corr = abs(correlation)
+    if abs_corr >= 0.8:
+        strength = "strong"
+    elif abs_corr >= 0.5:
+        strength = "moderate"
+    elif abs_corr >= 0.3:
+        strength = "weak"
+    else:
+        strength = "negligible"
+
+    direction = "positive" if correlation >= 0 else "negative"
+    return f"{strength} {direction} correlation"
 
 
 def register_tools(mcp: FastMCP):
@@ -42,56 +112,90 @@ def register_tools(mcp: FastMCP):
         values: str,
         threshold: float = 2.0,
         labels: str | None = None,
+        method: str = "rolling",
+        window: int = 30,
+        alpha: float = 0.1,
+        period: int | None = None,
+        hours_ago: int = 1,
+        step: str = "1m",
     ) -> str:
-        """Detect anomalies in a list of values using Z-score method.
-
-        Values more than `threshold` standard deviations from the mean are flagged.
+        """Detect anomalies in a time series using robust Z-scores.
+
+        Each point is compared with a baseline built from the points before it,
+        so a spike cannot hide by inflating the mean and deviation it is
+        measured against. Points more than `threshold` deviations from their
+        baseline are flagged.
+
+        Methods:
+        - rolling: median/MAD of the previous `window` points (default; the
+          first `window` points are compared with each other)
+        - ewma: exponentially weighted mean/variance with smoothing `alpha`
+        - seasonal: median of the same phase in earlier seasons of `period`
+          points (e.g. 1440 for daily seasonality at 1m resolution)
+        - robust: median/MAD of the whole series
+        - global: mean/stdev of the whole series
 
         Args:
-            values: JSON array of numeric values (e.g., "[1.2, 1.3, 5.0, 1.1, 1.4]")
+            values: JSON array of numeric values (e.g., "[1.2, 1.3, 5.0, 1.1, 1.4]"),
+                or "prometheus:<PromQL>" / "datadog:<query>" to fetch the full
+                series directly (the query must return a single series)
             threshold: Z-score threshold for anomaly detection (default: 2.0)
             labels: Optional JSON array of labels for each value (e.g., '["t1", "t2", "t3"]')
+            method: Baseline method (see above)
+            window: Trailing window for "rolling" (default: 30)
+            alpha: Smoothing factor for "ewma" (default: 0.1)
+            period: Points per season for "seasonal"
+            hours_ago: Time range when fetching from Prometheus/Datadog (default: 1)
+            step: Prometheus query resolution when fetching (default: "1m")
 
         Returns:
-            JSON with statistics and detected anomalies
+            JSON with statistics and detected anomalies (the strongest 100 if
+            there are more)
         """
         try:
-            data = json.loads(values)
-            if not data:
+            data, label_list = _load_series(values, labels, hours_ago, step)
+            if not len(data):
                 return json.dumps({"error": "Empty data array"})
 
-            label_list = json.loads(labels) if labels else list(range(len(data)))
+            z, baseline, used = anomaly_engine.score(
+                data, method, window, alpha, period
+            )
 
-            # Calculate statistics
-            mean = statistics.mean(data)
-            std = statistics.stdev(data) if len(data) > 1 else 0
+            # NaN scores (points without enough history) never compare true
+            with np.errstate(invalid="ignore"):
+                flagged = np.flatnonzero(np.abs(z) > threshold)
+            anomaly_count = len(flagged)
+            if anomaly_count > MAX_REPORTED_ANOMALIES:
+                strongest = np.argsort(-np.abs(z[flagged]))[:MAX_REPORTED_ANOMALIES]
+                flagged = np.sort(flagged[strongest])
 
-            # Detect anomalies
-            anomalies = []
-            for i, value in enumerate(data):
-                z = _z_score(value, mean, std)
-                if abs(z) > threshold:
-                    anomalies.append(
-                        {
-                            "index": i,
-                            "label": label_list[i] if i < len(label_list) else i,
-                            "value": value,
-                            "z_score": round(z, 2),
-                            "deviation": "high" if z > 0 else "low",
-                        }
-                    )
+            anomalies = [
+                {
+                    "index": int(i),
+                    "label": _label(label_list, i),
+                    "value": float(data[i]),
+                    "expected": _round(baseline[i]),
+                    "z_score": round(float(z[i]), 2),
+                    "deviation": "high" if z[i] > 0 else "low",
+                }
+                for i in flagged
+            ]
 
+            median = np.median(data)
             return json.dumps(
                 {
                     "statistics": {
-                        "mean": round(mean, 4),
-                        "std": round(std, 4),
-                        "min": min(data),
-                        "max": max(data),
+                        "mean": _round(data.mean()),
+                        "std": _round(data.std(ddof=1)) if len(data) > 1 else 0.0,
+                        "median": _round(median),
+                        "mad": _round(np.median(np.abs(data - median))),
+                        "min": float(data.min()),
+                        "max": float(data.max()),
                         "count": len(data),
                     },
+                    "method": used,
                     "threshold": threshold,
-                    "anomaly_count": len(anomalies),
+                    "anomaly_count": anomaly_count,
                     "anomalies": anomalies,
                 },
                 indent=2,
@@ -108,28 +212,44 @@ def register_tools(mcp: FastMCP):
         metric_b: str,
         labels_a: str | None = None,
         labels_b: str | None = None,
+        max_lag: int = 0,
+        hours_ago: int = 1,
+        step: str = "1m",
     ) -> str:
-        """Calculate correlation between two metrics.
+        """Calculate correlation between two metrics, optionally across time lags.
 
-        Useful for finding if two metrics move together (e.g., CPU and latency).
+        Useful for finding if two metrics move together (e.g., CPU and latency)
+        and, with max_lag, which one moves first.
 
         Args:
-            metric_a: JSON array of numeric values for first metric
-            metric_b: JSON array of numeric values for second metric
+            metric_a: JSON array of numeric values for first metric, or
+                "prometheus:<PromQL>" / "datadog:<query>" to fetch it
+            metric_b: JSON array of numeric values for second metric, or a query
             labels_a: Optional name for first metric (default: "metric_a")
             labels_b: Optional name for second metric (default: "metric_b")
+            max_lag: Also correlate metric_b shifted up to this many points
+                either way (default: 0). A positive best lag means metric_b
+                follows metric_a.
+            hours_ago: Time range when fetching from Prometheus/Datadog (default: 1)
+            step: Prometheus query resolution when fetching (default: "1m")
 
         Returns:
             JSON with Pearson correlation coefficient and interpretation
         """
         try:
-            data_a = json.loads(metric_a)
-            data_b = json.loads(metric_b)
+            data_a, times_a = _load_series(metric_a, None, hours_ago, step)
+            data_b, times_b = _load_series(metric_b, None, hours_ago, step)
 
             name_a = labels_a or "metric_a"
             name_b = labels_b or "metric_b"
 
-            if len(data_a) != len(data_b):
+            if isinstance(times_a, np.ndarray) and isinstance(times_b, np.ndarray):
+                # Both fetched: pair samples by timestamp
+                _, index_a, index_b = np.intersect1d(
+                    times_a, times_b, return_indices=True
+                )
+                data_a, data_b = data_a[index_a], data_b[index_b]
+            elif len(data_a) != len(data_b):
                 return json.dumps(
                     {
                         "error": f"Metric arrays must have same length ({len(data_a)} vs {len(data_b)})"
@@ -139,48 +259,48 @@ def register_tools(mcp: FastMCP):
             if len(data_a) < 2:
                 return json.dumps({"error": "Need at least 2 data points"})
 
-            # Calculate Pearson correlation
-            n = len(data_a)
-            mean_a = statistics.mean(data_a)
-            mean_b = statistics.mean(data_b)
-
-            covariance = (
-                sum((data_a[i] - mean_a) * (data_b[i] - mean_b) for i in range(n)) / n
+            lags, correlations = anomaly_engine.lagged_correlation(
+                data_a, data_b, max_lag
             )
+            # Constant series have no defined correlation
+            correlations = np.nan_to_num(correlations)
+            correlation = float(correlations[len(lags) // 2])
 
-            std_a = statistics.stdev(data_a)
-            std_b = statistics.stdev(data_b)
-
-            if std_a == 0 or std_b == 0:
-                correlation = 0.0
-            else:
-                correlation = covariance / (std_a * std_b)
-
-            # Interpret correlation
-            abs_corr = abs(correlation)
-            if abs_corr >= 0.8:
-                strength = "strong"
-            elif abs_corr >= 0.5:
-                strength = "moderate"
-            elif abs_corr >= 0.3:
-                strength = "weak"
-            else:
-                strength = "negligible"
-
-            direction = "positive" if correlation >= 0 else "negative"
-
-            return json.dumps(
-                {
-                    "metrics": {
-                        name_a: {"mean": round(mean_a, 4), "std": round(std_a, 4)},
-                        name_b: {"mean": round(mean_b, 4), "std": round(std_b, 4)},
+            result = {
+                "metrics": {
+                    name_a: {
+                        "mean": _round(data_a.mean()),
+                        "std": _round(data_a.std(ddof=1)),
+                    },
+                    name_b: {
+                        "mean": _round(data_b.mean()),
+                        "std": _round(data_b.std(ddof=1)),
                     },
-                    "correlation": round(correlation, 4),
-                    "interpretation": f"{strength} {direction} correlation",
-                    "data_points": n,
                 },
-                indent=2,
-            )
+                "correlation": round(correlation, 4),
+                "interpretation": _interpret_correlation(correlation),
+                "data_points": len(data_a),
+            }
+
+            if len(lags) > 1:
+                best = int(np.argmax(np.abs(correlations)))
+                best_lag = int(lags[best])
+                if best_lag > 0:
+                    lead = f"{name_b} follows {name_a} by {best_lag} point(s)"
+                elif best_lag < 0:
+                    lead = f"{name_a} follows {name_b} by {-best_lag} point(s)"
+                else:
+                    lead = "strongest with no lag"
+                result["lagged"] = {
+                    "max_lag": int(lags[-1]),
+                    "best_lag": best_lag,
+                    "correlation": round(float(correlations[best]), 4),
+                    "interpretation": (
+                        f"{_interpret_correlation(correlations[best])}, {lead}"
+                    ),
+                }
+
+            return json.dumps(result, indent=2)
 
         except json.JSONDecodeError as e:
             return json.dumps({"error": f"Invalid JSON: {e}"})
@@ -192,23 +312,34 @@ def register_tools(mcp: FastMCP):
         values: str,
         labels: str | None = None,
         window_size: int = 5,
+        penalty: float | None = None,
+        max_change_points: int = 10,
+        hours_ago: int = 1,
+        step: str = "1m",
     ) -> str:
         """Detect change points in a time series.
 
-        Finds where the behavior of a metric significantly changed.
-        Useful for identifying when an incident started.
+        Finds where the level of a metric significantly shifted, using binary
+        segmentation on CUSUM statistics (linear-time passes, so long series
+        are fine). Useful for identifying when an incident started.
 
         Args:
-            values: JSON array of numeric values in chronological order
+            values: JSON array of numeric values in chronological order, or
+                "prometheus:<PromQL>" / "datadog:<query>" to fetch the series
             labels: Optional JSON array of timestamps/labels for each value
-            window_size: Window size for comparison (default: 5)
+            window_size: Minimum points between change points (default: 5)
+            penalty: Minimum score for a change point, in units of noise
+                variance (default: 3 * ln(number of points)); raise it to
+                report only larger shifts
+            max_change_points: Most change points to report (default: 10)
+            hours_ago: Time range when fetching from Prometheus/Datadog (default: 1)
+            step: Prometheus query resolution when fetching (default: "1m")
 
         Returns:
             JSON with detected change points and their magnitude
         """
         try:
-            data = json.loads(values)
-            label_list = json.loads(labels) if labels else list(range(len(data)))
+            data, label_list = _load_series(values, labels, hours_ago, step)
 
             if len(data) < window_size * 2:
                 return json.dumps(
@@ -218,44 +349,32 @@ def register_tools(mcp: FastMCP):
                 )
 
             change_points = []
+            for point in anomaly_engine.change_points(
+                data, window_size, penalty, max_change_points
+            ):
+                mean_before = point["mean_before"]
+                change = point["mean_after"] - mean_before
+                change_points.append(
+                    {
+                        "index": point["index"],
+                        "label": _label(label_list, point["index"]),
+                        "mean_before": round(mean_before, 4),
+                        "mean_after": round(point["mean_after"], 4),
+                        "change": round(change, 4),
+                        "change_percent": (
+                            round((change / mean_before) * 100, 2)
+                            if mean_before != 0
+                            else None
+                        ),
+                        "direction": "increase" if change > 0 else "decrease",
+                        "score": round(point["score"], 1),
+                    }
+                )
 
-            # Sliding window comparison
-            for i in range(window_size, len(data) - window_size + 1):
-                before = data[i - window_size : i]
-                after = data[i : i + window_size]
-
-                mean_before = statistics.mean(before)
-                mean_after = statistics.mean(after)
-                std_before = statistics.stdev(before) if len(before) > 1 else 0.001
-
-                # Calculate change magnitude
-                change = mean_after - mean_before
-                change_z = change / std_before if std_before > 0 else 0
-
-                # Significant change if Z > 2
-                if abs(change_z) > 2:
-                    change_points.append(
-                        {
-                            "index": i,
-                            "label": label_list[i] if i < len(label_list) else i,
-                            "mean_before": round(mean_before, 4),
-                            "mean_after": round(mean_after, 4),
-                            "change": round(change, 4),
-                            "change_percent": (
-                                round((change / mean_before) * 100, 2)
-                                if mean_before != 0
-                                else None
-                            ),
-                            "direction": "increase" if change > 0 else "decrease",
-                        }
-                    )
-
-            # Find the most significant change point
+            # The largest shift relative to noise
             most_significant = None
             if change_points:
-                most_significant = max(
-                    change_points, key=lambda x: abs(x.get("change_percent", 0) or 0)
-                )
+                most_significant = max(change_points, key=lambda x: x["score"])
 
             return json.dumps(
                 {
@@ -382,6 +501,8 @@ def register_tools(mcp: FastMCP):
     def analyze_metric_distribution(
         values: str,
         metric_name: str = "metric",
+        hours_ago: int = 1,
+        step: str = "1m",
     ) -> str:
         """Analyze the distribution of metric values for deeper insights.
 
@@ -393,35 +514,34 @@ def register_tools(mcp: FastMCP):
         - Calculate percentiles for SLO analysis (p50, p90, p95, p99)
 
         Args:
-            values: JSON array of numeric values
+            values: JSON array of numeric values, or "prometheus:<PromQL>" /
+                "datadog:<query>" to fetch the series
             metric_name: Name of the metric
+            hours_ago: Time range when fetching from Prometheus/Datadog (default: 1)
+            step: Prometheus query resolution when fetching (default: "1m")
 
         Returns:
             JSON with distribution analysis, percentiles, and SLO insights
         """
         try:
-            data = [float(v) for v in json.loads(values)]
+            data, _ = _load_series(values, None, hours_ago, step)
 
             if len(data) < 10:
                 return json.dumps(
                     {"error": "Need at least 10 data points for distribution analysis"}
                 )
 
-            sorted_data = sorted(data)
             n = len(data)
 
             # Calculate percentiles
-            def percentile(p):
-                idx = int(n * p / 100)
-                return sorted_data[min(idx, n - 1)]
-
-            p50 = percentile(50)
-            p90 = percentile(90)
-            p95 = percentile(95)
-            p99 = percentile(99)
+            percentiles = anomaly_engine.percentiles(data, (50, 90, 95, 99))
+            p50 = percentiles[50]
+            p90 = percentiles[90]
+            p95 = percentiles[95]
+            p99 = percentiles[99]
 
-            mean = statistics.mean(data)
-            stdev = statistics.stdev(data)
+            mean = float(data.mean())
+            stdev = float(data.std(ddof=1))
 
             # Check for skewness (simplified)
             skewness = (mean - p50) / stdev if stdev > 0 else 0
@@ -466,8 +586,8 @@ def register_tools(mcp: FastMCP):
                     "statistics": {
                         "mean": round(mean, 4),
                         "stdev": round(stdev, 4),
-                        "min": round(sorted_data[0], 4),
-                        "max": round(sorted_data[-1], 4),
+                        "min": round(float(data.min()), 4),
+                        "max": round(float(data.max()), 4),
                     },
                     "distribution": {
                         "type": distribution_type,
@@ -57,6 +57,41 @@ def _get_datadog_client():
         raise DatadogConfigError("datadog-api-client not installed")
 
 
+def query_metric_series(query: str, hours_ago: int = 1) -> list[dict]:
+    """Query metrics and return every point, for in-process analysis.
+
+    Returns:
+        [{"metric": name, "timestamps": [epoch seconds], "values": [float]}];
+        null points become NaN
+
+    Raises:
+        DatadogConfigError: If Datadog is not configured
+    """
+    from datadog_api_client.v1.api.metrics_api import MetricsApi
+
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(hours=hours_ago)
+
+    with _get_datadog_client() as api_client:
+        response = MetricsApi(api_client).query_metrics(
+            _from=int(start_time.timestamp()),
+            to=int(end_time.timestamp()),
+            query=query,
+        )
+
+    series = []
+    for s in getattr(response, "series", None) or []:
+        points = getattr(s, "pointlist", None) or []
+        series.append(
+            {
+                "metric": getattr(s, "metric", query),
+                "timestamps": [p[0] / 1000.0 for p in points],
+                "values": [float("nan") if p[1] is None else p[1] for p in points],
+            }
+        )
+    return series
+
+
 def register_tools(mcp: FastMCP):
     """Register Datadog tools with the MCP server."""
 
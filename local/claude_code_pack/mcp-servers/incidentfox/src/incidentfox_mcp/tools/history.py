@@ -2,16 +2,46 @@
 
 Local SQLite-based storage for investigation history.
 Enables "what did I investigate last week?" and pattern learning.
+
+Investigations (summary, root cause, resolution, tags and findings) are
+indexed with SQLite FTS5 and ranked with BM25. If sentence-transformers is
+installed, investigations are also embedded locally and similarity search
+blends in cosine scores. One connection in WAL mode is shared by all tool
+calls.
 """
 
 import json
+import re
 import sqlite3
+import threading
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
+from ..utils.config import get_env
+
+SCHEMA_VERSION = 1
+
+# BM25 column weights: investigation_id, summary, root_cause, resolution,
+# tags, findings (the id column is unindexed)
+_BM25_WEIGHTS = (0.0, 5.0, 10.0, 2.0, 3.0, 1.0)
+
+# Columns returned by the tools (embeddings are internal)
+_COLUMNS = (
+    "i.id, i.started_at, i.ended_at, i.service, i.summary, i.root_cause, "
+    "i.resolution, i.severity, i.tags, i.status"
+)
+
+_conn: sqlite3.Connection | None = None
+_conn_lock = threading.RLock()
+_fts_available = False
+
+_embedder = None
+_embedder_loaded = False
+
 
 def _get_db_path() -> Path:
     """Get path to history database."""
@@ -20,69 +50,318 @@ def _get_db_path() -> Path:
     return incidentfox_dir / "history.db"
 
 
+@contextmanager
+def _db():
+    """Shared connection, serialized; commits on success, rolls back on error."""
+    global _conn
+    with _conn_lock:
+        if _conn is None:
+            _conn = sqlite3.connect(_get_db_path(), check_same_thread=False)
+            _conn.row_factory = sqlite3.Row
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.execute("PRAGMA synchronous=NORMAL")
+            _conn.execute("PRAGMA busy_timeout=5000")
+        try:
+            yield _conn
+            _conn.commit()
+        except BaseException:
+            _conn.rollback()
+            raise
+
+
 def _init_db():
-    """Initialize database schema."""
-    db_path = _get_db_path()
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS investigations (
-            id TEXT PRIMARY KEY,
-            started_at TEXT NOT NULL,
-            ended_at TEXT,
-            service TEXT,
-            summary TEXT,
-            root_cause TEXT,
-            resolution TEXT,
-            severity TEXT,
-            tags TEXT,
-            status TEXT DEFAULT 'in_progress'
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS findings (
-            id TEXT PRIMARY KEY,
-            investigation_id TEXT NOT NULL,
-            timestamp TEXT NOT NULL,
-            type TEXT NOT NULL,
-            title TEXT,
-            data TEXT,
-            FOREIGN KEY (investigation_id) REFERENCES investigations(id)
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS known_patterns (
-            id TEXT PRIMARY KEY,
-            pattern TEXT NOT NULL,
-            cause TEXT,
-            solution TEXT,
-            services TEXT,
-            occurrence_count INTEGER DEFAULT 1,
-            last_seen TEXT,
-            created_at TEXT NOT NULL
-        )
-    """)
+    """Initialize database schema and migrate older databases."""
+    with _db() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_investigations_service
-        ON investigations(service)
-    """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS investigations (
+                id TEXT PRIMARY KEY,
+                started_at TEXT NOT NULL,
+                ended_at TEXT,
+                service TEXT,
+                summary TEXT,
+                root_cause TEXT,
+                resolution TEXT,
+                severity TEXT,
+                tags TEXT,
+                status TEXT DEFAULT 'in_progress'
+            )
+        """)
 
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_investigations_started
-        ON investigations(started_at)
-    """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS findings (
+                id TEXT PRIMARY KEY,
+                investigation_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                type TEXT NOT NULL,
+                title TEXT,
+                data TEXT,
+                FOREIGN KEY (investigation_id) REFERENCES investigations(id)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS known_patterns (
+                id TEXT PRIMARY KEY,
+                pattern TEXT NOT NULL,
+                cause TEXT,
+                solution TEXT,
+                services TEXT,
+                occurrence_count INTEGER DEFAULT 1,
+                last_seen TEXT,
+                created_at TEXT NOT NULL
+            )
+        """)
 
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_findings_investigation
-        ON findings(investigation_id)
-    """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_investigations_service
+            ON investigations(service)
+        """)
 
-    conn.commit()
-    conn.close()
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_investigations_started
+            ON investigations(started_at)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_findings_investigation
+            ON findings(investigation_id)
+        """)
+
+        _migrate(conn)
+
+
+def _migrate(conn: sqlite3.Connection):
+    """Bring an existing database up to SCHEMA_VERSION.
+
+    Version 1 adds the embedding columns and the FTS5 search table, and
+    indexes every existing investigation. SQLite builds without FTS5 fall
+    back to LIKE matching.
+    """
+    global _fts_available
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    fts_existed = (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'investigation_search'"
+        ).fetchone()
+        is not None
+    )
+
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS investigation_search USING fts5(
+                investigation_id UNINDEXED,
+                summary,
+                root_cause,
+                resolution,
+                tags,
+                findings,
+                tokenize = 'porter unicode61'
+            )
+        """)
+        _fts_available = True
+    except sqlite3.OperationalError:
+        _fts_available = False
+
+    if version < 1:
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(investigations)")}
+        if "embedding" not in columns:
+            conn.execute("ALTER TABLE investigations ADD COLUMN embedding BLOB")
+        if "embedding_model" not in columns:
+            conn.execute("ALTER TABLE investigations ADD COLUMN embedding_model TEXT")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # Backfill on first creation (also covers databases migrated by a
+    # SQLite build that lacked FTS5)
+    if _fts_available and not fts_existed:
+        for (investigation_id,) in conn.execute(
+            "SELECT id FROM investigations"
+        ).fetchall():
+            _reindex(conn, investigation_id)
+
+
+def _reindex(conn: sqlite3.Connection, investigation_id: str):
+    """Refresh an investigation's full-text entry (including its findings)."""
+    if not _fts_available:
+        return
+
+    row = conn.execute(
+        "SELECT summary, root_cause, resolution, tags FROM investigations WHERE id = ?",
+        (investigation_id,),
+    ).fetchone()
+    conn.execute(
+        "DELETE FROM investigation_search WHERE investigation_id = ?",
+        (investigation_id,),
+    )
+    if row is None:
+        return
+
+    findings = " ".join(
+        f"{r['title'] or ''} {r['data'] or ''}"
+        for r in conn.execute(
+            "SELECT title, data FROM findings WHERE investigation_id = ?",
+            (investigation_id,),
+        )
+    )
+    conn.execute(
+        """
+        INSERT INTO investigation_search
+            (investigation_id, summary, root_cause, resolution, tags, findings)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+        (
+            investigation_id,
+            row["summary"] or "",
+            row["root_cause"] or "",
+            row["resolution"] or "",
+            (row["tags"] or "").replace(",", " "),
+            findings,
+        ),
+    )
+
+
+def _fts_query(text: str) -> str | None:
+    """FTS5 MATCH expression: any of the text's words, as prefixes."""
+    words = re.findall(r"\w+", text.lower())[:32]
+    if not words:
+        return None
+    return " OR ".join(f'"{w}"*' for w in dict.fromkeys(words))
+
+
+def _fts_rank(
+    conn: sqlite3.Connection, text: str, where: str, params: list, limit: int
+) -> list[str]:
+    """Investigation IDs matching text, best BM25 score first."""
+    match = _fts_query(text)
+    if match is None:
+        return []
+    weights = ", ".join(str(w) for w in _BM25_WEIGHTS)
+    rows = conn.execute(
+        f"""
+        SELECT s.investigation_id
+        FROM investigation_search s
+        JOIN investigations i ON i.id = s.investigation_id
+        WHERE investigation_search MATCH ? AND {where}
+        ORDER BY bm25(investigation_search, {weights})
+        LIMIT ?
+    """,
+        [match] + params + [limit],
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _get_embedder():
+    """Local sentence-transformers model, or None if not installed."""
+    global _embedder, _embedder_loaded
+    if not _embedder_loaded:
+        _embedder_loaded = True
+        try:
+            from sentence_transformers import SentenceTransformer
+
+            _embedder = SentenceTransformer(
+                get_env("INCIDENTFOX_EMBEDDING_MODEL") or "all-MiniLM-L6-v2"
+            )
+        except Exception:
+            _embedder = None
+    return _embedder
+
+
+def _embedding_text(row) -> str:
+    return " ".join(
+        row[k] or "" for k in ("summary", "root_cause", "resolution", "tags")
+    ).strip()
+
+
+def _vector_rank(
+    conn: sqlite3.Connection, text: str, where: str, params: list, limit: int
+) -> list[str]:
+    """Investigation IDs by cosine similarity to text (empty if no embedder)."""
+    embedder = _get_embedder()
+    if embedder is None:
+        return []
+    import numpy as np
+
+    model = get_env("INCIDENTFOX_EMBEDDING_MODEL") or "all-MiniLM-L6-v2"
+
+    # Embed investigations that have none yet (or one from another model)
+    stale = conn.execute(
+        f"""
+        SELECT i.id, i.summary, i.root_cause, i.resolution, i.tags
+        FROM investigations i
+        WHERE {where} AND (i.embedding IS NULL OR i.embedding_model IS NOT ?)
+        LIMIT 500
+    """,
+        params + [model],
+    ).fetchall()
+    if stale:
+        vectors = embedder.encode(
+            [_embedding_text(r) for r in stale], normalize_embeddings=True
+        ).astype(np.float32)
+        conn.executemany(
+            "UPDATE investigations SET embedding = ?, embedding_model = ? WHERE id = ?",
+            [(v.tobytes(), model, r["id"]) for r, v in zip(stale, vectors)],
+        )
+
+    rows = conn.execute(
+        f"""
+        SELECT i.id, i.embedding FROM investigations i
+        WHERE {where} AND i.embedding IS NOT NULL AND i.embedding_model = ?
+    """,
+        params + [model],
+    ).fetchall()
+    if not rows:
+        return []
+
+    matrix = np.frombuffer(b"".join(r[1] for r in rows), dtype=np.float32).reshape(
+        len(rows), -1
+    )
+    query = embedder.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+    scores = matrix @ query
+    top = np.argsort(-scores)[:limit]
+    return [rows[i][0] for i in top]
+
+
+def _fuse(rankings: list[list[str]], limit: int, k: int = 60) -> list[str]:
+    """Reciprocal rank fusion of several ranked ID lists."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, investigation_id in enumerate(ranking):
+            scores[investigation_id] = scores.get(investigation_id, 0.0) + 1 / (
+                k + rank + 1
+            )
+    return sorted(scores, key=lambda x: -scores[x])[:limit]
+
+
+def _like_rank(
+    conn: sqlite3.Connection, text: str, where: str, params: list, limit: int
+) -> list[str]:
+    """Substring fallback when FTS5 is unavailable: most recent matches first."""
+    pattern = f"%{text}%"
+    rows = conn.execute(
+        f"""
+        SELECT i.id FROM investigations i
+        WHERE {where} AND (i.root_cause LIKE ? OR i.summary LIKE ? OR i.tags LIKE ?)
+        ORDER BY i.started_at DESC
+        LIMIT ?
+    """,
+        params + [pattern, pattern, pattern, limit],
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _fetch_investigations(conn: sqlite3.Connection, ids: list[str]) -> list[dict]:
+    """Investigations by ID, in the order given."""
+    if not ids:
+        return []
+    rows = conn.execute(
+        f"SELECT {_COLUMNS} FROM investigations i "
+        f"WHERE i.id IN ({', '.join('?' * len(ids))})",
+        ids,
+    ).fetchall()
+    by_id = {r["id"]: dict(r) for r in rows}
+    return [by_id[i] for i in ids if i in by_id]
 
 
 def register_tools(mcp: FastMCP):
@@ -114,19 +393,15 @@ def register_tools(mcp: FastMCP):
         investigation_id = str(uuid.uuid4())[:8]
         now = datetime.utcnow().isoformat() + "Z"
 
-        conn = sqlite3.connect(_get_db_path())
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO investigations (id, started_at, service, summary, severity, tags, status)
-            VALUES (?, ?, ?, ?, ?, ?, 'in_progress')
-        """,
-            (investigation_id, now, service, summary, severity, tags),
-        )
-
-        conn.commit()
-        conn.close()
+        with _db() as conn:
+            conn.execute(
+                """
+                INSERT INTO investigations (id, started_at, service, summary, severity, tags, status)
+                VALUES (?, ?, ?, ?, ?, ?, 'in_progress')
+            """,
+                (investigation_id, now, service, summary, severity, tags),
+            )
+            _reindex(conn, investigation_id)
 
         return json.dumps(
             {
@@ -160,31 +435,26 @@ def register_tools(mcp: FastMCP):
         finding_id = str(uuid.uuid4())[:8]
         now = datetime.utcnow().isoformat() + "Z"
 
-        conn = sqlite3.connect(_get_db_path())
-        cursor = conn.cursor()
-
-        # Verify investigation exists
-        cursor.execute(
-            "SELECT id FROM investigations WHERE id = ?", (investigation_id,)
-        )
-        if not cursor.fetchone():
-            conn.close()
-            return json.dumps(
-                {
-                    "error": f"Investigation {investigation_id} not found",
-                }
+        with _db() as conn:
+            # Verify investigation exists
+            exists = conn.execute(
+                "SELECT id FROM investigations WHERE id = ?", (investigation_id,)
+            ).fetchone()
+            if not exists:
+                return json.dumps(
+                    {
+                        "error": f"Investigation {investigation_id} not found",
+                    }
+                )
+
+            conn.execute(
+                """
+                INSERT INTO findings (id, investigation_id, timestamp, type, title, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (finding_id, investigation_id, now, finding_type, title, data),
             )
-
-        cursor.execute(
-            """
-            INSERT INTO findings (id, investigation_id, timestamp, type, title, data)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (finding_id, investigation_id, now, finding_type, title, data),
-        )
-
-        conn.commit()
-        conn.close()
+            _reindex(conn, investigation_id)
 
         return json.dumps(
             {
@@ -217,35 +487,35 @@ def register_tools(mcp: FastMCP):
         """
         now = datetime.utcnow().isoformat() + "Z"
 
-        conn = sqlite3.connect(_get_db_path())
-        cursor = conn.cursor()
-
-        # Update investigation
-        if summary:
-            cursor.execute(
-                """
-                UPDATE investigations
-                SET ended_at = ?, root_cause = ?, resolution = ?, summary = ?, status = 'completed'
-                WHERE id = ?
-            """,
-                (now, root_cause, resolution, summary, investigation_id),
-            )
-        else:
-            cursor.execute(
-                """
-                UPDATE investigations
-                SET ended_at = ?, root_cause = ?, resolution = ?, status = 'completed'
-                WHERE id = ?
-            """,
-                (now, root_cause, resolution, investigation_id),
-            )
-
-        if cursor.rowcount == 0:
-            conn.close()
-            return json.dumps({"error": f"Investigation {investigation_id} not found"})
-
-        conn.commit()
-        conn.close()
+        with _db() as conn:
+            # Update investigation (clearing any embedding of the old text)
+            if summary:
+                cursor = conn.execute(
+                    """
+                    UPDATE investigations
+                    SET ended_at = ?, root_cause = ?, resolution = ?, summary = ?,
+                        status = 'completed', embedding = NULL
+                    WHERE id = ?
+                """,
+                    (now, root_cause, resolution, summary, investigation_id),
+                )
+            else:
+                cursor = conn.execute(
+                    """
+                    UPDATE investigations
+                    SET ended_at = ?, root_cause = ?, resolution = ?,
+                        status = 'completed', embedding = NULL
+                    WHERE id = ?
+                """,
+                    (now, root_cause, resolution, investigation_id),
+                )
+
+            if cursor.rowcount == 0:
+                return json.dumps(
+                    {"error": f"Investigation {investigation_id} not found"}
+                )
+
+            _reindex(conn, investigation_id)
 
         return json.dumps(
             {
@@ -268,29 +538,29 @@ def register_tools(mcp: FastMCP):
         Returns:
             JSON with investigation details and findings.
         """
-        conn = sqlite3.connect(_get_db_path())
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM investigations WHERE id = ?", (investigation_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            return json.dumps({"error": f"Investigation {investigation_id} not found"})
-
-        investigation = dict(row)
-
-        # Get findings
-        cursor.execute(
-            """
-            SELECT * FROM findings WHERE investigation_id = ? ORDER BY timestamp
-        """,
-            (investigation_id,),
-        )
-        findings = [dict(r) for r in cursor.fetchall()]
-
-        conn.close()
+        with _db() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM investigations i WHERE i.id = ?",
+                (investigation_id,),
+            ).fetchone()
+
+            if not row:
+                return json.dumps(
+                    {"error": f"Investigation {investigation_id} not found"}
+                )
+
+            investigation = dict(row)
+
+            # Get findings
+            findings = [
+                dict(r)
+                for r in conn.execute(
+                    """
+                SELECT * FROM findings WHERE investigation_id = ? ORDER BY timestamp
+            """,
+                    (investigation_id,),
+                )
+            ]
 
         investigation["findings"] = findings
         investigation["finding_count"] = len(findings)
@@ -315,44 +585,45 @@ def register_tools(mcp: FastMCP):
         Returns:
             JSON with matching investigations.
         """
-        conn = sqlite3.connect(_get_db_path())
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        from datetime import timedelta
 
         conditions = []
         params = []
 
-        if query:
-            conditions.append("""
-                (summary LIKE ? OR root_cause LIKE ? OR resolution LIKE ? OR tags LIKE ?)
-            """)
-            pattern = f"%{query}%"
-            params.extend([pattern, pattern, pattern, pattern])
-
         if service:
-            conditions.append("service = ?")
+            conditions.append("i.service = ?")
             params.append(service)
 
-        from datetime import timedelta
-
         cutoff = (datetime.utcnow() - timedelta(days=days_ago)).isoformat() + "Z"
-        conditions.append("started_at >= ?")
+        conditions.append("i.started_at >= ?")
         params.append(cutoff)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        cursor.execute(
-            f"""
-            SELECT * FROM investigations
-            WHERE {where_clause}
-            ORDER BY started_at DESC
-            LIMIT ?
-        """,
-            params + [limit],
-        )
+        where_clause = " AND ".join(conditions)
 
-        investigations = [dict(r) for r in cursor.fetchall()]
-        conn.close()
+        with _db() as conn:
+            if query and _fts_available:
+                ids = _fts_rank(conn, query, where_clause, params, limit)
+                investigations = _fetch_investigations(conn, ids)
+            else:
+                if query:
+                    where_clause += """
+                        AND (i.summary LIKE ? OR i.root_cause LIKE ?
+                             OR i.resolution LIKE ? OR i.tags LIKE ?)
+                    """
+                    pattern = f"%{query}%"
+                    params.extend([pattern, pattern, pattern, pattern])
+                investigations = [
+                    dict(r)
+                    for r in conn.execute(
+                        f"""
+                    SELECT {_COLUMNS} FROM investigations i
+                    WHERE {where_clause}
+                    ORDER BY i.started_at DESC
+                    LIMIT ?
+                """,
+                        params + [limit],
+                    )
+                ]
 
         return json.dumps(
             {
@@ -373,7 +644,10 @@ def register_tools(mcp: FastMCP):
     ) -> str:
         """Find past investigations similar to the current issue.
 
-        Useful for "have I seen this before?" queries.
+        Useful for "have I seen this before?" queries. Searches all completed
+        investigations (root cause, summary, resolution, tags and findings),
+        ranked by BM25 and, if a local embedding model is available, by
+        semantic similarity.
 
         Args:
             error_message: Error message to match against past findings
@@ -383,59 +657,47 @@ def register_tools(mcp: FastMCP):
         Returns:
             JSON with similar past investigations and their resolutions.
         """
-        conn = sqlite3.connect(_get_db_path())
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        conditions = ["status = 'completed'"]  # Only completed investigations
+        conditions = ["i.status = 'completed'"]  # Only completed investigations
         params = []
 
         if service:
-            conditions.append("service = ?")
+            conditions.append("i.service = ?")
             params.append(service)
 
         where_clause = " AND ".join(conditions)
 
-        # Get completed investigations
-        cursor.execute(
-            f"""
-            SELECT * FROM investigations
-            WHERE {where_clause}
-            ORDER BY started_at DESC
-            LIMIT 100
-        """,
-            params,
-        )
-
-        candidates = [dict(r) for r in cursor.fetchall()]
-
-        # Simple text matching for now
-        if error_message:
-            error_lower = error_message.lower()
-            scored = []
-            for inv in candidates:
-                score = 0
-                # Check root cause
-                if inv.get("root_cause") and error_lower in inv["root_cause"].lower():
-                    score += 10
-                # Check summary
-                if inv.get("summary") and error_lower in inv["summary"].lower():
-                    score += 5
-                # Check tags
-                if inv.get("tags") and any(
-                    t in error_lower for t in (inv["tags"] or "").split(",")
-                ):
-                    score += 3
-
-                if score > 0:
-                    scored.append((score, inv))
-
-            scored.sort(key=lambda x: x[0], reverse=True)
-            similar = [inv for _, inv in scored[:limit]]
-        else:
-            similar = candidates[:limit]
-
-        conn.close()
+        with _db() as conn:
+            if error_message:
+                # Rank over all completed investigations, not just recent ones
+                candidates = max(limit * 4, 20)
+                rankings = [
+                    (
+                        _fts_rank(conn, error_message, where_clause, params, candidates)
+                        if _fts_available
+                        else []
+                    ),
+                    _vector_rank(conn, error_message, where_clause, params, candidates),
+                ]
+                if not _fts_available and not rankings[1]:
+                    rankings[0] = _like_rank(
+                        conn, error_message, where_clause, params, candidates
+                    )
+                similar = _fetch_investigations(
+                    conn, _fuse([r for r in rankings if r], limit)
+                )
+            else:
+                similar = [
+                    dict(r)
+                    for r in conn.execute(
+                        f"""
+                    SELECT {_COLUMNS} FROM investigations i
+                    WHERE {where_clause}
+                    ORDER BY i.started_at DESC
+                    LIMIT ?
+                """,
+                        params + [limit],
+                    )
+                ]
 
         return json.dumps(
             {
@@ -472,43 +734,40 @@ def register_tools(mcp: FastMCP):
         pattern_id = str(uuid.uuid4())[:8]
         now = datetime.utcnow().isoformat() + "Z"
 
-        conn = sqlite3.connect(_get_db_path())
-        cursor = conn.cursor()
-
-        # Check if similar pattern exists
-        cursor.execute(
-            """
-            SELECT id, occurrence_count FROM known_patterns WHERE pattern = ?
-        """,
-            (pattern,),
-        )
-        existing = cursor.fetchone()
+        with _db() as conn:
+            cursor = conn.cursor()
 
-        if existing:
-            # Update existing pattern
+            # Check if similar pattern exists
             cursor.execute(
                 """
-                UPDATE known_patterns
-                SET occurrence_count = occurrence_count + 1, last_seen = ?, cause = ?, solution = ?
-                WHERE id = ?
+                SELECT id, occurrence_count FROM known_patterns WHERE pattern = ?
             """,
-                (now, cause, solution, existing[0]),
+                (pattern,),
             )
-            pattern_id = existing[0]
-            message = f"Updated existing pattern (seen {existing[1] + 1} times)"
-        else:
-            # Create new pattern
-            cursor.execute(
-                """
-                INSERT INTO known_patterns (id, pattern, cause, solution, services, created_at, last_seen)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (pattern_id, pattern, cause, solution, services, now, now),
-            )
-            message = "New pattern recorded"
-
-        conn.commit()
-        conn.close()
+            existing = cursor.fetchone()
+
+            if existing:
+                # Update existing pattern
+                cursor.execute(
+                    """
+                    UPDATE known_patterns
+                    SET occurrence_count = occurrence_count + 1, last_seen = ?, cause = ?, solution = ?
+                    WHERE id = ?
+                """,
+                    (now, cause, solution, existing[0]),
+                )
+                pattern_id = existing[0]
+                message = f"Updated existing pattern (seen {existing[1] + 1} times)"
+            else:
+                # Create new pattern
+                cursor.execute(
+                    """
+                    INSERT INTO known_patterns (id, pattern, cause, solution, services, created_at, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (pattern_id, pattern, cause, solution, services, now, now),
+                )
+                message = "New pattern recorded"
 
         return json.dumps(
             {
@@ -528,51 +787,51 @@ def register_tools(mcp: FastMCP):
         Returns:
             JSON with total investigations, common services, patterns, etc.
         """
-        conn = sqlite3.connect(_get_db_path())
-        cursor = conn.cursor()
+        with _db() as conn:
+            cursor = conn.cursor()
 
-        # Total investigations
-        cursor.execute("SELECT COUNT(*) FROM investigations")
-        total = cursor.fetchone()[0]
+            # Total investigations
+            cursor.execute("SELECT COUNT(*) FROM investigations")
+            total = cursor.fetchone()[0]
 
-        # Completed vs in-progress
-        cursor.execute("SELECT status, COUNT(*) FROM investigations GROUP BY status")
-        by_status = dict(cursor.fetchall())
-
-        # Top services
-        cursor.execute("""
-            SELECT service, COUNT(*) as count
-            FROM investigations
-            WHERE service IS NOT NULL
-            GROUP BY service
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        top_services = [{"service": r[0], "count": r[1]} for r in cursor.fetchall()]
-
-        # Known patterns count
-        cursor.execute("SELECT COUNT(*) FROM known_patterns")
-        patterns = cursor.fetchone()[0]
-
-        # Recent investigations
-        cursor.execute("""
-            SELECT id, started_at, service, summary, status
-            FROM investigations
-            ORDER BY started_at DESC
-            LIMIT 5
-        """)
-        recent = [
-            {
-                "id": r[0],
-                "started_at": r[1],
-                "service": r[2],
-                "summary": r[3],
-                "status": r[4],
-            }
-            for r in cursor.fetchall()
-        ]
-
-        conn.close()
+            # Completed vs in-progress
+            cursor.execute(
+                "SELECT status, COUNT(*) FROM investigations GROUP BY status"
+            )
+            by_status = {r[0]: r[1] for r in cursor.fetchall()}
+
+            # Top services
+            cursor.execute("""
+                SELECT service, COUNT(*) as count
+                FROM investigations
+                WHERE service IS NOT NULL
+                GROUP BY service
+                ORDER BY count DESC
+                LIMIT 10
+            """)
+            top_services = [{"service": r[0], "count": r[1]} for r in cursor.fetchall()]
+
+            # Known patterns count
+            cursor.execute("SELECT COUNT(*) FROM known_patterns")
+            patterns = cursor.fetchone()[0]
+
+            # Recent investigations
+            cursor.execute("""
+                SELECT id, started_at, service, summary, status
+                FROM investigations
+                ORDER BY started_at DESC
+                LIMIT 5
+            """)
+            recent = [
+                {
+                    "id": r[0],
+                    "started_at": r[1],
+                    "service": r[2],
+                    "summary": r[3],
+                    "status": r[4],
+                }
+                for r in cursor.fetchall()
+            ]
 
         return json.dumps(
             {
@@ -9,15 +9,21 @@ Supported backends: Elasticsearch, Coralogix, Datadog, Splunk, CloudWatch
 """
 
 import json
-import re
+import math
 from abc import ABC, abstractmethod
 from collections import Counter
+from collections.abc import Iterator
 from datetime import datetime, timedelta
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
+from ..utils import anomaly_engine
 from ..utils.config import get_env
+from ..utils.log_templates import load_miner, save_miner
+
+# Buckets of history each bucket is compared with in log_detect_anomalies
+ANOMALY_WINDOW_BUCKETS = 12
 
 
 class LogAnalysisConfigError(Exception):
@@ -105,6 +111,30 @@ class LogBackend(ABC):
         """Get logs around a specific timestamp."""
         pass
 
+    def iter_logs(
+        self,
+        service: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        errors_only: bool = True,
+        max_logs: int = 20000,
+        page_size: int = 1000,
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream logs page by page, newest first, up to max_logs.
+
+        Yields dicts with timestamp, service, level and the full message.
+        Only one page is held in memory at a time. Backends override this
+        with native paging; the default is a single sample_logs call.
+        """
+        strategy = "errors_only" if errors_only else "recent"
+        result = self.sample_logs(
+            strategy, service, start_time, end_time, max_logs, **kwargs
+        )
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+        yield from result.get("logs", [])
+
 
 class ElasticsearchBackend(LogBackend):
     """Elasticsearch log backend."""
@@ -378,6 +408,77 @@ class ElasticsearchBackend(LogBackend):
             "matches": matches,
         }
 
+    def iter_logs(
+        self,
+        service: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        errors_only: bool = True,
+        max_logs: int = 20000,
+        page_size: int = 1000,
+        index_pattern: str = "logs-*",
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream Elasticsearch logs with a point-in-time and search_after."""
+        es = self._get_client()
+
+        must_clauses = [
+            {
+                "range": {
+                    "@timestamp": {
+                        "gte": start_time.isoformat(),
+                        "lte": end_time.isoformat(),
+                    }
+                }
+            }
+        ]
+        if service:
+            must_clauses.append({"term": {"service.name": service}})
+        if errors_only:
+            must_clauses.append(
+                {"terms": {"level": ["ERROR", "CRITICAL", "error", "critical"]}}
+            )
+
+        pit_id = es.open_point_in_time(index=index_pattern, keep_alive="1m")["id"]
+        body = {
+            "query": {"bool": {"must": must_clauses}},
+            "sort": [{"@timestamp": "desc"}],
+            "_source": ["@timestamp", "service", "level", "message"],
+            "track_total_hits": False,
+        }
+        remaining = max_logs
+        try:
+            while remaining > 0:
+                body["size"] = min(page_size, remaining)
+                body["pit"] = {"id": pit_id, "keep_alive": "1m"}
+                response = es.search(body=body)
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+
+                for hit in hits:
+                    source = hit["_source"]
+                    yield {
+                        "timestamp": source.get("@timestamp"),
+                        "service": (
+                            source.get("service", {}).get("name")
+                            if isinstance(source.get("service"), dict)
+                            else source.get("service")
+                        ),
+                        "level": source.get("level"),
+                        "message": source.get("message", ""),
+                    }
+
+                remaining -= len(hits)
+                if len(hits) < body["size"]:
+                    return
+                # PIT sorts get an implicit _shard_doc tiebreaker, so this is exact
+                body["search_after"] = hits[-1]["sort"]
+        finally:
+            try:
+                es.close_point_in_time(id=pit_id)
+            except Exception:
+                pass
+
     def get_logs_around_time(
         self,
         timestamp: datetime,
@@ -694,6 +795,46 @@ class CoralogixBackend(LogBackend):
             "matches": matches,
         }
 
+    def iter_logs(
+        self,
+        service: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        errors_only: bool = True,
+        max_logs: int = 20000,
+        page_size: int = 1000,
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream Coralogix logs by walking the range in time slices.
+
+        DataPrime queries have no cursor, so the range is split into
+        max_logs / page_size slices (newest first) with one page each. This
+        spreads coverage over the whole range instead of its first page.
+        """
+        query = "source logs"
+        if service:
+            query += f" | filter $l.subsystemname == '{service}'"
+        if errors_only:
+            query += " | filter $d.logRecord.body:string ~ 'error' || $d.logRecord.body:string ~ 'Error' || $d.logRecord.body:string ~ 'ERROR' || $d.logRecord.body:string ~ 'exception' || $d.logRecord.body:string ~ 'Exception' || $d.logRecord.body:string ~ 'failed' || $d.logRecord.body:string ~ 'Failed'"
+        query += f" | limit {page_size}"
+
+        slices = max(1, math.ceil(max_logs / page_size))
+        step = (end_time - start_time) / slices
+        remaining = max_logs
+        for i in range(slices):
+            slice_end = end_time - step * i
+            results = self._query(query, slice_end - step, slice_end, limit=page_size)
+            for r in results[:remaining]:
+                yield {
+                    "timestamp": r.get("timestamp", ""),
+                    "service": r.get("subsystemname", ""),
+                    "level": r.get("severity", ""),
+                    "message": self._extract_body(r),
+                }
+            remaining -= min(len(results), remaining)
+            if remaining <= 0:
+                return
+
     def get_logs_around_time(
         self,
         timestamp: datetime,
@@ -766,6 +907,16 @@ class DatadogBackend(LogBackend):
         self, query: str, start_time: datetime, end_time: datetime, limit: int
     ) -> list[dict]:
         """Search Datadog logs."""
+        pages = self._search_log_pages(query, start_time, end_time, limit)
+        try:
+            return next(pages)
+        finally:
+            pages.close()
+
+    def _search_log_pages(
+        self, query: str, start_time: datetime, end_time: datetime, limit: int
+    ) -> Iterator[list[dict]]:
+        """Yield pages of Datadog search results, following the page cursor."""
         try:
             import httpx
         except ImportError:
@@ -794,10 +945,16 @@ class DatadogBackend(LogBackend):
         }
 
         with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", [])
+            while True:
+                response = client.post(url, headers=headers, json=payload)
+                response.raise_for_status()
+                data = response.json()
+                yield data.get("data", [])
+
+                cursor = data.get("meta", {}).get("page", {}).get("after")
+                if not cursor:
+                    return
+                payload["page"]["cursor"] = cursor
 
     def get_statistics(
         self, service: str | None, start_time: datetime, end_time: datetime, **kwargs
@@ -901,6 +1058,37 @@ class DatadogBackend(LogBackend):
             "matches": matches,
         }
 
+    def iter_logs(
+        self,
+        service: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        errors_only: bool = True,
+        max_logs: int = 20000,
+        page_size: int = 1000,
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream Datadog logs using the search API's page cursor."""
+        query = "status:(error OR critical)" if errors_only else "*"
+        if service:
+            query = f"service:{service} {query}"
+
+        remaining = max_logs
+        # The search API caps page[limit] at 1000
+        limit = min(page_size, max_logs, 1000)
+        for page in self._search_log_pages(query, start_time, end_time, limit):
+            for r in page[:remaining]:
+                attrs = r.get("attributes", {})
+                yield {
+                    "timestamp": attrs.get("timestamp", ""),
+                    "service": attrs.get("service", ""),
+                    "level": attrs.get("status", ""),
+                    "message": attrs.get("message", ""),
+                }
+            remaining -= min(len(page), remaining)
+            if remaining <= 0 or len(page) < limit:
+                return
+
     def get_logs_around_time(
         self,
         timestamp: datetime,
@@ -1153,6 +1341,47 @@ class CloudWatchBackend(LogBackend):
                 "error": str(e),
             }
 
+    def iter_logs(
+        self,
+        service: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        errors_only: bool = True,
+        max_logs: int = 20000,
+        page_size: int = 1000,
+        log_group: str | None = None,
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream CloudWatch log events, following nextToken."""
+        client = self._get_client()
+
+        log_group_name = log_group or (
+            f"/aws/lambda/{service}" if service else "/aws/lambda"
+        )
+        filter_pattern = (
+            "?ERROR ?Exception ?error ?exception ?fail" if errors_only else ""
+        )
+
+        paginator = client.get_paginator("filter_log_events")
+        pages = paginator.paginate(
+            logGroupName=log_group_name,
+            startTime=int(start_time.timestamp() * 1000),
+            endTime=int(end_time.timestamp() * 1000),
+            filterPattern=filter_pattern,
+            PaginationConfig={"MaxItems": max_logs, "PageSize": page_size},
+        )
+        for page in pages:
+            for event in page.get("events", []):
+                message = event.get("message", "")
+                yield {
+                    "timestamp": datetime.fromtimestamp(
+                        event["timestamp"] / 1000
+                    ).isoformat(),
+                    "service": service or "unknown",
+                    "level": "ERROR" if "error" in message.lower() else "INFO",
+                    "message": message,
+                }
+
     def get_logs_around_time(
         self,
         timestamp: datetime,
@@ -1384,6 +1613,75 @@ class SplunkBackend(LogBackend):
             ],
         }
 
+    def iter_logs(
+        self,
+        service: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        errors_only: bool = True,
+        max_logs: int = 20000,
+        page_size: int = 1000,
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream Splunk results from a search job, offset by offset."""
+        try:
+            import httpx
+        except ImportError:
+            raise LogAnalysisConfigError(
+                "httpx not installed. Install with: pip install httpx"
+            )
+
+        query = "index=*"
+        if service:
+            query += f' service="{service}"'
+        if errors_only:
+            query += " (log_level=ERROR OR log_level=CRITICAL)"
+        query += f" | head {max_logs} | fields _time, _raw, service, log_level"
+
+        config = self._get_config()
+        url = (
+            f"https://{config['host']}:{config.get('port', 8089)}/services/search/jobs"
+        )
+        headers = {"Authorization": f"Bearer {config['token']}"}
+        search_query = f"search {query} earliest={start_time.strftime('%Y-%m-%dT%H:%M:%S')} latest={end_time.strftime('%Y-%m-%dT%H:%M:%S')}"
+
+        with httpx.Client(timeout=60.0, verify=False) as client:
+            response = client.post(
+                url,
+                headers=headers,
+                data={
+                    "search": search_query,
+                    "output_mode": "json",
+                    "exec_mode": "blocking",
+                },
+            )
+            response.raise_for_status()
+            sid = response.json()["sid"]
+
+            offset = 0
+            while offset < max_logs:
+                response = client.get(
+                    f"{url}/{sid}/results",
+                    headers=headers,
+                    params={
+                        "output_mode": "json",
+                        "offset": offset,
+                        "count": min(page_size, max_logs - offset),
+                    },
+                )
+                response.raise_for_status()
+                results = response.json().get("results", [])
+                for r in results:
+                    yield {
+                        "timestamp": r.get("_time", ""),
+                        "service": r.get("service", ""),
+                        "level": r.get("log_level", "INFO"),
+                        "message": r.get("_raw", ""),
+                    }
+                if len(results) < min(page_size, max_logs - offset):
+                    return
+                offset += len(results)
+
     def get_logs_around_time(
         self,
         timestamp: datetime,
@@ -1844,27 +2142,36 @@ def register_tools(mcp: FastMCP):
         log_source: str = "auto",
         index_pattern: str | None = None,
         log_group: str | None = None,
+        max_logs: int = 20000,
+        persist_templates: bool = True,
     ) -> str:
         """Extract and cluster similar log messages into signatures.
 
-        This groups similar logs together by normalizing:
-        - Variable parts (IDs, timestamps, numbers)
-        - Stack traces (group by exception type)
-        - Similar message patterns
+        Streams up to max_logs logs from the backend page by page and mines
+        them into templates online (Drain):
+        - Variable parts (IDs, timestamps, numbers, IPs) are masked
+        - Stack traces group under their first line
+        - Messages that differ only in a few tokens share a template
+
+        Templates are remembered per service, so each signature says
+        whether it is new or was already seen in an earlier investigation.
 
         Use to understand the variety of issues without reading every log.
 
         Args:
             service: Optional service name to filter
             time_range: Time range to analyze (e.g., '1h', '24h')
-            severity_filter: Minimum severity level (default: ERROR)
+            severity_filter: ERROR/CRITICAL mines error logs (default: ERROR);
+                anything else mines all logs
             max_signatures: Maximum number of signatures to return (default 20)
             log_source: Log backend to query
             index_pattern: Elasticsearch index pattern
             log_group: CloudWatch log group
+            max_logs: Maximum number of logs to mine (default 20000)
+            persist_templates: Save learned templates for this service
 
         Returns:
-            JSON with log signatures and their frequencies
+            JSON with log signatures, their frequencies and new/known status
         """
         try:
             start_time, end_time = _get_time_bounds(time_range)
@@ -1876,96 +2183,91 @@ def register_tools(mcp: FastMCP):
             if log_group:
                 kwargs["log_group"] = log_group
 
-            sample_result = backend.sample_logs(
-                "errors_only", service, start_time, end_time, 200, **kwargs
-            )
-            logs = sample_result.get("logs", [])
-
-            def normalize_message(msg: str) -> str:
-                """Normalize a log message by replacing variables with placeholders."""
-                if not msg:
-                    return "empty"
-
-                normalized = msg
-                # UUIDs
-                normalized = re.sub(
-                    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-                    "{uuid}",
-                    normalized,
-                    flags=re.I,
-                )
-                # Numbers
-                normalized = re.sub(r"\b\d+\b", "{num}", normalized)
-                # IP addresses
-                normalized = re.sub(
-                    r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b", "{ip}", normalized
-                )
-                # Timestamps
-                normalized = re.sub(
-                    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}", "{timestamp}", normalized
-                )
-                # Hex strings
-                normalized = re.sub(
-                    r"\b[0-9a-f]{16,}\b", "{hex}", normalized, flags=re.I
-                )
-
-                return normalized[:100]
-
-            signature_counts = Counter()
-            signature_examples = {}
-            signature_services = {}
-            signature_first_seen = {}
-            signature_last_seen = {}
-
-            for log in logs:
-                msg = log.get("message", "")
-                sig = normalize_message(msg)
-                signature_counts[sig] += 1
+            miner = load_miner(service)
+            known_before = len(miner.known_ids)
 
-                if sig not in signature_examples:
-                    signature_examples[sig] = msg[:200]
-                    signature_first_seen[sig] = log.get("timestamp", "")
-                    signature_services[sig] = set()
+            # Per-template stats for this run, keyed by template id
+            seen: dict[str, dict] = {}
+            total_analyzed = 0
 
-                signature_last_seen[sig] = log.get("timestamp", "")
-                if log.get("service"):
-                    signature_services[sig].add(log["service"])
-
-            total_analyzed = len(logs)
+            for log in backend.iter_logs(
+                service,
+                start_time,
+                end_time,
+                errors_only=severity_filter.upper() in ("ERROR", "CRITICAL"),
+                max_logs=max_logs,
+                **kwargs,
+            ):
+                total_analyzed += 1
+                msg = log.get("message") or ""
+                timestamp = str(log.get("timestamp") or "")
+                cluster = miner.add(msg)
+
+                stats = seen.get(cluster.id)
+                if stats is None:
+                    stats = seen[cluster.id] = {
+                        "cluster": cluster,
+                        "count": 0,
+                        "first_seen": timestamp,
+                        "last_seen": timestamp,
+                        "sample_message": msg[:200],
+                        "services": set(),
+                    }
+                stats["count"] += 1
+                if timestamp:
+                    if not stats["first_seen"] or timestamp < stats["first_seen"]:
+                        stats["first_seen"] = timestamp
+                    if timestamp > stats["last_seen"]:
+                        stats["last_seen"] = timestamp
+                if log.get("service") and len(stats["services"]) < 20:
+                    stats["services"].add(log["service"])
+
+            if persist_templates and total_analyzed:
+                save_miner(service, miner)
+
+            ranked = sorted(seen.values(), key=lambda x: -x["count"])
+            new_count = sum(1 for x in ranked if x["cluster"].id not in miner.known_ids)
             signatures = []
 
-            for i, (pattern, count) in enumerate(
-                signature_counts.most_common(max_signatures)
-            ):
+            for i, stats in enumerate(ranked[:max_signatures]):
+                cluster = stats["cluster"]
+                count = stats["count"]
                 signatures.append(
                     {
                         "id": i + 1,
-                        "pattern": pattern,
+                        "template_id": cluster.id,
+                        "pattern": cluster.template,
+                        "is_new": cluster.id not in miner.known_ids,
                         "count": count,
                         "percentage": (
                             round(count / total_analyzed * 100, 1)
                             if total_analyzed > 0
                             else 0
                         ),
-                        "first_seen": signature_first_seen.get(pattern, ""),
-                        "last_seen": signature_last_seen.get(pattern, ""),
-                        "sample_message": signature_examples.get(pattern, ""),
-                        "affected_services": list(
-                            signature_services.get(pattern, set())
-                        ),
+                        "first_seen": stats["first_seen"],
+                        "last_seen": stats["last_seen"],
+                        "sample_message": stats["sample_message"],
+                        "affected_services": list(stats["services"]),
                         "severity": severity_filter,
                     }
                 )
 
             if signatures:
-                top_pct = signatures[0]["percentage"] if signatures else 0
-                insight = f"{len(signatures)} unique error patterns. Top pattern accounts for {top_pct}% of errors."
+                top_pct = signatures[0]["percentage"]
+                insight = (
+                    f"{len(ranked)} unique error patterns ({new_count} new). "
+                    f"Top pattern accounts for {top_pct}% of errors."
+                )
             else:
                 insight = "No error patterns found in the time range."
 
             result = {
                 "total_logs_analyzed": total_analyzed,
-                "unique_signatures": len(signatures),
+                "truncated": total_analyzed >= max_logs,
+                "unique_signatures": len(ranked),
+                "new_signatures": new_count,
+                "known_signatures": len(ranked) - new_count,
+                "templates_known_before": known_before,
                 "signatures": signatures,
                 "insight": insight,
                 "time_range": time_range,
@@ -1988,6 +2290,8 @@ def register_tools(mcp: FastMCP):
         log_source: str = "auto",
         index_pattern: str | None = None,
         log_group: str | None = None,
+        method: str = "rolling",
+        threshold: float = 2.0,
     ) -> str:
         """Detect anomalies in log volume patterns over time.
 
@@ -1996,6 +2300,10 @@ def register_tools(mcp: FastMCP):
         - Unusual drops in log volume
         - Pattern frequency anomalies
 
+        Each bucket is scored against the median/MAD of the 12 buckets before
+        it ("rolling"; the first 12 are compared with each other), so a spike
+        is not measured against an average it has already raised.
+
         Args:
             service: Optional service name to filter
             time_range: Time range to analyze (e.g., '1h', '24h')
@@ -2004,6 +2312,9 @@ def register_tools(mcp: FastMCP):
             log_source: Log backend to query
             index_pattern: Elasticsearch index pattern
             log_group: CloudWatch log group
+            method: Baseline method: rolling, robust, ewma or global
+                (see detect_anomalies)
+            threshold: Z-score threshold for flagging a bucket (default: 2.0)
 
         Returns:
             JSON with anomaly detection results
@@ -2041,24 +2352,29 @@ def register_tools(mcp: FastMCP):
                     }
                 )
 
-            mean = sum(counts) / len(counts)
-            variance = sum((x - mean) ** 2 for x in counts) / len(counts)
-            std_dev = variance**0.5 if variance > 0 else 1
+            series = anomaly_engine.as_series(counts)
+            mean = float(series.mean())
+            std_dev = float(series.std())
+            z_scores, baselines, used_method = anomaly_engine.score(
+                series, method, window=ANOMALY_WINDOW_BUCKETS
+            )
 
             anomalies = []
             for i, bucket in enumerate(time_buckets):
                 count = bucket.get("count", 0)
-                z_score = (count - mean) / std_dev if std_dev > 0 else 0
+                z_score = float(z_scores[i])
 
-                if abs(z_score) > 2:
+                # NaN (no baseline yet) never exceeds the threshold
+                if abs(z_score) > threshold:
                     anomaly_type = "spike" if z_score > 0 else "drop"
                     anomalies.append(
                         {
                             "timestamp": bucket.get("timestamp"),
                             "count": count,
+                            "expected": round(float(baselines[i]), 2),
                             "z_score": round(z_score, 2),
                             "type": anomaly_type,
-                            "description": f"{'Unusually high' if z_score > 0 else 'Unusually low'} log volume ({count} vs avg {round(mean)})",
+                            "description": f"{'Unusually high' if z_score > 0 else 'Unusually low'} log volume ({count} vs expected {round(float(baselines[i]))})",
                         }
                     )
 
@@ -2076,6 +2392,7 @@ def register_tools(mcp: FastMCP):
                 "time_range": time_range,
                 "granularity": granularity,
                 "metric": metric,
+                "method": used_method,
                 "log_source": log_source,
             }
 
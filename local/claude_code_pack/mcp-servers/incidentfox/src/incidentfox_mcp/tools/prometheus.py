@@ -23,6 +23,53 @@ def _get_alertmanager_url() -> str | None:
     return get_env("ALERTMANAGER_URL") or get_env("AM_URL")
 
 
+def query_range_series(
+    query: str, hours_ago: int = 1, step: str = "1m", timeout: float = 30.0
+) -> list[dict]:
+    """Run a range query and return every sample, for in-process analysis.
+
+    Unlike query_prometheus (which returns the last few samples as JSON),
+    this keeps whole series as Python lists so the anomaly tools can
+    analyze them without a JSON round-trip through the agent.
+
+    Returns:
+        [{"metric": labels, "timestamps": [epoch seconds], "values": [float]}]
+
+    Raises:
+        RuntimeError: If Prometheus is not configured or the query fails
+    """
+    prom_url = _get_prometheus_url()
+    if not prom_url:
+        raise RuntimeError("Prometheus not configured. Set PROMETHEUS_URL.")
+
+    now = datetime.utcnow()
+    params = {
+        "query": query,
+        "start": (now - timedelta(hours=hours_ago)).isoformat() + "Z",
+        "end": now.isoformat() + "Z",
+        "step": step,
+    }
+    with httpx.Client(timeout=timeout) as client:
+        response = client.get(f"{prom_url}/api/v1/query_range", params=params)
+        response.raise_for_status()
+        data = response.json()
+
+    if data.get("status") != "success":
+        raise RuntimeError(f"Prometheus query failed: {data.get('error')}")
+
+    series = []
+    for result in data.get("data", {}).get("result", []):
+        samples = result.get("values", [])
+        series.append(
+            {
+                "metric": result.get("metric", {}),
+                "timestamps": [float(ts) for ts, _ in samples],
+                "values": [float(value) for _, value in samples],
+            }
+        )
+    return series
+
+
 def register_tools(mcp: FastMCP):
     """Register Prometheus and Alertmanager tools."""
 
@@ -7,11 +7,18 @@ A single interface for searching logs across multiple backends:
 - Prometheus/Loki
 - Local files
 
-Automatically detects which backends are configured and queries them.
+Automatically detects which backends are configured and queries them
+concurrently, each under a deadline, so one slow backend cannot stall the
+search. Successful per-backend results are cached briefly, so repeated
+searches within an investigation don't refetch.
 """
 
 import json
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 
 from mcp.server.fastmcp import FastMCP
 
@@ -53,7 +60,7 @@ def _has_aws_credentials() -> bool:
 
 
 def _search_datadog(
-    query: str, service: str | None, hours_ago: int, limit: int
+    query: str, service: str | None, hours_ago: int, limit: int, timeout: float = 30.0
 ) -> dict:
     """Search Datadog logs."""
     try:
@@ -89,7 +96,8 @@ def _search_datadog(
                     ),
                     sort=LogsSort.TIMESTAMP_DESCENDING,
                     page=LogsListRequestPage(limit=limit),
-                )
+                ),
+                _request_timeout=timeout,
             )
 
         logs = []
@@ -116,12 +124,10 @@ def _search_datadog(
 
 
 def _search_cloudwatch(
-    query: str, service: str | None, hours_ago: int, limit: int
+    query: str, service: str | None, hours_ago: int, limit: int, timeout: float = 30.0
 ) -> dict:
     """Search CloudWatch logs using Logs Insights."""
     try:
-        import time
-
         import boto3
 
         session = boto3.Session(
@@ -164,8 +170,9 @@ def _search_cloudwatch(
         )
         query_id = response["queryId"]
 
-        # Poll for results
-        for _ in range(30):
+        # Poll for results until the deadline
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
             result = logs_client.get_query_results(queryId=query_id)
             if result["status"] == "Complete":
                 logs = []
@@ -189,6 +196,10 @@ def _search_cloudwatch(
                 }
             time.sleep(1)
 
+        try:
+            logs_client.stop_query(queryId=query_id)
+        except Exception:
+            pass
         return {"backend": "cloudwatch", "error": "Query timeout"}
 
     except Exception as e:
@@ -196,7 +207,7 @@ def _search_cloudwatch(
 
 
 def _search_elasticsearch(
-    query: str, service: str | None, hours_ago: int, limit: int
+    query: str, service: str | None, hours_ago: int, limit: int, timeout: float = 30.0
 ) -> dict:
     """Search Elasticsearch logs."""
     try:
@@ -236,7 +247,7 @@ def _search_elasticsearch(
             "size": limit,
         }
 
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=timeout) as client:
             response = client.post(
                 f"{es_url}/{es_index}/_search",
                 json=body,
@@ -269,7 +280,9 @@ def _search_elasticsearch(
         return {"backend": "elasticsearch", "error": str(e)}
 
 
-def _search_loki(query: str, service: str | None, hours_ago: int, limit: int) -> dict:
+def _search_loki(
+    query: str, service: str | None, hours_ago: int, limit: int, timeout: float = 30.0
+) -> dict:
     """Search Grafana Loki logs."""
     try:
         import httpx
@@ -293,7 +306,7 @@ def _search_loki(query: str, service: str | None, hours_ago: int, limit: int) ->
             "limit": limit,
         }
 
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=timeout) as client:
             response = client.get(
                 f"{loki_url}/loki/api/v1/query_range",
                 params=params,
@@ -324,12 +337,15 @@ def _search_loki(query: str, service: str | None, hours_ago: int, limit: int) ->
         return {"backend": "loki", "error": str(e)}
 
 
-def _search_local(query: str, service: str | None, hours_ago: int, limit: int) -> dict:
-    """Search local log files."""
+def _search_local(
+    query: str, service: str | None, hours_ago: int, limit: int, timeout: float = 30.0
+) -> dict:
+    """Search local log files (most recent matches within the time range)."""
     try:
-        import re
         from pathlib import Path
 
+        from ..utils.local_logs import search_local_logs
+
         log_path = get_env("LOG_PATH") or get_env("LOG_FILE")
         if not log_path:
             return {"backend": "local", "error": "LOG_PATH not set"}
@@ -338,46 +354,175 @@ def _search_local(query: str, service: str | None, hours_ago: int, limit: int) -
         if not path.exists():
             return {"backend": "local", "error": f"Log path not found: {log_path}"}
 
-        # Get files to search
-        if path.is_dir():
-            files = list(path.glob("**/*.log")) + list(path.glob("**/*.txt"))
-        else:
-            files = [path]
-
-        logs = []
-        pattern = re.compile(query, re.IGNORECASE)
-
-        for file in files:
-            try:
-                with open(file) as f:
-                    for line in f:
-                        if pattern.search(line):
-                            logs.append(
-                                {
-                                    "file": str(file),
-                                    "message": line.strip(),
-                                }
-                            )
-                            if len(logs) >= limit:
-                                break
-            except Exception:
-                continue
-
-            if len(logs) >= limit:
-                break
+        result = search_local_logs(
+            log_path,
+            query,
+            since=time.time() - hours_ago * 3600,
+            limit=limit,
+            deadline=time.monotonic() + timeout,
+            use_index=(get_env("LOG_INDEX") or "").lower() in ("1", "true", "yes"),
+        )
 
         return {
             "backend": "local",
             "path": log_path,
             "query": query,
-            "count": len(logs),
-            "logs": logs[-limit:],  # Most recent
+            "count": len(result["logs"]),
+            "files_searched": result["files_searched"],
+            "timed_out": result["timed_out"],
+            "logs": result["logs"],
         }
 
     except Exception as e:
         return {"backend": "local", "error": str(e)}
 
 
+_SEARCHES = {
+    "datadog": _search_datadog,
+    "cloudwatch": _search_cloudwatch,
+    "elasticsearch": _search_elasticsearch,
+    "loki": _search_loki,
+    "local": _search_local,
+}
+
+# Shared across calls; backends that overrun their deadline finish here
+# in the background instead of blocking the tool call.
+_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="log-search")
+
+_CACHE_TTL_SECONDS = 60
+_CACHE_MAX_ENTRIES = 128
+# (backend, query, service, hours_ago, limit) -> (stored_at, result)
+_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: tuple) -> dict | None:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > _CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(key: tuple, result: dict):
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), result)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def _cache_result(key: tuple, future):
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    # A backend that hit its deadline returned only part of its matches
+    if "error" not in result and not result.get("timed_out"):
+        _cache_put(key, result)
+
+
+def _timed_search(
+    backend: str,
+    query: str,
+    service: str | None,
+    hours_ago: int,
+    limit: int,
+    timeout: float,
+) -> dict:
+    """Run one backend search and record how long it took."""
+    started = time.monotonic()
+    result = _SEARCHES[backend](query, service, hours_ago, limit, timeout)
+    result["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+    return result
+
+
+def _fan_out(
+    backends: list[str],
+    query: str,
+    service: str | None,
+    hours_ago: int,
+    limit: int,
+    backend_timeout: float,
+    total_timeout: float,
+    use_cache: bool,
+) -> list[dict]:
+    """Query backends concurrently; late backends are reported as timed out.
+
+    Each backend gets min(backend_timeout, total_timeout) to answer. Results
+    come back in the order of backends.
+    """
+    deadline = min(backend_timeout, total_timeout)
+    results: dict[str, dict] = {}
+    futures = {}
+
+    for backend in backends:
+        key = (backend, query, service, hours_ago, limit)
+        cached = _cache_get(key) if use_cache else None
+        if cached is not None:
+            results[backend] = dict(cached, cached=True, elapsed_ms=0)
+        else:
+            future = _executor.submit(
+                _timed_search, backend, query, service, hours_ago, limit, deadline
+            )
+            # Cache from the callback so late finishers still warm the cache
+            future.add_done_callback(lambda f, key=key: _cache_result(key, f))
+            futures[future] = key
+
+    if futures:
+        wait(futures, timeout=deadline)
+
+    for future, key in futures.items():
+        backend = key[0]
+        if not future.done():
+            future.cancel()
+            results[backend] = {
+                "backend": backend,
+                "error": f"Timed out after {deadline:g}s",
+                "timed_out": True,
+            }
+            continue
+        try:
+            results[backend] = future.result()
+        except Exception as e:
+            results[backend] = {"backend": backend, "error": str(e)}
+
+    return [results[b] for b in backends]
+
+
+def _sort_key(log: dict) -> float:
+    """Epoch seconds for a log's timestamp; 0 if missing or unparseable."""
+    value = log.get("timestamp") or log.get("@timestamp")
+    if value is None:
+        return 0.0
+    text = str(value).strip()
+    if text.isdigit():
+        # Loki reports nanoseconds since the epoch
+        return int(text) / 1e9 if len(text) > 12 else float(text)
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _merge_logs(results: list[dict]) -> list[dict]:
+    """All logs from successful backends, newest first, tagged by backend."""
+    merged = [
+        dict(log, backend=r["backend"])
+        for r in results
+        if "error" not in r
+        for log in r.get("logs", [])
+    ]
+    merged.sort(key=_sort_key, reverse=True)
+    return merged
+
+
 def register_tools(mcp: FastMCP):
     """Register unified log search tools."""
 
@@ -388,11 +533,17 @@ def register_tools(mcp: FastMCP):
         hours_ago: int = 1,
         limit: int = 50,
         backends: str | None = None,
+        backend_timeout_seconds: float = 20.0,
+        timeout_seconds: float = 30.0,
+        use_cache: bool = True,
     ) -> str:
         """Search logs across all configured backends.
 
         This is the primary log search tool. It automatically detects and queries
-        all available log backends (Datadog, CloudWatch, Elasticsearch, Loki, local files).
+        all available log backends (Datadog, CloudWatch, Elasticsearch, Loki, local files)
+        in parallel. Backends that miss their deadline are reported as timed out
+        and the rest are returned. Identical searches within a minute are served
+        from cache.
 
         Args:
             query: Search query (text to find in logs)
@@ -400,9 +551,13 @@ def register_tools(mcp: FastMCP):
             hours_ago: How far back to search (default: 1 hour)
             limit: Maximum logs per backend (default: 50)
             backends: Comma-separated list of backends to query (default: all configured)
+            backend_timeout_seconds: Deadline for each backend (default: 20)
+            timeout_seconds: Deadline for the whole search (default: 30)
+            use_cache: Reuse recent results for the same search (default: True)
 
         Returns:
-            JSON with results from each backend that returned data.
+            JSON with logs from all backends merged newest first, plus
+            per-backend counts, timings and errors.
         """
         detected = _detect_backends()
 
@@ -426,28 +581,26 @@ def register_tools(mcp: FastMCP):
             requested = [b.strip().lower() for b in backends.split(",")]
             detected = [b for b in detected if b in requested]
 
-        results = []
-
-        # Query each backend
-        if "datadog" in detected:
-            results.append(_search_datadog(query, service, hours_ago, limit))
-
-        if "cloudwatch" in detected:
-            results.append(_search_cloudwatch(query, service, hours_ago, limit))
-
-        if "elasticsearch" in detected:
-            results.append(_search_elasticsearch(query, service, hours_ago, limit))
-
-        if "loki" in detected:
-            results.append(_search_loki(query, service, hours_ago, limit))
-
-        if "local" in detected:
-            results.append(_search_local(query, service, hours_ago, limit))
+        started = time.monotonic()
+        results = _fan_out(
+            detected,
+            query,
+            service,
+            hours_ago,
+            limit,
+            backend_timeout_seconds,
+            timeout_seconds,
+            use_cache,
+        )
 
         # Aggregate results
-        total_logs = sum(r.get("count", 0) for r in results if "error" not in r)
         errors = [r for r in results if "error" in r]
-        successful = [r for r in results if "error" not in r]
+        successful = [
+            {k: v for k, v in r.items() if k != "logs"}
+            for r in results
+            if "error" not in r
+        ]
+        logs = _merge_logs(results)
 
         return json.dumps(
             {
@@ -455,11 +608,16 @@ def register_tools(mcp: FastMCP):
                 "service": service,
                 "time_range": f"last {hours_ago} hour(s)",
                 "backends_queried": detected,
-                "total_logs_found": total_logs,
+                "total_logs_found": len(logs),
+                "elapsed_ms": round((time.monotonic() - started) * 1000),
+                "timing_ms": {r["backend"]: r.get("elapsed_ms") for r in results},
+                "partial": bool(errors) or any(r.get("timed_out") for r in results),
                 "results": successful,
+                "logs": logs,
                 "errors": errors if errors else None,
             },
             indent=2,
+            default=str,
         )
 
     @mcp.tool()
@@ -489,7 +647,7 @@ def register_tools(mcp: FastMCP):
             },
             "local": {
                 "configured": "local" in detected,
-                "requires": ["LOG_PATH or LOG_FILE"],
+                "requires": ["LOG_PATH or LOG_FILE", "LOG_INDEX=1 (optional)"],
             },
         }
 
@@ -0,0 +1,350 @@
+"""Vectorized time-series statistics behind the anomaly tools.
+
+Every function takes a 1-D sequence (list or NumPy array) and works in
+whole-array operations, so 100k-point series from Prometheus or Datadog
+can be analyzed directly instead of being sampled down first.
+
+Baselines come from each point's past (trailing window, EWMA, the same
+phase in earlier seasons), so a spike is never scored against a mean and
+deviation it has already inflated. Scale is the MAD (median absolute
+deviation) unless noted, which a handful of outliers cannot drag up.
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# MAD * 1.4826 estimates the standard deviation of normally distributed data
+MAD_SCALE = 1.4826
+
+# Deviations from a zero-variance baseline get this score instead of inf
+Z_CAP = 1000.0
+
+# Rows per block when materializing (rows, window) views, ~32 MB of float64
+_BLOCK_CELLS = 1 << 22
+
+METHODS = ("rolling", "robust", "ewma", "seasonal", "global")
+
+
+def as_series(values) -> np.ndarray:
+    """1-D float64 array from a list, tuple or array."""
+    return np.asarray(values, dtype=np.float64).ravel()
+
+
+def _zscores(residual: np.ndarray, scale: np.ndarray | float) -> np.ndarray:
+    """residual / scale, with zero scale mapped to 0 or +-Z_CAP; NaN stays NaN."""
+    scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), residual.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = residual / scale
+    flat = np.where(residual == 0, 0.0, np.sign(residual) * Z_CAP)
+    return np.clip(np.where(scale > 0, z, flat), -Z_CAP, Z_CAP)
+
+
+def global_zscores(values) -> tuple[np.ndarray, np.ndarray]:
+    """Classic z-scores against the mean/stdev of the whole series."""
+    x = as_series(values)
+    mean = x.mean()
+    std = x.std(ddof=1) if len(x) > 1 else 0.0
+    return _zscores(x - mean, std), np.full(len(x), mean)
+
+
+def robust_zscores(values) -> tuple[np.ndarray, np.ndarray]:
+    """Z-scores against the median/MAD of the whole series."""
+    x = as_series(values)
+    median = np.median(x)
+    mad = np.median(np.abs(x - median))
+    return _zscores(x - median, MAD_SCALE * mad), np.full(len(x), median)
+
+
+def _row_medians(rows: np.ndarray) -> np.ndarray:
+    """Median of each row; sorting short rows beats np.median's partition."""
+    ordered = np.sort(rows, axis=1)
+    mid = rows.shape[1] // 2
+    if rows.shape[1] % 2:
+        return ordered[:, mid]
+    return (ordered[:, mid - 1] + ordered[:, mid]) / 2
+
+
+def rolling_zscores(
+    values, window: int = 30, robust: bool = True
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score each point against the `window` points before it.
+
+    The first `window` points have no full history and score NaN.
+
+    Returns:
+        (z-scores, baseline) arrays, both the length of the input
+    """
+    x = as_series(values)
+    n = len(x)
+    z = np.full(n, np.nan)
+    baseline = np.full(n, np.nan)
+    if window < 2 or n <= window:
+        return z, baseline
+
+    # Row i of `past` is x[i:i + window], the history of x[i + window]
+    past = sliding_window_view(x[:-1], window)
+    rows = max(1, _BLOCK_CELLS // window)
+    for start in range(0, len(past), rows):
+        block = past[start : start + rows]
+        if robust:
+            center = _row_medians(block)
+            scale = MAD_SCALE * _row_medians(np.abs(block - center[:, None]))
+        else:
+            center = block.mean(axis=1)
+            scale = block.std(axis=1, ddof=1)
+        target = slice(window + start, window + start + len(block))
+        baseline[target] = center
+        z[target] = _zscores(x[target] - center, scale)
+    return z, baseline
+
+
+def ewma(values, alpha: float) -> np.ndarray:
+    """Exponentially weighted moving average, y[t] = a*x[t] + (1-a)*y[t-1].
+
+    Evaluated in closed form per block instead of a Python loop: within a
+    block, y[j] = d**(j+1) * y_prev + a * d**j * cumsum(x[k] / d**k) with
+    d = 1 - a. Blocks are sized so d**-j stays far from overflow.
+    """
+    x = as_series(values)
+    if not 0 < alpha <= 1:
+        raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+    n = len(x)
+    out = np.empty(n)
+    decay = 1.0 - alpha
+    if n == 0 or decay == 0:
+        out[:] = x
+        return out
+
+    block = max(1, int(230 / -math.log(decay)))  # decay**-block <= 1e100
+    prev = x[0]
+    for start in range(0, n, block):
+        chunk = x[start : start + block]
+        powers = decay ** np.arange(len(chunk))
+        acc = np.cumsum(chunk / powers)
+        out[start : start + len(chunk)] = powers * (decay * prev + alpha * acc)
+        prev = out[start + len(chunk) - 1]
+    return out
+
+
+def ewma_zscores(values, alpha: float = 0.1) -> tuple[np.ndarray, np.ndarray]:
+    """Score each point against the EWMA and EW variance of the points before it.
+
+    Points inside the warm-up span (about 2/alpha) score NaN.
+    """
+    x = as_series(values)
+    n = len(x)
+    z = np.full(n, np.nan)
+    baseline = np.full(n, np.nan)
+    if n < 3:
+        return z, baseline
+
+    mean = ewma(x, alpha)
+    baseline[1:] = mean[:-1]
+    residual = x[1:] - mean[:-1]
+    variance = ewma(residual**2, alpha)
+    # residual[i] (for x[i + 1]) is scaled by the variance up to residual[i - 1]
+    z[2:] = _zscores(residual[1:], np.sqrt(variance[:-1]))
+    z[: min(n, max(2, int(round(2 / alpha))))] = np.nan
+    return z, baseline
+
+
+def seasonal_zscores(
+    values, period: int, seasons: int = 3
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score each point against the same phase in up to `seasons` earlier periods.
+
+    The baseline is the median of x[t - period], x[t - 2*period], ...; the
+    scale is the MAD of the residuals. Points in the first period score NaN.
+    """
+    x = as_series(values)
+    n = len(x)
+    z = np.full(n, np.nan)
+    baseline = np.full(n, np.nan)
+    if period < 1 or n <= period:
+        return z, baseline
+
+    lagged = np.full((seasons, n), np.nan)
+    for k in range(1, seasons + 1):
+        if k * period < n:
+            lagged[k - 1, k * period :] = x[: n - k * period]
+    baseline[period:] = np.nanmedian(lagged[:, period:], axis=0)
+    residual = x - baseline
+    mad = np.median(np.abs(residual[period:] - np.median(residual[period:])))
+    z[period:] = _zscores(residual[period:], MAD_SCALE * mad)
+    return z, baseline
+
+
+def score(
+    values,
+    method: str = "rolling",
+    window: int = 30,
+    alpha: float = 0.1,
+    period: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, str]:
+    """Dispatch to one of METHODS.
+
+    With "rolling", the first `window` points (which have no full history)
+    are scored as "robust"; series no longer than the window are scored
+    entirely as "robust". "seasonal" requires `period`.
+
+    Returns:
+        (z-scores, baseline, method actually used)
+    """
+    x = as_series(values)
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Use one of: {', '.join(METHODS)}")
+    if method == "rolling" and len(x) <= window:
+        method = "robust"
+
+    if method == "rolling":
+        z, baseline = rolling_zscores(x, window)
+        head_z, head_baseline = robust_zscores(x[:window])
+        z[:window] = head_z
+        baseline[:window] = head_baseline
+    elif method == "robust":
+        z, baseline = robust_zscores(x)
+    elif method == "ewma":
+        z, baseline = ewma_zscores(x, alpha)
+    elif method == "seasonal":
+        if not period:
+            raise ValueError("method='seasonal' requires period (points per season)")
+        z, baseline = seasonal_zscores(x, period)
+    else:
+        z, baseline = global_zscores(x)
+    return z, baseline, method
+
+
+def change_points(
+    values,
+    min_size: int = 5,
+    penalty: float | None = None,
+    max_points: int = 10,
+) -> list[dict]:
+    """Find shifts in the mean by binary segmentation on CUSUM statistics.
+
+    For a segment, the best split and its cost reduction come from one
+    cumulative sum, so each pass is O(n) and finding k change points costs
+    O(n * log k) on balanced splits. A split is kept while its reduction,
+    in units of the noise variance, exceeds `penalty` (default 3 * ln n).
+    Noise is estimated from first differences, so the shifts themselves
+    do not inflate it.
+
+    Returns:
+        Change points in index order with the means of the segments on
+        either side and the split score
+    """
+    x = as_series(values)
+    n = len(x)
+    min_size = max(1, min_size)
+    if n < 2 * min_size:
+        return []
+
+    diffs = np.diff(x)
+    sigma = MAD_SCALE * np.median(np.abs(diffs - np.median(diffs))) / math.sqrt(2)
+    if sigma == 0:
+        sigma = x.std()
+    if sigma == 0:
+        return []
+    threshold = penalty if penalty is not None else 3 * math.log(n)
+
+    def best_split(start: int, end: int):
+        m = end - start
+        if m < 2 * min_size:
+            return None
+        seg = x[start:end] - x[start:end].mean()
+        left_sizes = np.arange(min_size, m - min_size + 1)
+        left_sums = np.cumsum(seg)[left_sizes - 1]
+        # SSE reduction from splitting a centered segment after k points
+        gains = left_sums**2 * m / (left_sizes * (m - left_sizes))
+        i = int(np.argmax(gains))
+        return gains[i] / sigma**2, start + int(left_sizes[i])
+
+    candidates = {(0, n): best_split(0, n)}
+    splits = {}
+    while candidates and len(splits) < max_points:
+        segment, best = max(
+            candidates.items(), key=lambda item: item[1][0] if item[1] else -1
+        )
+        if best is None or best[0] < threshold:
+            break
+        del candidates[segment]
+        split_score, index = best
+        splits[index] = split_score
+        for child in ((segment[0], index), (index, segment[1])):
+            candidates[child] = best_split(*child)
+
+    bounds = [0, *sorted(splits), n]
+    points = []
+    for before, index, after in zip(bounds, bounds[1:], bounds[2:]):
+        mean_before = float(x[before:index].mean())
+        mean_after = float(x[index:after].mean())
+        points.append(
+            {
+                "index": index,
+                "mean_before": mean_before,
+                "mean_after": mean_after,
+                "score": float(splits[index]),
+            }
+        )
+    return points
+
+
+def lagged_correlation(a, b, max_lag: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Pearson correlation of a[t] with b[t + lag] for lag in [-max_lag, max_lag].
+
+    A positive lag means `b` follows `a`. Cross products for all lags come
+    from one FFT; per-lag means and variances over the overlapping points
+    come from prefix sums, so each lag is an exact Pearson coefficient.
+
+    Returns:
+        (lags, correlations); correlation is NaN where either side is constant
+    """
+    x = as_series(a)
+    y = as_series(b)
+    n = len(x)
+    if len(y) != n:
+        raise ValueError(f"Series must have same length ({n} vs {len(y)})")
+    max_lag = max(0, min(max_lag, n - 2))
+    # Centering keeps the prefix-sum differences well conditioned
+    x = x - x.mean()
+    y = y - y.mean()
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    if max_lag == 0:
+        cross = np.array([x @ y])
+    else:
+        size = 1 << (2 * n - 1).bit_length()
+        full = np.fft.irfft(np.conj(np.fft.rfft(x, size)) * np.fft.rfft(y, size), size)
+        # full[L] = sum_t x[t] * y[t + L]; negative lags wrap around
+        cross = full[lags % size]
+
+    def prefix(v):
+        return np.concatenate(([0.0], np.cumsum(v)))
+
+    px, pxx, py, pyy = prefix(x), prefix(x * x), prefix(y), prefix(y * y)
+    shift = np.abs(lags)
+    m = n - shift
+    # For lag >= 0, x[0:m] pairs with y[lag:n]; for lag < 0, x[-lag:n] with y[0:m]
+    x_lo = np.where(lags < 0, shift, 0)
+    y_lo = np.where(lags > 0, shift, 0)
+    sx = px[x_lo + m] - px[x_lo]
+    sxx = pxx[x_lo + m] - pxx[x_lo]
+    sy = py[y_lo + m] - py[y_lo]
+    syy = pyy[y_lo + m] - pyy[y_lo]
+
+    cov = cross - sx * sy / m
+    var = (sxx - sx * sx / m) * (syy - sy * sy / m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.where(var > 0, cov / np.sqrt(var), np.nan)
+    return lags, np.clip(corr, -1.0, 1.0)
+
+
+def percentiles(values, points=(50, 90, 95, 99)) -> dict[int, float]:
+    """Nearest-rank percentiles (index int(n * p / 100)) via one partition."""
+    x = as_series(values)
+    n = len(x)
+    indices = sorted({min(int(n * p / 100), n - 1) for p in points})
+    part = np.partition(x, indices)
+    return {p: float(part[min(int(n * p / 100), n - 1)]) for p in points}
@@ -0,0 +1,492 @@
+"""Local log file search: time-bounded, newest first, optionally indexed.
+
+Plain files are memory-mapped. The start of the time window is found by
+binary search on line timestamps, and the window is then scanned backwards
+from the end of the file in chunks, so the most recent matches are found
+first and the scan stops as soon as enough are collected. Rotated files
+(app.log.1, app.log.2.gz, ...) are searched newest first, and files last
+modified before the window are skipped without being opened. Gzipped files
+cannot be seeked, so they are streamed keeping only the last matches.
+
+With use_index, a sidecar index per file (under ~/.incidentfox/log_index/)
+records, for each ~1 MiB block, its time range and which word trigrams
+occur in it. Blocks outside the window, or missing a trigram of a literal
+query, are skipped. Logs are append-only, so the index is extended
+incrementally and rebuilt only if the file was truncated or replaced.
+
+Line timestamps are parsed from ISO 8601, common log format and syslog
+prefixes. An explicit zone (Z, +HH:MM, -0700) is honoured; timestamps
+without one are taken to be in the host's local time, which is what
+loggers writing naive timestamps use. Lines before the first parseable
+timestamp of a file are treated as inside the window.
+"""
+
+import calendar
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+CHUNK_BYTES = 1 << 20
+INDEX_BLOCK_BYTES = 1 << 20
+
+# How many lines to look past a probe for one with a timestamp
+_PROBE_LINES = 64
+
+_ISO_RE = re.compile(
+    rb"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:[.,]\d+)?"
+    rb"(Z|[+-]\d{2}:?\d{2})?"
+)
+_CLF_RE = re.compile(
+    rb"\[(\d{2})/([A-Za-z]{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})(?: ([+-]\d{4}))?"
+)
+_SYSLOG_RE = re.compile(rb"^([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2})")
+_MONTHS = {
+    name: i + 1
+    for i, name in enumerate(
+        [b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun"]
+        + [b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec"]
+    )
+}
+
+_LOG_FILE_RE = re.compile(r"\.(log|txt)(\.\d+)?(\.gz)?$|\.log-\d+(\.gz)?$")
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+def _epoch(fields: tuple[int, ...], zone: bytes | None) -> float:
+    """Epoch seconds for (Y, m, d, H, M, S) in zone, or local time if None."""
+    if zone is None:
+        return time.mktime(fields + (0, 0, -1))
+    ts = calendar.timegm(fields + (0, 0, 0))
+    if zone == b"Z":
+        return ts
+    sign = -1 if zone[:1] == b"-" else 1
+    zone = zone[1:].replace(b":", b"")
+    return ts - sign * (int(zone[:2]) * 3600 + int(zone[2:]) * 60)
+
+
+def parse_line_timestamp(line: bytes) -> float | None:
+    """Epoch seconds from a line's leading timestamp, or None."""
+    head = line[:64]
+    try:
+        m = _ISO_RE.search(head)
+        if m:
+            return _epoch(tuple(int(g) for g in m.groups()[:6]), m.group(7))
+        m = _CLF_RE.search(head)
+        if m:
+            day, month, year, hh, mm, ss, zone = m.groups()
+            fields = (int(year), _MONTHS[month], int(day), int(hh), int(mm), int(ss))
+            return _epoch(fields, zone)
+        m = _SYSLOG_RE.match(head)
+        if m:
+            month, day, hh, mm, ss = m.groups()
+            now = time.time()
+            year = time.localtime(now).tm_year
+            fields = (_MONTHS[month], int(day), int(hh), int(mm), int(ss))
+            ts = _epoch((year,) + fields, None)
+            # Syslog has no year; a date in the future belongs to last year
+            if ts > now + 86400:
+                ts = _epoch((year - 1,) + fields, None)
+            return ts
+    except (KeyError, ValueError, OverflowError):
+        pass
+    return None
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def find_log_files(log_path: str, since: float | None = None) -> list[Path]:
+    """Log files under log_path (incl. rotated/gzipped), newest first.
+
+    Files last modified before since cannot contain lines in the window
+    and are left out.
+    """
+    path = Path(log_path)
+    if path.is_dir():
+        candidates = [p for p in path.rglob("*") if _LOG_FILE_RE.search(p.name)]
+    else:
+        # A single file plus its rotations: app.log, app.log.1, app.log.2.gz
+        candidates = [path] + [
+            p for p in path.parent.glob(path.name + ".*") if _LOG_FILE_RE.search(p.name)
+        ]
+
+    files = []
+    for p in candidates:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if p.is_file() and (since is None or st.st_mtime >= since):
+            files.append((st.st_mtime, p))
+    files.sort(key=lambda x: x[0], reverse=True)
+    return [p for _, p in files]
+
+
+# =============================================================================
+# Plain files (mmap)
+# =============================================================================
+
+
+def _next_line_start(mm, pos: int, size: int) -> int:
+    if pos <= 0:
+        return 0
+    nl = mm.find(b"\n", pos - 1)
+    return size if nl == -1 else nl + 1
+
+
+def _timestamp_from(mm, pos: int, size: int) -> float | None:
+    """Timestamp of the first timestamped line at or after pos."""
+    for _ in range(_PROBE_LINES):
+        if pos >= size:
+            return None
+        nl = mm.find(b"\n", pos)
+        end = size if nl == -1 else nl
+        ts = parse_line_timestamp(mm[pos : min(end, pos + 64)])
+        if ts is not None:
+            return ts
+        pos = end + 1
+    return None
+
+
+def seek_time(mm, size: int, since: float) -> int:
+    """Offset of the first line with a timestamp >= since (binary search)."""
+    lo, hi = 0, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        ts = _timestamp_from(mm, _next_line_start(mm, mid, size), size)
+        if ts is None or ts >= since:
+            hi = mid
+        else:
+            lo = mid + 1
+    return _next_line_start(mm, lo, size)
+
+
+def _reverse_matches(mm, start: int, end: int, pattern, deadline: float | None):
+    """Yield (offset, line) for lines in [start, end) matching, newest first.
+
+    The range is read backwards in line-aligned chunks and each chunk is
+    searched with one finditer, so non-matching lines cost no Python work.
+    """
+    chunk_end = end
+    while chunk_end > start:
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError
+        chunk_start = max(start, chunk_end - CHUNK_BYTES)
+        if chunk_start > start:
+            nl = mm.rfind(b"\n", start, chunk_start)
+            chunk_start = start if nl == -1 else nl + 1
+        chunk = mm[chunk_start:chunk_end]
+
+        lines = []
+        last_line_start = -1
+        for m in pattern.finditer(chunk):
+            line_start = chunk.rfind(b"\n", 0, m.start()) + 1
+            if line_start == last_line_start:
+                continue
+            last_line_start = line_start
+            line_end = chunk.find(b"\n", m.end())
+            lines.append((line_start, len(chunk) if line_end == -1 else line_end))
+        for line_start, line_end in reversed(lines):
+            yield chunk_start + line_start, chunk[line_start:line_end]
+        chunk_end = chunk_start
+
+
+def _search_mapped(
+    path: Path,
+    pattern,
+    since: float | None,
+    limit: int,
+    deadline: float | None,
+    literal_trigrams: set[int] | None,
+    use_index: bool,
+) -> tuple[list[dict], bool]:
+    """Newest matches in a plain file; also returns whether time ran out."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [], False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            window_start = seek_time(mm, size, since) if since is not None else 0
+            if use_index:
+                regions = _indexed_regions(
+                    path, mm, size, window_start, since, literal_trigrams
+                )
+            else:
+                regions = [(window_start, size)]
+
+            logs = []
+            try:
+                for start, end in regions:
+                    for _, line in _reverse_matches(mm, start, end, pattern, deadline):
+                        logs.append(
+                            {
+                                "file": str(path),
+                                "timestamp": _iso(parse_line_timestamp(line)),
+                                "message": line.decode("utf-8", "replace").strip(),
+                            }
+                        )
+                        if len(logs) >= limit:
+                            return logs, False
+            except TimeoutError:
+                return logs, True
+            return logs, False
+
+
+# =============================================================================
+# Gzipped files (streamed)
+# =============================================================================
+
+
+def _search_gzip(
+    path: Path, pattern, since: float | None, limit: int, deadline: float | None
+) -> tuple[list[dict], bool]:
+    """Stream a gzipped file, keeping the last `limit` matches in the window.
+
+    Like seek_time, lines that can't be placed in time (none of the lines
+    read so far had a timestamp) count as inside the window.
+    """
+    matches = deque(maxlen=limit)
+    in_window = since is None
+    seen_timestamp = False
+    timed_out = False
+    with gzip.open(path, "rb") as f:
+        for i, line in enumerate(f):
+            if deadline is not None and i % 10000 == 0 and time.monotonic() > deadline:
+                timed_out = True
+                break
+            if not in_window:
+                ts = parse_line_timestamp(line)
+                if ts is None:
+                    if seen_timestamp:
+                        continue
+                elif ts < since:
+                    if not seen_timestamp:
+                        # Untimed lines so far precede an old one
+                        matches.clear()
+                        seen_timestamp = True
+                    continue
+                else:
+                    in_window = True
+            if pattern.search(line):
+                matches.append(line)
+
+    logs = [
+        {
+            "file": str(path),
+            "timestamp": _iso(parse_line_timestamp(line)),
+            "message": line.decode("utf-8", "replace").strip(),
+        }
+        for line in reversed(matches)
+    ]
+    return logs, timed_out
+
+
+# =============================================================================
+# Sidecar trigram/time index
+# =============================================================================
+
+# Trigrams over lowercase ASCII word characters: 37^3 possible values, so a
+# block's trigram set is an exact bitmap rather than a probabilistic filter.
+_WORD_CHARS = b"abcdefghijklmnopqrstuvwxyz0123456789_"
+_CHAR_CODE = [-1] * 256
+for _i, _c in enumerate(_WORD_CHARS):
+    _CHAR_CODE[_c] = _i
+_TRIGRAM_SPACE = len(_WORD_CHARS) ** 3
+_BITMAP_BYTES = (_TRIGRAM_SPACE + 7) // 8
+_WORD_RE = re.compile(rb"[a-z0-9_]{3,}")
+_INDEX_VERSION = 2
+
+
+def _trigram_codes(data: bytes) -> set[int]:
+    """Codes of the word trigrams occurring in data (case-insensitive)."""
+    codes = set()
+    for word in set(_WORD_RE.findall(data.lower())):
+        c = [_CHAR_CODE[b] for b in word]
+        for i in range(len(c) - 2):
+            codes.add(c[i] * 1369 + c[i + 1] * 37 + c[i + 2])
+    return codes
+
+
+def literal_trigrams(query: str) -> set[int] | None:
+    """Trigrams any line containing query must have; None for regex queries."""
+    if any(ch in _REGEX_META for ch in query):
+        return None
+    return _trigram_codes(query.encode("utf-8", "replace"))
+
+
+def _index_path(path: Path) -> Path:
+    index_dir = Path.home() / ".incidentfox" / "log_index"
+    index_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:16]
+    return index_dir / f"{path.name}.{digest}.idx"
+
+
+def _head_digest(mm, size: int) -> str:
+    return hashlib.sha1(mm[: min(size, 4096)]).hexdigest()
+
+
+def _load_index(index_file: Path) -> tuple[dict, bytearray] | None:
+    try:
+        with open(index_file, "rb") as f:
+            header = json.loads(f.readline())
+            bitmaps = bytearray(f.read())
+    except (OSError, ValueError):
+        return None
+    if header.get("version") != _INDEX_VERSION:
+        return None
+    if len(bitmaps) != len(header["blocks"]) * _BITMAP_BYTES:
+        return None
+    return header, bitmaps
+
+
+def _update_index(path: Path, mm, size: int) -> tuple[dict, bytearray]:
+    """Load the file's index, extending it over newly appended blocks."""
+    index_file = _index_path(path)
+    head = _head_digest(mm, size)
+    loaded = _load_index(index_file)
+    if loaded and loaded[0]["head"] == head and loaded[0]["indexed_to"] <= size:
+        header, bitmaps = loaded
+    else:
+        header = {"version": _INDEX_VERSION, "head": head, "indexed_to": 0}
+        header["blocks"] = []
+        bitmaps = bytearray()
+
+    pos = header["indexed_to"]
+    changed = False
+    while pos < size:
+        # Blocks end on a newline; a trailing partial line stays unindexed
+        nl = mm.find(b"\n", min(pos + INDEX_BLOCK_BYTES, size) - 1)
+        if nl == -1:
+            break
+        end = nl + 1
+        block = mm[pos:end]
+        bitmap = bytearray(_BITMAP_BYTES)
+        for code in _trigram_codes(block):
+            bitmap[code >> 3] |= 1 << (code & 7)
+        header["blocks"].append(
+            [pos, end, _timestamp_from(mm, pos, end), _last_timestamp(mm, pos, end)]
+        )
+        bitmaps += bitmap
+        pos = end
+        changed = True
+    header["indexed_to"] = pos
+
+    if changed:
+        tmp_file = index_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(bitmaps)
+        os.replace(tmp_file, index_file)
+    return header, bitmaps
+
+
+def _last_timestamp(mm, start: int, end: int) -> float | None:
+    pos = end
+    for _ in range(_PROBE_LINES):
+        if pos <= start:
+            return None
+        nl = mm.rfind(b"\n", start, pos - 1)
+        line_start = start if nl == -1 else nl + 1
+        ts = parse_line_timestamp(mm[line_start : min(pos, line_start + 64)])
+        if ts is not None:
+            return ts
+        pos = line_start
+    return None
+
+
+def _indexed_regions(
+    path: Path,
+    mm,
+    size: int,
+    window_start: int,
+    since: float | None,
+    trigrams: set[int] | None,
+) -> list[tuple[int, int]]:
+    """Byte ranges worth scanning, newest first, after pruning by the index."""
+    header, bitmaps = _update_index(path, mm, size)
+    regions = []
+    if header["indexed_to"] < size:
+        regions.append((max(header["indexed_to"], window_start), size))
+
+    for i in range(len(header["blocks"]) - 1, -1, -1):
+        start, end, _first_ts, last_ts = header["blocks"][i]
+        if end <= window_start:
+            break
+        if since is not None and last_ts is not None and last_ts < since:
+            break
+        if trigrams:
+            offset = i * _BITMAP_BYTES
+            if not all(
+                bitmaps[offset + (code >> 3)] & (1 << (code & 7)) for code in trigrams
+            ):
+                continue
+        regions.append((max(start, window_start), end))
+    return regions
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+
+def search_local_logs(
+    log_path: str,
+    query: str,
+    since: float | None = None,
+    limit: int = 50,
+    deadline: float | None = None,
+    use_index: bool = False,
+) -> dict:
+    """Most recent lines matching query (case-insensitive regex) since a time.
+
+    Args:
+        log_path: A log file (its rotations are included) or a directory
+        query: Regular expression to search for
+        since: Epoch seconds; older lines are skipped (None: no bound)
+        limit: Maximum lines to return
+        deadline: time.monotonic() value after which to stop and return
+            what was found so far
+        use_index: Use and maintain the sidecar trigram/time index
+
+    Returns:
+        Dict with logs (newest first), files_searched and timed_out.
+    """
+    # MULTILINE: whole chunks are searched at once, so ^ and $ must anchor
+    # at line boundaries as they did when lines were searched one by one
+    pattern = re.compile(query.encode("utf-8"), re.IGNORECASE | re.MULTILINE)
+    trigrams = literal_trigrams(query) if use_index else None
+
+    logs: list[dict] = []
+    files_searched = 0
+    timed_out = False
+    for path in find_log_files(log_path, since):
+        remaining = limit - len(logs)
+        if remaining <= 0:
+            break
+        try:
+            if path.suffix == ".gz":
+                found, timed_out = _search_gzip(
+                    path, pattern, since, remaining, deadline
+                )
+            else:
+                found, timed_out = _search_mapped(
+                    path, pattern, since, remaining, deadline, trigrams, use_index
+                )
+        except (OSError, ValueError, EOFError):
+            continue
+        files_searched += 1
+        logs.extend(found)
+        if timed_out:
+            break
+
+    return {"logs": logs, "files_searched": files_searched, "timed_out": timed_out}
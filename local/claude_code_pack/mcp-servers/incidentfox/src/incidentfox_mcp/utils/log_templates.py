@@ -0,0 +1,224 @@
+"""Online log template mining (Drain) with per-service persistence.
+
+Messages are masked in one pass with a single precompiled regex (timestamps,
+UUIDs, IPs, hex, numbers), tokenized, and routed through a fixed-depth
+prefix tree keyed by token count and leading tokens. Within a leaf, a
+message joins the most similar template if enough tokens match; differing
+positions become wildcards. Each message costs O(depth + leaf size), so
+tens of thousands of logs can be mined in one streaming pass with memory
+bounded by the number of templates, not the number of logs.
+
+Learned templates are saved per service under ~/.incidentfox/log_templates/
+so later investigations can tell new templates from known ones.
+"""
+
+import json
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+WILDCARD = "{*}"
+
+# Order matters: the first alternative matching at a position wins
+_MASKS = (
+    (
+        "timestamp",
+        r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?",
+    ),
+    ("uuid", r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"),
+    ("ip", r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"),
+    ("hex", r"\b(?:0x[0-9a-f]+|[0-9a-f]{16,})\b"),
+    ("num", r"\b\d+(?:\.\d+)?"),
+)
+_MASK_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _MASKS), re.I
+)
+_HAS_DIGIT_RE = re.compile(r"\d")
+
+# Only the first line is mined (stack traces group under their headline)
+MAX_MESSAGE_CHARS = 1000
+
+
+def mask_message(message: str) -> str:
+    """Replace variable parts of a log line with {name} placeholders."""
+    line = message.strip().split("\n", 1)[0][:MAX_MESSAGE_CHARS]
+    return _MASK_RE.sub(lambda m: "{" + m.lastgroup + "}", line)
+
+
+class LogCluster:
+    """One learned template and how often it has matched (across runs)."""
+
+    __slots__ = ("id", "tokens", "count", "leaf")
+
+    def __init__(self, cluster_id: str, tokens: list[str], count: int = 0):
+        self.id = cluster_id
+        self.tokens = tokens
+        self.count = count
+        self.leaf: list[str] | None = None
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+
+class _Node:
+    __slots__ = ("children", "cluster_ids")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.cluster_ids: list[str] = []
+
+
+class TemplateMiner:
+    """Drain-style online template miner.
+
+    Args:
+        depth: Prefix tree depth, including the root and token-count levels
+        sim_threshold: Fraction of matching tokens needed to join a template
+        max_children: Max distinct tokens per tree node before falling back
+            to the wildcard branch
+        max_clusters: Templates kept in memory; least recently matched
+            templates are evicted beyond this
+    """
+
+    def __init__(
+        self,
+        depth: int = 4,
+        sim_threshold: float = 0.4,
+        max_children: int = 100,
+        max_clusters: int = 2000,
+    ):
+        self.prefix_depth = max(depth - 2, 1)
+        self.sim_threshold = sim_threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self._roots: dict[int, _Node] = {}
+        # id -> cluster, least to most recently matched
+        self._clusters: OrderedDict[str, LogCluster] = OrderedDict()
+        self._next_id = 1
+        self.known_ids: set[str] = set()
+
+    def add(self, message: str) -> LogCluster:
+        """Mine one message; returns the (possibly new) cluster it joined."""
+        tokens = mask_message(message or "").split() or ["{empty}"]
+        cluster = self._match(tokens)
+        if cluster is None:
+            cluster = LogCluster(f"T{self._next_id}", tokens)
+            self._next_id += 1
+            self._insert(cluster)
+        else:
+            cluster.tokens = [
+                t if t == m else WILDCARD for t, m in zip(cluster.tokens, tokens)
+            ]
+            self._clusters.move_to_end(cluster.id)
+        cluster.count += 1
+        return cluster
+
+    def _leaf(self, tokens: list[str], create: bool) -> _Node | None:
+        node = self._roots.get(len(tokens))
+        if node is None:
+            if not create:
+                return None
+            node = self._roots[len(tokens)] = _Node()
+
+        for token in tokens[: self.prefix_depth]:
+            if token not in node.children and _HAS_DIGIT_RE.search(token):
+                token = WILDCARD
+            child = node.children.get(token)
+            if child is None:
+                if not create:
+                    child = node.children.get(WILDCARD)
+                    if child is None:
+                        return None
+                elif len(node.children) >= self.max_children:
+                    child = node.children.setdefault(WILDCARD, _Node())
+                else:
+                    child = node.children[token] = _Node()
+            node = child
+        return node
+
+    def _match(self, tokens: list[str]) -> LogCluster | None:
+        leaf = self._leaf(tokens, create=False)
+        if leaf is None:
+            return None
+
+        best, best_sim, best_params = None, -1.0, -1
+        for cluster_id in leaf.cluster_ids:
+            cluster = self._clusters[cluster_id]
+            same = params = 0
+            for t, m in zip(cluster.tokens, tokens):
+                if t == WILDCARD:
+                    params += 1
+                elif t == m:
+                    same += 1
+            sim = same / len(tokens)
+            if sim > best_sim or (sim == best_sim and params > best_params):
+                best, best_sim, best_params = cluster, sim, params
+        return best if best_sim >= self.sim_threshold else None
+
+    def _insert(self, cluster: LogCluster):
+        leaf = self._leaf(cluster.tokens, create=True)
+        leaf.cluster_ids.append(cluster.id)
+        cluster.leaf = leaf.cluster_ids
+        self._clusters[cluster.id] = cluster
+        while len(self._clusters) > self.max_clusters:
+            _, evicted = self._clusters.popitem(last=False)
+            evicted.leaf.remove(evicted.id)
+
+    def load(self, templates: list[dict]):
+        """Seed the miner with previously learned templates (marked known)."""
+        # Least frequent first, so they are the first evicted
+        for entry in sorted(templates, key=lambda e: int(e.get("count", 0))):
+            cluster = LogCluster(
+                entry["id"], entry["template"].split(), int(entry.get("count", 0))
+            )
+            self._insert(cluster)
+            self.known_ids.add(cluster.id)
+            try:
+                self._next_id = max(self._next_id, int(cluster.id[1:]) + 1)
+            except ValueError:
+                pass
+
+    def export(self) -> list[dict]:
+        """Templates, most frequent first, in the format load() accepts."""
+        return [
+            {"id": c.id, "template": c.template, "count": c.count}
+            for c in sorted(self._clusters.values(), key=lambda c: -c.count)
+        ]
+
+
+def _templates_path(service: str | None) -> Path:
+    """Path to the saved templates for a service."""
+    templates_dir = Path.home() / ".incidentfox" / "log_templates"
+    templates_dir.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", service or "_all")
+    return templates_dir / f"{name}.json"
+
+
+def load_miner(service: str | None, **kwargs) -> TemplateMiner:
+    """Create a miner seeded with the templates saved for a service."""
+    miner = TemplateMiner(**kwargs)
+    path = _templates_path(service)
+    if path.exists():
+        try:
+            miner.load(json.loads(path.read_text()).get("templates", []))
+        except (OSError, ValueError, KeyError):
+            # Corrupt or unreadable file: start fresh, it is rewritten on save
+            pass
+    return miner
+
+
+def save_miner(service: str | None, miner: TemplateMiner):
+    """Persist a miner's templates for a service (atomic replace)."""
+    path = _templates_path(service)
+    payload = {"service": service, "templates": miner.export()}
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,116 @@
+"""Tests for local log timestamp parsing and time-bounded search."""
+
+import calendar
+import gzip
+import time
+
+import pytest
+from incidentfox_mcp.utils.local_logs import parse_line_timestamp, search_local_logs
+
+T = calendar.timegm((2026, 3, 1, 12, 0, 0, 0, 0, 0))
+
+
+@pytest.fixture()
+def local_tz(monkeypatch):
+    """Run with the host clock at UTC-5 (no DST)."""
+    monkeypatch.setenv("TZ", "XYZ5")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _local(ts: float, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+    return time.strftime(fmt, time.localtime(ts))
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (b"2026-03-01T12:00:00Z level=info", T),
+        (b"2026-03-01T12:00:00.123Z level=info", T),
+        (b"2026-03-01T14:00:00+02:00 level=info", T),
+        (b"2026-03-01T05:00:00-0700 level=info", T),
+        (b'1.2.3.4 - - [01/Mar/2026:07:00:00 -0500] "GET / HTTP/1.1"', T),
+    ],
+)
+def test_explicit_offsets(line, expected):
+    assert parse_line_timestamp(line) == expected
+
+
+def test_naive_timestamps_are_local_time(local_tz):
+    assert parse_line_timestamp(b"2026-03-01 07:00:00 INFO started") == T
+    assert parse_line_timestamp(b"Mar  1 07:00:00 host sshd[1]: ok") is not None
+    assert parse_line_timestamp(b"no timestamp here") is None
+
+
+def test_recent_naive_lines_found_west_of_utc(local_tz, tmp_path):
+    now = time.time()
+    log = tmp_path / "app.log"
+    log.write_text(
+        f"{_local(now - 3 * 3600)} ERROR old failure\n"
+        f"{_local(now - 600)} ERROR recent failure\n"
+        f"{_local(now - 60)} INFO all good\n"
+    )
+
+    result = search_local_logs(str(log), "error", since=now - 3600)
+
+    assert [entry["message"].split(" ", 2)[2] for entry in result["logs"]] == [
+        "ERROR recent failure"
+    ]
+
+
+def test_gzip_without_timestamps_is_searched(tmp_path):
+    rotated = tmp_path / "app.log.1.gz"
+    with gzip.open(rotated, "wt") as f:
+        f.write("ERROR first\nINFO fine\nERROR second\n")
+
+    result = search_local_logs(str(tmp_path), "error", since=time.time() - 3600)
+
+    assert [entry["message"] for entry in result["logs"]] == [
+        "ERROR second",
+        "ERROR first",
+    ]
+
+
+def test_gzip_untimed_lines_before_old_timestamp_are_dropped(tmp_path):
+    rotated = tmp_path / "app.log.1.gz"
+    now = time.time()
+    with gzip.open(rotated, "wt") as f:
+        f.write(
+            "ERROR banner\n"
+            f"{_local(now - 7200)} ERROR old\n"
+            f"{_local(now - 60)} ERROR new\n"
+        )
+
+    result = search_local_logs(str(tmp_path), "error", since=now - 3600)
+
+    assert [entry["message"].split(" ", 2)[2] for entry in result["logs"]] == [
+        "ERROR new"
+    ]
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_anchored_queries_match_at_line_boundaries(tmp_path, use_index):
+    log = tmp_path / "app.log"
+    log.write_text("INFO ok 1\nERROR boom 2\nINFO ok 3\nWARN not an ERROR 4\n")
+
+    starts = search_local_logs(str(log), "^error", use_index=use_index)
+    ends = search_local_logs(str(log), "ok 3$", use_index=use_index)
+    whole = search_local_logs(str(log), "^info ok \\d$", use_index=use_index)
+
+    assert [entry["message"] for entry in starts["logs"]] == ["ERROR boom 2"]
+    assert [entry["message"] for entry in ends["logs"]] == ["INFO ok 3"]
+    assert [entry["message"] for entry in whole["logs"]] == ["INFO ok 3", "INFO ok 1"]
+
+
+def test_anchored_queries_in_gzip(tmp_path):
+    with gzip.open(tmp_path / "app.log.1.gz", "wt") as f:
+        f.write("ERROR first\nINFO not an ERROR\nINFO ok 3\n")
+
+    assert [
+        entry["message"] for entry in search_local_logs(str(tmp_path), "^error")["logs"]
+    ] == ["ERROR first"]
+    assert [
+        entry["message"] for entry in search_local_logs(str(tmp_path), "ok 3$")["logs"]
+    ] == ["INFO ok 3"]
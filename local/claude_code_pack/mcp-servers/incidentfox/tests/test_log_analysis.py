@@ -0,0 +1,44 @@
+"""Tests for log_analysis backends."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from incidentfox_mcp.tools.log_analysis import CloudWatchBackend  # noqa: E402
+
+
+class _FakeLogsClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_paginator(self, name):
+        return self
+
+    def paginate(self, **kwargs):
+        self.calls.append(kwargs)
+        return [{"events": [{"timestamp": 0, "message": "ERROR boom"}]}]
+
+
+@pytest.mark.parametrize(
+    "service, log_group, expected",
+    [
+        (None, "/ecs/checkout", "/ecs/checkout"),
+        ("checkout", "/ecs/checkout", "/ecs/checkout"),
+        ("checkout", None, "/aws/lambda/checkout"),
+        (None, None, "/aws/lambda"),
+    ],
+)
+def test_cloudwatch_iter_logs_log_group(monkeypatch, service, log_group, expected):
+    client = _FakeLogsClient()
+    backend = CloudWatchBackend()
+    monkeypatch.setattr(backend, "_get_client", lambda: client)
+    end = datetime(2026, 3, 1, 12, 0)
+
+    logs = list(
+        backend.iter_logs(service, end - timedelta(hours=1), end, log_group=log_group)
+    )
+
+    assert client.calls[0]["logGroupName"] == expected
+    assert [log["message"] for log in logs] == ["ERROR boom"]
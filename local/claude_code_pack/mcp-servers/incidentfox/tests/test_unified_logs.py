@@ -0,0 +1,67 @@
+"""Tests for search_logs fan-out, caching and partial results."""
+
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from incidentfox_mcp.tools import unified_logs  # noqa: E402
+
+
+class _ToolRegistry:
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self):
+        def register(fn):
+            self.tools[fn.__name__] = fn
+            return fn
+
+        return register
+
+
+@pytest.fixture
+def search_logs(monkeypatch):
+    monkeypatch.setattr(unified_logs, "_detect_backends", lambda: ["local"])
+    monkeypatch.setattr(unified_logs, "_cache", unified_logs.OrderedDict())
+    registry = _ToolRegistry()
+    unified_logs.register_tools(registry)
+    return registry.tools["search_logs"]
+
+
+def test_timed_out_local_results_are_partial_and_not_cached(monkeypatch, search_logs):
+    calls = []
+
+    def truncated(query, service, hours_ago, limit, timeout):
+        calls.append(query)
+        return {
+            "backend": "local",
+            "count": 1,
+            "timed_out": True,
+            "logs": [{"timestamp": None, "message": "ERROR one"}],
+        }
+
+    monkeypatch.setitem(unified_logs._SEARCHES, "local", truncated)
+
+    first = json.loads(search_logs("error"))
+    second = json.loads(search_logs("error"))
+
+    assert first["partial"] is True
+    assert first["total_logs_found"] == 1
+    assert len(calls) == 2
+    assert "cached" not in second["results"][0]
+
+
+def test_complete_results_are_cached(monkeypatch, search_logs):
+    calls = []
+
+    def complete(query, service, hours_ago, limit, timeout):
+        calls.append(query)
+        return {"backend": "local", "count": 0, "timed_out": False, "logs": []}
+
+    monkeypatch.setitem(unified_logs._SEARCHES, "local", complete)
+
+    assert json.loads(search_logs("error"))["partial"] is False
+    assert json.loads(search_logs("error"))["results"][0]["cached"] is True
+    assert len(calls) == 1
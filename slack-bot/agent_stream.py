@@ -0,0 +1,201 @@
+"""
+Shared asyncio SSE client for sre-agent /investigate streams.
+
+Every investigation used to open its own requests connection and block a
+thread in iter_lines. Now all streams run on one background event loop with
+a single pooled httpx.AsyncClient; the investigation thread just pulls the
+next line (with backpressure, so nothing is buffered ahead of the Slack
+side).
+
+AgentStream mimics the subset of requests.Response the handlers use
+(status_code, text, iter_lines), and transport errors are re-raised as the
+matching requests exceptions so existing except clauses keep working.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent connections to sre-agent (streams beyond this wait for a slot)
+SRE_AGENT_MAX_CONNECTIONS = int(os.environ.get("SRE_AGENT_MAX_CONNECTIONS", "100"))
+SRE_AGENT_CONNECT_TIMEOUT = float(os.environ.get("SRE_AGENT_CONNECT_TIMEOUT", "10"))
+
+# Recent stream durations kept for stats
+_DURATION_WINDOW = 500
+
+_EOF = object()
+
+
+def _translate(e: Exception) -> Exception:
+    """Map an httpx error to the requests exception handlers already catch."""
+    if isinstance(e, httpx.TimeoutException):
+        return requests.exceptions.Timeout(str(e))
+    if isinstance(e, httpx.ConnectError):
+        return requests.exceptions.ConnectionError(str(e))
+    if isinstance(e, (httpx.RemoteProtocolError, httpx.ReadError)):
+        return requests.exceptions.ChunkedEncodingError(str(e))
+    return requests.exceptions.RequestException(str(e))
+
+
+class AgentStream:
+    """One in-flight SSE response, consumed from a worker thread."""
+
+    def __init__(self, owner: "AgentStreamClient", response: httpx.Response):
+        self._owner = owner
+        self._response = response
+        self.status_code = response.status_code
+        self.text = ""
+        self._started = time.monotonic()
+        self._closed = False
+
+    def iter_lines(self, decode_unicode: bool = True):
+        """Yield lines as the agent sends them; closes the stream when done."""
+        lines = self._response.aiter_lines()
+
+        async def _next():
+            try:
+                return await lines.__anext__()
+            except StopAsyncIteration:
+                return _EOF
+            except httpx.HTTPError as e:
+                raise _translate(e) from e
+
+        ok = False
+        try:
+            while True:
+                line = self._owner._run(_next())
+                if line is _EOF:
+                    ok = True
+                    return
+                yield line
+        finally:
+            self.close(ok)
+
+    def close(self, ok: bool = False):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._owner._run(self._response.aclose())
+        except Exception as e:
+            logger.debug(f"Error closing agent stream: {e}")
+        self._owner._record(time.monotonic() - self._started, ok)
+
+
+class AgentStreamClient:
+    """Background event loop + pooled httpx client shared by all streams."""
+
+    def __init__(self, base_url: str, max_connections: int = SRE_AGENT_MAX_CONNECTIONS):
+        self._base_url = base_url
+        self._max_connections = max_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self._durations = deque(maxlen=_DURATION_WINDOW)
+        self.stats_counters = {"opened": 0, "completed": 0, "failed": 0}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="agent-stream-loop", daemon=True
+                ).start()
+                self._client = httpx.AsyncClient(
+                    base_url=self._base_url,
+                    limits=httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_connections,
+                    ),
+                )
+                self._loop = loop
+        return self._loop
+
+    def _run(self, coro):
+        """Run a coroutine on the stream loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def investigate(self, payload: dict, headers: dict, timeout: float = 300):
+        """
+        POST /investigate and return an AgentStream once headers arrive.
+
+        timeout applies per read, like requests' stream timeout. Non-200
+        responses are read fully (for .text) and closed immediately.
+        """
+        self._ensure_loop()
+
+        async def _open():
+            request = self._client.build_request(
+                "POST",
+                "/investigate",
+                json=payload,
+                headers=headers,
+                timeout=httpx.Timeout(timeout, connect=SRE_AGENT_CONNECT_TIMEOUT),
+            )
+            try:
+                response = await self._client.send(request, stream=True)
+            except httpx.HTTPError as e:
+                raise _translate(e) from e
+            text = ""
+            if response.status_code != 200:
+                try:
+                    text = (await response.aread()).decode(errors="replace")
+                finally:
+                    await response.aclose()
+            return response, text
+
+        response, text = self._run(_open())
+        with self._stats_lock:
+            self.stats_counters["opened"] += 1
+            self._active += 1
+        stream = AgentStream(self, response)
+        if response.status_code != 200:
+            stream.text = text
+            stream.close(ok=False)
+        return stream
+
+    def _record(self, duration: float, ok: bool):
+        with self._stats_lock:
+            self._active -= 1
+            self._durations.append(duration)
+            self.stats_counters["completed" if ok else "failed"] += 1
+
+    def stats(self) -> dict:
+        """Active streams, outcome counts and recent duration percentiles."""
+        with self._stats_lock:
+            durations = sorted(self._durations)
+            stats = dict(self.stats_counters, active=self._active)
+        if durations:
+            stats["duration_p50_seconds"] = round(durations[len(durations) // 2], 2)
+            stats["duration_p95_seconds"] = round(
+                durations[min(len(durations) - 1, int(len(durations) * 0.95))], 2
+            )
+            stats["duration_max_seconds"] = round(durations[-1], 2)
+        return stats
+
+
+_client: Optional[AgentStreamClient] = None
+_client_lock = threading.Lock()
+
+
+def get_agent_stream_client() -> AgentStreamClient:
+    """Process-wide stream client (event loop starts on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from stream_handler import SRE_AGENT_URL
+
+                _client = AgentStreamClient(SRE_AGENT_URL)
+    return _client
@@ -644,6 +644,19 @@ if __name__ == "__main__":
             """Health check endpoint."""
             return {"status": "healthy", "apps": registry.list_slugs()}, 200
 
+        @flask_app.route("/stats", methods=["GET"])
+        def stats():
+            """Investigation queue, agent stream and Slack update counters."""
+            from agent_stream import get_agent_stream_client
+            from investigation_pool import get_investigation_pool
+            from slack_updater import get_updater
+
+            return {
+                "investigations": get_investigation_pool().stats(),
+                "agent_streams": get_agent_stream_client().stats(),
+                "slack_updates": dict(get_updater().stats),
+            }, 200
+
         port = int(os.environ.get("PORT", 3000))
         logger.info(f"Starting HTTP server on port {port}")
         logger.info(f"Apps loaded: {registry.list_slugs()}")
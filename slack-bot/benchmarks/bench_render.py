@@ -0,0 +1,173 @@
+"""Benchmark progress-message rendering over an investigation stream.
+
+Replays SSE events through the stream handler and, after every event,
+builds the progress blocks twice: once from scratch (no render cache,
+mrkdwn memo cleared) as before, and once incrementally with the
+message's render cache. Checks that both produce identical blocks and
+reports total and per-event render time.
+
+Without --events, a synthetic 500-event investigation is used: a handful
+of markdown-heavy thoughts, each with many tool calls, some of them
+inside subagents. --events takes a recorded stream, one SSE ``data:``
+line or JSON event per line.
+
+Usage:
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --events recorded_stream.jsonl
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import markdown_utils  # noqa: E402
+import stream_handler  # noqa: E402
+from message_builder import build_progress_message  # noqa: E402
+from state import MessageState  # noqa: E402
+
+LOADING_URL = "https://example.com/loading.gif"
+DONE_URL = "https://example.com/done.png"
+
+THOUGHT_TEXT = (
+    "Checking **{service}** after the latency spike. The error rate on "
+    "`/api/checkout` went from 0.2% to *4.1%* at 14:02 UTC.\n\n"
+    "- p99 latency: 1.8s (baseline 240ms)\n"
+    "- Recent deploy: `{service}@v{step}`\n"
+    "- See [runbook](https://runbooks.example.com/{service})"
+)
+
+
+def synthetic_events(count: int) -> list:
+    """A plausible investigation: thoughts, tools, subagents with children."""
+    events = []
+    step = 0
+    while len(events) < count:
+        step += 1
+        events.append(
+            {
+                "type": "thought",
+                "data": {"text": THOUGHT_TEXT.format(service="payments", step=step)},
+            }
+        )
+        task_id = f"task-{step}"
+        events.append(
+            {
+                "type": "tool_start",
+                "data": {
+                    "name": "Task",
+                    "tool_use_id": task_id,
+                    "input": {"description": f"Inspect pods for step {step}"},
+                },
+            }
+        )
+        for i in range(40):
+            tool_id = f"tool-{step}-{i}"
+            parent = task_id if i % 3 == 0 else None
+            events.append(
+                {
+                    "type": "tool_start",
+                    "data": {
+                        "name": "Bash" if i % 2 else "mcp__kubernetes__get_pod_logs",
+                        "tool_use_id": tool_id,
+                        "parent_tool_use_id": parent,
+                        "input": {"command": f"kubectl get pods -n ns-{i}"},
+                    },
+                }
+            )
+            events.append(
+                {
+                    "type": "tool_end",
+                    "data": {
+                        "name": "Bash",
+                        "tool_use_id": tool_id,
+                        "success": True,
+                        "output": f"pod-{i} Running",
+                    },
+                }
+            )
+        events.append(
+            {
+                "type": "tool_end",
+                "data": {"name": "Task", "tool_use_id": task_id, "output": "done"},
+            }
+        )
+    return events[:count]
+
+
+def load_events(path: str) -> list:
+    events = []
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        event = (
+            stream_handler.parse_sse_event(line)
+            if line.startswith("data: ")
+            else json.loads(line)
+        )
+        if event and event.get("type") in ("thought", "tool_start", "tool_end"):
+            events.append(event)
+    return events
+
+
+def render(state: MessageState, incremental: bool) -> list:
+    return build_progress_message(
+        thoughts=state.thoughts,
+        current_tool=state.current_tool,
+        loading_url=LOADING_URL,
+        done_url=DONE_URL,
+        thread_id=state.thread_id,
+        message_ts=state.message_ts,
+        render_cache=state.render_cache if incremental else None,
+    )
+
+
+def main(args):
+    events = load_events(args.events) if args.events else synthetic_events(500)
+
+    # Replay state changes only; Slack updates are what's being measured here
+    stream_handler.update_slack_message = lambda *a, **kw: None
+
+    state = MessageState(
+        channel_id="C1", message_ts="1.0", thread_ts="1.0", thread_id="bench"
+    )
+    full_seconds = 0.0
+    incremental_seconds = 0.0
+    for event in events:
+        stream_handler.handle_stream_event(state, event, None, "T1")
+
+        markdown_utils._slack_mrkdwn_cached.cache_clear()
+        start = time.perf_counter()
+        full = render(state, incremental=False)
+        full_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental = render(state, incremental=True)
+        incremental_seconds += time.perf_counter() - start
+
+        if full != incremental:
+            raise SystemExit(f"Blocks differ after event {event}")
+
+    tools = sum(len(t.tools) for t in state.thoughts)
+    print(f"events: {len(events)}  thoughts: {len(state.thoughts)}  tools: {tools}")
+    for label, seconds in (
+        ("full", full_seconds),
+        ("incremental", incremental_seconds),
+    ):
+        print(
+            f"{label:>12}: {seconds * 1000:8.1f} ms total  "
+            f"{seconds / len(events) * 1e6:8.1f} us/event"
+        )
+    print(f"     speedup: {full_seconds / incremental_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", help="Recorded SSE stream (JSONL or data: lines)")
+    logging.getLogger().setLevel(logging.WARNING)
+    main(parser.parse_args())
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
 import requests
+from state_store import StoreMap
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +47,13 @@ CONFIG_MODE = os.environ.get("CONFIG_MODE", "")
 # The credential-resolver fetches the shared key from Secrets Manager at runtime.
 # We only store trial metadata (is_trial=True, expiration) during provisioning.
 
-# Team token cache: slack_team_id -> (token, issued_at)
-# Tokens are cached for 1 hour to avoid excessive token issuance
-_team_token_cache: Dict[str, tuple] = {}
+# Team token cache: slack_team_id -> token
+# Tokens are cached for 1 hour to avoid excessive token issuance, in the
+# shared state store so replicas reuse each other's tokens
 _TEAM_TOKEN_CACHE_TTL = timedelta(hours=1)
+_team_token_cache = StoreMap(
+    "team_token", ttl_seconds=int(_TEAM_TOKEN_CACHE_TTL.total_seconds())
+)
 
 
 class ConfigServiceClient:
@@ -386,15 +390,10 @@ class ConfigServiceClient:
         Returns:
             Team token string, or None if workspace not provisioned.
         """
-        global _team_token_cache
-
-        # Check cache first
-        if slack_team_id in _team_token_cache:
-            token, issued_at = _team_token_cache[slack_team_id]
-            if datetime.utcnow() - issued_at < _TEAM_TOKEN_CACHE_TTL:
-                return token
-            # Token expired, remove from cache
-            del _team_token_cache[slack_team_id]
+        # Check cache first (entries expire after _TEAM_TOKEN_CACHE_TTL)
+        token = _team_token_cache.get(slack_team_id)
+        if token:
+            return token
 
         # Issue new token
         # In local mode, use 'local' org instead of per-workspace orgs
@@ -408,7 +407,7 @@ class ConfigServiceClient:
             token_response = self._issue_team_token(org_id, team_node_id)
             token = token_response.get("token")
             if token:
-                _team_token_cache[slack_team_id] = (token, datetime.utcnow())
+                _team_token_cache[slack_team_id] = token
                 logger.debug(f"Issued team token for workspace {slack_team_id}")
                 return token
             return None
@@ -9,7 +9,6 @@ import json
 import logging
 import os
 import re
-import threading
 import time
 from typing import Dict, Optional
 
@@ -28,23 +27,25 @@ def _sre_agent_headers() -> dict:
     return headers
 
 
+from agent_stream import get_agent_stream_client
 from file_handler import (
     _download_slack_image,
     _extract_file_attachments_from_event,
     _extract_images_from_event,
     _get_file_attachment_metadata,
 )
+from investigation_pool import get_investigation_pool
 from state import (
     MessageState,
     _auto_listen_threads,
-    _cache_timestamps,
     _get_user_display_name,
+    _get_user_display_names,
     _investigation_cache,
     _persist_session_to_db,
     save_investigation_snapshot,
 )
+from state_store import StoreMap
 from stream_handler import (
-    SRE_AGENT_URL,
     handle_stream_event,
     parse_sse_event,
     update_slack_message,
@@ -306,12 +307,10 @@ Use all available tools to gather context about this issue."""
         if team_token:
             request_payload["team_token"] = team_token
 
-        response = requests.post(
-            f"{SRE_AGENT_URL}/investigate",
-            json=request_payload,
-            stream=True,
-            timeout=300,
+        response = get_agent_stream_client().investigate(
+            request_payload,
             headers=_sre_agent_headers(),
+            timeout=300,
         )
 
         if response.status_code != 200:
@@ -330,8 +329,7 @@ Use all available tools to gather context about this issue."""
                     handle_stream_event(state, sse_event, client, slack_team_id)
 
         # Cache state for modal view
-        _investigation_cache[state.message_ts] = state
-        _cache_timestamps[state.message_ts] = time.time()
+        _investigation_cache.put(state, final=True)
         _persist_session_to_db(
             state, org_id=resolved_org_id, team_node_id=resolved_team_node_id
         )
@@ -402,9 +400,19 @@ def _build_full_thread_context(messages, current_message_ts, bot_user_id, client
     if not other_messages:
         return None, [], []
 
-    # Resolve user names via LRU-cached helper (avoids redundant API calls)
+    # Resolve all user names up front: one batched cache read, API calls
+    # only for users not seen recently
+    user_names = _get_user_display_names(
+        client,
+        [
+            m.get("user", "unknown")
+            for m in messages
+            if not (m.get("bot_id") or (bot_user_id and m.get("user") == bot_user_id))
+        ],
+    )
+
     def get_name(uid):
-        return _get_user_display_name(client, uid)
+        return user_names.get(uid) or _get_user_display_name(client, uid)
 
     context_parts = []
     thread_image_metadata = []
@@ -551,12 +559,48 @@ def _resolve_mentions(text: str, client, bot_user_id: str):
     return resolved_text, id_to_name
 
 
+def _notify_investigation_wait(client, event, text: str):
+    """Tell whoever triggered an investigation that it has to wait."""
+    channel_id = event.get("channel")
+    thread_ts = event.get("thread_ts") or event.get("ts")
+    user_id = event.get("user")
+    if not channel_id:
+        return
+    if user_id and not event.get("bot_id"):
+        client.chat_postEphemeral(
+            channel=channel_id, user=user_id, thread_ts=thread_ts, text=text
+        )
+    else:
+        client.chat_postMessage(channel=channel_id, thread_ts=thread_ts, text=text)
+
+
+def _submit_investigation(target, args, event, client, context):
+    """Run an investigation on the bounded worker pool instead of a new thread."""
+    get_investigation_pool().submit(
+        context.get("team_id") or event.get("team"),
+        target,
+        *args,
+        on_queued=lambda position: _notify_investigation_wait(
+            client,
+            event,
+            f"⏳ Lots of investigations are running right now. Yours is queued "
+            f"(position {position}) and will start automatically.",
+        ),
+        on_rejected=lambda: _notify_investigation_wait(
+            client,
+            event,
+            "⚠️ IncidentFox is at capacity right now and couldn't queue this "
+            "investigation. Please try again in a few minutes.",
+        ),
+    )
+
+
 def handle_mention(event, say, client, context):
     """
     Handle @mentions of the bot.
 
-    Immediately ACKs by returning quickly, then processes in a background
-    thread so Bolt's listener thread pool stays free for new events.
+    Immediately ACKs by returning quickly, then processes on the investigation
+    pool so Bolt's listener thread pool stays free for new events.
     """
     logger.info(
         f"🔔 APP_MENTION EVENT RECEIVED: channel={event.get('channel')}, user={event.get('user')}, ts={event.get('ts')}"
@@ -577,16 +621,13 @@ def handle_mention(event, say, client, context):
             )
             return
 
-    thread = threading.Thread(
-        target=_handle_mention_impl,
-        args=(event, say, client, context),
-        daemon=True,
+    _submit_investigation(
+        _handle_mention_impl, (event, say, client, context), event, client, context
     )
-    thread.start()
 
 
 def _handle_mention_impl(event, say, client, context):
-    """Process an app_mention event (runs in background thread)."""
+    """Process an app_mention event (runs on an investigation pool worker)."""
     user_id = event["user"]
     text = event.get("text", "").strip()
     channel_id = event["channel"]
@@ -1001,12 +1042,10 @@ def _handle_mention_impl(event, say, client, context):
             )
 
         # Call sre-agent with SSE streaming
-        response = requests.post(
-            f"{SRE_AGENT_URL}/investigate",
-            json=request_payload,
-            stream=True,
-            timeout=300,  # 5 minutes
+        response = get_agent_stream_client().investigate(
+            request_payload,
             headers=_sre_agent_headers(),
+            timeout=300,
         )
 
         if response.status_code != 200:
@@ -1025,10 +1064,7 @@ def _handle_mention_impl(event, say, client, context):
                     handle_stream_event(state, event, client, team_id)
 
         # Cache state for modal view (keyed by message_ts for per-message uniqueness)
-        import time
-
-        _investigation_cache[state.message_ts] = state
-        _cache_timestamps[state.message_ts] = time.time()
+        _investigation_cache.put(state, final=True)
         _persist_session_to_db(
             state, org_id=resolved_org_id, team_node_id=resolved_team_node_id
         )
@@ -1066,8 +1102,8 @@ def _handle_mention_impl(event, say, client, context):
 
 
 # Track threads where we've already sent a nudge (one nudge per user per thread)
-# Key: (thread_ts, user_id), Value: True
-_nudge_sent: Dict[tuple, bool] = {}
+# Key: (message_ts, coralogix_url), Value: True
+_nudge_sent = StoreMap("nudge", ttl_seconds=7 * 24 * 3600)
 
 
 def _run_auto_listen_investigation(event, client, context):
@@ -1327,12 +1363,10 @@ def _run_auto_listen_investigation(event, client, context):
                 for att in file_attachments
             ]
 
-        response = requests.post(
-            f"{SRE_AGENT_URL}/investigate",
-            json=request_payload,
-            stream=True,
-            timeout=300,
+        response = get_agent_stream_client().investigate(
+            request_payload,
             headers=_sre_agent_headers(),
+            timeout=300,
         )
 
         if response.status_code != 200:
@@ -1349,10 +1383,7 @@ def _run_auto_listen_investigation(event, client, context):
                     event_count += 1
                     handle_stream_event(state, sse_event, client, team_id)
 
-        import time
-
-        _investigation_cache[state.message_ts] = state
-        _cache_timestamps[state.message_ts] = time.time()
+        _investigation_cache.put(state, final=True)
         _persist_session_to_db(
             state, org_id=resolved_org_id, team_node_id=resolved_team_node_id
         )
@@ -1733,12 +1764,10 @@ Use all available tools to gather context about this issue."""
         if team_token:
             request_payload["team_token"] = team_token
 
-        response = requests.post(
-            f"{SRE_AGENT_URL}/investigate",
-            json=request_payload,
-            stream=True,
-            timeout=300,
+        response = get_agent_stream_client().investigate(
+            request_payload,
             headers=_sre_agent_headers(),
+            timeout=300,
         )
 
         if response.status_code != 200:
@@ -1757,10 +1786,7 @@ Use all available tools to gather context about this issue."""
                     handle_stream_event(state, sse_event, client, team_id)
 
         # Cache state for modal view (keyed by message_ts for per-message uniqueness)
-        import time
-
-        _investigation_cache[state.message_ts] = state
-        _cache_timestamps[state.message_ts] = time.time()
+        _investigation_cache.put(state, final=True)
         _persist_session_to_db(
             state, org_id=resolved_org_id, team_node_id=resolved_team_node_id
         )
@@ -2186,12 +2212,10 @@ def handle_message(event, client, context):
                 )
 
             # Call sre-agent with SSE streaming
-            response = requests.post(
-                f"{SRE_AGENT_URL}/investigate",
-                json=request_payload,
-                stream=True,
-                timeout=300,  # 5 minutes
+            response = get_agent_stream_client().investigate(
+                request_payload,
                 headers=_sre_agent_headers(),
+                timeout=300,
             )
 
             if response.status_code != 200:
@@ -2210,10 +2234,7 @@ def handle_message(event, client, context):
                         handle_stream_event(state, event, client, team_id)
 
             # Cache state for modal view (keyed by message_ts for per-message uniqueness)
-            import time
-
-            _investigation_cache[state.message_ts] = state
-            _cache_timestamps[state.message_ts] = time.time()
+            _investigation_cache.put(state, final=True)
             _persist_session_to_db(
                 state, org_id=resolved_org_id, team_node_id=resolved_team_node_id
             )
@@ -2287,11 +2308,13 @@ def handle_message(event, client, context):
                 )
 
             logger.info("✅ Confirmed: NEW ALERT - triggering investigation")
-            threading.Thread(
-                target=_trigger_incident_io_investigation,
-                args=(event, client, context),
-                daemon=True,
-            ).start()
+            _submit_investigation(
+                _trigger_incident_io_investigation,
+                (event, client, context),
+                event,
+                client,
+                context,
+            )
             return
         else:
             logger.info("ℹ️  Has bot_id but not a new alert pattern")
@@ -2450,11 +2473,13 @@ def handle_message(event, client, context):
             logger.info(
                 f"🔔 Auto-investigate triggered (bot message) in channel {channel_id}"
             )
-            threading.Thread(
-                target=_trigger_auto_investigate,
-                args=(event, client, context),
-                daemon=True,
-            ).start()
+            _submit_investigation(
+                _trigger_auto_investigate,
+                (event, client, context),
+                event,
+                client,
+                context,
+            )
         return
 
     # Only handle threaded messages (not top-level channel messages)
@@ -2471,11 +2496,13 @@ def handle_message(event, client, context):
             logger.info(
                 f"🔔 Auto-investigate triggered (human message) in channel {channel_id}"
             )
-            threading.Thread(
-                target=_trigger_auto_investigate,
-                args=(event, client, context),
-                daemon=True,
-            ).start()
+            _submit_investigation(
+                _trigger_auto_investigate,
+                (event, client, context),
+                event,
+                client,
+                context,
+            )
         return
 
     user_id = event.get("user")
@@ -2495,11 +2522,13 @@ def handle_message(event, client, context):
         logger.info(
             f"🔔 Auto-listen triggered for thread {thread_ts} by user {user_id}"
         )
-        threading.Thread(
-            target=_run_auto_listen_investigation,
-            args=(event, client, context),
-            daemon=True,
-        ).start()
+        _submit_investigation(
+            _run_auto_listen_investigation,
+            (event, client, context),
+            event,
+            client,
+            context,
+        )
 
 
 def handle_coralogix_investigate(ack, body, client, context, respond):
@@ -2645,12 +2674,10 @@ Use the Coralogix tools to fetch details about this insight and gather relevant
         if team_token:
             request_payload["team_token"] = team_token
 
-        response = requests.post(
-            f"{SRE_AGENT_URL}/investigate",
-            json=request_payload,
-            stream=True,
-            timeout=300,
+        response = get_agent_stream_client().investigate(
+            request_payload,
             headers=_sre_agent_headers(),
+            timeout=300,
         )
 
         if response.status_code != 200:
@@ -2669,10 +2696,7 @@ Use the Coralogix tools to fetch details about this insight and gather relevant
                     handle_stream_event(state, sse_event, client, team_id)
 
         # Cache state for modal view (keyed by message_ts for per-message uniqueness)
-        import time
-
-        _investigation_cache[state.message_ts] = state
-        _cache_timestamps[state.message_ts] = time.time()
+        _investigation_cache.put(state, final=True)
         _persist_session_to_db(
             state, org_id=resolved_org_id, team_node_id=resolved_team_node_id
         )
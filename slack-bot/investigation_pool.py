@@ -0,0 +1,204 @@
+"""
+Bounded worker pool for investigations.
+
+Mentions, auto-investigations and alert triggers used to start a thread
+each, so an alert storm meant hundreds of threads all streaming from
+sre-agent at once. They now go through a fixed set of workers:
+
+- At most SLACK_INVESTIGATION_WORKERS run concurrently.
+- Up to SLACK_INVESTIGATION_QUEUE_SIZE more wait; beyond that, submissions
+  are rejected so the caller can tell the user to retry.
+- Waiting work is queued per workspace and workers take from workspaces in
+  round-robin order, so one noisy workspace cannot starve the others.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+INVESTIGATION_WORKERS = int(os.environ.get("SLACK_INVESTIGATION_WORKERS", "16"))
+INVESTIGATION_QUEUE_SIZE = int(os.environ.get("SLACK_INVESTIGATION_QUEUE_SIZE", "200"))
+
+
+@dataclass
+class _Task:
+    team_id: str
+    fn: Callable
+    args: tuple
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class InvestigationPool:
+    """Fixed worker threads fed from per-workspace round-robin queues."""
+
+    def __init__(
+        self,
+        workers: int = INVESTIGATION_WORKERS,
+        max_queued: int = INVESTIGATION_QUEUE_SIZE,
+    ):
+        self._workers = workers
+        self._max_queued = max_queued
+        self._cond = threading.Condition()
+        # team_id -> waiting tasks; key order is the round-robin order
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._queued = 0
+        self._idle = 0
+        self._threads: list = []
+        self._max_wait = 0.0
+        self._total_wait = 0.0
+
+        self.stats_counters = {
+            "submitted": 0,
+            "queued": 0,
+            "rejected": 0,
+            "started": 0,
+            "failed": 0,
+        }
+
+    def submit(
+        self,
+        team_id: Optional[str],
+        fn: Callable,
+        *args,
+        on_queued: Optional[Callable[[int], None]] = None,
+        on_rejected: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """
+        Run fn(*args) on a worker. Returns False if the queue is full.
+
+        If no worker is free, on_queued(position) is called (from the
+        caller's thread) with the 1-based position in the queue; if the
+        task is rejected, on_rejected() is called instead.
+        """
+        team_id = team_id or ""
+        with self._cond:
+            self._ensure_started()
+            self.stats_counters["submitted"] += 1
+            waits = self._idle <= self._queued
+            if waits and self._queued >= self._max_queued:
+                self.stats_counters["rejected"] += 1
+                position = None
+            else:
+                queue = self._queues.setdefault(team_id, deque())
+                queue.append(_Task(team_id=team_id, fn=fn, args=args))
+                self._queued += 1
+                position = self._position(team_id, len(queue) - 1) if waits else 0
+                if waits:
+                    self.stats_counters["queued"] += 1
+                self._cond.notify()
+
+        if position is None:
+            logger.warning(
+                f"Investigation rejected for {team_id or 'unknown'}: "
+                f"{self._max_queued} already queued"
+            )
+            _safe_call(on_rejected)
+            return False
+        if position:
+            logger.info(
+                f"Investigation queued for {team_id or 'unknown'} at position {position}"
+            )
+            _safe_call(on_queued, position)
+        return True
+
+    def _position(self, team_id: str, index: int) -> int:
+        """Approximate 1-based queue position under round-robin scheduling."""
+        ahead = index
+        for other, queue in self._queues.items():
+            if other != team_id:
+                ahead += min(len(queue), index + 1)
+        return ahead + 1
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        for i in range(self._workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"investigation-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self._idle = self._workers
+
+    def _next_task(self) -> _Task:
+        with self._cond:
+            while not self._queued:
+                self._cond.wait()
+            team_id, queue = next(iter(self._queues.items()))
+            task = queue.popleft()
+            if queue:
+                self._queues.move_to_end(team_id)
+            else:
+                del self._queues[team_id]
+            self._queued -= 1
+            self._idle -= 1
+
+            wait = time.monotonic() - task.submitted_at
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self.stats_counters["started"] += 1
+            return task
+
+    def _worker(self):
+        while True:
+            task = self._next_task()
+            try:
+                task.fn(*task.args)
+            except Exception as e:
+                logger.error(
+                    f"Investigation task {getattr(task.fn, '__name__', task.fn)} "
+                    f"failed: {e}",
+                    exc_info=True,
+                )
+                with self._cond:
+                    self.stats_counters["failed"] += 1
+            finally:
+                with self._cond:
+                    self._idle += 1
+
+    def stats(self) -> dict:
+        """Queue depth (total and per workspace), worker usage and wait times."""
+        with self._cond:
+            started = self.stats_counters["started"]
+            return dict(
+                self.stats_counters,
+                workers=self._workers,
+                active=len(self._threads) - self._idle if self._threads else 0,
+                queue_depth=self._queued,
+                queue_depth_by_workspace={
+                    team_id: len(queue) for team_id, queue in self._queues.items()
+                },
+                avg_wait_seconds=(
+                    round(self._total_wait / started, 2) if started else 0.0
+                ),
+                max_wait_seconds=round(self._max_wait, 2),
+            )
+
+
+def _safe_call(callback, *args):
+    if callback is None:
+        return
+    try:
+        callback(*args)
+    except Exception as e:
+        logger.warning(f"Investigation pool callback failed: {e}")
+
+
+_pool: Optional[InvestigationPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_investigation_pool() -> InvestigationPool:
+    """Process-wide pool (workers start on first submit)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = InvestigationPool()
+    return _pool
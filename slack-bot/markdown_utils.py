@@ -16,6 +16,8 @@ Key differences (Markdown -> Slack mrkdwn):
 Reference: https://api.slack.com/reference/surfaces/formatting
 """
 
+from functools import lru_cache
+
 import mistune
 
 # Em space for indentation (Slack collapses regular ASCII spaces)
@@ -293,6 +295,9 @@ def slack_mrkdwn(text: str) -> str:
     Uses mistune for proper AST-based parsing - handles all edge cases
     like nested formatting, malformed input, etc.
 
+    Conversions are memoized: progress messages re-render the same thought
+    text on every update, and parsing dominates the cost.
+
     Args:
         text: Standard markdown text
 
@@ -301,7 +306,11 @@ def slack_mrkdwn(text: str) -> str:
     """
     if not text:
         return ""
+    return _slack_mrkdwn_cached(text)
+
 
+@lru_cache(maxsize=1024)
+def _slack_mrkdwn_cached(text: str) -> str:
     result = _slack_md(text)
 
     # Clean up extra whitespace
@@ -200,6 +200,7 @@ def build_progress_message(
     message_ts: Optional[str] = None,
     trigger_user_id: Optional[str] = None,
     trigger_text: Optional[str] = None,
+    render_cache: Optional[dict] = None,
 ) -> list:
     """
     Build Block Kit blocks for an in-progress investigation.
@@ -216,6 +217,11 @@ def build_progress_message(
         +N more
 
     [View Session]
+
+    render_cache: Optional per-message dict (MessageState.render_cache).
+    When given, blocks for completed thoughts and displayed tools are reused
+    across updates and the current thought's tools are grouped
+    incrementally, so an update only re-renders what changed.
     """
     blocks = []
     thoughts = thoughts or []
@@ -246,133 +252,30 @@ def build_progress_message(
 
     for i, thought in enumerate(display_thoughts):
         is_current = i == len(display_thoughts) - 1  # Last one is current
-        is_completed = thought.completed
-
-        # Build thought line - show full text (may wrap to multiple lines)
-        thought_text = slack_mrkdwn(thought.text)
 
-        # Choose icon based on state
-        if is_completed:
-            icon_url = done_icon
-            icon_alt = "Done"
-        else:
-            icon_url = loading_icon
-            icon_alt = "Loading"
+        # Completed thoughts no longer change, so their blocks are cached
+        if thought.completed:
+            blocks.extend(_completed_thought_blocks(thought, done_icon, render_cache))
+            continue
 
-        # Build thought block
+        # Build thought line - show full text (may wrap to multiple lines)
         thought_elements = []
-        if icon_url:
+        if loading_icon:
             thought_elements.append(
                 {
                     "type": "image",
-                    "image_url": icon_url,
-                    "alt_text": icon_alt,
+                    "image_url": loading_icon,
+                    "alt_text": "Loading",
                 }
             )
-        thought_elements.append({"type": "mrkdwn", "text": thought_text})
+        thought_elements.append({"type": "mrkdwn", "text": slack_mrkdwn(thought.text)})
         blocks.append({"type": "context", "elements": thought_elements})
 
-        tool_count = len(thought.tools)
-
-        # For completed thoughts: show tool info
-        # 1 tool: show actual tool name (more informative)
-        # 2+ tools: show count summary (avoid clutter)
-        if is_completed and tool_count == 1:
-            tool = thought.tools[0]
-            tool_text = _format_tool_for_thought(tool, thought_completed=is_completed)
-            blocks.append(
-                {
-                    "type": "context",
-                    "elements": [{"type": "mrkdwn", "text": f"   ↳  ✓ {tool_text}"}],
-                }
-            )
-        elif is_completed and tool_count > 1:
-            blocks.append(
-                {
-                    "type": "context",
-                    "elements": [
-                        {"type": "mrkdwn", "text": f"   ↳  Used {tool_count} tools"}
-                    ],
-                }
-            )
-
         # For current (non-completed) thought: show actual tools
         # Option C: Per-subagent sections - group tools by subagent for clarity
-        elif is_current and not is_completed and thought.tools:
-            tools = thought.tools
-
-            # Separate tools into categories:
-            # 1. Top-level tools (non-Task, no parent)
-            # 2. Subagent tools (Task tools) with their children
-            top_level_tools = []
-            subagents = {}  # tool_use_id -> {"task": tool, "children": [...]}
-
-            for tool in tools:
-                tool_name = tool.get("name", "")
-                parent_id = tool.get("parent_tool_use_id")
-                tool_use_id = tool.get("tool_use_id")
-
-                if tool_name == "Task" and tool_use_id:
-                    # This is a subagent - create entry for it
-                    if tool_use_id not in subagents:
-                        subagents[tool_use_id] = {"task": tool, "children": []}
-                    else:
-                        subagents[tool_use_id]["task"] = tool
-                elif parent_id and parent_id in subagents:
-                    # This tool belongs to a subagent
-                    subagents[parent_id]["children"].append(tool)
-                elif parent_id:
-                    # Parent not seen yet - create placeholder
-                    if parent_id not in subagents:
-                        subagents[parent_id] = {"task": None, "children": []}
-                    subagents[parent_id]["children"].append(tool)
-                else:
-                    # Top-level tool
-                    top_level_tools.append(tool)
-
-            # Helper to render a single tool line
-            def render_tool(tool, indent_level=1):
-                tool_text = _format_tool_for_thought(
-                    tool, thought_completed=is_completed
-                )
-                is_running = tool.get("running", False)
-                tool_image_url = tool.get("_image_url")  # URL for image output
-
-                icon_element = None
-                if is_running and loading_icon:
-                    icon_element = {
-                        "type": "image",
-                        "image_url": loading_icon,
-                        "alt_text": "Loading",
-                    }
-                elif not is_running and done_icon:
-                    icon_element = {
-                        "type": "image",
-                        "image_url": done_icon,
-                        "alt_text": "Done",
-                    }
-
-                # Indentation based on level (1=normal, 2=nested under subagent)
-                if indent_level == 2:
-                    arrow_text = "      ↳" if icon_element else "      ↳  "
-                else:
-                    arrow_text = "   ↳" if icon_element else "   ↳  "
-
-                tool_elements = [{"type": "mrkdwn", "text": arrow_text}]
-                if icon_element:
-                    tool_elements.append(icon_element)
-                tool_elements.append({"type": "mrkdwn", "text": tool_text})
-
-                if tool_image_url and not is_running:
-                    tool_elements.append(
-                        {
-                            "type": "image",
-                            "image_url": tool_image_url,
-                            "alt_text": "Image output",
-                        }
-                    )
-
-                return {"type": "context", "elements": tool_elements}
+        if is_current and thought.tools:
+            top_level_tools, subagents = _group_tools(thought, render_cache)
+            tool_blocks = _ToolBlockCache(loading_icon, done_icon, render_cache)
 
             # Show "+N older" at TOP if we're hiding tools
             # We'll show: last 2 top-level + each subagent with last 2 children
@@ -410,7 +313,7 @@ def build_progress_message(
 
             # Render top-level tools first
             for tool in display_top_level:
-                blocks.append(render_tool(tool, indent_level=1))
+                blocks.append(tool_blocks.render(tool, indent_level=1))
 
             # Render each subagent section
             for sa_id, sa_data in subagents.items():
@@ -419,7 +322,7 @@ def build_progress_message(
 
                 # Show subagent header (the Task tool itself)
                 if task_tool:
-                    blocks.append(render_tool(task_tool, indent_level=1))
+                    blocks.append(tool_blocks.render(task_tool, indent_level=1))
 
                 # Show last N children indented
                 display_children = (
@@ -428,7 +331,9 @@ def build_progress_message(
                     else children
                 )
                 for child in display_children:
-                    blocks.append(render_tool(child, indent_level=2))
+                    blocks.append(tool_blocks.render(child, indent_level=2))
+
+            tool_blocks.commit()
 
     # Safety check: Ensure we don't exceed Slack's 50 block limit
     MAX_BLOCKS = 50
@@ -483,6 +388,7 @@ def build_final_message(
     trigger_text: Optional[str] = None,
     auto_listen_channel_id: Optional[str] = None,
     auto_listen_thread_ts: Optional[str] = None,
+    render_cache: Optional[dict] = None,
 ) -> list:
     """
     Build Block Kit blocks for a completed investigation.
@@ -507,6 +413,7 @@ def build_final_message(
         done_url: URL for done icon (S3-hosted)
         thread_id: Thread ID for View Session button
         result_images: List of image dicts with {path, file_id/image_url, alt, media_type}
+        render_cache: Optional per-message dict shared with build_progress_message
     """
     blocks = []
     thoughts = thoughts or []
@@ -555,42 +462,7 @@ def build_final_message(
         display_thoughts = thoughts[-3:-1] if len(thoughts) > 3 else thoughts[:-1]
 
         for thought in display_thoughts:
-            thought_text = slack_mrkdwn(thought.text)
-
-            thought_elements = []
-            if done_icon:
-                thought_elements.append(
-                    {
-                        "type": "image",
-                        "image_url": done_icon,
-                        "alt_text": "Done",
-                    }
-                )
-            thought_elements.append({"type": "mrkdwn", "text": thought_text})
-            blocks.append({"type": "context", "elements": thought_elements})
-
-            # Add tool count summary
-            tool_count = len(thought.tools)
-            if tool_count == 1:
-                tool = thought.tools[0]
-                tool_text = _format_tool_for_thought(tool, thought_completed=True)
-                blocks.append(
-                    {
-                        "type": "context",
-                        "elements": [
-                            {"type": "mrkdwn", "text": f"   ↳  ✓ {tool_text}"}
-                        ],
-                    }
-                )
-            elif tool_count > 1:
-                blocks.append(
-                    {
-                        "type": "context",
-                        "elements": [
-                            {"type": "mrkdwn", "text": f"   ↳  Used {tool_count} tools"}
-                        ],
-                    }
-                )
+            blocks.extend(_completed_thought_blocks(thought, done_icon, render_cache))
 
     # Extract clean final text - strip out all previous thoughts from result
     final_text = _extract_clean_result(result_text, thoughts)
@@ -749,6 +621,208 @@ def build_final_message(
     return blocks
 
 
+def _completed_thought_blocks(
+    thought, done_icon: Optional[str], render_cache: Optional[dict]
+) -> list:
+    """
+    Blocks for a completed thought: the thought line plus a tool summary.
+
+    1 tool: show actual tool name (more informative)
+    2+ tools: show count summary (avoid clutter)
+
+    Cached per thought in render_cache. A tool_end can still land on a
+    completed thought, so the key includes the tool count and the state of
+    a lone tool.
+    """
+    tool_count = len(thought.tools)
+    signature = (
+        thought.text,
+        tool_count,
+        done_icon,
+        _tool_signature(thought.tools[0]) if tool_count == 1 else None,
+    )
+    cache = render_cache.setdefault("thoughts", {}) if render_cache is not None else {}
+    cached = cache.get(id(thought))
+    if cached and cached[0] is thought and cached[1] == signature:
+        return cached[2]
+
+    blocks = []
+    thought_elements = []
+    if done_icon:
+        thought_elements.append(
+            {
+                "type": "image",
+                "image_url": done_icon,
+                "alt_text": "Done",
+            }
+        )
+    thought_elements.append({"type": "mrkdwn", "text": slack_mrkdwn(thought.text)})
+    blocks.append({"type": "context", "elements": thought_elements})
+
+    if tool_count == 1:
+        tool_text = _format_tool_for_thought(thought.tools[0], thought_completed=True)
+        blocks.append(
+            {
+                "type": "context",
+                "elements": [{"type": "mrkdwn", "text": f"   ↳  ✓ {tool_text}"}],
+            }
+        )
+    elif tool_count > 1:
+        blocks.append(
+            {
+                "type": "context",
+                "elements": [
+                    {"type": "mrkdwn", "text": f"   ↳  Used {tool_count} tools"}
+                ],
+            }
+        )
+
+    if render_cache is not None:
+        # Only the last few thoughts are ever displayed; drop the rest
+        if len(cache) > 8:
+            cache.clear()
+        cache[id(thought)] = (thought, signature, blocks)
+    return blocks
+
+
+def _group_tools(thought, render_cache: Optional[dict]) -> tuple:
+    """
+    Split a thought's tools into top-level tools and subagent sections.
+
+    Categories:
+    1. Top-level tools (non-Task, no parent)
+    2. Subagent tools (Task tools) with their children
+
+    Tools are only ever appended to a thought, so with a render_cache only
+    the tools added since the last render are processed.
+
+    Returns:
+        tuple: (top_level_tools, {tool_use_id: {"task": tool, "children": [...]}})
+    """
+    entry = render_cache.get("grouping") if render_cache is not None else None
+    if entry is None or entry["thought"] is not thought:
+        entry = {"thought": thought, "seen": 0, "top": [], "subagents": {}}
+        if render_cache is not None:
+            render_cache["grouping"] = entry
+
+    top_level_tools = entry["top"]
+    subagents = entry["subagents"]
+    for tool in thought.tools[entry["seen"] :]:
+        tool_name = tool.get("name", "")
+        parent_id = tool.get("parent_tool_use_id")
+        tool_use_id = tool.get("tool_use_id")
+
+        if tool_name == "Task" and tool_use_id:
+            # This is a subagent - create entry for it
+            if tool_use_id not in subagents:
+                subagents[tool_use_id] = {"task": tool, "children": []}
+            else:
+                subagents[tool_use_id]["task"] = tool
+        elif parent_id and parent_id in subagents:
+            # This tool belongs to a subagent
+            subagents[parent_id]["children"].append(tool)
+        elif parent_id:
+            # Parent not seen yet - create placeholder
+            subagents[parent_id] = {"task": None, "children": [tool]}
+        else:
+            # Top-level tool
+            top_level_tools.append(tool)
+    entry["seen"] = len(thought.tools)
+
+    return top_level_tools, subagents
+
+
+def _tool_signature(tool: dict) -> tuple:
+    """Fields of a tool dict that change while it runs and affect its display."""
+    return (
+        tool.get("running", False),
+        tool.get("timed_out", False),
+        tool.get("output"),
+        tool.get("_image_url"),
+    )
+
+
+class _ToolBlockCache:
+    """Renders tool lines for the current thought, reusing unchanged blocks."""
+
+    def __init__(
+        self,
+        loading_icon: Optional[str],
+        done_icon: Optional[str],
+        render_cache: Optional[dict],
+    ):
+        self._loading_icon = loading_icon
+        self._done_icon = done_icon
+        self._render_cache = render_cache
+        self._previous = (
+            render_cache.get("tools", {}) if render_cache is not None else {}
+        )
+        self._current = {}
+
+    def render(self, tool: dict, indent_level: int = 1) -> dict:
+        signature = (
+            _tool_signature(tool),
+            indent_level,
+            self._loading_icon,
+            self._done_icon,
+        )
+        key = (id(tool), indent_level)
+        cached = self._previous.get(key)
+        if cached and cached[0] is tool and cached[1] == signature:
+            block = cached[2]
+        else:
+            block = self._render(tool, indent_level)
+        self._current[key] = (tool, signature, block)
+        return block
+
+    def commit(self):
+        """Keep only the blocks displayed in this render for the next one."""
+        if self._render_cache is not None:
+            self._render_cache["tools"] = self._current
+
+    def _render(self, tool: dict, indent_level: int) -> dict:
+        """Render a single tool line (tools are only listed for in-progress thoughts)."""
+        tool_text = _format_tool_for_thought(tool, thought_completed=False)
+        is_running = tool.get("running", False)
+        tool_image_url = tool.get("_image_url")  # URL for image output
+
+        icon_element = None
+        if is_running and self._loading_icon:
+            icon_element = {
+                "type": "image",
+                "image_url": self._loading_icon,
+                "alt_text": "Loading",
+            }
+        elif not is_running and self._done_icon:
+            icon_element = {
+                "type": "image",
+                "image_url": self._done_icon,
+                "alt_text": "Done",
+            }
+
+        # Indentation based on level (1=normal, 2=nested under subagent)
+        if indent_level == 2:
+            arrow_text = "      ↳" if icon_element else "      ↳  "
+        else:
+            arrow_text = "   ↳" if icon_element else "   ↳  "
+
+        tool_elements = [{"type": "mrkdwn", "text": arrow_text}]
+        if icon_element:
+            tool_elements.append(icon_element)
+        tool_elements.append({"type": "mrkdwn", "text": tool_text})
+
+        if tool_image_url and not is_running:
+            tool_elements.append(
+                {
+                    "type": "image",
+                    "image_url": tool_image_url,
+                    "alt_text": "Image output",
+                }
+            )
+
+        return {"type": "context", "elements": tool_elements}
+
+
 def _format_tool_for_thought(tool: dict, thought_completed: bool = False) -> str:
     """Format a tool call for display under a thought.
 
@@ -509,18 +509,18 @@ def handle_toggle_button(ack, body, client):
 
     q_idx, label = value.split(":", 1)
 
-    # Initialize selections for this thread if needed
-    if thread_id not in _button_selections:
-        _button_selections[thread_id] = {}
+    # Selections live in the shared state store: read, modify, write back
+    selections = _button_selections.get(thread_id, {})
 
     # Toggle selection (if already selected, deselect; otherwise select)
-    current = _button_selections[thread_id].get(q_idx)
+    current = selections.get(q_idx)
     if current == label:
         # Deselect
-        _button_selections[thread_id].pop(q_idx, None)
+        selections.pop(q_idx, None)
     else:
         # Select this option
-        _button_selections[thread_id][q_idx] = label
+        selections[q_idx] = label
+    _button_selections[thread_id] = selections
 
     # Update message to show selection state
     try:
@@ -543,9 +543,9 @@ def handle_toggle_button(ack, body, client):
                         button_q_idx, button_label = button_value.split(":", 1)
 
                         # Set style based on selection
-                        if button_q_idx == q_idx and button_label == _button_selections[
-                            thread_id
-                        ].get(q_idx):
+                        if button_q_idx == q_idx and button_label == selections.get(
+                            q_idx
+                        ):
                             element["style"] = "primary"
                         else:
                             element.pop("style", None)  # Remove style (default)
@@ -570,7 +570,8 @@ def handle_answer_submit(ack, body, client):
 
     logger.info(f"[SUBMIT] thread_id={thread_id}")
     logger.info(f"[SUBMIT] state_values keys: {list(state_values.keys())}")
-    logger.info(f"[SUBMIT] _button_selections: {_button_selections.get(thread_id, {})}")
+    selections = _button_selections.get(thread_id, {})
+    logger.info(f"[SUBMIT] _button_selections: {selections}")
 
     # Extract answers from form
     answers = {}
@@ -582,10 +583,7 @@ def handle_answer_submit(ack, body, client):
     for q_idx in range(max_questions):
         question_block = state_values.get(f"question_{q_idx}")
         text_block = state_values.get(f"text_{q_idx}")
-        has_button_selection = (
-            thread_id in _button_selections
-            and str(q_idx) in _button_selections[thread_id]
-        )
+        has_button_selection = str(q_idx) in selections
 
         # If no data for this question, we're done
         if not question_block and not text_block and not has_button_selection:
@@ -609,7 +607,7 @@ def handle_answer_submit(ack, body, client):
 
         # Check for button selection (single-select toggle buttons)
         if not selected and has_button_selection:
-            selected = _button_selections[thread_id][str(q_idx)]
+            selected = selections[str(q_idx)]
 
         # Check for text input (comment)
         text_value = None
@@ -636,8 +634,7 @@ def handle_answer_submit(ack, body, client):
     logger.info(f"[SUBMIT] Final answers: {answers}")
 
     # Clean up button selections
-    if thread_id in _button_selections:
-        del _button_selections[thread_id]
+    _button_selections.pop(thread_id, None)
 
     # Send answers to server
     try:
@@ -0,0 +1,366 @@
+"""
+Background, coalescing chat.update scheduler.
+
+The SSE reader used to call chat.update inline on every thought/tool event,
+so a throttled Slack API slowed down stream consumption. Now the reader only
+records "message X has new state" and returns. Worker threads then:
+
+- Coalesce: only the latest pending update per message is kept; blocks are
+  rendered from the live MessageState when the update is actually sent.
+- Rate-limit: each send takes a token from a per-channel and a
+  per-workspace bucket (chat.update is a Tier 3 method). A 429 pauses the
+  workspace bucket for Retry-After seconds and requeues the update.
+- Skip no-ops: if the rendered blocks/text hash matches what was last sent
+  for that message, the API call is skipped.
+
+Final updates go ahead of progress updates, and once a message is final,
+late progress updates for it are dropped.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-channel budget: sustained updates/sec and burst size
+CHANNEL_UPDATES_PER_SECOND = float(
+    os.environ.get("SLACK_CHANNEL_UPDATES_PER_SECOND", "1.0")
+)
+CHANNEL_UPDATE_BURST = int(os.environ.get("SLACK_CHANNEL_UPDATE_BURST", "3"))
+
+# Per-workspace budget (Tier 3 is ~50 calls/min per method per workspace)
+WORKSPACE_UPDATES_PER_MINUTE = float(
+    os.environ.get("SLACK_WORKSPACE_UPDATES_PER_MINUTE", "50")
+)
+WORKSPACE_UPDATE_BURST = int(os.environ.get("SLACK_WORKSPACE_UPDATE_BURST", "10"))
+
+UPDATER_WORKERS = int(os.environ.get("SLACK_UPDATER_WORKERS", "4"))
+
+# Default pause when a 429 has no Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+# Render callback: returns (blocks, fallback_text) for the current state
+Renderer = Callable[[], Tuple[list, str]]
+
+
+class TokenBucket:
+    """Token bucket with an optional hard pause (for Retry-After)."""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_at(self, now: float) -> float:
+        """Earliest time a token will be available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return max(now, self.paused_until)
+        return max(now + (1 - self.tokens) / self.rate, self.paused_until)
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, until: float):
+        self.paused_until = max(self.paused_until, until)
+
+
+@dataclass
+class _PendingUpdate:
+    client: object
+    team_id: str
+    channel_id: str
+    message_ts: str
+    render: Renderer
+    final: bool
+    lock: Optional[object] = (
+        None  # Held while rendering (state is mutated by the reader)
+    )
+
+
+class SlackMessageUpdater:
+    """Coalescing, rate-budgeted chat.update sender."""
+
+    def __init__(
+        self,
+        channel_rate: float = CHANNEL_UPDATES_PER_SECOND,
+        channel_burst: int = CHANNEL_UPDATE_BURST,
+        workspace_rate: float = WORKSPACE_UPDATES_PER_MINUTE / 60.0,
+        workspace_burst: int = WORKSPACE_UPDATE_BURST,
+        workers: int = UPDATER_WORKERS,
+    ):
+        self._channel_rate = channel_rate
+        self._channel_burst = channel_burst
+        self._workspace_rate = workspace_rate
+        self._workspace_burst = workspace_burst
+        self._workers = workers
+
+        self._cond = threading.Condition()
+        # message key -> latest pending update
+        self._pending: Dict[Tuple[str, str], _PendingUpdate] = {}
+        # messages currently being sent (one send per message at a time)
+        self._in_flight: set = set()
+        # message key -> hash of the last blocks/text Slack accepted
+        self._sent_hashes: Dict[Tuple[str, str], str] = {}
+        # messages whose final update was submitted (dict used as ordered set)
+        self._finalized: Dict[Tuple[str, str], None] = {}
+        self._channel_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._workspace_buckets: Dict[str, TokenBucket] = {}
+        self._threads: list = []
+
+        self.stats = {
+            "submitted": 0,
+            "sent": 0,
+            "skipped_unchanged": 0,
+            "rate_limited": 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def submit(
+        self,
+        client,
+        team_id: str,
+        channel_id: str,
+        message_ts: str,
+        render: Renderer,
+        final: bool = False,
+        lock=None,
+    ):
+        """Queue the latest state of a message for update. Never blocks on Slack."""
+        key = (channel_id, message_ts)
+        with self._cond:
+            if not final and key in self._finalized:
+                return
+            if final:
+                self._finalized[key] = None
+            self._pending[key] = _PendingUpdate(
+                client=client,
+                team_id=team_id or "",
+                channel_id=channel_id,
+                message_ts=message_ts,
+                render=render,
+                final=final,
+                lock=lock,
+            )
+            self.stats["submitted"] += 1
+            self._ensure_started()
+            self._cond.notify()
+
+    def discard(self, channel_id: str, message_ts: str, finalize: bool = False):
+        """Drop any pending update for a message (optionally marking it final)."""
+        key = (channel_id, message_ts)
+        with self._cond:
+            self._pending.pop(key, None)
+            if finalize:
+                self._finalized[key] = None
+
+    def update_now(
+        self, client, team_id: str, channel_id: str, message_ts: str, blocks, text
+    ) -> bool:
+        """
+        Send one chat.update from the calling thread, waiting for rate budget.
+
+        For flows that must see each call's outcome (progressive image
+        rendering). Returns True if Slack accepted the update.
+        """
+        while True:
+            self._wait_for_budget(team_id or "", channel_id)
+            result = self._call(
+                client, team_id or "", channel_id, message_ts, blocks, text
+            )
+            if result != "rate_limited":
+                return result == "ok"
+
+    def _wait_for_budget(self, team_id: str, channel_id: str):
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                channel, workspace = self._buckets(team_id, channel_id)
+                ready = max(channel.ready_at(now), workspace.ready_at(now))
+                if ready <= now:
+                    channel.take(now)
+                    workspace.take(now)
+                    return
+            time.sleep(ready - now)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until nothing is pending or in flight (tests / shutdown)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        for i in range(self._workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"slack-updater-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _buckets(self, team_id: str, channel_id: str):
+        channel = self._channel_buckets.get((team_id, channel_id))
+        if channel is None:
+            channel = TokenBucket(self._channel_rate, self._channel_burst)
+            self._channel_buckets[(team_id, channel_id)] = channel
+        workspace = self._workspace_buckets.get(team_id)
+        if workspace is None:
+            workspace = TokenBucket(self._workspace_rate, self._workspace_burst)
+            self._workspace_buckets[team_id] = workspace
+        return channel, workspace
+
+    def _next_update(self) -> Tuple[Tuple[str, str], _PendingUpdate]:
+        """Block until some pending update has budget; reserve and return it."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wake_at = None
+                # Finals first, then oldest-submitted (dict order)
+                candidates = sorted(
+                    (k for k in self._pending if k not in self._in_flight),
+                    key=lambda k: not self._pending[k].final,
+                )
+                for key in candidates:
+                    update = self._pending[key]
+                    channel, workspace = self._buckets(
+                        update.team_id, update.channel_id
+                    )
+                    ready = max(channel.ready_at(now), workspace.ready_at(now))
+                    if ready <= now:
+                        channel.take(now)
+                        workspace.take(now)
+                        del self._pending[key]
+                        self._in_flight.add(key)
+                        return key, update
+                    wake_at = ready if wake_at is None else min(wake_at, ready)
+
+                self._cond.wait(None if wake_at is None else wake_at - now)
+
+    def _worker(self):
+        while True:
+            key, update = self._next_update()
+            try:
+                self._send(key, update)
+            except Exception as e:
+                logger.error(f"Slack updater error for {key}: {e}")
+            finally:
+                with self._cond:
+                    self._in_flight.discard(key)
+                    if update.final and key not in self._pending:
+                        # Nothing more will be sent for this message
+                        self._sent_hashes.pop(key, None)
+                        self._prune_finalized()
+                    self._cond.notify_all()
+
+    def _send(self, key, update: _PendingUpdate):
+        if update.lock is not None:
+            with update.lock:
+                blocks, text = update.render()
+        else:
+            blocks, text = update.render()
+
+        digest = _digest(blocks, text)
+        with self._cond:
+            if self._sent_hashes.get(key) == digest:
+                self.stats["skipped_unchanged"] += 1
+                return
+
+        result = self._call(
+            update.client,
+            update.team_id,
+            update.channel_id,
+            update.message_ts,
+            blocks,
+            text,
+        )
+        if result == "ok":
+            with self._cond:
+                self._sent_hashes[key] = digest
+        elif result == "rate_limited":
+            with self._cond:
+                # Retry unless a newer update for this message arrived meanwhile
+                self._pending.setdefault(key, update)
+
+    def _call(self, client, team_id, channel_id, message_ts, blocks, text) -> str:
+        """chat.update with 429 handling. Returns "ok", "rate_limited" or "error"."""
+        try:
+            client.chat_update(
+                channel=channel_id, ts=message_ts, blocks=blocks, text=text
+            )
+            with self._cond:
+                self.stats["sent"] += 1
+            return "ok"
+        except Exception as e:
+            response = getattr(e, "response", None)
+            if response is not None and getattr(response, "status_code", None) == 429:
+                retry_after = _retry_after_seconds(response)
+                logger.warning(
+                    f"chat.update rate limited in {team_id or 'workspace'}; "
+                    f"pausing {retry_after:.1f}s"
+                )
+                with self._cond:
+                    self.stats["rate_limited"] += 1
+                    _, workspace = self._buckets(team_id, channel_id)
+                    workspace.pause(time.monotonic() + retry_after)
+                return "rate_limited"
+            logger.error(f"Failed to update message: {e}")
+            return "error"
+
+    def _prune_finalized(self, max_entries: int = 10000):
+        """Keep the finalized-message set bounded, dropping the oldest."""
+        while len(self._finalized) > max_entries:
+            del self._finalized[next(iter(self._finalized))]
+
+
+def _digest(blocks, text) -> str:
+    payload = json.dumps({"b": blocks, "t": text}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _retry_after_seconds(response) -> float:
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+_updater: Optional[SlackMessageUpdater] = None
+_updater_lock = threading.Lock()
+
+
+def get_updater() -> SlackMessageUpdater:
+    """Process-wide updater (threads start on first submit)."""
+    global _updater
+    if _updater is None:
+        with _updater_lock:
+            if _updater is None:
+                _updater = SlackMessageUpdater()
+    return _updater
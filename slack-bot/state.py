@@ -3,9 +3,13 @@ Shared state, data models, and caching for the IncidentFox Slack Bot.
 
 This module contains:
 - ThoughtSection and MessageState dataclasses
-- In-memory investigation cache with TTL
+- Investigation cache (live objects locally, snapshots in the shared store)
 - Session persistence to/from config-service DB
 - User display name cache
+
+Small maps (auto-listen threads, pending questions, user names, ...) are
+StoreMap views over state_store, so they are shared across replicas when
+SLACK_STATE_BACKEND=redis.
 """
 
 import json
@@ -13,9 +17,13 @@ import logging
 import os
 import threading
 import time
+import zlib
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from state_store import KEY_PREFIX, StoreMap, get_state_store, is_shared
 
 logger = logging.getLogger(__name__)
 
@@ -27,56 +35,60 @@ def get_config_client():
     return _get_config_client()
 
 
-# Track channels where we've sent the welcome nudge (resets on restart, which is fine)
+_DAY_SECONDS = 24 * 3600
+
+# Track channels where we've sent the welcome nudge
 # Key format: "{team_id}:{channel_id}"
-_nudge_sent_channels: set = set()
+_nudge_sent_channels = StoreMap("nudge_channel", ttl_seconds=30 * _DAY_SECONDS)
 
 # Track threads where auto-listen is active (bot responds without @mention)
 # Key: (channel_id, thread_ts), Value: True
-_auto_listen_threads: Dict[tuple, bool] = {}
+_auto_listen_threads = StoreMap("auto_listen", ttl_seconds=7 * _DAY_SECONDS)
 
-# Track button selections in memory (thread_id -> {q_idx: selected_value})
-_button_selections = {}
+# Track button selections (thread_id -> {q_idx: selected_value})
+_button_selections = StoreMap("button_selections", ttl_seconds=_DAY_SECONDS)
 
 # Track pending questions for displaying in submitted answer summary (thread_id -> questions list)
-_pending_questions = {}
+_pending_questions = StoreMap("pending_questions", ttl_seconds=_DAY_SECONDS)
 
 # Track question message timestamps for timeout updates (thread_id -> {message_ts, channel_id})
-_question_messages = {}
+_question_messages = StoreMap("question_messages", ttl_seconds=_DAY_SECONDS)
 
-# LRU cache for Slack user display name lookups (avoids repeated API calls
+# Cache for Slack user display name lookups (avoids repeated API calls
 # when the same users keep chatting in the same thread)
-_user_name_cache: Dict[str, str] = {}
-_USER_NAME_CACHE_MAX = 200
+_user_name_cache = StoreMap("user_name", ttl_seconds=_DAY_SECONDS)
 
 
-def _get_user_display_name(client, user_id: str) -> str:
-    """Look up a Slack user's display name, with in-memory LRU caching."""
-    if user_id in _user_name_cache:
-        return _user_name_cache[user_id]
-
+def _lookup_user_display_name(client, user_id: str) -> str:
     try:
         resp = client.users_info(user=user_id)
         if resp["ok"]:
             user = resp["user"]
             profile = user.get("profile", {})
-            name = (
+            return (
                 profile.get("display_name")
                 or profile.get("real_name")
                 or user.get("name", f"User_{user_id}")
             )
-        else:
-            name = f"User_{user_id}"
     except Exception:
-        name = f"User_{user_id}"
+        pass
+    return f"User_{user_id}"
 
-    # Evict oldest entry if at capacity (dict preserves insertion order in 3.7+)
-    if len(_user_name_cache) >= _USER_NAME_CACHE_MAX:
-        oldest_key = next(iter(_user_name_cache))
-        del _user_name_cache[oldest_key]
 
-    _user_name_cache[user_id] = name
-    return name
+def _get_user_display_names(client, user_ids: List[str]) -> Dict[str, str]:
+    """Display names for several users: one batched cache read, API for misses."""
+    user_ids = list(dict.fromkeys(user_ids))
+    names = _user_name_cache.get_many(user_ids)
+    for user_id in user_ids:
+        if user_id not in names:
+            names[user_id] = _lookup_user_display_name(client, user_id)
+            _user_name_cache[user_id] = names[user_id]
+    return names
+
+
+def _get_user_display_name(client, user_id: str) -> str:
+    """Look up a Slack user's display name, with caching."""
+    return _get_user_display_names(client, [user_id])[user_id]
 
 
 @dataclass
@@ -119,6 +131,18 @@ class MessageState:
     # Tracking
     last_update_time: float = 0
 
+    # Guards mutation by the stream reader vs. rendering by the Slack updater
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+
+    # Not persisted: tool dicts by tool_use_id (for tool_end lookups) and
+    # blocks reused between progress renders (see message_builder)
+    tools_by_id: Dict[str, dict] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    render_cache: dict = field(default_factory=dict, repr=False, compare=False)
+
     # Trigger context (for nudge-initiated investigations)
     trigger_user_id: Optional[str] = None  # Who clicked "Yes" on the nudge
     trigger_text: Optional[str] = None  # The message that triggered it
@@ -209,33 +233,149 @@ class MessageState:
         return tools
 
 
-# In-memory cache for investigation state (for modal views)
-# Keyed by message_ts (unique per message, unlike thread_id which is shared)
-# Falls back to config-service DB on cache miss (persisted for 3 days)
-_investigation_cache: Dict[str, MessageState] = {}
-_cache_timestamps: Dict[str, float] = {}  # Track when entries were added
-CACHE_TTL_HOURS = 24  # Keep in-memory cache entries for 24 hours
-
-
-def _cleanup_old_cache_entries():
-    """Remove cache entries older than CACHE_TTL_HOURS."""
-    now = time.time()
-    ttl_seconds = CACHE_TTL_HOURS * 3600
-    expired_keys = []
-
-    for key, timestamp in _cache_timestamps.items():
-        if now - timestamp > ttl_seconds:
-            expired_keys.append(key)
-
-    for key in expired_keys:
-        _investigation_cache.pop(key, None)
-        _cache_timestamps.pop(key, None)
-        logger.info(f"Cleaned up expired cache entry: {key}")
-
-    if expired_keys:
-        logger.info(
-            f"Cache cleanup: removed {len(expired_keys)} expired entries, {len(_investigation_cache)} remaining"
-        )
+# Fields that are process-local (locks, render caches, indexes) and never
+# serialized
+_TRANSIENT_FIELDS = ("lock", "tools_by_id", "render_cache")
+
+# Serialized states above this size are zlib-compressed
+_COMPRESS_THRESHOLD_BYTES = 1024
+
+
+def encode_state(state: MessageState) -> bytes:
+    """
+    Compact serialization of a MessageState for the shared store.
+
+    JSON without empty fields or whitespace, zlib-compressed when large
+    (tool outputs dominate and compress well). A one-byte prefix records
+    the encoding.
+    """
+    with state.lock:
+        data = {k: v for k, v in state.to_dict().items() if v not in (None, [], {})}
+        raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    if len(raw) < _COMPRESS_THRESHOLD_BYTES:
+        return b"j" + raw
+    return b"z" + zlib.compress(raw, 6)
+
+
+def decode_state(data: bytes) -> MessageState:
+    """Inverse of encode_state."""
+    raw = zlib.decompress(data[1:]) if data[:1] == b"z" else data[1:]
+    return MessageState.from_dict(json.loads(raw))
+
+
+CACHE_TTL_HOURS = 24  # Keep investigation state cached for 24 hours
+CACHE_MAX_LOCAL = int(os.environ.get("SLACK_STATE_LOCAL_MAX_INVESTIGATIONS", "500"))
+# Min seconds between shared-store snapshots of an in-flight investigation
+# (final updates are always written)
+STATE_SYNC_INTERVAL_SECONDS = float(
+    os.environ.get("SLACK_STATE_SYNC_INTERVAL_SECONDS", "5")
+)
+
+
+class InvestigationCache:
+    """
+    Investigation state keyed by message_ts (unique per message, unlike
+    thread_id which is shared).
+
+    The replica running an investigation keeps the live MessageState in a
+    local TTL/LRU map. With a shared store, encoded snapshots are also
+    written there (throttled while streaming, always on final), so other
+    replicas and restarted pods can serve modals. Snapshots read from the
+    store are only kept locally for sync_interval, since the owning replica
+    keeps replacing them. Misses fall back to the config-service DB
+    (persisted for 3 days) in _load_session_from_db.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = CACHE_TTL_HOURS * 3600,
+        max_local: int = CACHE_MAX_LOCAL,
+        sync_interval: float = STATE_SYNC_INTERVAL_SECONDS,
+    ):
+        self._ttl = ttl_seconds
+        self._max_local = max_local
+        self._sync_interval = sync_interval
+        self._lock = threading.Lock()
+        # message_ts -> (expires_at, state); least- to most-recently used
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._synced_at: Dict[str, float] = {}
+
+    @staticmethod
+    def _key(message_ts: str) -> str:
+        return f"{KEY_PREFIX}:investigation:{message_ts}"
+
+    def put(self, state: MessageState, final: bool = False):
+        """Cache state locally and (if shared, and due) snapshot it to the store."""
+        now = time.time()
+        message_ts = state.message_ts
+        with self._lock:
+            self._local[message_ts] = (now + self._ttl, state)
+            self._local.move_to_end(message_ts)
+            self._evict(now)
+            due = final or (
+                now - self._synced_at.get(message_ts, 0.0) >= self._sync_interval
+            )
+            if due:
+                self._synced_at[message_ts] = now
+
+        if due and is_shared():
+            get_state_store().set(self._key(message_ts), encode_state(state), self._ttl)
+        if final:
+            with self._lock:
+                self._synced_at.pop(message_ts, None)
+
+    def get(self, message_ts: str) -> Optional[MessageState]:
+        return self.get_many([message_ts]).get(message_ts)
+
+    def get_many(self, message_ts_list: List[str]) -> Dict[str, MessageState]:
+        """Local hits first, then one batched read from the shared store."""
+        now = time.time()
+        found: Dict[str, MessageState] = {}
+        with self._lock:
+            for message_ts in message_ts_list:
+                entry = self._local.get(message_ts)
+                if entry and now <= entry[0]:
+                    self._local.move_to_end(message_ts)
+                    found[message_ts] = entry[1]
+
+        missing = [ts for ts in message_ts_list if ts not in found]
+        if missing and is_shared():
+            raws = get_state_store().get_many([self._key(ts) for ts in missing])
+            for message_ts, raw in zip(missing, raws):
+                if raw is None:
+                    continue
+                try:
+                    state = decode_state(raw)
+                except Exception as e:
+                    logger.warning(f"Undecodable cached state for {message_ts}: {e}")
+                    continue
+                found[message_ts] = state
+                self._remember(state, now)
+        return found
+
+    def _remember(self, state: MessageState, now: float):
+        """Keep a decoded snapshot briefly, without writing it back."""
+        with self._lock:
+            entry = self._local.get(state.message_ts)
+            if entry and entry[0] - now > self._sync_interval:
+                return  # This replica put() a state of its own meanwhile
+            self._local[state.message_ts] = (now + self._sync_interval, state)
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries from the LRU end, then trim to size."""
+        while self._local:
+            message_ts, (expires_at, _) = next(iter(self._local.items()))
+            if now <= expires_at and len(self._local) <= self._max_local:
+                break
+            del self._local[message_ts]
+            self._synced_at.pop(message_ts, None)
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+_investigation_cache = InvestigationCache()
 
 
 def _persist_session_to_db(
@@ -269,9 +409,8 @@ def _load_session_from_db(message_ts: str) -> Optional[MessageState]:
         state_json = config_client.get_session_state(message_ts)
         if state_json:
             state = MessageState.from_dict(state_json)
-            # Populate in-memory cache for subsequent accesses
-            _investigation_cache[message_ts] = state
-            _cache_timestamps[message_ts] = time.time()
+            # Populate the cache for subsequent accesses
+            _investigation_cache.put(state, final=True)
             logger.info(f"Loaded session state from DB for message_ts={message_ts}")
             return state
     except Exception as e:
@@ -300,7 +439,11 @@ def save_investigation_snapshot(state: MessageState):
         # Convert MessageState to dict (recursively handle dataclasses)
         def to_serializable(obj):
             if hasattr(obj, "__dict__"):
-                return {k: to_serializable(v) for k, v in obj.__dict__.items()}
+                return {
+                    k: to_serializable(v)
+                    for k, v in obj.__dict__.items()
+                    if k not in _TRANSIENT_FIELDS
+                }
             elif isinstance(obj, list):
                 return [to_serializable(item) for item in obj]
             elif isinstance(obj, dict):
@@ -0,0 +1,222 @@
+"""
+Pluggable key/value store for slack-bot state shared across replicas.
+
+Investigation state, auto-listen threads, pending questions, the user name
+cache and team tokens used to live in module-level dicts, so a second
+replica (or a restart) could not see them: "View Session" broke when the
+click landed on another pod, and every pod issued its own team tokens.
+
+Backends (SLACK_STATE_BACKEND):
+  - "memory" (default): per-process, TTL + LRU bounded (SLACK_STATE_MAX_ITEMS
+    per namespace, so a busy cache cannot evict another map's entries).
+  - "redis": shared by all replicas and survives restarts. Requires
+    SLACK_STATE_REDIS_URL (or REDIS_URL). Entries expire via Redis TTLs.
+
+Values are bytes; StoreMap layers a JSON codec and a key namespace on top
+so call sites keep dict-style access. Store errors are logged and treated
+as cache misses, never as failures of the calling handler.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_BACKEND = os.environ.get("SLACK_STATE_BACKEND", "memory").strip().lower()
+STATE_REDIS_URL = os.environ.get("SLACK_STATE_REDIS_URL") or os.environ.get(
+    "REDIS_URL", ""
+)
+STATE_MAX_ITEMS = int(os.environ.get("SLACK_STATE_MAX_ITEMS", "10000"))
+
+KEY_PREFIX = "slackbot"
+
+
+class StateStore:
+    """Minimal bytes store with per-key TTLs."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryStateStore(StateStore):
+    """
+    Process-local store: TTL per entry, least-recently-used eviction.
+
+    Each namespace ("slackbot:<namespace>:...") has its own LRU of at most
+    max_items entries.
+    """
+
+    def __init__(self, max_items: int = STATE_MAX_ITEMS):
+        self._max_items = max_items
+        self._lock = threading.Lock()
+        # namespace -> key -> (expires_at, value); each ordered least- to
+        # most-recently used
+        self._namespaces: Dict[str, "OrderedDict[str, Tuple[float, bytes]]"] = {}
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        parts = key.split(":", 2)
+        return ":".join(parts[:2]) if len(parts) == 3 else ""
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                items = self._namespaces.get(self._namespace(key), {})
+                entry = items.get(key)
+                if entry is None:
+                    values.append(None)
+                elif entry[0] < now:
+                    del items[key]
+                    values.append(None)
+                else:
+                    items.move_to_end(key)
+                    values.append(entry[1])
+        return values
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        with self._lock:
+            items = self._namespaces.setdefault(self._namespace(key), OrderedDict())
+            items[key] = (time.monotonic() + ttl_seconds, value)
+            items.move_to_end(key)
+            while len(items) > self._max_items:
+                items.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._namespaces.get(self._namespace(key), {}).pop(key, None)
+
+
+class RedisStateStore(StateStore):
+    """Store shared by all replicas; TTLs are Redis key expirations."""
+
+    def __init__(self, *, redis_url: str):
+        # Lazy import so runtime doesn't require redis unless enabled.
+        import redis  # type: ignore
+
+        self._client = redis.Redis.from_url(redis_url)
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        try:
+            return self._client.mget(keys)
+        except Exception as e:
+            logger.warning(f"State store read failed: {e}")
+            return [None] * len(keys)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        try:
+            self._client.set(key, value, ex=ttl_seconds)
+        except Exception as e:
+            logger.warning(f"State store write failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(key)
+        except Exception as e:
+            logger.warning(f"State store delete failed for {key}: {e}")
+
+
+class StoreMap:
+    """
+    Dict-style view of one namespace of a StateStore.
+
+    Keys may be strings or tuples of strings (joined with ":"). Values go
+    through JSON, so read-modify-write is required for nested values.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int, store=None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._store = store
+
+    @property
+    def store(self) -> StateStore:
+        return self._store or get_state_store()
+
+    def _key(self, key) -> str:
+        if isinstance(key, tuple):
+            key = ":".join(str(part) for part in key)
+        return f"{KEY_PREFIX}:{self.namespace}:{key}"
+
+    def get(self, key, default=None):
+        raw = self.store.get(self._key(key))
+        return default if raw is None else json.loads(raw)
+
+    def get_many(self, keys: Iterable) -> Dict[Any, Any]:
+        """Batched read; returns only the keys that were found."""
+        keys = list(keys)
+        raws = self.store.get_many([self._key(key) for key in keys])
+        return {key: json.loads(raw) for key, raw in zip(keys, raws) if raw is not None}
+
+    def __getitem__(self, key):
+        raw = self.store.get(self._key(key))
+        if raw is None:
+            raise KeyError(key)
+        return json.loads(raw)
+
+    def __setitem__(self, key, value) -> None:
+        self.store.set(
+            self._key(key),
+            json.dumps(value, separators=(",", ":")).encode(),
+            self.ttl_seconds,
+        )
+
+    def __delitem__(self, key) -> None:
+        self.store.delete(self._key(key))
+
+    def __contains__(self, key) -> bool:
+        return self.store.get(self._key(key)) is not None
+
+    def pop(self, key, default=None):
+        value = self.get(key, default)
+        self.store.delete(self._key(key))
+        return value
+
+
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """Process-wide store selected by SLACK_STATE_BACKEND."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_state_store()
+    return _store
+
+
+def _create_state_store() -> StateStore:
+    if STATE_BACKEND == "redis":
+        if not STATE_REDIS_URL:
+            raise RuntimeError(
+                "SLACK_STATE_BACKEND=redis requires SLACK_STATE_REDIS_URL or REDIS_URL"
+            )
+        logger.info("Using Redis state store")
+        return RedisStateStore(redis_url=STATE_REDIS_URL)
+    if STATE_BACKEND == "memory":
+        return InMemoryStateStore()
+    raise RuntimeError(f"Unknown SLACK_STATE_BACKEND: {STATE_BACKEND}")
+
+
+def is_shared() -> bool:
+    """True if state is visible to other replicas (not process-local)."""
+    return STATE_BACKEND != "memory"
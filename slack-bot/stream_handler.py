@@ -8,6 +8,7 @@ for progressive investigation updates, and managing the streaming lifecycle.
 import json
 import logging
 import os
+import threading
 from typing import Optional
 
 from file_handler import (
@@ -16,12 +17,11 @@ from file_handler import (
     _upload_base64_image_to_slack,
     _upload_image_to_slack,
 )
+from slack_updater import get_updater
 from state import (
     MessageState,
     ThoughtSection,
     _auto_listen_threads,
-    _cache_timestamps,
-    _cleanup_old_cache_entries,
     _investigation_cache,
     _pending_questions,
     _question_messages,
@@ -30,7 +30,6 @@ from state import (
 logger = logging.getLogger(__name__)
 
 SRE_AGENT_URL = os.environ.get("SRE_AGENT_URL", "http://localhost:8000")
-UPDATE_INTERVAL_SECONDS = 0.5
 
 
 def parse_sse_event(line: str) -> Optional[dict]:
@@ -61,6 +60,7 @@ def build_progress_blocks(state: MessageState, client, team_id: str) -> list:
         message_ts=state.message_ts,
         trigger_user_id=state.trigger_user_id,
         trigger_text=state.trigger_text,
+        render_cache=state.render_cache,
     )
 
 
@@ -91,76 +91,78 @@ def build_final_blocks(state: MessageState, client, team_id: str) -> list:
         trigger_text=state.trigger_text,
         auto_listen_channel_id=state.channel_id if auto_listen_active else None,
         auto_listen_thread_ts=state.thread_ts if auto_listen_active else None,
+        render_cache=state.render_cache,
     )
 
 
+def _fallback_text(state: MessageState) -> str:
+    """Notification/fallback text for the current state."""
+    if state.error:
+        return f"❌ Error: {state.error}"
+    if state.final_result:
+        return (
+            state.final_result[:200] + "..."
+            if len(state.final_result or "") > 200
+            else state.final_result
+        )
+    if state.current_thought:
+        return state.current_thought[:200] + "..."
+    return "🔄 Processing..."
+
+
 def update_slack_message(
     client, state: MessageState, team_id: str, final: bool = False
 ):
-    """Update the Slack message with current state."""
+    """
+    Update the Slack message with current state.
+
+    Non-blocking: the update is handed to the background updater, which
+    coalesces bursts of events into the latest state per message and sends
+    chat.update within per-channel/per-workspace rate budgets.
+    """
     import time
 
-    # ALWAYS cache state for modal access (even if we skip the message update)
+    # ALWAYS cache state for modal access (even if the message update is coalesced)
     # Use message_ts as key (unique per message, unlike thread_id which is shared in threads)
-    _investigation_cache[state.message_ts] = state
-    _cache_timestamps[state.message_ts] = time.time()
-    logger.info(
+    _investigation_cache.put(state, final=final)
+    logger.debug(
         f"Cached investigation state for message_ts: {state.message_ts} (final={final}, thoughts={len(state.thoughts)})"
     )
+    state.last_update_time = time.time()
 
-    # Rate limit message updates (except for final)
-    now = time.time()
-    if not final and (now - state.last_update_time) < UPDATE_INTERVAL_SECONDS:
-        logger.debug("Skipping message update (rate limited), but cache updated")
-        return
-    state.last_update_time = now
-
-    # Cleanup old cache entries periodically (only on final updates to avoid overhead)
-    if final:
-        _cleanup_old_cache_entries()
-
-    # Get fallback text
-    if state.error:
-        text = f"❌ Error: {state.error}"
-    elif state.final_result:
-        text = (
-            state.final_result[:200] + "..."
-            if len(state.final_result or "") > 200
-            else state.final_result
-        )
-    elif state.current_thought:
-        text = state.current_thought[:200] + "..."
-    else:
-        text = "🔄 Processing..."
+    updater = get_updater()
 
     # For final updates with images: use progressive enhancement strategy
+    # (its propagation delays run on a separate thread, not the stream reader)
     if final and state.result_images:
-        _update_with_progressive_images(client, state, team_id, text)
-    else:
-        # Regular update (using S3-hosted URLs - no caching issues)
-        try:
-            if final:
-                blocks = build_final_blocks(state, client, team_id)
-            else:
-                blocks = build_progress_blocks(state, client, team_id)
+        updater.discard(state.channel_id, state.message_ts, finalize=True)
+        threading.Thread(
+            target=_update_with_progressive_images,
+            args=(client, state, team_id),
+            daemon=True,
+        ).start()
+        return
 
-            logger.debug(
-                f"Calling chat.update with {len(blocks)} blocks (final={final})"
-            )
-            client.chat_update(
-                channel=state.channel_id,
-                ts=state.message_ts,
-                blocks=blocks,
-                text=text,
-            )
-            logger.info(f"✅ chat.update succeeded (final={final})")
-        except Exception as e:
-            logger.error(f"Failed to update message: {e}")
+    def render():
+        # Regular update (using S3-hosted URLs - no caching issues)
+        if final:
+            blocks = build_final_blocks(state, client, team_id)
+        else:
+            blocks = build_progress_blocks(state, client, team_id)
+        return blocks, _fallback_text(state)
+
+    updater.submit(
+        client,
+        team_id,
+        state.channel_id,
+        state.message_ts,
+        render,
+        final=final,
+        lock=state.lock,
+    )
 
 
-def _update_with_progressive_images(
-    client, state: MessageState, team_id: str, text: str
-):
+def _update_with_progressive_images(client, state: MessageState, team_id: str):
     """
     Progressive enhancement strategy for images:
     1. First update: text only (no images) - immediate, no delay
@@ -171,34 +173,44 @@ def _update_with_progressive_images(
     render a broken image if files aren't propagated. We can't detect this from
     the API response, so we always do a final re-render to force the frontend
     to re-fetch the (now-ready) images.
+
+    Runs on its own thread; each chat.update still draws from the updater's
+    rate budgets.
     """
     import time
 
+    updater = get_updater()
+
+    def send(blocks) -> bool:
+        return updater.update_now(
+            client,
+            team_id,
+            state.channel_id,
+            state.message_ts,
+            blocks,
+            _fallback_text(state),
+        )
+
     logger.info(
         f"🚀 Starting progressive image update for {len(state.result_images)} images"
     )
 
     # Step 1: Immediate update with text only (strip images)
-    original_images = state.result_images
-    state.result_images = None  # Temporarily strip images
+    with state.lock:
+        original_images = state.result_images
+        state.result_images = None  # Temporarily strip images
+        try:
+            blocks = build_final_blocks(state, client, team_id)
+        finally:
+            # Restore images (also needed by the modal)
+            state.result_images = original_images
 
-    try:
-        blocks = build_final_blocks(state, client, team_id)
-        client.chat_update(
-            channel=state.channel_id,
-            ts=state.message_ts,
-            blocks=blocks,
-            text=text,
-        )
-        logger.info("✅ Initial text-only update succeeded")
-    except Exception as e:
-        logger.error(f"Failed text-only update: {e}")
-        # Restore images for modal
-        state.result_images = original_images
+    if not send(blocks):
+        logger.error("Failed text-only update")
         return
+    logger.info("✅ Initial text-only update succeeded")
 
     # Step 2: Image updates with re-renders
-    state.result_images = original_images  # Restore images
 
     # Determine if we need delays (only for newly uploaded images)
     newly_uploaded = [
@@ -207,26 +219,13 @@ def _update_with_progressive_images(
 
     def do_image_update(attempt_name: str) -> bool:
         """Try to update with images. Returns True if API accepted (might still render broken)."""
-        try:
+        with state.lock:
             blocks = build_final_blocks(state, client, team_id)
-            client.chat_update(
-                channel=state.channel_id,
-                ts=state.message_ts,
-                blocks=blocks,
-                text=text,
-            )
+        if send(blocks):
             logger.info(f"✅ {attempt_name} - API accepted")
             return True
-        except Exception as e:
-            error_str = str(e)
-            if (
-                "invalid_blocks" in error_str.lower()
-                and "slack_file" in error_str.lower()
-            ):
-                logger.warning(f"⚠️ {attempt_name} - slack_file rejected: {e}")
-            else:
-                logger.error(f"❌ {attempt_name} - error: {e}")
-            return False
+        logger.warning(f"⚠️ {attempt_name} - update rejected (see error above)")
+        return False
 
     if newly_uploaded:
         # New images need propagation time
@@ -378,8 +377,33 @@ def build_question_blocks(questions: list, thread_id: str) -> list:
     return blocks
 
 
+def _find_tool(state: MessageState, tool_name: str, tool_use_id: Optional[str]):
+    """
+    Find the tool dict a tool_end refers to.
+
+    Matches by tool_use_id (indexed at tool_start), falling back to the first
+    running tool with the same name when the event has no tool_use_id.
+    """
+    if tool_use_id and tool_use_id in state.tools_by_id:
+        return state.tools_by_id[tool_use_id]
+    for thought in state.thoughts:
+        for tool in thought.tools:
+            if tool_use_id and tool.get("tool_use_id") == tool_use_id:
+                return tool
+            if not tool_use_id and tool.get("running") and tool["name"] == tool_name:
+                return tool
+    return None
+
+
 def handle_stream_event(state: MessageState, event: dict, client, team_id: str):
     """Process a single SSE event and update state."""
+    # Hold the state lock so the background updater never renders a
+    # half-applied event
+    with state.lock:
+        _handle_stream_event(state, event, client, team_id)
+
+
+def _handle_stream_event(state: MessageState, event: dict, client, team_id: str):
     event_type = event.get("type")
     data = event.get("data", {})
 
@@ -443,6 +467,8 @@ def handle_stream_event(state: MessageState, event: dict, client, team_id: str):
 
         # Add tool to current thought section
         state.thoughts[-1].tools.append(tool_data)
+        if tool_use_id:
+            state.tools_by_id[tool_use_id] = tool_data
         state.current_tool = tool_data
         update_slack_message(client, state, team_id)
 
@@ -477,42 +503,17 @@ def handle_stream_event(state: MessageState, event: dict, client, team_id: str):
                 logger.info(f"Image uploaded (private): file_id={file_id}")
 
         if state.thoughts:
-            # Find and update the tool by tool_use_id (or by name as fallback)
-            found = False
-            for thought in state.thoughts:
-                for tool in thought.tools:
-                    # Match by tool_use_id if available, otherwise fall back to name
-                    if tool_use_id and tool.get("tool_use_id") == tool_use_id:
-                        tool["running"] = False
-                        tool["success"] = data.get("success", True)
-                        tool["summary"] = data.get("summary")
-                        tool["output"] = data.get("output")
-                        tool["_image_file_id"] = data.get("_image_file_id")
-                        found = True
-                        logger.info(
-                            f"Updated tool {tool_name} (id={tool_use_id}): running=False, output_len={len(str(data.get('output', '')))}"
-                        )
-                        break
-                    elif (
-                        not tool_use_id
-                        and tool.get("running")
-                        and tool["name"] == tool_name
-                    ):
-                        # Fallback: match by name if no tool_use_id (backwards compatibility)
-                        tool["running"] = False
-                        tool["success"] = data.get("success", True)
-                        tool["summary"] = data.get("summary")
-                        tool["output"] = data.get("output")
-                        tool["_image_file_id"] = data.get("_image_file_id")
-                        found = True
-                        logger.info(
-                            f"Updated tool {tool_name} (by name): running=False, output_len={len(str(data.get('output', '')))}"
-                        )
-                        break
-                if found:
-                    break
-
-            if not found:
+            tool = _find_tool(state, tool_name, tool_use_id)
+            if tool is not None:
+                tool["running"] = False
+                tool["success"] = data.get("success", True)
+                tool["summary"] = data.get("summary")
+                tool["output"] = data.get("output")
+                tool["_image_file_id"] = data.get("_image_file_id")
+                logger.info(
+                    f"Updated tool {tool_name} (id={tool_use_id}): running=False, output_len={len(str(data.get('output', '')))}"
+                )
+            else:
                 logger.warning(
                     f"Could not find tool to update: name={tool_name}, id={tool_use_id}"
                 )
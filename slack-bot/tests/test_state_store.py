@@ -0,0 +1,125 @@
+"""Tests for the slack-bot state store backends and StoreMap."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path to import production modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import state_store  # noqa: E402
+from state_store import InMemoryStateStore, StoreMap  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(state_store.time, "monotonic", clock.monotonic)
+    return clock
+
+
+class TestInMemoryStateStore:
+    def test_entries_expire_after_their_ttl(self, clock):
+        store = InMemoryStateStore()
+        store.set("slackbot:a:1", b"x", ttl_seconds=10)
+        clock.now += 10
+        assert store.get("slackbot:a:1") == b"x"
+        clock.now += 1
+        assert store.get("slackbot:a:1") is None
+
+    def test_lru_eviction_is_per_namespace(self, clock):
+        store = InMemoryStateStore(max_items=2)
+        listen = StoreMap("auto_listen", ttl_seconds=7 * 86400, store=store)
+        names = StoreMap("user_name", ttl_seconds=86400, store=store)
+
+        listen[("C1", "1.0")] = True
+        for i in range(50):
+            names[f"U{i}"] = f"user {i}"
+
+        assert ("C1", "1.0") in listen
+        assert names.get_many(["U0", "U48", "U49"]) == {
+            "U48": "user 48",
+            "U49": "user 49",
+        }
+
+    def test_reads_refresh_recency(self, clock):
+        store = InMemoryStateStore(max_items=2)
+        store.set("slackbot:a:1", b"1", 60)
+        store.set("slackbot:a:2", b"2", 60)
+        assert store.get("slackbot:a:1") == b"1"
+        store.set("slackbot:a:3", b"3", 60)
+        assert store.get_many(["slackbot:a:1", "slackbot:a:2", "slackbot:a:3"]) == [
+            b"1",
+            None,
+            b"3",
+        ]
+
+    def test_delete(self, clock):
+        store = InMemoryStateStore()
+        store.set("slackbot:a:1", b"1", 60)
+        store.delete("slackbot:a:1")
+        store.delete("slackbot:a:missing")
+        assert store.get("slackbot:a:1") is None
+
+
+class TestStoreMap:
+    def test_dict_style_access_round_trips_json(self, clock):
+        questions = StoreMap(
+            "pending_questions", ttl_seconds=60, store=InMemoryStateStore()
+        )
+        questions["t1"] = [{"q": "Restart?", "options": ["yes", "no"]}]
+
+        assert "t1" in questions
+        assert questions["t1"] == [{"q": "Restart?", "options": ["yes", "no"]}]
+        assert questions.get("t2", "none") == "none"
+        with pytest.raises(KeyError):
+            questions["t2"]
+
+        assert questions.pop("t1") == [{"q": "Restart?", "options": ["yes", "no"]}]
+        assert "t1" not in questions
+        questions["t3"] = 1
+        del questions["t3"]
+        assert questions.get("t3") is None
+
+    def test_tuple_keys_are_namespaced(self):
+        store = InMemoryStateStore()
+        StoreMap("auto_listen", ttl_seconds=60, store=store)[("C1", "1.5")] = True
+        assert store.get("slackbot:auto_listen:C1:1.5") == b"true"
+
+
+class TestRedisStateStore:
+    def test_round_trip_with_ttl(self, monkeypatch):
+        redis = pytest.importorskip("redis")
+        fakeredis = pytest.importorskip("fakeredis")
+        monkeypatch.setattr(redis, "Redis", fakeredis.FakeRedis)
+        store = state_store.RedisStateStore(redis_url="redis://fake:6379/0")
+
+        store.set("slackbot:a:1", b"1", ttl_seconds=30)
+        assert store.get_many(["slackbot:a:1", "slackbot:a:2"]) == [b"1", None]
+        assert 0 < store._client.ttl("slackbot:a:1") <= 30
+        store.delete("slackbot:a:1")
+        assert store.get("slackbot:a:1") is None
+        assert store.get_many([]) == []
+
+    def test_errors_are_cache_misses(self):
+        class Broken:
+            def __getattr__(self, name):
+                def fail(*args, **kwargs):
+                    raise ConnectionError("down")
+
+                return fail
+
+        store = state_store.RedisStateStore.__new__(state_store.RedisStateStore)
+        store._client = Broken()
+        assert store.get_many(["slackbot:a:1"]) == [None]
+        store.set("slackbot:a:1", b"1", 30)
+        store.delete("slackbot:a:1")
@@ -0,0 +1,110 @@
+"""Micro-benchmark for the ext_authz hot path.
+
+Measures checks/sec for a single worker (one event loop) calling
+``ext_authz_check`` directly, with credentials served from an in-memory
+stub so only resolver-side CPU is measured.
+
+Usage:
+    cd sre-agent/credential-proxy
+    python benchmarks/bench_ext_authz.py --iterations 20000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "bench-secret-bench-secret-bench-secret")
+
+import jwt
+from credential_resolver import jwt_auth, main
+from fastapi import Request
+
+HOSTS = [
+    ("api.github.com", "/extauthz/repos/acme/api/pulls"),
+    ("acme.atlassian.net", "/extauthz/wiki/rest/api/content"),
+    ("api.pagerduty.com", "/extauthz/incidents"),
+    ("envoy:8001", "/extauthz/v1/messages"),
+    ("example.org", "/extauthz/"),
+]
+
+
+class _StubConfigClient:
+    async def get_integration_config(self, tenant_id, team_id, integration_id):
+        return {
+            "api_key": f"{integration_id}-key",
+            "email": "bench@example.com",
+            "domain": "https://acme.atlassian.net",
+        }
+
+    async def get_llm_model(self, tenant_id, team_id):
+        return None
+
+
+def _make_token(sandbox: int) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "tenant_id": "bench-tenant",
+            "team_id": "bench-team",
+            "sandbox_name": f"sandbox-{sandbox}",
+            "thread_id": f"thread-{sandbox}",
+            "iss": jwt_auth.JWT_ISSUER,
+            "aud": jwt_auth.JWT_AUDIENCE,
+            "iat": now,
+            "exp": now + 3600,
+        },
+        jwt_auth.JWT_SECRET,
+        algorithm=jwt_auth.JWT_ALGORITHM,
+    )
+
+
+def _make_request(token: str, host: str, path: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "headers": [
+                (b"x-original-host", host.encode()),
+                (b"x-sandbox-jwt", token.encode()),
+            ],
+            "query_string": b"",
+        }
+    )
+
+
+async def _run(iterations: int, sandboxes: int, cached: bool) -> float:
+    main.config_client = _StubConfigClient()
+    tokens = [_make_token(i) for i in range(sandboxes)]
+    requests = [
+        _make_request(tokens[i % sandboxes], *HOSTS[i % len(HOSTS)])
+        for i in range(iterations)
+    ]
+
+    start = time.perf_counter()
+    for request in requests:
+        if not cached:
+            main.ext_authz_decision_cache.clear()
+            jwt_auth._claims_cache.clear()
+        await main.ext_authz_check(request)
+    return iterations / (time.perf_counter() - start)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--sandboxes", type=int, default=50)
+    args = parser.parse_args()
+
+    import logging
+
+    logging.getLogger("credential_resolver").setLevel(logging.WARNING)
+
+    for label, cached in (("cold (no decision/JWT cache)", False), ("warm", True)):
+        rate = asyncio.run(_run(args.iterations, args.sandboxes, cached))
+        print(f"{label:32s} {rate:12,.0f} checks/sec/worker")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,118 @@
+"""Throughput benchmark for OpenAI -> Anthropic stream translation.
+
+Replays a recorded OpenAI-compatible SSE stream (``data: {...}`` frames, as
+captured from a provider with ``curl -N``) through StreamTranslator as
+LiteLLM stream objects, which is what _litellm_streaming feeds it. The
+recording is decoded once up front, so only translation is timed. Without
+``--recording`` a synthetic agent turn is generated: long text deltas
+followed by a large tool call.
+
+Usage:
+    cd sre-agent/credential-proxy
+    python benchmarks/bench_llm_stream.py
+    python benchmarks/bench_llm_stream.py --recording /tmp/openai-stream.sse
+"""
+
+import argparse
+import json
+import time
+
+from credential_resolver.llm_stream import StreamTranslator
+
+
+def _synthetic_stream(text_chunks: int, tool_arg_chunks: int) -> bytes:
+    frames: list[dict] = []
+    for i in range(text_chunks):
+        frames.append({"choices": [{"delta": {"content": f'token {i} "quoted" '}}]})
+    frames.append(
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "call_bench",
+                                "function": {"name": "run_query", "arguments": ""},
+                            }
+                        ]
+                    }
+                }
+            ]
+        }
+    )
+    for i in range(tool_arg_chunks):
+        frames.append(
+            {
+                "choices": [
+                    {
+                        "delta": {
+                            "tool_calls": [
+                                {"index": 0, "function": {"arguments": f'"k{i}": 1, '}}
+                            ]
+                        }
+                    }
+                ]
+            }
+        )
+    frames.append({"choices": [{"delta": {}, "finish_reason": "tool_calls"}]})
+    frames.append({"usage": {"prompt_tokens": 12000, "completion_tokens": 900}})
+    body = b"".join(b"data: " + json.dumps(f).encode() + b"\n\n" for f in frames)
+    return body + b"data: [DONE]\n\n"
+
+
+def _data_payloads(stream: bytes) -> list[bytes]:
+    """Split a recorded stream into ``data:`` payloads (any line ending)."""
+    text = stream.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    payloads = []
+    for frame in text.split(b"\n\n"):
+        data = [
+            line[5:].lstrip(b" ")
+            for line in frame.split(b"\n")
+            if line.startswith(b"data:")
+        ]
+        if data and data != [b"[DONE]"]:
+            payloads.append(b"\n".join(data))
+    return payloads
+
+
+def _replay_objects(objects: list) -> int:
+    translator = StreamTranslator(model_name="openai/bench")
+    out = 0
+    for chunk in objects:
+        out += len("".join(translator.translate_chunk(chunk)))
+    out += len("".join(translator.finalize()))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", help="Path to a recorded SSE stream")
+    parser.add_argument("--text-chunks", type=int, default=20000)
+    parser.add_argument("--tool-arg-chunks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.recording:
+        with open(args.recording, "rb") as f:
+            stream = f.read()
+    else:
+        stream = _synthetic_stream(args.text_chunks, args.tool_arg_chunks)
+
+    from litellm.types.utils import ModelResponseStream
+
+    objects = []
+    for payload in _data_payloads(stream):
+        data = json.loads(payload)
+        objects.append(ModelResponseStream(**data) if "choices" in data else data)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        _replay_objects(objects)
+        best = min(best, time.perf_counter() - start)
+    print(f"litellm objects {len(objects) / best:12,.0f} chunks/sec")
+
+
+if __name__ == "__main__":
+    main()
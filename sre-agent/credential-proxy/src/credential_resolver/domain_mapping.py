@@ -16,8 +16,13 @@
 
 Maps target hostnames to integration IDs for credential lookup.
 When requests come through proxy (envoy:8001), use path-based routing.
+
+Lookups run on every ext_authz check, so the tables below are compiled once
+at import into a label-reversed suffix index and host results are memoized.
 """
 
+from functools import lru_cache
+
 DOMAIN_TO_INTEGRATION: dict[str, str] = {
     # Anthropic
     "api.anthropic.com": "anthropic",
@@ -91,6 +96,37 @@ def is_proxy_host(host: str) -> bool:
     return False
 
 
+def _build_suffix_index(mapping: dict[str, str]) -> dict:
+    """Compile domain -> integration into a trie keyed by reversed labels.
+
+    "api.github.com" is stored under root["com"]["github"]["api"], with the
+    integration ID on the terminal node under the ``None`` key.
+    """
+    root: dict = {}
+    for domain, integration_id in mapping.items():
+        node = root
+        for label in reversed(domain.lstrip("*.").split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(None, integration_id)
+    return root
+
+
+_SUFFIX_INDEX = _build_suffix_index(DOMAIN_TO_INTEGRATION)
+
+
+@lru_cache(maxsize=4096)
+def _match_domain_suffix(host: str) -> str | None:
+    """Return the integration for the longest mapped domain suffix of host."""
+    node = _SUFFIX_INDEX
+    match = None
+    for label in reversed(host.split(".")):
+        node = node.get(label)
+        if node is None:
+            break
+        match = node.get(None, match)
+    return match
+
+
 def get_integration_for_host(host: str, path: str = "") -> str | None:
     """Get integration ID for a given host and path.
 
@@ -108,13 +144,5 @@ def get_integration_for_host(host: str, path: str = "") -> str | None:
                 return integration_id
         return None
 
-    # Direct lookup by host
-    if host in DOMAIN_TO_INTEGRATION:
-        return DOMAIN_TO_INTEGRATION[host]
-
-    # Try wildcard match for subdomains
-    for domain, integration_id in DOMAIN_TO_INTEGRATION.items():
-        if host.endswith(domain.lstrip("*")):
-            return integration_id
-
-    return None
+    # Exact host or any parent domain (e.g. "acme.atlassian.net")
+    return _match_domain_suffix(host)
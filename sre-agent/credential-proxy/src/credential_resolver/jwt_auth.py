@@ -28,9 +28,11 @@ Note: JWT generation is in sre-agent/auth.py
 """
 
 import os
+import time
 from typing import NamedTuple
 
 import jwt
+from cachetools import TLRUCache
 
 # Shared secret with sre-agent server
 # In production, load from K8s Secret (same secret in both deployments)
@@ -57,6 +59,23 @@ class SandboxClaims(NamedTuple):
     team_id: str
     sandbox_name: str
     thread_id: str
+    expires_at: float | None = None
+
+
+# Validated claims keyed by raw token. Every ext_authz check and proxy call
+# carries the same per-sandbox JWT, so we only pay for the HMAC + claim checks
+# once per token. Entries expire with the token's own exp claim.
+_CLAIMS_CACHE_MAX_TTL_SECONDS = 300
+
+
+def _claims_ttu(_token: str, claims: SandboxClaims, now: float) -> float:
+    expires = now + _CLAIMS_CACHE_MAX_TTL_SECONDS
+    if claims.expires_at is not None:
+        return min(expires, claims.expires_at)
+    return expires
+
+
+_claims_cache: TLRUCache = TLRUCache(maxsize=4096, ttu=_claims_ttu, timer=time.time)
 
 
 def validate_sandbox_jwt(token: str) -> SandboxClaims | None:
@@ -71,6 +90,10 @@ def validate_sandbox_jwt(token: str) -> SandboxClaims | None:
     if not token:
         return None
 
+    cached = _claims_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(
             token,
@@ -79,13 +102,17 @@ def validate_sandbox_jwt(token: str) -> SandboxClaims | None:
             issuer=JWT_ISSUER,
             audience=JWT_AUDIENCE,
         )
-        return SandboxClaims(
+        claims = SandboxClaims(
             tenant_id=payload["tenant_id"],
             team_id=payload["team_id"],
             sandbox_name=payload["sandbox_name"],
             thread_id=payload["thread_id"],
+            expires_at=payload.get("exp"),
         )
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+
+    _claims_cache[token] = claims
+    return claims
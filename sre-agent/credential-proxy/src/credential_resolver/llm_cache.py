@@ -0,0 +1,205 @@
+# Copyright 2026 IncidentFox, Inc.
+#
+# Licensed under the Business Source License 1.1 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://github.com/incidentfox/incidentfox/blob/main/LICENSE-ENTERPRISE
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prompt-prefix caching and exact-match response cache for the LLM proxy.
+
+Two independent mechanisms:
+
+- Prompt caching breakpoints: agents resend the same system prompt and tool
+  catalog on every turn. If the client didn't mark any cache_control blocks,
+  we mark the end of the tools list and the end of the system prompt so
+  Anthropic bills the stable prefix at the cached-read rate.
+  https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching
+
+- Response cache (opt-in): deterministic, non-streaming calls
+  (count_tokens, or temperature 0 messages) are served from memory when the
+  exact same request is repeated by the same tenant/team.
+
+Hit/miss counters are kept per tenant and exposed via get_cache_stats().
+"""
+
+import hashlib
+import os
+from collections import defaultdict
+
+from cachetools import TTLCache
+
+# Automatically insert prompt-caching breakpoints (Claude models only)
+AUTO_PROMPT_CACHE = os.getenv("LLM_AUTO_PROMPT_CACHE", "true").lower() == "true"
+
+# Exact-match response cache for deterministic non-streaming calls
+RESPONSE_CACHE_ENABLED = os.getenv("LLM_RESPONSE_CACHE", "false").lower() == "true"
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+
+# Responses larger than this are not cached (bounds memory per entry)
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+# key -> (content bytes, media type)
+_response_cache: TTLCache = TTLCache(
+    maxsize=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL_SECONDS
+)
+
+# tenant_id -> counter name -> count
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching breakpoints
+# ---------------------------------------------------------------------------
+
+
+def _has_cache_control(body: dict) -> bool:
+    """Return True if the client already placed any cache_control marker."""
+    system = body.get("system")
+    if isinstance(system, list) and any(
+        isinstance(b, dict) and "cache_control" in b for b in system
+    ):
+        return True
+    if any(
+        isinstance(t, dict) and "cache_control" in t for t in body.get("tools") or []
+    ):
+        return True
+    for msg in body.get("messages") or []:
+        content = msg.get("content") if isinstance(msg, dict) else None
+        if isinstance(content, list) and any(
+            isinstance(b, dict) and "cache_control" in b for b in content
+        ):
+            return True
+    return False
+
+
+def apply_prompt_cache_breakpoints(body: dict) -> bool:
+    """Mark the stable tools + system prefix with cache_control in place.
+
+    Does nothing if the client already set cache_control anywhere (its
+    placement wins). Uses at most two of Anthropic's four breakpoints.
+
+    Returns:
+        True if the body was modified.
+    """
+    if not AUTO_PROMPT_CACHE or _has_cache_control(body):
+        return False
+
+    modified = False
+
+    tools = body.get("tools")
+    if isinstance(tools, list) and tools and isinstance(tools[-1], dict):
+        tools[-1] = {**tools[-1], "cache_control": _EPHEMERAL}
+        modified = True
+
+    system = body.get("system")
+    if isinstance(system, str) and system:
+        body["system"] = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+        modified = True
+    elif isinstance(system, list) and system and isinstance(system[-1], dict):
+        system[-1] = {**system[-1], "cache_control": _EPHEMERAL}
+        modified = True
+
+    return modified
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+
+def is_cacheable_request(path: str, body: dict) -> bool:
+    """Return True if the request is deterministic and safe to replay."""
+    if not RESPONSE_CACHE_ENABLED or body.get("stream"):
+        return False
+    if path.endswith("/count_tokens"):
+        return True
+    return body.get("temperature") == 0
+
+
+def response_cache_key(
+    tenant_id: str, team_id: str, model: str, path: str, raw_body: bytes
+) -> str:
+    """Build the exact-match key for a request."""
+    digest = hashlib.sha256(raw_body).hexdigest()
+    return f"{tenant_id}:{team_id}:{model}:{path}:{digest}"
+
+
+def get_cached_response(tenant_id: str, key: str) -> tuple[bytes, str] | None:
+    """Look up a cached response and record a hit or miss for the tenant."""
+    cached = _response_cache.get(key)
+    _stats[tenant_id]["response_hits" if cached else "response_misses"] += 1
+    return cached
+
+
+def store_response(key: str, status_code: int, content: bytes, media_type: str):
+    """Cache a successful response body."""
+    if status_code != 200 or len(content) > RESPONSE_CACHE_MAX_BYTES:
+        return
+    _response_cache[key] = (content, media_type)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+def record_prompt_cache_breakpoints(tenant_id: str, applied: bool):
+    """Count requests that did / didn't get automatic breakpoints."""
+    _stats[tenant_id][
+        "prompt_cache_applied" if applied else "prompt_cache_skipped"
+    ] += 1
+
+
+def record_prompt_cache_usage(tenant_id: str, usage: dict | None):
+    """Accumulate Anthropic cache read/write token counts from a response."""
+    if not usage:
+        return
+    stats = _stats[tenant_id]
+    stats["cache_read_input_tokens"] += usage.get("cache_read_input_tokens") or 0
+    stats["cache_creation_input_tokens"] += (
+        usage.get("cache_creation_input_tokens") or 0
+    )
+    stats["input_tokens"] += usage.get("input_tokens") or 0
+
+
+def get_cache_stats(tenant_id: str | None = None) -> dict[str, dict]:
+    """Per-tenant counters plus derived hit rates (one tenant if given)."""
+    if tenant_id is None:
+        tenants = list(_stats.items())
+    else:
+        tenants = [(tenant_id, _stats[tenant_id])] if tenant_id in _stats else []
+    result: dict[str, dict] = {}
+    for tenant_id, counters in tenants:
+        entry: dict = dict(counters)
+        lookups = counters["response_hits"] + counters["response_misses"]
+        entry["response_hit_rate"] = (
+            round(counters["response_hits"] / lookups, 4) if lookups else None
+        )
+        prompt_tokens = (
+            counters["cache_read_input_tokens"]
+            + counters["cache_creation_input_tokens"]
+            + counters["input_tokens"]
+        )
+        entry["prompt_cache_read_ratio"] = (
+            round(counters["cache_read_input_tokens"] / prompt_tokens, 4)
+            if prompt_tokens
+            else None
+        )
+        result[tenant_id] = entry
+    return result
+
+
+def reset_cache():
+    """Clear cached responses and counters (tests)."""
+    _response_cache.clear()
+    _stats.clear()
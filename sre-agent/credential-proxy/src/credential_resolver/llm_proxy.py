@@ -31,6 +31,16 @@ import litellm
 from fastapi import APIRouter, HTTPException, Request
 from starlette.responses import Response, StreamingResponse
 
+from .llm_cache import (
+    apply_prompt_cache_breakpoints,
+    get_cache_stats,
+    get_cached_response,
+    is_cacheable_request,
+    record_prompt_cache_breakpoints,
+    record_prompt_cache_usage,
+    response_cache_key,
+    store_response,
+)
 from .llm_stream import StreamTranslator
 from .llm_translator import (
     anthropic_to_openai_request,
@@ -193,11 +203,34 @@ async def llm_proxy(request: Request):
         f"tenant={tenant_id}, team={team_id}"
     )
 
-    # 4. Route based on model
+    # 4. Serve repeated deterministic calls from the response cache (opt-in)
+    cache_key = None
+    if is_cacheable_request(request.url.path, body):
+        cache_key = response_cache_key(
+            tenant_id, team_id, model, request.url.path, raw_body
+        )
+        cached = _cached_response(tenant_id, cache_key)
+        if cached is not None:
+            return cached
+
+    # 5. Route based on model
     if is_claude_model(model):
-        return await _forward_to_anthropic(request, raw_body, is_streaming)
+        # Mark the stable system + tools prefix for prompt caching
+        applied = apply_prompt_cache_breakpoints(body)
+        record_prompt_cache_breakpoints(tenant_id, applied)
+        if applied:
+            raw_body = json.dumps(body).encode()
+        response = await _forward_to_anthropic(request, raw_body, is_streaming)
+        if not is_streaming and response.status_code == 200:
+            _record_usage(tenant_id, response.body)
     else:
-        return await _forward_to_provider(body, model, is_streaming, tenant_id, team_id)
+        response = await _forward_to_provider(
+            body, model, is_streaming, tenant_id, team_id
+        )
+
+    if cache_key is not None:
+        _store_response(cache_key, response)
+    return response
 
 
 @router.api_route("/v1/messages/count_tokens", methods=["POST"])
@@ -205,9 +238,27 @@ async def count_tokens_proxy(request: Request):
     """Token counting endpoint — forward to Anthropic or estimate."""
     model = request.headers.get("x-llm-model", "")
     if not model or is_claude_model(model):
-        return await _forward_to_anthropic(
-            request, await request.body(), is_streaming=False
-        )
+        tenant_id = request.headers.get("x-tenant-id", "local")
+        team_id = request.headers.get("x-team-id", "local")
+        raw_body = await request.body()
+        try:
+            body = json.loads(raw_body)
+        except json.JSONDecodeError:
+            body = {}
+
+        cache_key = None
+        if isinstance(body, dict) and is_cacheable_request(request.url.path, body):
+            cache_key = response_cache_key(
+                tenant_id, team_id, body.get("model", ""), request.url.path, raw_body
+            )
+            cached = _cached_response(tenant_id, cache_key)
+            if cached is not None:
+                return cached
+
+        response = await _forward_to_anthropic(request, raw_body, is_streaming=False)
+        if cache_key is not None:
+            _store_response(cache_key, response)
+        return response
     # For non-Claude models, return a basic estimate
     # (exact counting requires provider-specific tokenizers)
     body = await request.json()
@@ -235,6 +286,55 @@ async def event_logging_proxy(path: str, request: Request):
     return Response(status_code=200)
 
 
+@router.get("/llm-proxy/cache-stats")
+async def cache_stats(request: Request):
+    """Prompt-cache and response-cache counters for the caller's tenant.
+
+    Security: JWT-authenticated like the other resolver APIs; only the
+    tenant from the validated JWT is returned.
+    """
+    from .main import extract_tenant_context
+
+    tenant_id, _team_id, _sandbox_name = await extract_tenant_context(request)
+    return get_cache_stats(tenant_id)
+
+
+# ---------------------------------------------------------------------------
+# Response cache helpers
+# ---------------------------------------------------------------------------
+
+
+def _cached_response(tenant_id: str, cache_key: str) -> Response | None:
+    """Return a cached response for the key, if any."""
+    cached = get_cached_response(tenant_id, cache_key)
+    if cached is None:
+        return None
+    content, media_type = cached
+    return Response(
+        content=content,
+        status_code=200,
+        media_type=media_type,
+        headers={"x-incidentfox-cache": "hit"},
+    )
+
+
+def _store_response(cache_key: str, response: Response):
+    """Cache a non-streaming response body (successful responses only)."""
+    if isinstance(response, StreamingResponse):
+        return
+    media_type = response.headers.get("content-type", "application/json")
+    store_response(cache_key, response.status_code, response.body, media_type)
+
+
+def _record_usage(tenant_id: str, content: bytes):
+    """Record prompt-cache token usage from a non-streaming Anthropic response."""
+    try:
+        usage = json.loads(content).get("usage")
+    except (json.JSONDecodeError, AttributeError, UnicodeDecodeError):
+        return
+    record_prompt_cache_usage(tenant_id, usage)
+
+
 # ---------------------------------------------------------------------------
 # Anthropic pass-through
 # ---------------------------------------------------------------------------
@@ -412,20 +512,22 @@ async def _forward_to_provider(
         f"tools={len(openai_body.get('tools', []))}"
     )
 
-    # Debug: dump message structure for diagnosing tool_call_id issues
-    for i, m in enumerate(openai_body.get("messages", [])):
-        role = m.get("role", "?")
-        if role == "assistant" and m.get("tool_calls"):
-            tc_ids = [tc["id"] for tc in m["tool_calls"]]
-            tc_names = [tc["function"]["name"] for tc in m["tool_calls"]]
-            logger.info(
-                f"  msg[{i}] assistant tool_calls: {list(zip(tc_names, tc_ids))}"
-            )
-        elif role == "tool":
-            logger.info(f"  msg[{i}] tool result: call_id={m.get('tool_call_id')}")
-        else:
-            content_preview = str(m.get("content", ""))[:80]
-            logger.info(f"  msg[{i}] {role}: {content_preview}")
+    # Debug: dump message structure for diagnosing tool_call_id issues.
+    # Guarded because long sessions have hundreds of messages per request.
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, m in enumerate(openai_body.get("messages", [])):
+            role = m.get("role", "?")
+            if role == "assistant" and m.get("tool_calls"):
+                tc_ids = [tc["id"] for tc in m["tool_calls"]]
+                tc_names = [tc["function"]["name"] for tc in m["tool_calls"]]
+                logger.debug(
+                    f"  msg[{i}] assistant tool_calls: {list(zip(tc_names, tc_ids))}"
+                )
+            elif role == "tool":
+                logger.debug(f"  msg[{i}] tool result: call_id={m.get('tool_call_id')}")
+            else:
+                content_preview = str(m.get("content", ""))[:80]
+                logger.debug(f"  msg[{i}] {role}: {content_preview}")
 
     # Validate and fix tool_call_id consistency
     # Collect ALL pending call IDs and resolve them in order
@@ -627,13 +729,15 @@ async def _litellm_streaming(kwargs: dict, model_name: str) -> StreamingResponse
 
         response = await litellm.acompletion(**kwargs)
 
+        # One write per provider chunk: a chunk can expand into several
+        # Anthropic events (block stop/start + delta), so join them.
         async for chunk in response:
-            for sse_event in translator.translate_chunk(chunk):
-                yield sse_event
+            events = translator.translate_chunk(chunk)
+            if events:
+                yield "".join(events)
 
         # Finalize (close blocks, emit message_stop)
-        for sse_event in translator.finalize():
-            yield sse_event
+        yield "".join(translator.finalize())
 
     return StreamingResponse(
         event_generator(),
@@ -30,6 +30,37 @@ from .llm_translator import _map_stop_reason
 
 logger = logging.getLogger(__name__)
 
+# Pre-rendered SSE frames for the per-token hot path. Byte-for-byte identical
+# to _format_sse() output, but only the variable parts are JSON-encoded.
+_TEXT_DELTA_SSE = (
+    "event: content_block_delta\n"
+    'data: {"type": "content_block_delta", "index": %d, '
+    '"delta": {"type": "text_delta", "text": %s}}\n\n'
+)
+_INPUT_JSON_DELTA_SSE = (
+    "event: content_block_delta\n"
+    'data: {"type": "content_block_delta", "index": %d, '
+    '"delta": {"type": "input_json_delta", "partial_json": %s}}\n\n'
+)
+_BLOCK_STOP_SSE = (
+    "event: content_block_stop\n"
+    'data: {"type": "content_block_stop", "index": %d}\n\n'
+)
+_TEXT_BLOCK_START_SSE = (
+    "event: content_block_start\n"
+    'data: {"type": "content_block_start", "index": %d, '
+    '"content_block": {"type": "text", "text": ""}}\n\n'
+)
+
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+
+def _field(obj, name: str):
+    """Read a field from a LiteLLM stream object or a plain dict."""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
 
 class StreamTranslator:
     """State machine that converts OpenAI-format streaming chunks to Anthropic SSE events.
@@ -44,6 +75,9 @@ class StreamTranslator:
         # After stream ends:
         for sse_event in translator.finalize():
             yield sse_event
+
+    Chunks are read field-by-field (no ``model_dump()`` of the whole chunk),
+    and text/argument deltas are rendered from pre-built frame templates.
     """
 
     def __init__(self, model_name: str, message_id: str | None = None):
@@ -72,12 +106,8 @@ class StreamTranslator:
         """
         events: list[str] = []
 
-        # Normalize: litellm returns objects, but accept dicts too
-        if hasattr(chunk, "model_dump"):
-            chunk_dict = chunk.model_dump()
-        elif isinstance(chunk, dict):
-            chunk_dict = chunk
-        else:
+        # litellm returns objects, but accept dicts too
+        if not isinstance(chunk, dict) and not hasattr(chunk, "choices"):
             return events
 
         # Emit message_start on first chunk
@@ -85,35 +115,37 @@ class StreamTranslator:
             events.extend(self._emit_message_start())
             self._message_started = True
 
-        choices = chunk_dict.get("choices", [])
+        usage = _field(chunk, "usage")
+        choices = _field(chunk, "choices")
         if not choices:
             # Usage-only chunk (some providers send usage separately)
-            if "usage" in chunk_dict:
-                self._update_usage(chunk_dict["usage"])
+            if usage:
+                self._update_usage(usage)
             return events
 
         choice = choices[0]
-        delta = choice.get("delta", {})
+        delta = _field(choice, "delta")
 
-        # Text content
-        text = delta.get("content")
-        if text:
-            events.extend(self._handle_text(text))
+        if delta is not None:
+            # Text content
+            text = _field(delta, "content")
+            if text:
+                events.extend(self._handle_text(text))
 
-        # Tool calls
-        tool_calls = delta.get("tool_calls")
-        if tool_calls:
-            for tc in tool_calls:
-                events.extend(self._handle_tool_call(tc))
+            # Tool calls
+            tool_calls = _field(delta, "tool_calls")
+            if tool_calls:
+                for tc in tool_calls:
+                    events.extend(self._handle_tool_call(tc))
 
         # Finish reason
-        finish_reason = choice.get("finish_reason")
+        finish_reason = _field(choice, "finish_reason")
         if finish_reason:
             self._finish_reason = finish_reason
 
         # Usage (may appear on final chunk or separately)
-        if "usage" in chunk_dict:
-            self._update_usage(chunk_dict["usage"])
+        if usage:
+            self._update_usage(usage)
 
         return events
 
@@ -130,15 +162,7 @@ class StreamTranslator:
 
         # Close any open content block
         if self._block_type is not None:
-            events.append(
-                self._format_sse(
-                    "content_block_stop",
-                    {
-                        "type": "content_block_stop",
-                        "index": self._block_index,
-                    },
-                )
-            )
+            events.append(_BLOCK_STOP_SSE % self._block_index)
             self._block_type = None
 
         # message_delta with stop_reason and usage
@@ -176,69 +200,36 @@ class StreamTranslator:
 
         # If we're in a tool_use block, close it first
         if self._block_type == "tool_use":
-            events.append(
-                self._format_sse(
-                    "content_block_stop",
-                    {
-                        "type": "content_block_stop",
-                        "index": self._block_index,
-                    },
-                )
-            )
+            events.append(_BLOCK_STOP_SSE % self._block_index)
             self._block_type = None
 
         # Start text block if not already open
         if self._block_type != "text":
             self._block_index += 1
             self._block_type = "text"
-            events.append(
-                self._format_sse(
-                    "content_block_start",
-                    {
-                        "type": "content_block_start",
-                        "index": self._block_index,
-                        "content_block": {"type": "text", "text": ""},
-                    },
-                )
-            )
+            events.append(_TEXT_BLOCK_START_SSE % self._block_index)
 
         # Emit text delta
-        events.append(
-            self._format_sse(
-                "content_block_delta",
-                {
-                    "type": "content_block_delta",
-                    "index": self._block_index,
-                    "delta": {"type": "text_delta", "text": text},
-                },
-            )
-        )
+        events.append(_TEXT_DELTA_SSE % (self._block_index, _encode_json_string(text)))
 
         return events
 
-    def _handle_tool_call(self, tc_delta: dict) -> list[str]:
+    def _handle_tool_call(self, tc_delta) -> list[str]:
         """Handle a tool call delta from the stream."""
         events: list[str] = []
-        tc_index = tc_delta.get("index", 0)
+        tc_index = _field(tc_delta, "index") or 0
+        function = _field(tc_delta, "function")
 
         if tc_index not in self._tool_calls:
             # New tool call — close any open block
             if self._block_type is not None:
-                events.append(
-                    self._format_sse(
-                        "content_block_stop",
-                        {
-                            "type": "content_block_stop",
-                            "index": self._block_index,
-                        },
-                    )
-                )
+                events.append(_BLOCK_STOP_SSE % self._block_index)
 
             self._block_index += 1
             self._block_type = "tool_use"
 
-            tool_id = tc_delta.get("id", f"toolu_{uuid4().hex[:24]}")
-            tool_name = tc_delta.get("function", {}).get("name", "")
+            tool_id = _field(tc_delta, "id") or f"toolu_{uuid4().hex[:24]}"
+            tool_name = (_field(function, "name") if function else None) or ""
 
             self._tool_calls[tc_index] = {
                 "id": tool_id,
@@ -264,21 +255,11 @@ class StreamTranslator:
             )
 
         # Stream argument fragment
-        args_fragment = tc_delta.get("function", {}).get("arguments", "")
+        args_fragment = _field(function, "arguments") if function else None
         if args_fragment:
             block_idx = self._tool_calls[tc_index]["block_index"]
             events.append(
-                self._format_sse(
-                    "content_block_delta",
-                    {
-                        "type": "content_block_delta",
-                        "index": block_idx,
-                        "delta": {
-                            "type": "input_json_delta",
-                            "partial_json": args_fragment,
-                        },
-                    },
-                )
+                _INPUT_JSON_DELTA_SSE % (block_idx, _encode_json_string(args_fragment))
             )
 
         return events
@@ -304,12 +285,14 @@ class StreamTranslator:
             )
         ]
 
-    def _update_usage(self, usage: dict):
-        """Update token usage from a chunk."""
-        if "prompt_tokens" in usage:
-            self._usage["input_tokens"] = usage["prompt_tokens"]
-        if "completion_tokens" in usage:
-            self._usage["output_tokens"] = usage["completion_tokens"]
+    def _update_usage(self, usage):
+        """Update token usage from a chunk (Usage object or dict)."""
+        prompt_tokens = _field(usage, "prompt_tokens")
+        if prompt_tokens is not None:
+            self._usage["input_tokens"] = prompt_tokens
+        completion_tokens = _field(usage, "completion_tokens")
+        if completion_tokens is not None:
+            self._usage["output_tokens"] = completion_tokens
 
     # -------------------------------------------------------------------
     # SSE formatting
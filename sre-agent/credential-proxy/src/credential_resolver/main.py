@@ -27,11 +27,13 @@ JWT validation ensures only legitimate sandboxes get credentials:
 4. We validate JWT and extract tenant/team (ignoring spoofed headers)
 """
 
+import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 
-from cachetools import TTLCache
+from cachetools import TLRUCache, TTLCache
 from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
 
@@ -115,6 +117,31 @@ JWT_MODE = os.getenv("JWT_MODE", "strict")
 # Cache for credentials (5-minute TTL)
 credential_cache: TTLCache = TTLCache(maxsize=1000, ttl=300)
 
+# In-flight Config Service lookups, so concurrent misses for the same
+# (tenant, team, integration) share one request instead of stampeding.
+_credential_fetches: dict[tuple[str, str, str], asyncio.Task] = {}
+
+# ext_authz decision cache: final header set per (sandbox JWT, target host,
+# integration). Entries live until the JWT expires or this TTL elapses,
+# whichever is first. The default matches LLM_MODEL_CACHE_TTL_SECONDS so
+# model changes still propagate quickly; credentials are cached longer anyway.
+EXT_AUTHZ_DECISION_TTL_SECONDS = float(
+    os.getenv("EXT_AUTHZ_DECISION_TTL_SECONDS", "30")
+)
+
+
+def _decision_ttu(_key: tuple, value: tuple[dict, float | None], now: float) -> float:
+    _headers, jwt_expires_at = value
+    expires = now + EXT_AUTHZ_DECISION_TTL_SECONDS
+    if jwt_expires_at is not None:
+        return min(expires, jwt_expires_at)
+    return expires
+
+
+ext_authz_decision_cache: TLRUCache = TLRUCache(
+    maxsize=10000, ttu=_decision_ttu, timer=time.time
+)
+
 # Config Service client
 config_client: ConfigServiceClient | None = None
 
@@ -2331,7 +2358,7 @@ async def ext_authz_check(request: Request, path: str = ""):
     Security: Tenant/team context is extracted from the validated JWT,
     not from headers (which could be spoofed by malicious code in sandbox).
     """
-    logger.info(f"ext_authz check: {request.method} {request.url.path}")
+    logger.debug(f"ext_authz check: {request.method} {request.url.path}")
 
     # Distinguish ext_authz requests (from Envoy, have x-original-host) from
     # direct requests (agent accidentally hitting the catch-all route).
@@ -2346,22 +2373,41 @@ async def ext_authz_check(request: Request, path: str = ""):
             "If this is a proxy request, use the dedicated /<integration>/... path.",
         )
 
-    # 1. Validate JWT and extract tenant context
-    tenant_id, team_id, sandbox_name = await extract_tenant_context(request)
-
-    # 2. Determine integration from target host and path
+    # 1. Determine integration from target host and path
     request_path = request.url.path
     # Strip ext_authz path_prefix if present (envoy prepends /extauthz to avoid
     # hitting LLM proxy routes, but we need the original path for integration mapping)
     if request_path.startswith("/extauthz"):
         request_path = request_path[len("/extauthz") :]
-    logger.info(f"Target host: {target_host}, path: {request_path}")
     integration_id = get_integration_for_host(target_host, request_path)
-    logger.info(f"Integration ID mapped: {integration_id}")
+
+    # Fast lane: a decision cached for this exact JWT was made after the JWT
+    # validated, and expires no later than the JWT itself.
+    jwt_token = _get_request_jwt(request)
+    decision_key = (jwt_token, target_host, integration_id) if jwt_token else None
+    if decision_key is not None:
+        cached = ext_authz_decision_cache.get(decision_key)
+        if cached is not None:
+            return Response(status_code=200, headers=cached[0])
+
+    # 2. Validate JWT and extract tenant context
+    tenant_id, team_id, sandbox_name = await extract_tenant_context(request)
+
+    # Only cache decisions backed by a valid JWT (not permissive header fallback)
+    claims = validate_sandbox_jwt(jwt_token)
+    if claims is None:
+        decision_key = None
+
+    logger.debug(
+        f"Target host: {target_host}, path: {request_path}, "
+        f"integration: {integration_id}"
+    )
 
     if not integration_id:
         # Passthrough - no credential injection needed
         logger.warning(f"No integration mapping for host: {target_host}")
+        if decision_key is not None:
+            ext_authz_decision_cache[decision_key] = ({}, claims.expires_at)
         return Response(status_code=200)
 
     logger.info(
@@ -2392,6 +2438,11 @@ async def ext_authz_check(request: Request, path: str = ""):
                 "x-team-id": team_id,
                 "x-llm-model": llm_model,
             }
+            if decision_key is not None:
+                ext_authz_decision_cache[decision_key] = (
+                    headers_to_add,
+                    claims.expires_at,
+                )
             return Response(status_code=200, headers=headers_to_add)
 
     # 4. Get credentials and validate based on integration type
@@ -2438,22 +2489,18 @@ async def ext_authz_check(request: Request, path: str = ""):
     if llm_model:
         headers_to_add["x-llm-model"] = llm_model
 
-    logger.info(
+    logger.debug(
         f"Injecting headers for {integration_id}: {list(headers_to_add.keys())}"
     )
 
-    return Response(status_code=200, headers=headers_to_add)
-
+    if decision_key is not None:
+        ext_authz_decision_cache[decision_key] = (headers_to_add, claims.expires_at)
 
-async def extract_tenant_context(request: Request) -> tuple[str, str, str]:
-    """Extract tenant/team context from JWT (secure) or headers (permissive mode).
+    return Response(status_code=200, headers=headers_to_add)
 
-    Security: In strict mode (production), we ONLY trust the JWT.
-    In permissive mode (local dev), we fall back to headers if JWT is missing.
 
-    Returns:
-        Tuple of (tenant_id, team_id, sandbox_name)
-    """
+def _get_request_jwt(request: Request) -> str:
+    """Return the sandbox JWT from x-sandbox-jwt or the Authorization header."""
     jwt_token = request.headers.get("x-sandbox-jwt", "")
 
     # Also accept JWT from Authorization header (Bearer or token prefix)
@@ -2464,6 +2511,19 @@ async def extract_tenant_context(request: Request) -> tuple[str, str, str]:
             jwt_token = auth_header[7:]
         elif auth_header.startswith("token "):
             jwt_token = auth_header[6:]
+    return jwt_token
+
+
+async def extract_tenant_context(request: Request) -> tuple[str, str, str]:
+    """Extract tenant/team context from JWT (secure) or headers (permissive mode).
+
+    Security: In strict mode (production), we ONLY trust the JWT.
+    In permissive mode (local dev), we fall back to headers if JWT is missing.
+
+    Returns:
+        Tuple of (tenant_id, team_id, sandbox_name)
+    """
+    jwt_token = _get_request_jwt(request)
 
     # Try to validate JWT
     claims = validate_sandbox_jwt(jwt_token)
@@ -2490,7 +2550,11 @@ async def extract_tenant_context(request: Request) -> tuple[str, str, str]:
 async def get_credentials(
     tenant_id: str, team_id: str, integration_id: str
 ) -> dict | None:
-    """Get credentials from Config Service (with 5-minute cache)."""
+    """Get credentials from Config Service (with 5-minute cache).
+
+    Concurrent misses for the same key are coalesced into a single
+    Config Service request.
+    """
     cache_key = (tenant_id, team_id, integration_id)
     if cache_key in credential_cache:
         return credential_cache[cache_key]
@@ -2499,9 +2563,15 @@ async def get_credentials(
         logger.error("Config Service client not initialized")
         return None
 
-    creds = await config_client.get_integration_config(
-        tenant_id, team_id, integration_id
-    )
+    fetch = _credential_fetches.get(cache_key)
+    if fetch is None:
+        fetch = asyncio.ensure_future(
+            config_client.get_integration_config(tenant_id, team_id, integration_id)
+        )
+        _credential_fetches[cache_key] = fetch
+        fetch.add_done_callback(lambda _: _credential_fetches.pop(cache_key, None))
+
+    creds = await asyncio.shield(fetch)
     if creds:
         credential_cache[cache_key] = creds
 
@@ -0,0 +1,213 @@
+"""Tests for the ext_authz hot path — domain index, decision cache, single-flight."""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+os.environ.setdefault("JWT_MODE", "permissive")
+
+import jwt
+import pytest
+from credential_resolver import jwt_auth, main
+from credential_resolver.domain_mapping import get_integration_for_host
+from fastapi import Request
+
+TEST_SECRET = "test-secret-for-ext-authz-unit-tests"
+
+
+def _make_jwt(exp_offset: int = 3600, **overrides) -> str:
+    now = int(time.time())
+    payload = {
+        "tenant_id": "t1",
+        "team_id": "team1",
+        "sandbox_name": "sb-1",
+        "thread_id": "th-1",
+        "iss": jwt_auth.JWT_ISSUER,
+        "aud": jwt_auth.JWT_AUDIENCE,
+        "iat": now,
+        "exp": now + exp_offset,
+    }
+    payload.update(overrides)
+    return jwt.encode(payload, TEST_SECRET, algorithm=jwt_auth.JWT_ALGORITHM)
+
+
+def _make_request(headers: dict[str, str], path: str = "/extauthz/v1/messages"):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        "query_string": b"",
+    }
+    return Request(scope)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(monkeypatch):
+    monkeypatch.setattr(jwt_auth, "JWT_SECRET", TEST_SECRET)
+    monkeypatch.delenv("LLM_MODEL", raising=False)
+    monkeypatch.setattr(main, "config_client", None)
+    jwt_auth._claims_cache.clear()
+    main.credential_cache.clear()
+    main.ext_authz_decision_cache.clear()
+    yield
+    jwt_auth._claims_cache.clear()
+    main.credential_cache.clear()
+    main.ext_authz_decision_cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Domain index
+# ---------------------------------------------------------------------------
+
+
+class TestDomainIndex:
+    def test_exact_host(self):
+        assert get_integration_for_host("api.github.com") == "github"
+
+    def test_subdomain(self):
+        assert get_integration_for_host("acme.atlassian.net") == "confluence"
+
+    def test_longest_suffix_wins(self):
+        assert get_integration_for_host("api.eu1.honeycomb.io") == "honeycomb"
+
+    def test_partial_label_does_not_match(self):
+        # String suffix, but not on a label boundary
+        assert get_integration_for_host("evilgithub.com") is None
+
+    def test_unknown_host(self):
+        assert get_integration_for_host("example.org") is None
+
+    def test_proxy_host_uses_path(self):
+        assert get_integration_for_host("envoy:8001", "/v1/messages") == "anthropic"
+        assert get_integration_for_host("localhost:9999", "/clickup/x") == "clickup"
+        assert get_integration_for_host("envoy:8001", "/nope") is None
+
+
+# ---------------------------------------------------------------------------
+# JWT claims cache
+# ---------------------------------------------------------------------------
+
+
+class TestClaimsCache:
+    def test_valid_token_cached_with_expiry(self):
+        token = _make_jwt()
+        claims = jwt_auth.validate_sandbox_jwt(token)
+        assert claims.tenant_id == "t1"
+        assert claims.expires_at is not None
+        assert jwt_auth._claims_cache.get(token) == claims
+
+    def test_invalid_token_not_cached(self):
+        assert jwt_auth.validate_sandbox_jwt("not-a-jwt") is None
+        assert len(jwt_auth._claims_cache) == 0
+
+    def test_expired_token_rejected(self):
+        assert jwt_auth.validate_sandbox_jwt(_make_jwt(exp_offset=-10)) is None
+
+
+# ---------------------------------------------------------------------------
+# Decision cache
+# ---------------------------------------------------------------------------
+
+
+class TestDecisionCache:
+    @pytest.mark.asyncio
+    async def test_second_check_served_from_cache(self):
+        token = _make_jwt()
+        headers = {"x-original-host": "api.github.com", "x-sandbox-jwt": token}
+        get_creds = AsyncMock(return_value={"api_key": "ghp_test"})
+
+        with patch.object(main, "get_credentials", get_creds):
+            first = await main.ext_authz_check(_make_request(headers))
+            second = await main.ext_authz_check(_make_request(headers))
+
+        assert first.headers["authorization"] == "Bearer ghp_test"
+        assert second.headers["authorization"] == "Bearer ghp_test"
+        assert second.headers["x-tenant-id"] == "t1"
+        get_creds.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_different_host_not_shared(self):
+        token = _make_jwt()
+        get_creds = AsyncMock(return_value={"api_key": "key"})
+
+        with patch.object(main, "get_credentials", get_creds):
+            await main.ext_authz_check(
+                _make_request(
+                    {"x-original-host": "api.github.com", "x-sandbox-jwt": token}
+                )
+            )
+            await main.ext_authz_check(
+                _make_request(
+                    {"x-original-host": "api.pagerduty.com", "x-sandbox-jwt": token}
+                )
+            )
+
+        assert get_creds.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_with_jwt(self):
+        token = _make_jwt(exp_offset=5)
+        headers = {"x-original-host": "api.github.com", "x-sandbox-jwt": token}
+        get_creds = AsyncMock(return_value={"api_key": "key"})
+
+        with patch.object(main, "get_credentials", get_creds):
+            await main.ext_authz_check(_make_request(headers))
+
+        key = (token, "api.github.com", "github")
+        assert key in main.ext_authz_decision_cache
+        # Simulate the clock passing the JWT's exp claim
+        main.ext_authz_decision_cache.expire(time.time() + 10)
+        assert key not in main.ext_authz_decision_cache
+
+    @pytest.mark.asyncio
+    async def test_permissive_header_fallback_not_cached(self):
+        headers = {"x-original-host": "api.github.com", "x-tenant-id": "t2"}
+        get_creds = AsyncMock(return_value={"api_key": "key"})
+
+        with patch.object(main, "JWT_MODE", "permissive"):
+            with patch.object(main, "get_credentials", get_creds):
+                await main.ext_authz_check(_make_request(headers))
+
+        assert len(main.ext_authz_decision_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_credentials_not_cached(self):
+        token = _make_jwt()
+        headers = {"x-original-host": "api.github.com", "x-sandbox-jwt": token}
+
+        with patch.object(main, "get_credentials", AsyncMock(return_value=None)):
+            with pytest.raises(main.HTTPException):
+                await main.ext_authz_check(_make_request(headers))
+
+        assert len(main.ext_authz_decision_cache) == 0
+
+
+# ---------------------------------------------------------------------------
+# Single-flight credential fetch
+# ---------------------------------------------------------------------------
+
+
+class TestCredentialSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        calls = 0
+
+        async def slow_fetch(tenant_id, team_id, integration_id):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"api_key": "shared"}
+
+        client = AsyncMock()
+        client.get_integration_config = slow_fetch
+
+        with patch.object(main, "config_client", client):
+            results = await asyncio.gather(
+                *(main.get_credentials("t1", "team1", "github") for _ in range(10))
+            )
+
+        assert calls == 1
+        assert all(r == {"api_key": "shared"} for r in results)
+        assert main._credential_fetches == {}
@@ -0,0 +1,227 @@
+"""Tests for llm_cache.py — prompt-cache breakpoints and response cache."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from credential_resolver import llm_cache
+from credential_resolver.llm_cache import (
+    apply_prompt_cache_breakpoints,
+    get_cache_stats,
+    is_cacheable_request,
+)
+from fastapi import Request
+from starlette.responses import Response
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.setattr(llm_cache, "AUTO_PROMPT_CACHE", True)
+    monkeypatch.setattr(llm_cache, "RESPONSE_CACHE_ENABLED", True)
+    llm_cache.reset_cache()
+    yield
+    llm_cache.reset_cache()
+
+
+def _make_request(path: str, body: dict, headers: dict | None = None) -> Request:
+    headers = {"x-tenant-id": "t1", "x-team-id": "team1", **(headers or {})}
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        "query_string": b"",
+    }
+    request = Request(scope)
+    request._body = json.dumps(body).encode()
+    return request
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching breakpoints
+# ---------------------------------------------------------------------------
+
+
+class TestPromptCacheBreakpoints:
+    def test_string_system_and_tools_marked(self):
+        body = {
+            "system": "You are an SRE agent.",
+            "tools": [{"name": "a"}, {"name": "b"}],
+            "messages": [{"role": "user", "content": "hi"}],
+        }
+        assert apply_prompt_cache_breakpoints(body) is True
+        assert body["system"] == [
+            {
+                "type": "text",
+                "text": "You are an SRE agent.",
+                "cache_control": EPHEMERAL,
+            }
+        ]
+        assert "cache_control" not in body["tools"][0]
+        assert body["tools"][1]["cache_control"] == EPHEMERAL
+
+    def test_system_blocks_last_marked(self):
+        body = {
+            "system": [
+                {"type": "text", "text": "one"},
+                {"type": "text", "text": "two"},
+            ],
+            "messages": [],
+        }
+        assert apply_prompt_cache_breakpoints(body) is True
+        assert "cache_control" not in body["system"][0]
+        assert body["system"][1]["cache_control"] == EPHEMERAL
+
+    def test_client_breakpoints_respected(self):
+        body = {
+            "system": "prompt",
+            "tools": [{"name": "a"}],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "x", "cache_control": EPHEMERAL}
+                    ],
+                }
+            ],
+        }
+        assert apply_prompt_cache_breakpoints(body) is False
+        assert body["system"] == "prompt"
+        assert "cache_control" not in body["tools"][0]
+
+    def test_nothing_to_mark(self):
+        assert apply_prompt_cache_breakpoints({"messages": []}) is False
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(llm_cache, "AUTO_PROMPT_CACHE", False)
+        body = {"system": "prompt", "messages": []}
+        assert apply_prompt_cache_breakpoints(body) is False
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+
+class TestIsCacheableRequest:
+    def test_count_tokens_cacheable(self):
+        assert is_cacheable_request("/v1/messages/count_tokens", {"messages": []})
+
+    def test_temperature_zero_cacheable(self):
+        assert is_cacheable_request("/v1/messages", {"temperature": 0})
+
+    def test_default_temperature_not_cacheable(self):
+        assert not is_cacheable_request("/v1/messages", {})
+
+    def test_streaming_not_cacheable(self):
+        assert not is_cacheable_request(
+            "/v1/messages", {"temperature": 0, "stream": True}
+        )
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(llm_cache, "RESPONSE_CACHE_ENABLED", False)
+        assert not is_cacheable_request("/v1/messages/count_tokens", {})
+
+
+class TestResponseCacheRoutes:
+    @pytest.mark.asyncio
+    async def test_count_tokens_cached_per_tenant(self):
+        from credential_resolver.llm_proxy import count_tokens_proxy
+
+        upstream = AsyncMock(
+            return_value=Response(
+                content=b'{"input_tokens": 42}', media_type="application/json"
+            )
+        )
+        body = {"model": "claude-sonnet-4-20250514", "messages": []}
+
+        with patch("credential_resolver.llm_proxy._forward_to_anthropic", upstream):
+            first = await count_tokens_proxy(
+                _make_request("/v1/messages/count_tokens", body)
+            )
+            second = await count_tokens_proxy(
+                _make_request("/v1/messages/count_tokens", body)
+            )
+            other_tenant = await count_tokens_proxy(
+                _make_request("/v1/messages/count_tokens", body, {"x-tenant-id": "t2"})
+            )
+
+        assert upstream.await_count == 2
+        assert first.body == second.body == other_tenant.body
+        assert second.headers["x-incidentfox-cache"] == "hit"
+
+        stats = get_cache_stats()
+        assert stats["t1"]["response_hits"] == 1
+        assert stats["t1"]["response_misses"] == 1
+        assert stats["t1"]["response_hit_rate"] == 0.5
+        assert stats["t2"]["response_misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self):
+        from credential_resolver.llm_proxy import count_tokens_proxy
+
+        upstream = AsyncMock(return_value=Response(content=b"{}", status_code=529))
+        body = {"messages": []}
+
+        with patch("credential_resolver.llm_proxy._forward_to_anthropic", upstream):
+            await count_tokens_proxy(_make_request("/v1/messages/count_tokens", body))
+            await count_tokens_proxy(_make_request("/v1/messages/count_tokens", body))
+
+        assert upstream.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_messages_get_breakpoints_and_usage_recorded(self):
+        from credential_resolver.llm_proxy import llm_proxy
+
+        upstream = AsyncMock(
+            return_value=Response(
+                content=json.dumps(
+                    {
+                        "usage": {
+                            "input_tokens": 10,
+                            "cache_read_input_tokens": 90,
+                            "cache_creation_input_tokens": 0,
+                        }
+                    }
+                ).encode(),
+                media_type="application/json",
+            )
+        )
+        body = {
+            "model": "claude-sonnet-4-20250514",
+            "system": "You are an SRE agent.",
+            "messages": [{"role": "user", "content": "hi"}],
+        }
+
+        with patch(
+            "credential_resolver.main.get_credentials", AsyncMock(return_value=None)
+        ):
+            with patch("credential_resolver.llm_proxy._forward_to_anthropic", upstream):
+                await llm_proxy(_make_request("/v1/messages", body))
+
+        forwarded = json.loads(upstream.call_args[0][1])
+        assert forwarded["system"][0]["cache_control"] == EPHEMERAL
+
+        stats = get_cache_stats()["t1"]
+        assert stats["prompt_cache_applied"] == 1
+        assert stats["prompt_cache_read_ratio"] == 0.9
+
+    @pytest.mark.asyncio
+    async def test_cache_stats_requires_auth_and_scopes_to_tenant(self):
+        from credential_resolver import main
+        from credential_resolver.llm_proxy import cache_stats
+        from fastapi import HTTPException
+
+        llm_cache.record_prompt_cache_breakpoints("t1", True)
+        llm_cache.record_prompt_cache_breakpoints("t2", True)
+
+        with patch.object(main, "JWT_MODE", "strict"):
+            with pytest.raises(HTTPException) as exc:
+                await cache_stats(_make_request("/llm-proxy/cache-stats", {}))
+        assert exc.value.status_code == 401
+
+        with patch.object(main, "JWT_MODE", "permissive"):
+            stats = await cache_stats(_make_request("/llm-proxy/cache-stats", {}))
+        assert list(stats) == ["t1"]
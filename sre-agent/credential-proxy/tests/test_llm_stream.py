@@ -316,3 +316,48 @@ class TestStreamTranslator:
         events = t.translate_chunk(_make_chunk(content="Hi"))
         _, data = _parse_sse(events[0])
         assert data["message"]["id"] == "msg_custom123"
+
+    def test_template_frames_match_format_sse(self):
+        """Pre-rendered delta frames are byte-identical to _format_sse output."""
+        t = StreamTranslator(model_name="test")
+        text = 'quote " backslash \\ newline \n unicode \u00e9'
+        events = t.translate_chunk(_make_chunk(content=text))
+        assert events[-1] == StreamTranslator._format_sse(
+            "content_block_delta",
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": text},
+            },
+        )
+
+    def test_litellm_objects_without_model_dump(self):
+        """LiteLLM stream objects are read field-by-field."""
+        from litellm.types.utils import Delta, ModelResponseStream, StreamingChoices
+
+        t = StreamTranslator(model_name="openai/gpt-4o")
+        chunk = ModelResponseStream(
+            choices=[
+                StreamingChoices(
+                    delta=Delta(
+                        tool_calls=[
+                            {
+                                "index": 0,
+                                "id": "call_1",
+                                "type": "function",
+                                "function": {"name": "get_pods", "arguments": "{}"},
+                            }
+                        ]
+                    ),
+                    finish_reason="tool_calls",
+                )
+            ]
+        )
+        parsed = [_parse_sse(e) for e in t.translate_chunk(chunk)]
+        types = [p[0] for p in parsed]
+        assert types == ["message_start", "content_block_start", "content_block_delta"]
+        assert parsed[1][1]["content_block"]["name"] == "get_pods"
+        assert parsed[2][1]["delta"]["partial_json"] == "{}"
+
+        _, delta = _parse_sse(t.finalize()[-2])
+        assert delta["delta"]["stop_reason"] == "tool_use"
@@ -9,18 +9,69 @@ Proactively maintains the knowledge base:
 """
 
 import logging
-from dataclasses import dataclass
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 if TYPE_CHECKING:
     from ..core.node import KnowledgeNode, TreeForest
     from ..graph.graph import KnowledgeGraph
+    from ..raptor_lib.EmbeddingModels import BaseEmbeddingModel
     from .observations import ObservationCollector
 
 logger = logging.getLogger(__name__)
 
+GAP_STOP_WORDS = {
+    "how",
+    "do",
+    "i",
+    "the",
+    "a",
+    "an",
+    "to",
+    "for",
+    "in",
+    "is",
+    "what",
+    "why",
+    "when",
+    "where",
+    "can",
+    "could",
+    "would",
+    "should",
+    "does",
+    "did",
+    "are",
+    "was",
+    "were",
+    "be",
+    "been",
+    "being",
+}
+
+
+def _gap_topics(queries: List[str]) -> List[str]:
+    """Keywords shared by a cluster's queries, most common first."""
+    all_words: Dict[str, int] = {}
+    for query in queries:
+        words = set(query.lower().split()) - GAP_STOP_WORDS
+        for word in words:
+            all_words[word] = all_words.get(word, 0) + 1
+
+    # Get top keywords that appear in most queries
+    sorted_words = sorted(all_words.items(), key=lambda x: x[1], reverse=True)
+    top_topics = [w[0] for w in sorted_words[:5] if w[1] >= 2]
+
+    if not top_topics:
+        top_topics = [w[0] for w in sorted_words[:3]]
+    return top_topics
+
 
 @dataclass
 class KnowledgeGap:
@@ -72,6 +123,115 @@ class Contradiction:
         }
 
 
+@dataclass
+class QueryCluster:
+    """A group of similar failed queries, maintained across maintenance cycles."""
+
+    gap_id: str
+    # Failure timestamps inside the gap window, oldest first
+    timestamps: Deque[datetime] = field(default_factory=deque)
+    # Unit vector of each failure, aligned with timestamps
+    vectors: Deque[np.ndarray] = field(default_factory=deque)
+    # Most recent queries, for gap descriptions
+    recent_queries: Deque[str] = field(default_factory=lambda: deque(maxlen=50))
+
+    @property
+    def frequency(self) -> int:
+        return len(self.timestamps)
+
+
+class OnlineQueryClusterer:
+    """
+    Incremental clustering of failed-query embeddings.
+
+    Each batch of new embeddings is matched against every cluster centroid
+    with one matrix product and joins its most similar cluster if the
+    cosine similarity clears the threshold. The rest are leader-clustered
+    among themselves (the first unassigned query seeds a cluster and takes
+    every remaining query similar enough to it). Centroids are running
+    means of their members' unit vectors (a mini-batch k-means update), so
+    earlier failures never have to be re-embedded or re-clustered. Expired
+    members are subtracted from their centroid again.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.7):
+        self.similarity_threshold = similarity_threshold
+        self.clusters: List[QueryCluster] = []
+        self._sums: Optional[np.ndarray] = None  # (k, dim) sum of member vectors
+        self._centroids: Optional[np.ndarray] = None  # (k, dim) unit vectors
+
+    def add(self, observations: List[Any], embeddings: np.ndarray) -> np.ndarray:
+        """Cluster new failures (in record order). Returns each one's cluster index."""
+        if not observations:
+            return np.zeros(0, dtype=np.int64)
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        labels = np.full(len(vectors), -1, dtype=np.int64)
+
+        # 1. Nearest existing centroid, all at once
+        if self._centroids is not None and len(self.clusters):
+            similarities = vectors @ self._centroids.T
+            best = similarities.argmax(axis=1)
+            matched = similarities[np.arange(len(vectors)), best]
+            hits = matched >= self.similarity_threshold
+            labels[hits] = best[hits]
+
+        # 2. Leader clustering of whatever is left
+        new_sums = []
+        unassigned = np.flatnonzero(labels < 0)
+        while len(unassigned):
+            leader = unassigned[0]
+            similarities = vectors[unassigned] @ vectors[leader]
+            members = unassigned[similarities >= self.similarity_threshold]
+            members = np.union1d(members, [leader])
+            labels[members] = len(self.clusters)
+            self.clusters.append(QueryCluster(gap_id=str(uuid.uuid4())))
+            new_sums.append(np.zeros(vectors.shape[1], dtype=np.float32))
+            unassigned = np.setdiff1d(unassigned, members, assume_unique=True)
+
+        if new_sums:
+            new_sums = np.stack(new_sums)
+            self._sums = (
+                new_sums if self._sums is None else np.vstack([self._sums, new_sums])
+            )
+
+        # 3. Mini-batch centroid update
+        np.add.at(self._sums, labels, vectors)
+        self._centroids = self._sums / (
+            np.linalg.norm(self._sums, axis=1, keepdims=True) + 1e-12
+        )
+
+        for obs, vector, label in zip(observations, vectors, labels.tolist()):
+            cluster = self.clusters[label]
+            cluster.timestamps.append(obs.timestamp)
+            cluster.vectors.append(vector)
+            cluster.recent_queries.append(obs.query)
+        return labels
+
+    def expire(self, cutoff: datetime) -> None:
+        """Forget failures older than cutoff and drop clusters left empty."""
+        keep = []
+        changed = False
+        for i, cluster in enumerate(self.clusters):
+            while cluster.timestamps and cluster.timestamps[0] < cutoff:
+                cluster.timestamps.popleft()
+                self._sums[i] -= cluster.vectors.popleft()
+                changed = True
+            if cluster.timestamps:
+                keep.append(i)
+        if not changed:
+            return
+        self.clusters = [self.clusters[i] for i in keep]
+        if keep:
+            self._sums = self._sums[keep]
+            self._centroids = self._sums / (
+                np.linalg.norm(self._sums, axis=1, keepdims=True) + 1e-12
+            )
+        else:
+            self._sums = self._centroids = None
+
+
 class MaintenanceTaskType(str, Enum):
     """Types of maintenance tasks."""
 
@@ -138,6 +298,9 @@ class MaintenanceAgent:
         stale_threshold_days: int = 90,
         low_value_threshold: float = 0.1,
         gap_detection_min_frequency: int = 3,
+        embedding_model: Optional["BaseEmbeddingModel"] = None,
+        gap_similarity_threshold: float = 0.7,
+        query_embedding_cache_size: int = 50_000,
     ):
         self.forest = forest
         self.graph = graph
@@ -154,8 +317,17 @@ class MaintenanceAgent:
 
         # Detected issues
         self._gaps: Dict[str, KnowledgeGap] = {}
+        self._gap_tasks: Dict[str, MaintenanceTask] = {}
         self._contradictions: Dict[str, Contradiction] = {}
 
+        # Incremental gap detection: failures are clustered once, as they
+        # arrive, and their query embeddings are cached
+        self._embedding_model = embedding_model
+        self._gap_clusterer = OnlineQueryClusterer(gap_similarity_threshold)
+        self._failure_cursor = 0
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_embedding_cache_size = query_embedding_cache_size
+
         # Stats
         self._last_run: Optional[datetime] = None
         self._run_count = 0
@@ -187,12 +359,14 @@ class MaintenanceAgent:
         for node in stale_nodes:
             await self._create_refresh_task(node)
 
-        # 2. Analyze query logs for gaps
+        # 2. Analyze query logs for gaps; only gaps that gained failures
+        #    this cycle get a new or refreshed task
         if self.observations:
-            gaps = await self.analyze_query_logs_for_gaps()
+            gaps, updated = self._detect_gaps(days=7)
             results["gaps_detected"] = len(gaps)
             for gap in gaps:
-                await self._create_gap_task(gap)
+                if gap.gap_id in updated:
+                    await self._create_gap_task(gap)
 
         # 3. Detect contradictions
         contradictions = await self.find_contradictions()
@@ -256,74 +430,86 @@ class MaintenanceAgent:
         """
         Analyze failed queries to identify knowledge gaps.
 
-        Uses semantic clustering with embeddings to find patterns.
+        Runs incrementally: only failures recorded since the previous call
+        are embedded (through a query embedding cache) and folded into the
+        running semantic clusters. Failures older than `days` age out of
+        their cluster. Returns every open gap, i.e. every cluster at least
+        gap_detection_min_frequency strong; a gap keeps its ID as long as
+        its cluster lives.
+
+        Falls back to keyword clustering of recent failures when
+        embeddings are unavailable.
         """
+        gaps, _ = self._detect_gaps(days)
+        return gaps
+
+    def _detect_gaps(self, days: int) -> Tuple[List[KnowledgeGap], Set[str]]:
+        """Open gaps, and the IDs of those whose cluster gained failures."""
         if not self.observations:
-            return []
+            return [], set()
 
-        failed_queries = self.observations.get_recent_failures(days=days)
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        new_failures, cursor = self.observations.get_failures_since(
+            self._failure_cursor
+        )
+        new_failures = [obs for obs in new_failures if obs.timestamp > cutoff]
 
-        if len(failed_queries) < self.gap_detection_min_frequency:
-            return []
+        embeddings = self._embed_queries([obs.query for obs in new_failures])
+        if embeddings is None:
+            gaps = self._keyword_gaps(days)
+            return gaps, {gap.gap_id for gap in gaps}
+        self._failure_cursor = cursor
 
-        # Use semantic clustering with embeddings
-        clusters = await self._cluster_queries_by_embedding(failed_queries)
+        clusters = self._gap_clusterer.clusters
+        labels = self._gap_clusterer.add(new_failures, embeddings)
+        updated = {clusters[i].gap_id for i in set(labels.tolist())}
+        self._gap_clusterer.expire(cutoff)
 
-        # Convert clusters to gaps
         gaps = []
-        import uuid
+        for cluster in self._gap_clusterer.clusters:
+            if cluster.frequency < self.gap_detection_min_frequency:
+                continue
+            queries = list(reversed(cluster.recent_queries))
+            top_topics = _gap_topics(queries)
+            gap = KnowledgeGap(
+                gap_id=cluster.gap_id,
+                description=f"Missing knowledge about: {', '.join(top_topics)}",
+                frequency=cluster.frequency,
+                example_queries=queries[:5],
+                suggested_sources=[],
+                affected_topics=top_topics,
+                detected_at=(
+                    self._gaps[cluster.gap_id].detected_at
+                    if cluster.gap_id in self._gaps
+                    else datetime.utcnow()
+                ),
+                priority=min(1.0, cluster.frequency / 10),
+            )
+            gaps.append(gap)
+            self._gaps[gap.gap_id] = gap
 
-        for cluster_queries in clusters:
-            if len(cluster_queries) >= self.gap_detection_min_frequency:
-                # Extract common topics from the cluster
-                all_words: Dict[str, int] = {}
-                stop_words = {
-                    "how",
-                    "do",
-                    "i",
-                    "the",
-                    "a",
-                    "an",
-                    "to",
-                    "for",
-                    "in",
-                    "is",
-                    "what",
-                    "why",
-                    "when",
-                    "where",
-                    "can",
-                    "could",
-                    "would",
-                    "should",
-                    "does",
-                    "did",
-                    "are",
-                    "was",
-                    "were",
-                    "be",
-                    "been",
-                    "being",
-                }
-                for obs in cluster_queries:
-                    words = set(obs.query.lower().split()) - stop_words
-                    for word in words:
-                        all_words[word] = all_words.get(word, 0) + 1
-
-                # Get top keywords that appear in most queries
-                sorted_words = sorted(
-                    all_words.items(), key=lambda x: x[1], reverse=True
-                )
-                top_topics = [w[0] for w in sorted_words[:5] if w[1] >= 2]
+        updated.intersection_update(gap.gap_id for gap in gaps)
+        logger.info(
+            f"Detected {len(gaps)} knowledge gaps ({len(updated)} updated) from "
+            f"{len(new_failures)} new failures "
+            f"({len(self._gap_clusterer.clusters)} open clusters)"
+        )
+        return gaps, updated
 
-                if not top_topics:
-                    top_topics = [w[0] for w in sorted_words[:3]]
+    def _keyword_gaps(self, days: int) -> List[KnowledgeGap]:
+        """Gaps from keyword clustering of recent failures (no embeddings)."""
+        failed_queries = self.observations.get_recent_failures(days=days)
 
-                description = f"Missing knowledge about: {', '.join(top_topics)}"
+        if len(failed_queries) < self.gap_detection_min_frequency:
+            return []
 
+        gaps = []
+        for cluster_queries in self._fallback_keyword_clustering(failed_queries):
+            if len(cluster_queries) >= self.gap_detection_min_frequency:
+                top_topics = _gap_topics([obs.query for obs in cluster_queries])
                 gap = KnowledgeGap(
                     gap_id=str(uuid.uuid4()),
-                    description=description,
+                    description=f"Missing knowledge about: {', '.join(top_topics)}",
                     frequency=len(cluster_queries),
                     example_queries=[obs.query for obs in cluster_queries[:5]],
                     suggested_sources=[],
@@ -334,79 +520,79 @@ class MaintenanceAgent:
                 gaps.append(gap)
                 self._gaps[gap.gap_id] = gap
 
-        logger.info(f"Detected {len(gaps)} knowledge gaps")
+        logger.info(f"Detected {len(gaps)} knowledge gaps (keyword fallback)")
         return gaps
 
+    def _embed_queries(self, queries: List[str]) -> Optional[np.ndarray]:
+        """
+        Embeddings for queries as a (n, dim) array, None if unavailable.
+
+        Identical queries (after normalisation) are embedded once and kept
+        in an LRU cache; only cache misses go to the embedding model, in a
+        single batch call.
+        """
+        if not queries:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        if self._embedding_model is None:
+            try:
+                from ultimate_rag.raptor_lib.EmbeddingModels import (
+                    OpenAIEmbeddingModel,
+                )
+
+                self._embedding_model = OpenAIEmbeddingModel()
+            except ImportError as e:
+                logger.warning(
+                    f"RAPTOR imports failed, falling back to keyword clustering: {e}"
+                )
+                return None
+
+        keys = [" ".join(q.lower().split()) for q in queries]
+        cache = self._query_embeddings
+        missing = list(dict.fromkeys(k for k in keys if k not in cache))
+        if missing:
+            try:
+                embedded = self._embedding_model.create_embeddings_batch(missing)
+            except Exception as e:
+                logger.warning(
+                    f"Embedding failed, falling back to keyword clustering: {e}"
+                )
+                return None
+            for key, vector in zip(missing, embedded):
+                cache[key] = np.asarray(vector, dtype=np.float32)
+
+        vectors = np.stack([cache[k] for k in keys])
+        for key in set(keys):
+            cache.move_to_end(key)
+        while len(cache) > self._query_embedding_cache_size:
+            cache.popitem(last=False)
+        return vectors
+
     async def _cluster_queries_by_embedding(
         self,
         failed_queries: List[Any],
         similarity_threshold: float = 0.7,
     ) -> List[List[Any]]:
         """
-        Cluster failed queries using embedding similarity.
+        Cluster a set of failed queries using embedding similarity.
 
-        Uses agglomerative clustering based on cosine similarity.
+        One-shot version of the incremental clustering used by
+        analyze_query_logs_for_gaps, for ad-hoc analysis of a given set.
         """
         if not failed_queries:
             return []
 
-        try:
-            from ultimate_rag.raptor_lib.EmbeddingModels import OpenAIEmbeddingModel
-            from ultimate_rag.raptor_lib.utils import distances_from_embeddings
-        except ImportError as e:
-            logger.warning(
-                f"RAPTOR imports failed, falling back to keyword clustering: {e}"
-            )
-            return self._fallback_keyword_clustering(failed_queries)
-
-        # Get embeddings for all queries using batch API
-        embedding_model = OpenAIEmbeddingModel()
-        queries = [obs.query for obs in failed_queries]
-
-        try:
-            embeddings = embedding_model.create_embeddings_batch(queries)
-        except Exception as e:
-            logger.warning(f"Embedding failed, falling back to keyword clustering: {e}")
+        embeddings = self._embed_queries([obs.query for obs in failed_queries])
+        if embeddings is None:
             return self._fallback_keyword_clustering(failed_queries)
 
-        # Simple agglomerative clustering
-        clusters: List[List[int]] = []  # List of query indices per cluster
-        assigned = set()
-
-        for i in range(len(failed_queries)):
-            if i in assigned:
-                continue
-
-            # Start a new cluster with this query
-            cluster = [i]
-            assigned.add(i)
-
-            # Find similar queries
-            query_embedding = embeddings[i]
-            other_embeddings = []
-            other_indices = []
-
-            for j in range(len(failed_queries)):
-                if j not in assigned:
-                    other_embeddings.append(embeddings[j])
-                    other_indices.append(j)
-
-            if other_embeddings:
-                distances = distances_from_embeddings(
-                    query_embedding, other_embeddings, distance_metric="cosine"
-                )
-
-                for idx, distance in enumerate(distances):
-                    similarity = 1.0 - distance
-                    if similarity >= similarity_threshold:
-                        j = other_indices[idx]
-                        cluster.append(j)
-                        assigned.add(j)
-
-            clusters.append(cluster)
-
-        # Convert indices back to observation objects
-        return [[failed_queries[i] for i in cluster] for cluster in clusters]
+        labels = OnlineQueryClusterer(similarity_threshold).add(
+            failed_queries, embeddings
+        )
+        clusters: Dict[int, List[Any]] = {}
+        for obs, label in zip(failed_queries, labels.tolist()):
+            clusters.setdefault(label, []).append(obs)
+        return list(clusters.values())
 
     def _fallback_keyword_clustering(
         self,
@@ -723,8 +909,13 @@ NOT contradictions:
         return task
 
     async def _create_gap_task(self, gap: KnowledgeGap) -> MaintenanceTask:
-        """Create a task to fill a knowledge gap."""
-        import uuid
+        """Create a task to fill a knowledge gap, or refresh its pending one."""
+        task = self._gap_tasks.get(gap.gap_id)
+        if task is not None and task.status == "pending":
+            task.description = gap.description
+            task.priority = gap.priority
+            task.target_entities = gap.affected_topics
+            return task
 
         task = MaintenanceTask(
             task_id=str(uuid.uuid4()),
@@ -736,6 +927,7 @@ NOT contradictions:
             created_at=datetime.utcnow(),
         )
         self._tasks.append(task)
+        self._gap_tasks[gap.gap_id] = task
         return task
 
     def get_pending_tasks(
@@ -7,10 +7,11 @@ enabling the learning loop that improves knowledge over time.
 
 import logging
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,19 @@ class ObservationType(str, Enum):
     SUGGESTED_LINK = "suggested_link"  # Agent suggests linking entities
 
 
+GAP_TYPES = (
+    ObservationType.QUERY_FAILURE,
+    ObservationType.QUERY_PARTIAL,
+    ObservationType.INCOMPLETE,
+)
+QUALITY_ISSUE_TYPES = (
+    ObservationType.OUTDATED,
+    ObservationType.CONTRADICTION,
+    ObservationType.UNCLEAR,
+    ObservationType.CORRECTION,
+)
+
+
 @dataclass
 class AgentObservation:
     """
@@ -120,20 +134,11 @@ class AgentObservation:
 
     def indicates_gap(self) -> bool:
         """Check if this observation indicates a knowledge gap."""
-        return self.observation_type in (
-            ObservationType.QUERY_FAILURE,
-            ObservationType.QUERY_PARTIAL,
-            ObservationType.INCOMPLETE,
-        )
+        return self.observation_type in GAP_TYPES
 
     def indicates_quality_issue(self) -> bool:
         """Check if this indicates a quality issue with existing knowledge."""
-        return self.observation_type in (
-            ObservationType.OUTDATED,
-            ObservationType.CONTRADICTION,
-            ObservationType.UNCLEAR,
-            ObservationType.CORRECTION,
-        )
+        return self.observation_type in QUALITY_ISSUE_TYPES
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary."""
@@ -213,70 +218,103 @@ class ObservationCollector:
 
     This is the main interface for agents to report feedback
     to the knowledge base.
+
+    Observations are append-only and live in a fixed-size ring buffer:
+    each gets a sequence number, and once the buffer is full every new
+    observation evicts the oldest one. Indexes map keys to the sequence
+    numbers of their observations in record order, so eviction only pops
+    the front of the evicted observation's own index entries instead of
+    rebuilding anything. Sequence numbers also let consumers read only
+    what was recorded since their last visit (see get_failures_since).
     """
 
     def __init__(self, max_observations: int = 10000):
-        self._observations: List[AgentObservation] = []
         self._max_observations = max_observations
+        self._ring: List[Optional[AgentObservation]] = [None] * max_observations
+        self._next_seq = 0  # sequence number of the next observation
 
-        # Indexes for efficient lookup
-        self._by_node: Dict[int, List[str]] = {}  # node_id -> observation_ids
-        self._by_query: Dict[str, List[str]] = {}  # query_hash -> observation_ids
-        self._by_type: Dict[ObservationType, List[str]] = {}
+        # Indexes for efficient lookup: key -> sequence numbers, oldest first
+        self._by_node: Dict[int, Deque[int]] = {}
+        self._by_query: Dict[int, Deque[int]] = {}  # query_hash -> seqs
+        self._by_type: Dict[ObservationType, Deque[int]] = {}
 
-    def record(self, observation: AgentObservation) -> None:
-        """Record an observation."""
-        self._observations.append(observation)
+        # Running total for get_stats
+        self._success_sum = 0.0
 
-        # Update indexes
-        for node_id in observation.retrieved_nodes:
-            if node_id not in self._by_node:
-                self._by_node[node_id] = []
-            self._by_node[node_id].append(observation.observation_id)
+    def __len__(self) -> int:
+        return min(self._next_seq, self._max_observations)
+
+    @property
+    def _first_seq(self) -> int:
+        """Sequence number of the oldest observation still held."""
+        return max(0, self._next_seq - self._max_observations)
 
-        query_hash = hash(observation.query.lower().strip())
-        if query_hash not in self._by_query:
-            self._by_query[query_hash] = []
-        self._by_query[query_hash].append(observation.observation_id)
+    def _get(self, seq: int) -> AgentObservation:
+        return self._ring[seq % self._max_observations]
 
-        if observation.observation_type not in self._by_type:
-            self._by_type[observation.observation_type] = []
-        self._by_type[observation.observation_type].append(observation.observation_id)
+    def _iter_observations(self) -> Iterator[AgentObservation]:
+        """All held observations, oldest first."""
+        for seq in range(self._first_seq, self._next_seq):
+            yield self._get(seq)
 
-        # Trim if needed
-        if len(self._observations) > self._max_observations:
-            self._trim_old_observations()
+    def _index_entries(
+        self, observation: AgentObservation
+    ) -> Iterator[Tuple[Dict[Any, Deque[int]], Hashable]]:
+        """(index, key) pairs an observation is filed under."""
+        for node_id in observation.retrieved_nodes:
+            yield self._by_node, node_id
+        yield self._by_query, hash(observation.query.lower().strip())
+        yield self._by_type, observation.observation_type
+
+    def record(self, observation: AgentObservation) -> None:
+        """Record an observation."""
+        seq = self._next_seq
+        if seq >= self._max_observations:
+            self._evict(seq - self._max_observations)
+        self._ring[seq % self._max_observations] = observation
+        self._next_seq += 1
+        self._success_sum += observation.success_score
+
+        # Update indexes
+        for index, key in self._index_entries(observation):
+            if key not in index:
+                index[key] = deque()
+            index[key].append(seq)
 
         logger.info(
             f"Recorded observation: type={observation.observation_type.value} "
             f"success={observation.success_score:.2f} nodes={len(observation.retrieved_nodes)}"
         )
 
-    def _trim_old_observations(self) -> None:
-        """Remove oldest observations to stay within limit."""
-        # Keep most recent half
-        keep_count = self._max_observations // 2
-        self._observations = self._observations[-keep_count:]
-
-        # Rebuild indexes
-        self._by_node.clear()
-        self._by_query.clear()
-        self._by_type.clear()
-
-        for obs in self._observations:
-            for node_id in obs.retrieved_nodes:
-                if node_id not in self._by_node:
-                    self._by_node[node_id] = []
-                self._by_node[node_id].append(obs.observation_id)
-
-            query_hash = hash(obs.query.lower().strip())
-            if query_hash not in self._by_query:
-                self._by_query[query_hash] = []
-            self._by_query[query_hash].append(obs.observation_id)
-
-            if obs.observation_type not in self._by_type:
-                self._by_type[obs.observation_type] = []
-            self._by_type[obs.observation_type].append(obs.observation_id)
+    def _evict(self, seq: int) -> None:
+        """Drop the oldest observation (seq) from the running totals and indexes."""
+        observation = self._get(seq)
+        self._success_sum -= observation.success_score
+        # seq is the oldest held, so it is at the front of each of its entries
+        for index, key in self._index_entries(observation):
+            seqs = index.get(key)
+            if seqs and seqs[0] == seq:
+                seqs.popleft()
+                if not seqs:
+                    del index[key]
+
+    def _live_seqs(self, seqs: Deque[int], since: int = 0) -> List[int]:
+        """Sequence numbers in an index entry at or after `since`, oldest first."""
+        since = max(since, self._first_seq)
+        newer = []
+        for seq in reversed(seqs):
+            if seq < since:
+                break
+            newer.append(seq)
+        newer.reverse()
+        return newer
+
+    def _seqs_of_types(self, types, since: int = 0) -> List[int]:
+        seqs: List[int] = []
+        for obs_type in types:
+            seqs.extend(self._live_seqs(self._by_type.get(obs_type, ()), since))
+        seqs.sort()
+        return seqs
 
     # ==================== Observation Factories ====================
 
@@ -428,8 +466,7 @@ class ObservationCollector:
 
     def get_observations_for_node(self, node_id: int) -> List[AgentObservation]:
         """Get all observations involving a specific node."""
-        obs_ids = self._by_node.get(node_id, [])
-        return [obs for obs in self._observations if obs.observation_id in obs_ids]
+        return [self._get(seq) for seq in self._by_node.get(node_id, ())]
 
     def get_node_success_rate(self, node_id: int) -> float:
         """Calculate success rate for a specific node."""
@@ -446,42 +483,46 @@ class ObservationCollector:
         limit: int = 100,
     ) -> List[AgentObservation]:
         """Get recent query failures."""
-        cutoff = datetime.utcnow()
-        from datetime import timedelta
-
-        cutoff = cutoff - timedelta(days=days)
+        cutoff = datetime.utcnow() - timedelta(days=days)
 
         failures = [
             obs
-            for obs in self._observations
-            if obs.indicates_gap() and obs.timestamp > cutoff
+            for obs in map(self._get, self._seqs_of_types(GAP_TYPES))
+            if obs.timestamp > cutoff
         ]
 
         # Sort by recency
         failures.sort(key=lambda x: x.timestamp, reverse=True)
         return failures[:limit]
 
+    def get_failures_since(self, cursor: int) -> Tuple[List[AgentObservation], int]:
+        """
+        Gap-indicating observations recorded since `cursor`, oldest first.
+
+        Returns them with the cursor to pass next time (start from 0).
+        Observations already evicted from the buffer are skipped.
+        """
+        failures = [self._get(seq) for seq in self._seqs_of_types(GAP_TYPES, cursor)]
+        return failures, self._next_seq
+
     def get_quality_issues(
         self,
         days: int = 30,
     ) -> List[AgentObservation]:
         """Get recent quality issue observations."""
-        cutoff = datetime.utcnow()
-        from datetime import timedelta
-
-        cutoff = cutoff - timedelta(days=days)
+        cutoff = datetime.utcnow() - timedelta(days=days)
 
         return [
             obs
-            for obs in self._observations
-            if obs.indicates_quality_issue() and obs.timestamp > cutoff
+            for obs in map(self._get, self._seqs_of_types(QUALITY_ISSUE_TYPES))
+            if obs.timestamp > cutoff
         ]
 
     def get_nodes_needing_review(self) -> List[int]:
         """Get node IDs that have negative observations."""
         nodes_to_review = set()
 
-        for obs in self._observations:
+        for obs in self._iter_observations():
             nodes_to_review.update(obs.should_invalidate)
             nodes_to_review.update(obs.should_demote)
             nodes_to_review.update(obs.contradicting_nodes)
@@ -490,28 +531,22 @@ class ObservationCollector:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get observation statistics."""
-        total = len(self._observations)
+        total = len(self)
         if total == 0:
             return {"total_observations": 0}
 
         type_counts = {}
-        for obs_type, obs_ids in self._by_type.items():
-            type_counts[obs_type.value] = len(obs_ids)
-
-        success_scores = [obs.success_score for obs in self._observations]
-        avg_success = sum(success_scores) / len(success_scores)
-
-        gaps = [obs for obs in self._observations if obs.indicates_gap()]
-        quality_issues = [
-            obs for obs in self._observations if obs.indicates_quality_issue()
-        ]
+        for obs_type, seqs in self._by_type.items():
+            type_counts[obs_type.value] = len(seqs)
 
         return {
             "total_observations": total,
             "by_type": type_counts,
-            "avg_success_score": avg_success,
-            "gap_count": len(gaps),
-            "quality_issue_count": len(quality_issues),
+            "avg_success_score": self._success_sum / total,
+            "gap_count": sum(len(self._by_type.get(t, ())) for t in GAP_TYPES),
+            "quality_issue_count": sum(
+                len(self._by_type.get(t, ())) for t in QUALITY_ISSUE_TYPES
+            ),
             "nodes_tracked": len(self._by_node),
             "unique_queries": len(self._by_query),
         }
@@ -0,0 +1,206 @@
+"""Tests for the ring-buffer observation store and incremental gap clustering."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ultimate_rag.agents.maintenance import (  # noqa: E402
+    MaintenanceAgent,
+    OnlineQueryClusterer,
+)
+from ultimate_rag.agents.observations import (  # noqa: E402
+    AgentObservation,
+    ObservationCollector,
+    ObservationType,
+)
+
+
+class TopicEmbeddings:
+    """Embeds a query as the unit vector of its first word's topic."""
+
+    TOPICS = ["redis", "kafka", "postgres", "dns"]
+
+    def __init__(self):
+        self.calls = []
+
+    def create_embeddings_batch(self, texts):
+        self.calls.append(list(texts))
+        vectors = []
+        for text in texts:
+            vector = [0.0] * len(self.TOPICS)
+            vector[self.TOPICS.index(text.split()[0])] = 1.0
+            vectors.append(vector)
+        return vectors
+
+
+class TestObservationRingBuffer:
+    def test_eviction_keeps_indexes_in_sync(self):
+        collector = ObservationCollector(max_observations=5)
+        for i in range(12):
+            if i % 3 == 0:
+                collector.record_failure(f"query {i}", "missing", retrieved_nodes=[i])
+            else:
+                collector.record_success(f"query {i}", [1, i], success_score=1.0)
+
+        assert len(collector) == 5
+        held = [obs.query for obs in collector._iter_observations()]
+        assert held == [f"query {i}" for i in range(7, 12)]
+
+        # Node 1 was retrieved by every success; only the held ones remain
+        assert len(collector.get_observations_for_node(1)) == 4
+        assert collector.get_observations_for_node(3) == []
+        assert [o.query for o in collector.get_recent_failures()] == ["query 9"]
+
+        stats = collector.get_stats()
+        assert stats["total_observations"] == 5
+        assert stats["gap_count"] == 1
+        assert stats["avg_success_score"] == pytest.approx(0.8)
+        assert stats["unique_queries"] == 5
+
+    def test_failures_since_cursor(self):
+        collector = ObservationCollector(max_observations=4)
+        collector.record_failure("a", "missing")
+        failures, cursor = collector.get_failures_since(0)
+        assert [o.query for o in failures] == ["a"]
+
+        collector.record_success("b", [1])
+        collector.record(
+            AgentObservation(observation_type=ObservationType.INCOMPLETE, query="c")
+        )
+        failures, cursor = collector.get_failures_since(cursor)
+        assert [o.query for o in failures] == ["c"]
+        assert collector.get_failures_since(cursor)[0] == []
+
+
+class TestIncrementalGapDetection:
+    @pytest.mark.asyncio
+    async def test_new_failures_join_existing_gaps(self):
+        collector = ObservationCollector()
+        embedder = TopicEmbeddings()
+        agent = MaintenanceAgent(
+            forest=None,
+            observation_collector=collector,
+            embedding_model=embedder,
+        )
+        for i in range(3):
+            collector.record_failure(f"redis eviction policy {i}", "missing")
+        collector.record_failure("kafka lag", "missing")
+
+        (gap,) = await agent.analyze_query_logs_for_gaps()
+        assert gap.frequency == 3
+        assert "redis" in gap.affected_topics
+
+        # Repeated query is served from the embedding cache; only new
+        # failures are embedded and the redis gap keeps its id
+        collector.record_failure("redis eviction policy 0", "missing")
+        collector.record_failure("kafka consumer lag", "missing")
+        gaps = await agent.analyze_query_logs_for_gaps()
+        assert [g.gap_id for g in gaps] == [gap.gap_id]
+        assert gaps[0].frequency == 4
+        assert embedder.calls[-1] == ["kafka consumer lag"]
+
+        collector.record_failure("kafka offsets", "missing")
+        gaps = await agent.analyze_query_logs_for_gaps()
+        assert [g.frequency for g in gaps] == [4, 3]
+        kafka_gap = gaps[1]
+        assert "kafka" in kafka_gap.affected_topics
+
+        # Nothing new: the open gaps are still reported, with the same ids
+        again = await agent.analyze_query_logs_for_gaps()
+        assert [g.gap_id for g in again] == [gap.gap_id, kafka_gap.gap_id]
+
+        await agent._create_gap_task(gap)
+        await agent._create_gap_task(gap)
+        assert len(agent.get_pending_tasks()) == 1
+
+    @pytest.mark.asyncio
+    async def test_min_frequency_applies_to_existing_clusters(self):
+        collector = ObservationCollector()
+        agent = MaintenanceAgent(
+            forest=None,
+            observation_collector=collector,
+            embedding_model=TopicEmbeddings(),
+        )
+        for i in range(5):
+            collector.record_failure(f"redis failover {i}", "missing")
+        collector.record_failure("dns resolution", "missing")
+
+        assert len(await agent.analyze_query_logs_for_gaps()) == 1
+        assert len(await agent.analyze_query_logs_for_gaps()) == 1
+
+        agent.gap_detection_min_frequency = 1
+        gaps = await agent.analyze_query_logs_for_gaps()
+        assert sorted(g.frequency for g in gaps) == [1, 5]
+
+    @pytest.mark.asyncio
+    async def test_cycle_only_creates_tasks_for_updated_gaps(self):
+        collector = ObservationCollector()
+        agent = MaintenanceAgent(
+            forest=None,
+            observation_collector=collector,
+            embedding_model=TopicEmbeddings(),
+        )
+        agent.detect_stale_content = AsyncMock(return_value=[])
+        agent.find_contradictions = AsyncMock(return_value=[])
+        agent.find_near_duplicates = AsyncMock(return_value=[])
+        agent.recalculate_importance_scores = AsyncMock()
+        agent.archive_low_value_nodes = AsyncMock(return_value=[])
+        for i in range(3):
+            collector.record_failure(f"postgres vacuum {i}", "missing")
+
+        assert (await agent.run_maintenance_cycle())["gaps_detected"] == 1
+        (task,) = agent.get_pending_tasks()
+        await agent.complete_task(task.task_id, success=True, result="documented")
+
+        # The gap is still open, but a finished task is not reopened until
+        # the gap gains new failures
+        assert (await agent.run_maintenance_cycle())["gaps_detected"] == 1
+        assert agent.get_pending_tasks() == []
+        collector.record_failure("postgres vacuum 3", "missing")
+        await agent.run_maintenance_cycle()
+        assert len(agent.get_pending_tasks()) == 1
+
+    @pytest.mark.asyncio
+    async def test_old_failures_age_out(self):
+        collector = ObservationCollector()
+        agent = MaintenanceAgent(
+            forest=None,
+            observation_collector=collector,
+            embedding_model=TopicEmbeddings(),
+        )
+        old = datetime.utcnow() - timedelta(days=10)
+        for i in range(3):
+            collector.record(
+                AgentObservation(
+                    observation_type=ObservationType.QUERY_FAILURE,
+                    query=f"dns timeout {i}",
+                    timestamp=old,
+                )
+            )
+        assert await agent.analyze_query_logs_for_gaps(days=30) != []
+        assert await agent.analyze_query_logs_for_gaps(days=7) == []
+        assert agent._gap_clusterer.clusters == []
+
+    def test_expired_members_leave_the_centroid(self):
+        clusterer = OnlineQueryClusterer(similarity_threshold=0.5)
+        now = datetime.utcnow()
+
+        def failure(query, age_days):
+            return AgentObservation(
+                observation_type=ObservationType.QUERY_FAILURE,
+                query=query,
+                timestamp=now - timedelta(days=age_days),
+            )
+
+        clusterer.add(
+            [failure("old", 10), failure("new", 1)],
+            np.array([[1.0, 0.0], [0.8, 0.6]]),
+        )
+        clusterer.expire(now - timedelta(days=7))
+
+        (cluster,) = clusterer.clusters
+        assert cluster.frequency == 1
+        assert clusterer._centroids[0] == pytest.approx([0.8, 0.6], abs=1e-6)